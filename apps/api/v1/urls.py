@@ -55,6 +55,9 @@ urlpatterns = [
     
     # Etiketler app'i URL'leri
     path('etiketler/', include('apps.etiketler.urls', namespace='etiketler')),
+    
+    # Ortak yönetim endpoint'leri (personel)
+    path('ortak/', include('apps.ortak.urls', namespace='ortak')),
 ]
 
 # Swagger/OpenAPI dokümantasyonu (eğer drf_yasg yüklüyse)
@@ -107,6 +110,9 @@ if settings.DEBUG:
     - /api/v1/etiketler/populer/    → Popüler etiketler
     - /api/v1/etiketler/harfe_gore/ → Harfe göre etiket listesi
 
+📁 Ortak API (personel):
+    - /api/v1/ortak/tarayici-metrikleri/ → Şüpheli desen tarayıcı sayaçları
+
 📁 Hayvanlar API:
     - /api/v1/hayvanlar/                 → Hayvan listesi
     - /api/v1/hayvanlar/{id}/            → Hayvan detayı
@@ -49,6 +49,7 @@ class EtiketAdmin(admin.ModelAdmin):
         """Etiketin kullanım sayısını gösterir"""
         return obj.kullanim_sayisi
     kullanim_sayisi_goster.short_description = _("Kullanım Sayısı")
+    kullanim_sayisi_goster.admin_order_field = 'hayvan_sayisi'
     
     def renk_renkli(self, obj):
         """Renk kodunun önizlemesini gösterir"""
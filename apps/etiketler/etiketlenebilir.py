@@ -0,0 +1,172 @@
+"""
+🏷️ Etiketlenebilir Model Kaydı
+==============================================================================
+Etiket ilişkisi olan modeller buraya kendileri kaydolur. m2m_changed alıcısı
+yalnızca kayıtlı modellerin `through` tablolarına bağlanır; diğer M2M
+değişiklikleri (yetki, grup, admin kayıtları) hiç dinlenmez.
+
+Bir transaction içindeki tüm etiket değişiklikleri through tablosu başına
+tek partide toplanır ve commit sonrası tek `etiketler_degisti` olayı olarak
+gönderilir.
+==============================================================================
+"""
+
+import threading
+from collections import defaultdict
+from typing import Any, Dict, NamedTuple
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed
+
+from .signals import etiketler_degisti
+
+
+class EtiketIliskisi(NamedTuple):
+    """Kayıtlı modelin etiket ilişkisi: ara tablo ve sütun adları"""
+    model: type
+    through: type
+    kaynak: str
+    hedef: str
+
+
+# model -> ilişki, through -> ilişki
+_MODELLER: Dict[type, EtiketIliskisi] = {}
+_THROUGH: Dict[type, EtiketIliskisi] = {}
+
+_yerel = threading.local()
+
+
+def etiketlenebilir_yap(model, alan: str = 'etiketler') -> EtiketIliskisi:
+    """
+    Modeli etiketlenebilir olarak kaydet (AppConfig.ready içinde çağrılır)
+
+    Args:
+        model: Etiket ManyToManyField'ı olan model
+        alan: İlişki alanının adı
+    """
+    m2m_alani = model._meta.get_field(alan)
+    iliski = EtiketIliskisi(
+        model=model,
+        through=m2m_alani.remote_field.through,
+        kaynak=m2m_alani.m2m_field_name(),
+        hedef=m2m_alani.m2m_reverse_field_name(),
+    )
+    _MODELLER[model] = iliski
+    _THROUGH[iliski.through] = iliski
+    m2m_changed.connect(
+        _iliski_degisti,
+        sender=iliski.through,
+        dispatch_uid=f"etiketlenebilir:{iliski.through._meta.label}",
+    )
+    return iliski
+
+
+def etiket_iliskisi(model) -> EtiketIliskisi:
+    """Kayıtlı modelin etiket ilişkisi; kayıtlı değilse AttributeError"""
+    try:
+        return _MODELLER[model]
+    except KeyError:
+        raise AttributeError(f"{model.__name__} etiketlenebilir olarak kaydedilmemiş")
+
+
+def etiketlenebilir_modeller():
+    """Kayıtlı modeller"""
+    return list(_MODELLER)
+
+
+class _Parti:
+    """Bir transaction boyunca bir through tablosunda biriken değişiklikler"""
+
+    def __init__(self, iliski: EtiketIliskisi):
+        self.iliski = iliski
+        self.nesne_deltalari = defaultdict(lambda: defaultdict(int))
+
+    def ekle(self, nesne_deltalari: Dict[Any, Dict[int, int]]):
+        for nesne_id, deltalar in nesne_deltalari.items():
+            birikim = self.nesne_deltalari[nesne_id]
+            for etiket_id, delta in deltalar.items():
+                birikim[etiket_id] += delta
+
+    def gonder(self):
+        bekleyenler = getattr(_yerel, 'partiler', {})
+        if bekleyenler.get(self.iliski.through) is self:
+            del bekleyenler[self.iliski.through]
+
+        nesne_deltalari = {}
+        deltalar = defaultdict(int)
+        for nesne_id, birikim in self.nesne_deltalari.items():
+            net = {etiket_id: delta for etiket_id, delta in birikim.items() if delta}
+            if net:
+                nesne_deltalari[nesne_id] = net
+            for etiket_id, delta in net.items():
+                deltalar[etiket_id] += delta
+
+        deltalar = {etiket_id: delta for etiket_id, delta in deltalar.items() if delta}
+        if nesne_deltalari:
+            etiketler_degisti.send(
+                sender=self.iliski.model,
+                model=self.iliski.model,
+                nesne_idleri=set(self.nesne_deltalari),
+                deltalar=deltalar,
+                nesne_deltalari=nesne_deltalari,
+            )
+
+
+def degisiklik_bildir(model, nesne_deltalari: Dict[Any, Dict[int, int]]):
+    """
+    Etiket değişikliğini transaction'ın partisine ekle
+
+    Args:
+        model: Etiketlenebilir model
+        nesne_deltalari: {nesne_id: {etiket_id: +1 / -1}}
+
+    Transaction dışında olay hemen gönderilir. İçeride ilk değişiklik partiyi
+    açar ve commit'e tek bir gönderim bağlar; parti geri alınmış bir
+    savepoint'e aitse (callback kuyruktan düşmüşse) yeni parti açılır.
+    """
+    iliski = etiket_iliskisi(model)
+    baglanti = transaction.get_connection()
+    if not baglanti.in_atomic_block:
+        parti = _Parti(iliski)
+        parti.ekle(nesne_deltalari)
+        parti.gonder()
+        return
+
+    if not hasattr(_yerel, 'partiler'):
+        _yerel.partiler = {}
+    parti = _yerel.partiler.get(iliski.through)
+    if parti is None or not any(kayit[1] == parti.gonder for kayit in baglanti.run_on_commit):
+        parti = _yerel.partiler[iliski.through] = _Parti(iliski)
+        transaction.on_commit(parti.gonder)
+    parti.ekle(nesne_deltalari)
+
+
+def _iliski_degisti(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Kayıtlı bir through tablosundaki add/remove/clear değişikliklerini topla
+
+    post_add'de pk_set yalnızca gerçekten eklenenleri içerir. remove ve
+    clear için silinecek satırlar işlemden önce (pre_*) okunur; böylece
+    var olmayan ilişkiler sayılmaz ve clear'ın kapsamı bilinir.
+    """
+    iliski = _THROUGH[sender]
+    # reverse=True: instance bir Etiket, pk_set nesne id'leri
+    kendi_sutunu, karsi_sutun = (iliski.hedef, iliski.kaynak) if reverse else (iliski.kaynak, iliski.hedef)
+
+    if action == 'post_add':
+        degisenler, isaret = pk_set, 1
+    elif action in ('pre_remove', 'pre_clear'):
+        filtre = {kendi_sutunu: instance.pk}
+        if action == 'pre_remove':
+            filtre[f"{karsi_sutun}__in"] = pk_set
+        degisenler = set(sender.objects.filter(**filtre).values_list(karsi_sutun, flat=True))
+        isaret = -1
+    else:
+        return
+
+    if not degisenler:
+        return
+    if reverse:
+        degisiklik_bildir(iliski.model, {nesne_id: {instance.pk: isaret} for nesne_id in degisenler})
+    else:
+        degisiklik_bildir(iliski.model, {instance.pk: {etiket_id: isaret for etiket_id in degisenler}})
@@ -7,14 +7,13 @@ API için etiket filtreleme sınıfları
 
 import django_filters
 from django.utils.translation import gettext_lazy as _
-from django.db.models import Count
 
-from .models import Etiket
+from .models import Etiket, KULLANIM_SAYISI
 
 
 class EtiketFilter(django_filters.FilterSet):
     """Etiket modeli için filtreler"""
-    ad = django_filters.CharFilter(lookup_expr='icontains', label=_("Etiket Adı"))
+    ad = django_filters.CharFilter(lookup_expr='tr_icontains', label=_("Etiket Adı"))
     harf = django_filters.CharFilter(method='filter_harf_ile_baslayan', label=_("Başlangıç Harfi"))
     min_kullanim = django_filters.NumberFilter(method='filter_min_kullanim', label=_("Min Kullanım"))
     olusturma_tarihi_baslangic = django_filters.DateFilter(
@@ -47,9 +46,6 @@ class EtiketFilter(django_filters.FilterSet):
     def filter_min_kullanim(self, queryset, name, value):
         """Minimum kullanım sayısına göre filtrele"""
         if value is not None:
-            # Hayvan ve İlanlar koleksiyonlarındaki toplam kullanım sayısı
-            kullanim_queryset = queryset.annotate(
-                toplam_kullanim=Count('hayvanlar', distinct=True) + Count('ilanlar', distinct=True)
-            )
-            return kullanim_queryset.filter(toplam_kullanim__gte=value)
+            # Hayvan ve ilan sayaçlarının toplamı (fonksiyonel indeksli ifade)
+            return queryset.alias(toplam_kullanim=KULLANIM_SAYISI).filter(toplam_kullanim__gte=value)
         return queryset
@@ -0,0 +1,105 @@
+"""
+🏷️ Etiket Öneri Benchmark Komutu
+==============================================================================
+benzer_etiketler_onerisi'nin eski (her çağrıda tüm etiketleri okuyup doğrusal
+tarama) ve yeni (süreç içi öneri indeksi) halini karşılaştırır. Sentetik
+etiketler transaction sonunda geri alınır.
+==============================================================================
+"""
+
+import random
+import statistics
+import time
+from collections import Counter
+from re import sub
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+
+from apps.etiketler.models import Etiket
+from apps.etiketler.servisler import EtiketOneriService, EtiketService
+
+HECELER = ['ke', 'di', 'kö', 'pek', 'sev', 'gi', 'li', 'oy', 'un', 'cu', 'sa', 'kin', 'tüy',
+           'lü', 'a', 'şı', 'ba', 'rı', 'nak', 'ev', 'ci', 'yav', 'ru', 'ı', 'şık', 'göz']
+
+METINLER = [
+    "Bu sevimli ve oyuncu kedi çok sakin bir yapıya sahip, aşıları tamam.",
+    "Barınaktan sahiplendirilen yavru köpek uzun tüylü ve çok sevgili.",
+    "Işıklı gözleri olan kedicik evcil ve oyuncu bir dost arıyor.",
+]
+
+
+def eski_oneri(metin, limit=5):
+    """Değişiklik öncesi benzer_etiketler_onerisi davranışının taklidi"""
+    temiz_metin = sub(r'[^\w\s]', ' ', metin.lower())
+    stopwords = ["ve", "veya", "ile", "için", "bir", "bu", "şu", "o", "da", "de"]
+    kelimeler = [k for k in temiz_metin.split() if len(k) > 3 and k not in stopwords]
+    en_sik = [kelime for kelime, _ in Counter(kelimeler).most_common(limit)]
+
+    mevcut = list(Etiket.objects.values_list('ad', flat=True))
+    oneriler = []
+    for kelime in en_sik:
+        if kelime in [e.lower() for e in mevcut]:
+            oneriler.append(kelime)
+            continue
+        for etiket in mevcut:
+            if kelime in etiket.lower() and etiket not in oneriler:
+                oneriler.append(etiket)
+                break
+    if len(oneriler) < limit:
+        for etiket in Etiket.objects.annotate(
+            hayvan_sayi=Count('hayvanlar', distinct=True)
+        ).order_by('-hayvan_sayi')[:limit]:
+            if etiket.ad not in oneriler and len(oneriler) < limit:
+                oneriler.append(etiket.ad)
+    return oneriler[:limit]
+
+
+class Command(BaseCommand):
+    help = 'Etiket öneri indeksini eski doğrusal taramayla karşılaştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--etiket', type=int, default=50_000,
+                            help='Sentetik etiket sayısı')
+        parser.add_argument('--tekrar', type=int, default=20,
+                            help='Yöntem başına öneri çağrısı')
+
+    def handle(self, *args, **options):
+        rastgele = random.Random(42)
+        adlar = set()
+        while len(adlar) < options['etiket']:
+            kelimeler = [
+                ''.join(rastgele.choices(HECELER, k=rastgele.randint(2, 4)))
+                for _ in range(rastgele.randint(1, 2))
+            ]
+            adlar.add(' '.join(kelimeler).capitalize()[:50])
+
+        with transaction.atomic():
+            Etiket.tum_etiketler.bulk_create(
+                [Etiket(ad=ad, slug=f"bench-{i}") for i, ad in enumerate(adlar)], batch_size=2000
+            )
+
+            baslangic = time.perf_counter()
+            EtiketOneriService._bellek = (None, 0.0, None)
+            indeks = EtiketOneriService.indeks()
+            self.stdout.write(f"{len(indeks)} etiket, indeks kurulumu {time.perf_counter() - baslangic:.2f} sn")
+
+            self.stdout.write(f"{'yol':<8}{'medyan ms':>12}{'p95 ms':>10}{'sorgu/çağrı':>14}")
+            for yol, oner in (('eski', eski_oneri), ('yeni', EtiketService.benzer_etiketler_onerisi)):
+                sureler = []
+                with CaptureQueriesContext(connection) as ctx:
+                    for i in range(options['tekrar']):
+                        baslangic = time.perf_counter()
+                        oner(METINLER[i % len(METINLER)])
+                        sureler.append((time.perf_counter() - baslangic) * 1000)
+                sureler.sort()
+                self.stdout.write(
+                    f"{yol:<8}{statistics.median(sureler):>12.2f}"
+                    f"{sureler[int(len(sureler) * 0.95) - 1]:>10.2f}"
+                    f"{len(ctx.captured_queries) / options['tekrar']:>14.1f}"
+                )
+
+            transaction.set_rollback(True)
+        EtiketOneriService._bellek = (None, 0.0, None)
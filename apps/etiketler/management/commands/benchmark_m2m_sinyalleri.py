@@ -0,0 +1,96 @@
+"""
+🏷️ M2M Sinyal Benchmark Komutu
+==============================================================================
+Admin kayıtlarına benzer M2M yoğun işlemleri (grup yetkileri, kullanıcı
+grupları, hayvan etiketleri) eski global `m2m_changed` alıcısıyla ve yeni
+hedefli etiketlenebilir kaydıyla karşılaştırır. Veriler geri alınır.
+==============================================================================
+"""
+
+import logging
+import random
+import time
+
+from django.contrib.auth.models import Group, Permission
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models.signals import m2m_changed
+
+from apps.etiketler.etiketlenebilir import _iliski_degisti
+from apps.etiketler.models import Etiket
+from apps.hayvanlar.models import Hayvan
+from apps.kullanicilar.models import CustomUser
+
+logger = logging.getLogger('apps.etiketler.signals')
+
+
+def eski_alici(sender, instance, action, pk_set, **kwargs):
+    """Değişiklik öncesi `@receiver(m2m_changed, sender=None)` alıcısının taklidi"""
+    try:
+        if not hasattr(instance, 'etiketler'):
+            return
+        if not sender._meta.get_field('etiketler').related_model == Etiket:
+            return
+        if action not in ('post_add', 'post_remove', 'post_clear'):
+            return
+        transaction.on_commit(lambda: None)
+    except Exception as e:
+        logger.error(f"Etiket kullanımı izleme sinyalinde hata: {str(e)}")
+
+
+class _Sayac(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.adet = 0
+
+    def emit(self, record):
+        self.adet += 1
+
+
+class Command(BaseCommand):
+    help = 'M2M yoğun kayıtlarda sinyal maliyetini eski ve yeni bağlantıyla karşılaştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tekrar', type=int, default=300,
+                            help='Yol başına kayıt turu')
+
+    def handle(self, *args, **options):
+        rastgele = random.Random(7)
+        sayac = _Sayac()
+        logger.addHandler(sayac)
+        logger.propagate = False
+
+        with transaction.atomic():
+            yetkiler = list(Permission.objects.all()[:60])
+            gruplar = [Group.objects.create(name=f"benchmark-{i}") for i in range(5)]
+            kullanici = CustomUser.objects.create_user(email="m2m-benchmark@example.com", password="x")
+            hayvan = Hayvan.objects.create(ad="Benchmark", tur="kedi")
+            etiketler = [Etiket.objects.create(ad=f"m2m-bench-{i}") for i in range(20)]
+            through = Hayvan.etiketler.through
+
+            self.stdout.write(f"{'yol':<8}{'süre sn':>10}{'tur/sn':>10}{'log hatası':>12}")
+            for yol in ('eski', 'yeni'):
+                if yol == 'eski':
+                    m2m_changed.disconnect(_iliski_degisti, sender=through,
+                                           dispatch_uid=f"etiketlenebilir:{through._meta.label}")
+                    m2m_changed.connect(eski_alici)
+                else:
+                    m2m_changed.disconnect(eski_alici)
+                    m2m_changed.connect(_iliski_degisti, sender=through,
+                                        dispatch_uid=f"etiketlenebilir:{through._meta.label}")
+                sayac.adet = 0
+
+                baslangic = time.perf_counter()
+                for _ in range(options['tekrar']):
+                    for grup in gruplar:
+                        grup.permissions.set(rastgele.sample(yetkiler, min(len(yetkiler), 10)))
+                    kullanici.groups.set(rastgele.sample(gruplar, 2))
+                    hayvan.etiketler.set(rastgele.sample(etiketler, 5))
+                sure = time.perf_counter() - baslangic
+
+                self.stdout.write(f"{yol:<8}{sure:>10.2f}{options['tekrar'] / sure:>10.0f}{sayac.adet:>12}")
+
+            transaction.set_rollback(True)
+
+        logger.removeHandler(sayac)
+        logger.propagate = True
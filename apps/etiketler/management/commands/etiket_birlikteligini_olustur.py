@@ -0,0 +1,34 @@
+"""
+🏷️ Etiket Birliktelik Matrisi Komutu
+==============================================================================
+Artımlı güncellenen etiket birliktelik (co-occurrence) matrisini ara
+tablolardan toplu olarak yeniden kurar. İlk kurulumda ve lift değerlerini
+tazelemek için periyodik (cron / beat) çalıştırılır.
+==============================================================================
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.etiketler.servisler import EtiketService
+
+
+class Command(BaseCommand):
+    """
+    Etiket birliktelik matrisini yeniden kurar
+    
+    Kullanım:
+        python manage.py etiket_birlikteligini_olustur
+    """
+    
+    help = 'Etiket birliktelik matrisini ilişki başına tek self-join GROUP BY sorgusuyla yeniden kurar'
+    
+    def handle(self, *args, **options):
+        baslangic = time.perf_counter()
+        cift = EtiketService.birlikteligi_yeniden_olustur()
+        sure = time.perf_counter() - baslangic
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'{cift} yönlü etiket çifti yazıldı ({sure:.2f} sn)'
+        ))
@@ -0,0 +1,33 @@
+"""
+🏷️ Etiket Sayaç Eşitleme Komutu
+==============================================================================
+Delta ile güncellenen etiket kullanım sayaçlarındaki kaymayı düzelten yönetim
+komutu. Periyodik (cron / beat) çalıştırılmak üzere tasarlanmıştır.
+==============================================================================
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.etiketler.servisler import EtiketService
+
+
+class Command(BaseCommand):
+    """
+    Etiket hayvan/ilan sayaçlarını ilişki tablolarıyla eşitler
+    
+    Kullanım:
+        python manage.py etiket_sayaclarini_esitle
+    """
+    
+    help = 'Etiket sayaçlarını ilişki başına tek GROUP BY sorgusuyla yeniden hesaplar'
+    
+    def handle(self, *args, **options):
+        baslangic = time.perf_counter()
+        duzeltilen = EtiketService.sayaclari_esitle()
+        sure = time.perf_counter() - baslangic
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'{duzeltilen} etiketin sayacı düzeltildi ({sure:.2f} sn)'
+        ))
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.16 on 2026-10-18 19:24
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.expressions
+
+
+def hayvan_sayilarini_hesapla(apps, schema_editor):
+    """Mevcut etiket ilişkilerinden başlangıç sayaçlarını doldur"""
+    Hayvan = apps.get_model('hayvanlar', 'Hayvan')
+    Etiket = apps.get_model('etiketler', 'Etiket')
+    sayilar = (
+        Hayvan.etiketler.through.objects.order_by()
+        .values('etiket_id')
+        .annotate(adet=Count('pk'))
+        .values_list('etiket_id', 'adet')
+    )
+    for etiket_id, adet in sayilar:
+        Etiket.objects.filter(pk=etiket_id).update(hayvan_sayisi=adet)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etiketler', '0001_initial'),
+        ('hayvanlar', '0005_saglikdurumu_remove_hayvan_asilar_tamam_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='etiket',
+            name='hayvan_sayisi',
+            field=models.PositiveIntegerField(default=0, help_text='Bu etiketi taşıyan hayvan sayısı', verbose_name='Hayvan Sayısı'),
+        ),
+        migrations.AddField(
+            model_name='etiket',
+            name='ilan_sayisi',
+            field=models.PositiveIntegerField(default=0, help_text='Bu etiketi taşıyan ilan sayısı', verbose_name='İlan Sayısı'),
+        ),
+        migrations.AddIndex(
+            model_name='etiket',
+            index=models.Index(fields=['aktif', '-hayvan_sayisi', '-ilan_sayisi'], name='etiket_populer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='etiket',
+            index=models.Index(django.db.models.expressions.CombinedExpression(models.F('hayvan_sayisi'), '+', models.F('ilan_sayisi')), name='etiket_kullanim_idx'),
+        ),
+        migrations.RunPython(hayvan_sayilarini_hesapla, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.16 on 2026-10-18 19:29
+
+from collections import defaultdict
+from itertools import groupby, permutations
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def birlikteligi_hesapla(apps, schema_editor):
+    """Mevcut hayvan etiketlerinden başlangıç birliktelik matrisini kur"""
+    Hayvan = apps.get_model('hayvanlar', 'Hayvan')
+    Etiket = apps.get_model('etiketler', 'Etiket')
+    EtiketBirlikteligi = apps.get_model('etiketler', 'EtiketBirlikteligi')
+
+    satirlar = Hayvan.etiketler.through.objects.order_by('hayvan_id').values_list('hayvan_id', 'etiket_id')
+    ciftler = defaultdict(int)
+    toplam = 0
+    for _hayvan_id, grup in groupby(satirlar.iterator(), key=lambda satir: satir[0]):
+        toplam += 1
+        for a, b in permutations({etiket_id for _h, etiket_id in grup}, 2):
+            ciftler[(a, b)] += 1
+
+    kullanim = dict(Etiket.objects.values_list('id', 'hayvan_sayisi'))
+    EtiketBirlikteligi.objects.bulk_create(
+        [
+            EtiketBirlikteligi(
+                etiket_id=a, diger_id=b, adet=adet,
+                lift=adet * toplam / (kullanim[a] * kullanim[b]) if kullanim.get(a) and kullanim.get(b) else 0.0,
+            )
+            for (a, b), adet in ciftler.items()
+        ],
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etiketler', '0002_etiket_kullanim_sayaclari'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EtiketBirlikteligi',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('adet', models.PositiveIntegerField(default=0, help_text='İki etiketi birlikte taşıyan nesne sayısı', verbose_name='Birlikte Kullanım')),
+                ('lift', models.FloatField(default=0.0, help_text='Birlikte görülme olasılığının bağımsızlık varsayımına oranı', verbose_name='Lift')),
+                ('diger', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='birlikte_kullanimlar', to='etiketler.etiket', verbose_name='Birlikte Kullanılan Etiket')),
+                ('etiket', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='birliktelikler', to='etiketler.etiket', verbose_name='Etiket')),
+            ],
+            options={
+                'verbose_name': '🏷️ Etiket Birlikteliği',
+                'verbose_name_plural': '🏷️ Etiket Birliktelikleri',
+                'indexes': [models.Index(fields=['etiket', '-adet'], name='etiket_birlikte_adet_idx'), models.Index(fields=['etiket', '-lift'], name='etiket_birlikte_lift_idx')],
+                'unique_together': {('etiket', 'diger')},
+            },
+        ),
+        migrations.RunPython(birlikteligi_hesapla, migrations.RunPython.noop),
+    ]
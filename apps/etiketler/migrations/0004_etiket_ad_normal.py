@@ -0,0 +1,49 @@
+# Generated by Django 4.2.16 on 2026-10-18 19:32
+
+import apps.ortak.fields
+from django.db import migrations
+
+from apps.ortak.utils import turkce_normalize
+
+
+def etiket_ad_normal_doldur(apps, schema_editor):
+    """Mevcut kayıtların gölge sütununu doldur"""
+    Etiket = apps.get_model('etiketler', 'Etiket')
+    degisenler = []
+    for nesne in Etiket.objects.only('id', 'ad', 'ad_normal').iterator(chunk_size=2000):
+        nesne.ad_normal = turkce_normalize(nesne.ad or '')
+        degisenler.append(nesne)
+    Etiket.objects.bulk_update(degisenler, ['ad_normal'], batch_size=1000)
+
+
+def trigram_indeksi_kur(apps, schema_editor):
+    """tr_icontains için trigram indeksi (sadece PostgreSQL)"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm; "
+            "CREATE INDEX IF NOT EXISTS etiket_ad_normal_trgm_gin "
+            "ON etiketler_etiket USING gin (ad_normal gin_trgm_ops);",
+            params=None,
+        )
+
+
+def trigram_indeksi_kaldir(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS etiket_ad_normal_trgm_gin;", params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('etiketler', '0003_etiket_birlikteligi'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='etiket',
+            name='ad_normal',
+            field=apps.ortak.fields.NormalizeAlan(kaynak='ad', max_length=50, verbose_name='Normalize Ad'),
+        ),
+        migrations.RunPython(etiket_ad_normal_doldur, migrations.RunPython.noop),
+        migrations.RunPython(trigram_indeksi_kur, trigram_indeksi_kaldir),
+    ]
@@ -5,12 +5,29 @@ Platform üzerindeki etiketlerin veri yapısı ve ilişkileri
 ==============================================================================
 """
 
-from django.db import models
+import math
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
-from django.utils.text import slugify
+from collections import defaultdict
+
 from django.core.exceptions import ValidationError
-from django.db.models import Count
+from django.core.cache import cache
+from django.db.models import Count, F, Min, Q, Sum
+from django.db.models.functions import Greatest
+
+from apps.ortak.fields import NormalizeAlan
+from apps.ortak.utils import create_slug
+
+
+# Etiket ilişkisi (related_name) -> saklanan sayaç sütunu
+SAYAC_ALANLARI = {
+    'hayvanlar': 'hayvan_sayisi',
+    'ilanlar': 'ilan_sayisi',
+}
+
+# Toplam kullanım; aynı ifadenin fonksiyonel indeksi vardır
+KULLANIM_SAYISI = F('hayvan_sayisi') + F('ilan_sayisi')
 
 
 class EtiketManager(models.Manager):
@@ -23,11 +40,67 @@ class EtiketManager(models.Manager):
         return super().get_queryset().filter(aktif=True)
     
     def en_populer(self, limit=10):
-        """En çok kullanılan etiketleri döndür"""
-        return self.annotate(
-            hayvan_sayi=Count('hayvanlar', distinct=True),
-            ilan_sayi=Count('ilanlar', distinct=True)
-        ).order_by('-hayvan_sayi', '-ilan_sayi')[:limit]
+        """En çok kullanılan etiketleri döndür (saklanan sayaçlar, indeksli)"""
+        return self.order_by('-hayvan_sayisi', '-ilan_sayisi')[:limit]
+    
+    def kullanim_sayilarini_degistir(self, alan, deltalar):
+        """
+        Sayaçları COUNT(*) yapmadan artır/azalt (pasif etiketler dahil)
+        
+        Args:
+            alan: Sayaç sütunu (SAYAC_ALANLARI değerlerinden biri)
+            deltalar: {etiket_id: +n / -n} sözlüğü
+        
+        Aynı deltaya sahip etiketler tek UPDATE ile güncellenir; sayaçlar
+        sıfırın altına inmez.
+        """
+        gruplar = defaultdict(list)
+        for etiket_id, delta in deltalar.items():
+            if etiket_id and delta:
+                gruplar[delta].append(etiket_id)
+        
+        for delta, etiket_idleri in gruplar.items():
+            self.model.tum_etiketler.filter(id__in=etiket_idleri).update(
+                **{alan: Greatest(F(alan) + delta, 0)}
+            )
+    
+    def sayaclari_esitle(self):
+        """
+        Sayaç kaymasını düzelt
+        
+        İlişki başına tek GROUP BY sorgusuyla gerçek sayılar alınır, sadece
+        değişen etiketler yazılır.
+        
+        Returns:
+            int: Düzeltilen etiket sayısı
+        """
+        gercek = {}
+        for iliski in self.model._meta.related_objects:
+            alan = SAYAC_ALANLARI.get(iliski.related_name)
+            if not iliski.many_to_many or alan is None:
+                continue
+            hedef = iliski.field.m2m_reverse_field_name()
+            gercek[alan] = dict(
+                iliski.through.objects.order_by()
+                .values(hedef)
+                .annotate(adet=Count('pk'))
+                .values_list(hedef, 'adet')
+            )
+        
+        degisenler = []
+        for etiket in self.model.tum_etiketler.only('id', *SAYAC_ALANLARI.values()):
+            degisti = False
+            for alan in SAYAC_ALANLARI.values():
+                deger = gercek.get(alan, {}).get(etiket.id, 0)
+                if getattr(etiket, alan) != deger:
+                    setattr(etiket, alan, deger)
+                    degisti = True
+            if degisti:
+                degisenler.append(etiket)
+        
+        if degisenler:
+            self.model.tum_etiketler.bulk_update(degisenler, list(SAYAC_ALANLARI.values()), batch_size=500)
+        return len(degisenler)
     
     def harf_ile_baslayan(self, harf):
         """Belirli bir harfle başlayan etiketleri döndür"""
@@ -35,16 +108,41 @@ class EtiketManager(models.Manager):
     
     def ile_ilgili(self, etiket_adi, limit=5):
         """Verilen etiket ile ilişkili diğer etiketleri döndür"""
-        try:
-            etiket = self.get(ad__iexact=etiket_adi)
-            # İlişkili hayvanlar üzerinden ortak etiketleri bul
-            return self.filter(hayvanlar__in=etiket.hayvanlar.all()).exclude(
-                id=etiket.id
-            ).annotate(
-                kullanim=Count('id')
-            ).order_by('-kullanim')[:limit]
-        except self.model.DoesNotExist:
+        etiket = self.filter(ad__tr_iexact=etiket_adi).first()
+        if etiket is None:
             return self.none()
+        return self.ilgili(etiket.id, limit=limit)
+    
+    def ilgili(self, etiket_id, limit=5, siralama='birlikte'):
+        """
+        Etiketle en sık birlikte kullanılan etiketler (birliktelik tablosundan)
+        
+        Args:
+            etiket_id: Etiket ID
+            limit: Maksimum sonuç
+            siralama: 'birlikte' (birlikte kullanım sayısı) veya 'lift'
+        """
+        return self.filter(birlikte_kullanimlar__etiket_id=etiket_id).annotate(
+            birlikte=F('birlikte_kullanimlar__adet'),
+            lift=F('birlikte_kullanimlar__lift'),
+        ).order_by(f'-{siralama}', 'ad')[:limit]
+    
+    def kume_ile_ilgili(self, etiket_idleri, limit=10):
+        """
+        Bir etiket kümesinin tamamıyla birlikte kullanılan etiketler (facet)
+        
+        Aday, kümedeki her etiketle en az bir kez birlikte görülmüş olmalıdır.
+        `birlikte` değeri çift sayılarının en küçüğüdür; kümenin tamamını
+        taşıyan nesne sayısı için üst sınırdır.
+        """
+        etiket_idleri = set(etiket_idleri)
+        return self.filter(
+            birlikte_kullanimlar__etiket_id__in=etiket_idleri
+        ).exclude(id__in=etiket_idleri).annotate(
+            eslesen=Count('birlikte_kullanimlar'),
+            birlikte=Min('birlikte_kullanimlar__adet'),
+            toplam_birlikte=Sum('birlikte_kullanimlar__adet'),
+        ).filter(eslesen=len(etiket_idleri)).order_by('-birlikte', '-toplam_birlikte', 'ad')[:limit]
 
 
 class Etiket(models.Model):
@@ -57,6 +155,12 @@ class Etiket(models.Model):
         verbose_name=_("Etiket Adı"),
         help_text=_("Etiket adı benzersiz olmalıdır")
     )
+    # Türkçe duyarlı ad eşleştirmesi için gölge sütun (ad__tr_iexact)
+    ad_normal = NormalizeAlan(
+        kaynak='ad',
+        max_length=50,
+        verbose_name=_("Normalize Ad")
+    )
     slug = models.SlugField(
         max_length=60, 
         unique=True, 
@@ -94,6 +198,18 @@ class Etiket(models.Model):
         verbose_name=_("Güncellenme Tarihi")
     )
     
+    # İstatistikler - m2m sinyalleriyle delta olarak güncellenir
+    hayvan_sayisi = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Hayvan Sayısı"),
+        help_text=_("Bu etiketi taşıyan hayvan sayısı")
+    )
+    ilan_sayisi = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("İlan Sayısı"),
+        help_text=_("Bu etiketi taşıyan ilan sayısı")
+    )
+    
     # Etiketler için özel yönetici tanımlama
     objects = EtiketManager()
     # Tüm etiketleri içeren temel yönetici (aktif olmayan etiketler dahil)
@@ -106,6 +222,8 @@ class Etiket(models.Model):
         indexes = [
             models.Index(fields=['slug']),
             models.Index(fields=['aktif']),
+            models.Index(fields=['aktif', '-hayvan_sayisi', '-ilan_sayisi'], name='etiket_populer_idx'),
+            models.Index(KULLANIM_SAYISI, name='etiket_kullanim_idx'),
         ]
     
     def __str__(self):
@@ -118,7 +236,7 @@ class Etiket(models.Model):
         
         # Aynı ada sahip etiket var mı kontrol et (büyük/küçük harf duyarsız)
         if not self.pk:  # Sadece yeni etiketler için kontrol et
-            existing = Etiket.tum_etiketler.filter(ad__iexact=self.ad).first()
+            existing = Etiket.tum_etiketler.filter(ad__tr_iexact=self.ad).first()
             if existing:
                 # Varolan etiket pasif durumdaysa, onu aktifleştir
                 if not existing.aktif:
@@ -138,7 +256,7 @@ class Etiket(models.Model):
         
     def _generate_unique_slug(self):
         """Benzersiz slug oluştur"""
-        slug = slugify(self.ad)
+        slug = create_slug(self.ad, max_length=50)
         unique_slug = slug
         num = 1
         
@@ -150,14 +268,252 @@ class Etiket(models.Model):
     
     @property
     def kullanim_sayisi(self):
-        """Etiketin toplam kullanım sayısını döndür"""
-        hayvan_sayisi = getattr(self, 'hayvanlar', None)
-        ilan_sayisi = getattr(self, 'ilanlar', None)
-        
-        toplam = 0
-        if hayvan_sayisi:
-            toplam += hayvan_sayisi.count()
-        if ilan_sayisi:
-            toplam += ilan_sayisi.count()
-            
-        return toplam
\ No newline at end of file
+        """Etiketin toplam kullanım sayısını döndür (saklanan sayaçlardan)"""
+        return self.hayvan_sayisi + self.ilan_sayisi
+
+
+
+def _etiket_iliskileri():
+    """Sayaçlı Etiket M2M ilişkileri: (through, kaynak sütunu, hedef sütunu, M2M alan adı)"""
+    for iliski in Etiket._meta.related_objects:
+        if iliski.many_to_many and iliski.related_name in SAYAC_ALANLARI:
+            yield (iliski.through, iliski.field.m2m_field_name(),
+                   iliski.field.m2m_reverse_field_name(), iliski.field.name)
+
+
+# Lift hesabındaki N; etiket değişikliklerinde delta ile güncellenir, günde bir sayılır
+TOPLAM_NESNE_CACHE_ANAHTARI = "etiketler:birliktelik:toplam_nesne"
+TOPLAM_NESNE_CACHE_SURESI = 60 * 60 * 24
+
+
+def _lift(adet, kullanim_a, kullanim_b, toplam):
+    payda = kullanim_a * kullanim_b
+    return adet * toplam / payda if payda else 0.0
+
+
+class EtiketBirlikteligiManager(models.Manager):
+    """
+    Etiket birliktelik (co-occurrence) tablosu yöneticisi
+    """
+    
+    def toplam_nesne(self, yenile=False):
+        """
+        Etiketli nesne sayısı (lift hesabındaki N)
+        
+        Cache'ten okunur (bkz. toplam_nesne_degistir); yoksa veya `yenile`
+        verilmişse ara tablolarda COUNT(DISTINCT) ile sayılır.
+        """
+        if not yenile:
+            toplam = cache.get(TOPLAM_NESNE_CACHE_ANAHTARI)
+            if toplam is not None:
+                return toplam
+        toplam = sum(
+            through.objects.order_by().values(kaynak).distinct().count()
+            for through, kaynak, _hedef, _alan in _etiket_iliskileri()
+        )
+        cache.set(TOPLAM_NESNE_CACHE_ANAHTARI, toplam, TOPLAM_NESNE_CACHE_SURESI)
+        return toplam
+    
+    def toplam_nesne_degistir(self, fark):
+        """İlk etiketini alan / son etiketini kaybeden nesne farkını N'e uygula"""
+        if not fark:
+            return
+        try:
+            cache.incr(TOPLAM_NESNE_CACHE_ANAHTARI, fark)
+        except ValueError:
+            # Cache'te yok: bir sonraki okuma güncel değeri sayar
+            pass
+    
+    def degisiklikleri_uygula(self, through, kaynak, hedef, nesne_deltalari):
+        """
+        Commit edilmiş etiket değişikliklerinden çift sayılarını güncelle
+        
+        Nesnelerin güncel etiketleri tek sorguyla okunur; değişiklik öncesi
+        küme deltalardan geri çıkarılır ve yalnızca oluşan/kaybolan çiftler
+        yazılır. Kullanımı değişen etiketlerin tüm çiftlerinin lift'i
+        yenilenir.
+        
+        Args:
+            through: Etiket ilişkisinin ara tablosu
+            kaynak, hedef: Ara tablodaki nesne ve etiket sütunları
+            nesne_deltalari: {nesne_id: {etiket_id: +1 / -1}}
+        """
+        guncel = defaultdict(set)
+        for nesne_id, etiket_id in through.objects.filter(
+            **{f"{kaynak}__in": list(nesne_deltalari)}
+        ).values_list(kaynak, hedef):
+            guncel[nesne_id].add(etiket_id)
+        
+        ciftler = defaultdict(int)
+        nesne_farki = 0
+        for nesne_id, deltalar in nesne_deltalari.items():
+            yeni = guncel[nesne_id]
+            eski = (yeni - {e for e, d in deltalar.items() if d > 0}) | {e for e, d in deltalar.items() if d < 0}
+            if bool(yeni) != bool(eski):
+                nesne_farki += 1 if yeni else -1
+            for kume, karsi, isaret in ((yeni, eski, 1), (eski, yeni, -1)):
+                for a in kume:
+                    for b in kume:
+                        if a != b and not (a in karsi and b in karsi):
+                            ciftler[(a, b)] += isaret
+        self.toplam_nesne_degistir(nesne_farki)
+        self.ciftleri_degistir(ciftler)
+        self.liftleri_guncelle({
+            etiket_id
+            for deltalar in nesne_deltalari.values()
+            for etiket_id, delta in deltalar.items() if delta
+        })
+    
+    def ciftleri_degistir(self, ciftler):
+        """
+        Çift sayılarını delta olarak uygula, sıfırlanan çiftleri sil
+        (lift: liftleri_guncelle)
+        
+        Args:
+            ciftler: {(etiket_id, diger_id): +n / -n}; çiftler iki yönlü verilir
+        """
+        ciftler = {cift: delta for cift, delta in ciftler.items() if delta}
+        if not ciftler:
+            return
+        
+        self.bulk_create(
+            [self.model(etiket_id=a, diger_id=b) for (a, b), delta in ciftler.items() if delta > 0],
+            batch_size=1000, ignore_conflicts=True,
+        )
+        gruplar = defaultdict(list)
+        for (a, b), delta in ciftler.items():
+            gruplar[(a, delta)].append(b)
+        for (a, delta), digerleri in gruplar.items():
+            self.filter(etiket_id=a, diger_id__in=digerleri).update(adet=F('adet') + delta)
+        
+        etiket_idleri = {a for a, _b in ciftler}
+        self.filter(etiket_id__in=etiket_idleri, adet__lte=0).delete()
+    
+    def liftleri_guncelle(self, etiket_idleri=None):
+        """
+        lift = P(a, b) / (P(a) P(b)) = adet * N / (kullanım_a * kullanım_b)
+        
+        Args:
+            etiket_idleri: Kullanımı değişen etiketler; bu etiketlerin iki
+                yöndeki tüm çiftleri yenilenir (varsayılan: tüm tablo)
+        
+        Returns:
+            int: Değişen satır sayısı
+        """
+        satirlar = self.only('id', 'etiket_id', 'diger_id', 'adet', 'lift')
+        if etiket_idleri is None:
+            kullanim = dict(Etiket.tum_etiketler.values_list('id', KULLANIM_SAYISI))
+            satirlar = satirlar.iterator(chunk_size=2000)
+        else:
+            if not etiket_idleri:
+                return 0
+            satirlar = list(satirlar.filter(Q(etiket_id__in=etiket_idleri) | Q(diger_id__in=etiket_idleri)))
+            if not satirlar:
+                return 0
+            idler = {satir.etiket_id for satir in satirlar} | {satir.diger_id for satir in satirlar}
+            kullanim = dict(Etiket.tum_etiketler.filter(id__in=idler).values_list('id', KULLANIM_SAYISI))
+        toplam = self.toplam_nesne()
+        
+        degisenler = []
+        for satir in satirlar:
+            lift = _lift(satir.adet, kullanim.get(satir.etiket_id, 0), kullanim.get(satir.diger_id, 0), toplam)
+            if satir.lift != lift:
+                satir.lift = lift
+                degisenler.append(satir)
+        self.bulk_update(degisenler, ['lift'], batch_size=1000)
+        return len(degisenler)
+    
+    @transaction.atomic
+    def yeniden_olustur(self):
+        """
+        Tabloyu ara tablolardan baştan kur
+        
+        İlişki başına tek self-join GROUP BY sorgusu; ardından toplu INSERT ve
+        lift hesabı.
+        
+        Returns:
+            int: Yazılan (yönlü) çift sayısı
+        """
+        ciftler = defaultdict(int)
+        for through, kaynak, hedef, alan in _etiket_iliskileri():
+            for a, b, adet in (
+                through.objects.order_by()
+                .values(hedef, diger=F(f"{kaynak}__{alan}"))
+                .annotate(adet=Count('pk'))
+                .exclude(diger=F(hedef))
+                .values_list(hedef, 'diger', 'adet')
+                .iterator()
+            ):
+                ciftler[(a, b)] += adet
+        
+        toplam = self.toplam_nesne(yenile=True)
+        kullanim = dict(Etiket.tum_etiketler.values_list('id', KULLANIM_SAYISI))
+        self.all().delete()
+        self.bulk_create(
+            [
+                self.model(
+                    etiket_id=a, diger_id=b, adet=adet,
+                    lift=_lift(adet, kullanim.get(a, 0), kullanim.get(b, 0), toplam),
+                )
+                for (a, b), adet in ciftler.items()
+            ],
+            batch_size=2000,
+        )
+        return len(ciftler)
+
+
+class EtiketBirlikteligi(models.Model):
+    """
+    Seyrek etiket birliktelik matrisi
+    
+    Aynı nesnede birlikte kullanılan her etiket çifti için iki yönlü satır
+    tutulur; bir etiketin ilişkili etiketleri (etiket, -adet) indeksinden tek
+    okumayla gelir. Sayılar etiket değişiklik olaylarından artımlı güncellenir,
+    `etiket_birlikteligini_olustur` komutuyla toplu yeniden kurulur.
+    
+    `adet` her zaman kesindir. `lift` ise yalnızca yeniden kurulumdan sonra
+    kesindir: artımlı güncelleme kullanımı değişen etiketlerin çiftlerini
+    güncel N ile yeniler, diğer çiftler N'deki değişimi bir sonraki yeniden
+    kuruluma kadar yansıtmaz.
+    """
+    etiket = models.ForeignKey(
+        Etiket,
+        on_delete=models.CASCADE,
+        related_name='birliktelikler',
+        verbose_name=_("Etiket")
+    )
+    diger = models.ForeignKey(
+        Etiket,
+        on_delete=models.CASCADE,
+        related_name='birlikte_kullanimlar',
+        verbose_name=_("Birlikte Kullanılan Etiket")
+    )
+    adet = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Birlikte Kullanım"),
+        help_text=_("İki etiketi birlikte taşıyan nesne sayısı")
+    )
+    lift = models.FloatField(
+        default=0.0,
+        verbose_name=_("Lift"),
+        help_text=_("Birlikte görülme olasılığının bağımsızlık varsayımına oranı")
+    )
+    
+    objects = EtiketBirlikteligiManager()
+    
+    class Meta:
+        verbose_name = _("🏷️ Etiket Birlikteliği")
+        verbose_name_plural = _("🏷️ Etiket Birliktelikleri")
+        unique_together = [['etiket', 'diger']]
+        indexes = [
+            models.Index(fields=['etiket', '-adet'], name='etiket_birlikte_adet_idx'),
+            models.Index(fields=['etiket', '-lift'], name='etiket_birlikte_lift_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.etiket_id} + {self.diger_id}: {self.adet}"
+    
+    @property
+    def pmi(self):
+        """Noktasal karşılıklı bilgi: log2(lift)"""
+        return math.log2(self.lift) if self.lift > 0 else float('-inf')
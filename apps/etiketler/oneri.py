@@ -0,0 +1,109 @@
+"""
+🏷️ Etiket Öneri İndeksi
+==============================================================================
+Aktif etiket adlarının süreç içi öneri indeksi. Tek sorguyla kurulur;
+tam eşleşme, önek (düzleştirilmiş trie) ve alt dizi (trigram ters indeksi)
+aramaları veritabanına gitmeden ve etiket sayısından bağımsız sürede
+cevaplanır. Adaylar popülerlik ağırlığına göre sıralıdır.
+==============================================================================
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Türkçe kurallarla küçült, aksanları katla: 'IŞIKLI Köpek' -> 'isikli kopek'
+from apps.ortak.utils import turkce_normalize as normalize
+
+# Öneri indeksinin cache (nesil) etiketi: etiket eklenince/değişince artırılır
+ETIKET_CACHE_ETIKETI = "etiketler"
+
+
+def _trigramlar(metin: str) -> set:
+    return {metin[i:i + 3] for i in range(len(metin) - 2)}
+
+
+class EtiketOneriIndeksi:
+    """
+    Etiket öneri indeksi
+
+    - `_tam`: normalize ad -> etiket
+    - `_onekler`: kelime/ad önekleri (ONEK_DERINLIGI karaktere kadar) -> en
+      popüler ONEK_ADAY etiket; daha uzun önekler son düğümün kovasında süzülür
+    - `_trigramlar`: trigram -> ağırlığa göre sıralı etiket listesi
+
+    Args:
+        satirlar: (id, ad, ağırlık) üçlüleri
+    """
+
+    ONEK_DERINLIGI = 6
+    ONEK_ADAY = 10
+    TARAMA_SINIRI = 500
+
+    def __init__(self, satirlar: Iterable[Tuple[int, str, int]]):
+        # Ağırlığa göre azalan, eşitlikte ada göre: tüm listeler bu sırayı korur
+        satirlar = sorted(satirlar, key=lambda s: (-s[2], s[1]))
+        self._adlar: List[str] = []
+        self._normal: List[str] = []
+        self._tam: Dict[str, int] = {}
+        onekler = defaultdict(list)
+        kovalar = defaultdict(list)
+        trigramlar = defaultdict(list)
+
+        for sira, (_etiket_id, ad, _agirlik) in enumerate(satirlar):
+            normal = normalize(ad)
+            self._adlar.append(ad)
+            self._normal.append(normal)
+            self._tam.setdefault(normal, sira)
+
+            for kelime in {normal, *normal.split()}:
+                for uzunluk in range(1, min(len(kelime), self.ONEK_DERINLIGI) + 1):
+                    liste = onekler[kelime[:uzunluk]]
+                    if len(liste) < self.ONEK_ADAY and (not liste or liste[-1] != sira):
+                        liste.append(sira)
+                if len(kelime) > self.ONEK_DERINLIGI:
+                    kovalar[kelime[:self.ONEK_DERINLIGI]].append((kelime, sira))
+
+            for gram in _trigramlar(normal):
+                trigramlar[gram].append(sira)
+
+        self._onekler = {onek: tuple(liste) for onek, liste in onekler.items()}
+        self._kovalar = dict(kovalar)
+        self._trigramlar = {gram: tuple(liste) for gram, liste in trigramlar.items()}
+
+    def __len__(self):
+        return len(self._adlar)
+
+    def tam(self, kelime: str) -> Optional[str]:
+        """Normalize adı birebir eşleşen etiket"""
+        sira = self._tam.get(normalize(kelime))
+        return self._adlar[sira] if sira is not None else None
+
+    def onek(self, onek: str, limit: int = 5) -> List[str]:
+        """Bir kelimesi (veya tam adı) önekle başlayan en popüler etiketler"""
+        onek = normalize(onek)
+        if not onek:
+            return []
+        if len(onek) <= self.ONEK_DERINLIGI:
+            return [self._adlar[sira] for sira in self._onekler.get(onek, ())[:limit]]
+
+        sonuc = []
+        for kelime, sira in self._kovalar.get(onek[:self.ONEK_DERINLIGI], ())[:self.TARAMA_SINIRI]:
+            if kelime.startswith(onek) and sira not in sonuc:
+                sonuc.append(sira)
+        return [self._adlar[sira] for sira in sorted(sonuc)[:limit]]
+
+    def icerir(self, parca: str) -> Optional[str]:
+        """Adında parçayı geçiren en popüler etiket"""
+        parca = normalize(parca)
+        if len(parca) < 3:
+            return None
+        listeler = [self._trigramlar.get(gram, ()) for gram in _trigramlar(parca)]
+        en_kisa = min(listeler, key=len)
+        for sira in en_kisa[:self.TARAMA_SINIRI]:
+            if parca in self._normal[sira]:
+                return self._adlar[sira]
+        return None
+
+    def populer(self, limit: int = 5) -> List[str]:
+        """En popüler etiketler"""
+        return self._adlar[:limit]
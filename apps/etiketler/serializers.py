@@ -25,6 +25,14 @@ class EtiketSerializer(serializers.ModelSerializer):
         read_only_fields = ['slug', 'kullanim_sayisi', 'olusturma_tarihi']
 
 
+class IliskiliEtiketSerializer(EtiketSerializer):
+    """Birliktelik matrisinden gelen ilişkili etiket"""
+    birlikte = serializers.IntegerField(read_only=True)
+    
+    class Meta(EtiketSerializer.Meta):
+        fields = EtiketSerializer.Meta.fields + ['birlikte']
+
+
 class EtiketCreateUpdateSerializer(serializers.ModelSerializer):
     """Etiket oluşturma/güncelleme için serializer"""
     
@@ -75,6 +83,6 @@ class EtiketDetailSerializer(EtiketSerializer):
         fields = EtiketSerializer.Meta.fields + ['iliskili_etiketler']
     
     def get_iliskili_etiketler(self, obj):
-        """Etiket ile ilişkili diğer etiketleri döndürür"""
-        iliskili = Etiket.objects.ile_ilgili(obj.ad, limit=5)
+        """Etiket ile birlikte en sık kullanılan diğer etiketleri döndürür"""
+        iliskili = Etiket.objects.ilgili(obj.pk, limit=5)
         return EtiketSerializer(iliskili, many=True).data
\ No newline at end of file
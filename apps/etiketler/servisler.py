@@ -5,12 +5,23 @@ Etiketler uygulaması için servis katmanı
 ==============================================================================
 """
 
-from typing import List, Dict, Any, Optional
+import re
+import time
+from collections import defaultdict
+from typing import List, Dict, Any, Iterable, Optional
 from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from django.utils.text import slugify
 
-from .models import Etiket
+from apps.ortak.cache import etiket_versiyonlari, etiketleri_gecersiz_kil
+from apps.ortak.utils import create_slug, turkce_normalize
+from .etiketlenebilir import degisiklik_bildir, etiket_iliskisi
+from .models import Etiket, EtiketBirlikteligi, KULLANIM_SAYISI
+from .oneri import ETIKET_CACHE_ETIKETI, EtiketOneriIndeksi, normalize
+
+# Öneri çıkarımında atlanan sık kelimeler (normalize edilmiş)
+STOPWORDS = {"ve", "veya", "ile", "icin", "bir", "bu", "su", "o", "da", "de"}
 
 
 class EtiketService:
@@ -35,8 +46,8 @@ class EtiketService:
         if not etiket_adi:
             raise ValueError(_("Etiket adı boş olamaz"))
             
-        # Benzer etiket ara (büyük/küçük harf duyarsız)
-        etiket = Etiket.tum_etiketler.filter(ad__iexact=etiket_adi).first()
+        # Benzer etiket ara (Türkçe duyarlı, büyük/küçük harf duyarsız)
+        etiket = Etiket.tum_etiketler.filter(ad__tr_iexact=etiket_adi).first()
         
         if etiket:
             # Etiket pasif ise aktifleştir
@@ -46,19 +57,137 @@ class EtiketService:
             return etiket
             
         # Etiket bulunamadıysa yenisini oluştur
-        yeni_etiket = Etiket(
-            ad=etiket_adi,
-            slug=slugify(etiket_adi)
-        )
+        yeni_etiket = Etiket(ad=etiket_adi)
         yeni_etiket.save()
         return yeni_etiket
     
+    @staticmethod
+    def _anahtar(etiket_adi: str) -> str:
+        """Karşılaştırma anahtarı (Etiket.ad_normal ile aynı)"""
+        return turkce_normalize(etiket_adi)
+    
+    @classmethod
+    def _adlari_temizle(cls, etiket_adlari: Iterable[str]) -> Dict[str, str]:
+        """Boşları at, tekrarları ilk yazılışıyla tekilleştir: {anahtar: ad}"""
+        temiz = {}
+        for ad in etiket_adlari:
+            ad = (ad or '').strip()
+            if ad:
+                temiz.setdefault(cls._anahtar(ad), ad)
+        return temiz
+    
+    @staticmethod
+    def _benzersiz_sluglar(adlar: List[str]) -> List[str]:
+        """Adlar için tek sorguda çakışmayan slug'lar üret"""
+        tabanlar = [create_slug(ad) or 'etiket' for ad in adlar]
+        kosul = Q()
+        for taban in set(tabanlar):
+            kosul |= Q(slug=taban) | Q(slug__startswith=f"{taban}-")
+        alinmis = set(Etiket.tum_etiketler.filter(kosul).values_list('slug', flat=True))
+        
+        sluglar = []
+        for taban in tabanlar:
+            slug, sayac = taban, 1
+            while slug in alinmis:
+                slug = f"{taban}-{sayac}"
+                sayac += 1
+            alinmis.add(slug)
+            sluglar.append(slug)
+        return sluglar
+    
+    @classmethod
+    def etiketleri_olustur_veya_getir(cls, etiket_adlari: Iterable[str]) -> Dict[str, Etiket]:
+        """
+        Birden çok etiketi tek seferde çöz; olmayanları toplu oluştur
+        
+        Mevcutlar tek sorguda (indeksli ad_normal üzerinden) bulunur, eksikler
+        tek bulk_create ile eklenir, pasif olanlar tek UPDATE ile aktifleşir.
+        
+        Returns:
+            Dict[str, Etiket]: {karşılaştırma anahtarı: etiket}
+        """
+        temiz = cls._adlari_temizle(etiket_adlari)
+        if not temiz:
+            return {}
+        
+        def bul(anahtarlar):
+            return {
+                etiket.ad_normal: etiket
+                for etiket in Etiket.tum_etiketler.filter(ad_normal__in=anahtarlar)
+            }
+        
+        etiketler = bul(list(temiz))
+        eksikler = [ad for anahtar, ad in temiz.items() if anahtar not in etiketler]
+        if eksikler:
+            # Eşzamanlı oluşturulanlar çakışırsa atlanır ve aşağıda yeniden okunur
+            Etiket.tum_etiketler.bulk_create(
+                [Etiket(ad=ad, slug=slug) for ad, slug in zip(eksikler, cls._benzersiz_sluglar(eksikler))],
+                ignore_conflicts=True,
+            )
+            etiketler.update(bul([cls._anahtar(ad) for ad in eksikler]))
+            EtiketOneriService.gecersiz_kil()
+        
+        pasifler = [etiket for etiket in etiketler.values() if not etiket.aktif]
+        if pasifler:
+            Etiket.tum_etiketler.filter(pk__in=[e.pk for e in pasifler]).update(
+                aktif=True, guncelleme_tarihi=timezone.now()
+            )
+            for etiket in pasifler:
+                etiket.aktif = True
+            EtiketOneriService.gecersiz_kil()
+        return etiketler
+    
+    @classmethod
+    def _atamalari_uygula(cls, model, hedefler: Dict[Any, Dict[str, Etiket]], sadece_ekle: bool = False):
+        """
+        Nesne başına hedef etiket kümelerini ara tabloya fark olarak yaz
+        
+        Returns:
+            Tuple: ({nesne_id: [mevcut (etiket_id, ad)]}, eklenen satır, silinen satır)
+        """
+        iliski = etiket_iliskisi(model)
+        through, kaynak, hedef = iliski.through, iliski.kaynak, iliski.hedef
+        
+        mevcut = defaultdict(list)
+        satir_idleri = {}
+        for satir_id, nesne_id, etiket_id, ad in through.objects.filter(
+            **{f"{kaynak}__in": list(hedefler)}
+        ).values_list('id', kaynak, hedef, f"{hedef}__ad"):
+            mevcut[nesne_id].append((etiket_id, ad))
+            satir_idleri[(nesne_id, etiket_id)] = satir_id
+        
+        eklenecek, silinecek = [], []
+        nesne_deltalari = defaultdict(dict)
+        for nesne_id, etiketler in hedefler.items():
+            hedef_idler = {etiket.pk for etiket in etiketler.values()}
+            mevcut_idler = {etiket_id for etiket_id, _ad in mevcut[nesne_id]}
+            for etiket_id in hedef_idler - mevcut_idler:
+                eklenecek.append(through(**{f"{kaynak}_id": nesne_id, f"{hedef}_id": etiket_id}))
+                nesne_deltalari[nesne_id][etiket_id] = 1
+            if not sadece_ekle:
+                for etiket_id in mevcut_idler - hedef_idler:
+                    silinecek.append(satir_idleri[(nesne_id, etiket_id)])
+                    nesne_deltalari[nesne_id][etiket_id] = -1
+        
+        if eklenecek:
+            through.objects.bulk_create(eklenecek, batch_size=1000, ignore_conflicts=True)
+        if silinecek:
+            through.objects.filter(id__in=silinecek).delete()
+        
+        if nesne_deltalari:
+            degisiklik_bildir(model, nesne_deltalari)
+        return mevcut, len(eklenecek), len(silinecek)
+    
     @classmethod
     @transaction.atomic
     def etiketleri_guncelle(cls, nesne, yeni_etiketler: List[str]) -> Dict[str, Any]:
         """
         Bir nesnenin (Hayvan, İlan vb.) etiketlerini günceller.
         
+        Etiketler silinip yeniden eklenmez; mevcut küme ile yeni küme
+        arasındaki fark ara tabloya toplu yazılır; commit sonrası tek bir
+        `etiketler_degisti` olayı gönderilir.
+        
         Args:
             nesne: Etiketleri güncellenecek nesne (hayvan/ilan/vb)
             yeni_etiketler: Yeni etiket adları listesi
@@ -68,49 +197,83 @@ class EtiketService:
         """
         if not hasattr(nesne, 'etiketler'):
             raise AttributeError(_("Bu nesne etiketlenemez"))
-            
-        # Boş string içeren veya boş olan etiketleri filtrele
-        temiz_etiketler = [e.strip() for e in yeni_etiketler if e and e.strip()]
-        
-        # İşlem öncesi mevcut etiketler
-        mevcut_etiketler = list(nesne.etiketler.values_list('ad', flat=True))
-        
-        # İstatistikler
-        stats = {
-            'eklenen': [],
-            'kaldirilan': [],
-            'degismedi': [],
-            'toplam': len(temiz_etiketler)
+        
+        temiz = cls._adlari_temizle(yeni_etiketler)
+        etiketler = cls.etiketleri_olustur_veya_getir(temiz.values())
+        mevcut, _eklenen, _silinen = cls._atamalari_uygula(type(nesne), {nesne.pk: etiketler})
+        
+        mevcut_anahtarlar = {cls._anahtar(ad) for _etiket_id, ad in mevcut[nesne.pk]}
+        return {
+            'eklenen': [ad for anahtar, ad in temiz.items() if anahtar not in mevcut_anahtarlar],
+            'kaldirilan': [ad for _etiket_id, ad in mevcut[nesne.pk] if cls._anahtar(ad) not in temiz],
+            'degismedi': [ad for anahtar, ad in temiz.items() if anahtar in mevcut_anahtarlar],
+            'toplam': len([e for e in yeni_etiketler if e and e.strip()])
         }
+    
+    @classmethod
+    @transaction.atomic
+    def etiketleri_toplu_guncelle(cls, model, atamalar: Dict[Any, Iterable[str]],
+                                  sadece_ekle: bool = False) -> Dict[str, int]:
+        """
+        Binlerce nesneye (ör. barınak içe aktarımı) etiket kümelerini tek seferde uygula
         
-        # Tüm etiketleri kaldır ve yeni etiketleri ekle
-        nesne.etiketler.clear()
+        Tüm etiket adları bir kez çözülür; ara tabloya tek toplu INSERT ve
+        tek DELETE yazılır.
         
-        for etiket_adi in temiz_etiketler:
-            # Aynı etiket birden fazla gelmişse sadece bir kez ekle
-            if etiket_adi.lower() in [e.lower() for e in stats['eklenen']]:
-                continue
-                
-            etiket = cls.etiket_olustur_veya_getir(etiket_adi)
-            nesne.etiketler.add(etiket)
+        Args:
+            model: Etiketlenebilir model sınıfı (ör. Hayvan)
+            atamalar: {nesne_id: etiket adları}
+            sadece_ekle: True ise mevcut etiketler korunur, sadece eksikler eklenir
             
-            if etiket_adi.lower() in [e.lower() for e in mevcut_etiketler]:
-                stats['degismedi'].append(etiket_adi)
-            else:
-                stats['eklenen'].append(etiket_adi)
-        
-        # Kaldırılan etiketleri belirle  
-        for eski_etiket in mevcut_etiketler:
-            if eski_etiket.lower() not in [e.lower() for e in temiz_etiketler]:
-                stats['kaldirilan'].append(eski_etiket)
-                
-        return stats
+        Returns:
+            Dict[str, int]: nesne / eklenen / kaldirilan ilişki sayıları
+        """
+        temiz = {nesne_id: cls._adlari_temizle(adlar) for nesne_id, adlar in atamalar.items()}
+        tum_adlar = {}
+        for adlar in temiz.values():
+            for anahtar, ad in adlar.items():
+                tum_adlar.setdefault(anahtar, ad)
+        etiketler = cls.etiketleri_olustur_veya_getir(tum_adlar.values())
+        
+        hedefler = {
+            nesne_id: {anahtar: etiketler[anahtar] for anahtar in adlar}
+            for nesne_id, adlar in temiz.items()
+        }
+        _mevcut, eklenen, kaldirilan = cls._atamalari_uygula(model, hedefler, sadece_ekle=sadece_ekle)
+        return {'nesne': len(hedefler), 'eklenen': eklenen, 'kaldirilan': kaldirilan}
+    
+    @staticmethod
+    def sayaclari_esitle() -> int:
+        """
+        Etiket kullanım sayaçlarındaki kaymayı düzelt
+        
+        Returns:
+            int: Düzeltilen etiket sayısı
+        """
+        return Etiket.objects.sayaclari_esitle()
+    
+    @staticmethod
+    def birlikteligi_yeniden_olustur() -> int:
+        """
+        Etiket birliktelik matrisini ara tablolardan baştan kur
+        
+        Lift, kullanım sayaçlarından hesaplandığı için önce sayaçlar eşitlenir.
+        
+        Returns:
+            int: Yazılan (yönlü) çift sayısı
+        """
+        Etiket.objects.sayaclari_esitle()
+        return EtiketBirlikteligi.objects.yeniden_olustur()
     
     @staticmethod
     def benzer_etiketler_onerisi(metin: str, limit: int = 5) -> List[str]:
         """
         Verilen metne göre etiket önerileri oluşturur
         
+        Metnin en sık kelimeleri süreç içi öneri indeksinde aranır: önce tam
+        eşleşme, sonra önek, sonra alt dizi; eksik kalan öneriler popüler
+        etiketlerle tamamlanır. Etiket tablosu her çağrıda okunmaz.
+        
         Args:
             metin (str): Analiz edilecek metin
             limit (int): Döndürülecek maksimum öneri sayısı
@@ -118,46 +281,66 @@ class EtiketService:
         Returns:
             List[str]: Önerilen etiket adları listesi
         """
-        # Daha gelişmiş öneri algoritmaları için yer tutucu
-        # Burada AI destekli öneri sistemi entegre edilecek
-        # Şimdilik basit anahtar kelime eşleştirmesi yapıyoruz
-        
-        # Metni küçük harfe çevir ve noktalama işaretlerini kaldır
-        from re import sub
-        temiz_metin = sub(r'[^\w\s]', ' ', metin.lower())
-        kelimeler = temiz_metin.split()
-        
-        # Sık kullanılan kelimeleri kaldır
-        stopwords = ["ve", "veya", "ile", "için", "bir", "bu", "şu", "o", "da", "de"]
-        filtrelenmis_kelimeler = [k for k in kelimeler if len(k) > 3 and k not in stopwords]
-        
-        # Kelime frekansını hesapla
         from collections import Counter
-        kelime_frekanslari = Counter(filtrelenmis_kelimeler)
-        en_sik_kelimeler = [kelime for kelime, _ in kelime_frekanslari.most_common(limit)]
         
-        # Veritabanında mevcut olan etiketlerle eşleştir
-        mevcut_etiketler = list(Etiket.objects.values_list('ad', flat=True))
+        indeks = EtiketOneriService.indeks()
+        
+        # Metni normalize et, sık kullanılan kelimeleri kaldır
+        kelimeler = normalize(re.sub(r'[^\w\s]', ' ', metin)).split()
+        filtrelenmis_kelimeler = [k for k in kelimeler if len(k) > 3 and k not in STOPWORDS]
+        en_sik_kelimeler = [kelime for kelime, _ in Counter(filtrelenmis_kelimeler).most_common(limit)]
         
         oneriler = []
         for kelime in en_sik_kelimeler:
-            # Tam eşleşme varsa ekle
-            if kelime in [e.lower() for e in mevcut_etiketler]:
-                oneriler.append(kelime)
-                continue
-                
-            # Kısmi eşleşme ara
-            for etiket in mevcut_etiketler:
-                if kelime in etiket.lower() and etiket not in oneriler:
-                    oneriler.append(etiket)
-                    break
-        
-        # Öneri sayısını tamamla
-        if len(oneriler) < limit:
-            # Daha çok öneri eklemek için popüler etiketleri kullan
-            populer_etiketler = Etiket.objects.en_populer(limit=limit)
-            for etiket in populer_etiketler:
-                if etiket.ad not in oneriler and len(oneriler) < limit:
-                    oneriler.append(etiket.ad)
-        
-        return oneriler[:limit]
\ No newline at end of file
+            etiket = indeks.tam(kelime) or next(iter(indeks.onek(kelime, 1)), None) or indeks.icerir(kelime)
+            if etiket and etiket not in oneriler:
+                oneriler.append(etiket)
+        
+        # Öneri sayısını popüler etiketlerle tamamla
+        for etiket in indeks.populer(limit + len(oneriler)):
+            if len(oneriler) >= limit:
+                break
+            if etiket not in oneriler:
+                oneriler.append(etiket)
+        
+        return oneriler[:limit]
+
+
+class EtiketOneriService:
+    """
+    Versiyonlu, süreç içi etiket öneri indeksi servisi
+    
+    İndeks tek sorguyla kurulur ve süreç belleğinde tutulur. Etiket
+    yazmaları `etiketler` cache etiketini geçersiz kılar; sonraki çağrı
+    versiyon farkını görüp indeksi yeniden kurar. Popülerlik ağırlıkları
+    saklanan kullanım sayaçlarıdır ve en fazla BELLEK_TIMEOUT kadar gecikebilir.
+    """
+    
+    BELLEK_TIMEOUT = 300
+    
+    # (versiyon, zaman, indeks) - süreç içi kopya
+    _bellek = (None, 0.0, None)
+    
+    @staticmethod
+    def indeks() -> EtiketOneriIndeksi:
+        """Güncel öneri indeksi (gerekirse bir sorguyla kurulur)"""
+        versiyonlar = etiket_versiyonlari([ETIKET_CACHE_ETIKETI])
+        versiyon = versiyonlar[ETIKET_CACHE_ETIKETI] if versiyonlar else None
+        bellek_versiyon, bellek_zamani, bellek_indeks = EtiketOneriService._bellek
+        if (
+            versiyon is not None and bellek_versiyon == versiyon and
+            time.monotonic() - bellek_zamani < EtiketOneriService.BELLEK_TIMEOUT
+        ):
+            return bellek_indeks
+        
+        indeks = EtiketOneriIndeksi(
+            Etiket.objects.order_by().values_list('id', 'ad', KULLANIM_SAYISI)
+        )
+        if versiyon is not None:
+            EtiketOneriService._bellek = (versiyon, time.monotonic(), indeks)
+        return indeks
+    
+    @staticmethod
+    def gecersiz_kil():
+        """Etiket kümesi değişti: tüm süreçlerde indeks yeniden kurulsun"""
+        etiketleri_gecersiz_kil(ETIKET_CACHE_ETIKETI)
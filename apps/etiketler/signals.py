@@ -5,60 +5,56 @@ Etiket modeli için signal handlers
 ==============================================================================
 """
 
-from django.db.models.signals import pre_delete, m2m_changed
-from django.dispatch import receiver
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
 from django.utils import timezone
-from django.db import transaction
 
-from .models import Etiket
+from .models import Etiket, EtiketBirlikteligi, SAYAC_ALANLARI
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Etiketlenebilir modellerde bir transaction'daki tüm etiket değişiklikleri
+# için commit sonrası tek olay (bkz. etiketlenebilir.degisiklik_bildir).
+# Argümanlar: model, nesne_idleri (set), deltalar ({etiket_id: +n / -n}),
+# nesne_deltalari ({nesne_id: {etiket_id: +1 / -1}})
+etiketler_degisti = Signal()
 
-@receiver(m2m_changed, sender=None)
-def etiket_kullanim_degisim_izle(sender, instance, action, pk_set, **kwargs):
+
+def _sayac_alani(model):
+    """Modelin Etiket ilişkisine karşılık gelen sayaç sütunu (yoksa None)"""
+    for iliski in Etiket._meta.related_objects:
+        if iliski.many_to_many and iliski.related_model is model:
+            return SAYAC_ALANLARI.get(iliski.related_name)
+    return None
+
+
+@receiver(etiketler_degisti)
+def etiket_sayaclarini_uygula(sender, model, deltalar, **kwargs):
     """
-    ManyToMany ilişkisi değiştiğinde etiket kullanım sayılarını güncelle.
-    - Özellikle Hayvan ve İlan modelleriyle ilişki değişimlerini izler
-    - Sender parametresi None olarak belirtildiğinden tüm M2M bağlantılarını dinler
-    - İlgili bağlantılar, apps/etiketler/apps.py içinde bağlanır
+    Etiket kullanım sayaçlarını güncelle
+    - Etiketlenebilir modellerin add/remove/clear değişiklikleri ve
+      EtiketService toplu atamaları bu olayda commit sonrası toplanmış gelir
+    - Sayaçlar etiket başına net delta ile F() üzerinden güncellenir
     """
-    try:
-        if not hasattr(instance, 'etiketler'):
-            return
-            
-        # İlişkinin diğer tarafının Etiket olduğunu doğrula
-        if not sender._meta.get_field('etiketler').related_model == Etiket:
-            return
-            
-        # Sadece ekleme/çıkarma işlemlerini işle
-        if action not in ('post_add', 'post_remove', 'post_clear'):
-            return
-            
-        # İşlem tamamlandıktan sonra çalışması için transaction kullan
-        transaction.on_commit(lambda: _guncelle_etiket_istatistikleri(sender, pk_set, action))
-    
-    except Exception as e:
-        logger.error(f"Etiket kullanımı izleme sinyalinde hata: {str(e)}")
+    alan = _sayac_alani(model)
+    if alan:
+        Etiket.objects.kullanim_sayilarini_degistir(alan, deltalar)
 
 
-def _guncelle_etiket_istatistikleri(sender, pk_set, action):
-    """Etiket istatistiklerini günceller"""
-    try:
-        if action == 'post_clear':
-            # Bu işlem için daha karmaşık bir yenileme gerekiyor
-            # Tüm etiketleri yeniliyoruz (maliyetli bir işlem)
-            # İleride optimize edilebilir
-            pass
-        else:
-            # Özellikle etkilenen etiketleri güncelle
-            if pk_set:
-                # İleride bir istatistik alanı eklenmesi durumunda burada güncelleme yapılacak
-                # Şu anki modelde böyle bir alan olmadığı için işlem yapmıyoruz
-                pass
-    except Exception as e:
-        logger.error(f"Etiket istatistikleri güncelleme hatası: {str(e)}")
+@receiver(etiketler_degisti)
+def etiket_birlikteligini_guncelle(sender, model, nesne_deltalari, **kwargs):
+    """
+    Birliktelik matrisini artımlı güncelle
+    - Sayaç alıcısından sonra bağlanır; lift güncel sayaçlarla hesaplanır
+    """
+    if not _sayac_alani(model):
+        return
+    from .etiketlenebilir import etiket_iliskisi
+    iliski = etiket_iliskisi(model)
+    EtiketBirlikteligi.objects.degisiklikleri_uygula(
+        iliski.through, iliski.kaynak, iliski.hedef, nesne_deltalari
+    )
 
 
 @receiver(pre_delete, sender=Etiket)
@@ -92,3 +88,11 @@ def etiket_silinme_oncesi(sender, instance, **kwargs):
     
     except Exception as e:
         logger.error(f"Etiket silme öncesi kontrolde hata: {str(e)}")
+
+
+@receiver(post_save, sender=Etiket)
+@receiver(post_delete, sender=Etiket)
+def etiket_oneri_indeksi_gecersiz_kil(sender, instance, **kwargs):
+    """Etiket eklendi, değişti veya silindi: öneri indeksi yeniden kurulsun"""
+    from .servisler import EtiketOneriService
+    EtiketOneriService.gecersiz_kil()
@@ -0,0 +1,83 @@
+"""
+🏷️ Evcil Hayvan Platformu - Etiketlenebilir Model Kaydı Testleri
+==============================================================================
+Hedefli m2m_changed bağlantısı ve transaction başına parti testleri
+==============================================================================
+"""
+
+import pytest
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.db.models.signals import m2m_changed
+
+from apps.etiketler.etiketlenebilir import etiket_iliskisi, etiketlenebilir_modeller
+from apps.etiketler.models import Etiket
+from apps.etiketler.signals import etiketler_degisti
+from apps.hayvanlar.models import Hayvan
+
+
+@pytest.fixture
+def olaylar():
+    """etiketler_degisti olaylarını topla"""
+    kayit = []
+
+    def alici(sender, **kwargs):
+        kayit.append(kwargs)
+
+    etiketler_degisti.connect(alici)
+    yield kayit
+    etiketler_degisti.disconnect(alici)
+
+
+@pytest.fixture
+def etiketler():
+    return [Etiket.objects.create(ad=ad) for ad in ("Sevimli", "Oyuncu", "Sakin")]
+
+
+@pytest.mark.django_db
+class TestEtiketlenebilirKayit:
+    """Kayıt ve hedefli bağlantı"""
+
+    def test_hayvan_kayitli(self):
+        assert Hayvan in etiketlenebilir_modeller()
+        assert etiket_iliskisi(Hayvan).through is Hayvan.etiketler.through
+
+    def test_kayitsiz_model(self):
+        with pytest.raises(AttributeError):
+            etiket_iliskisi(Group)
+
+    def test_ilgisiz_m2m_dinlenmez(self):
+        assert m2m_changed.has_listeners(Hayvan.etiketler.through)
+        assert not m2m_changed.has_listeners(Group.permissions.through)
+
+    def test_transaction_basina_tek_olay(self, etiketler, olaylar, django_capture_on_commit_callbacks):
+        sevimli, oyuncu, sakin = etiketler
+        hayvan = Hayvan.objects.create(ad="Pamuk", tur="kedi")
+        diger = Hayvan.objects.create(ad="Tarçın", tur="kedi")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            hayvan.etiketler.add(sevimli, oyuncu)
+            hayvan.etiketler.add(sevimli)            # zaten var: sayılmaz
+            hayvan.etiketler.remove(oyuncu, sakin)   # sakin yok: sayılmaz
+            diger.etiketler.add(sevimli, sakin)
+            sakin.hayvanlar.clear()                  # ters taraf
+
+        assert len(olaylar) == 1
+        assert olaylar[0]['model'] is Hayvan
+        assert olaylar[0]['nesne_idleri'] == {hayvan.pk, diger.pk}
+        assert olaylar[0]['deltalar'] == {sevimli.pk: 2}
+
+    def test_geri_alinan_savepoint_sayilmaz(self, etiketler, olaylar, django_capture_on_commit_callbacks):
+        sevimli, oyuncu, _sakin = etiketler
+        hayvan = Hayvan.objects.create(ad="Pamuk", tur="kedi")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    hayvan.etiketler.add(sevimli)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            hayvan.etiketler.add(oyuncu)
+
+        assert [olay['deltalar'] for olay in olaylar] == [{oyuncu.pk: 1}]
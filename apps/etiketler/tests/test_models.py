@@ -6,8 +6,14 @@ Etiket modeli için unit testler
 """
 
 import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
 from django.utils.text import slugify
-from apps.etiketler.models import Etiket
+from apps.etiketler.models import Etiket, EtiketBirlikteligi
+from apps.etiketler.servisler import EtiketService
+from apps.hayvanlar.models import Hayvan
 
 
 @pytest.mark.django_db
@@ -83,4 +89,192 @@ class TestEtiketModel:
         etiket = Etiket(ad="Renk Test", renk_kodu="FF5733")
         
         with pytest.raises(ValidationError):
-            etiket.full_clean()
\ No newline at end of file
+            etiket.full_clean()
+
+
+def _sayilar(*etiketler):
+    return [Etiket.tum_etiketler.get(pk=e.pk).hayvan_sayisi for e in etiketler]
+
+
+@pytest.mark.django_db
+class TestEtiketSayaclari:
+    """m2m sinyalleriyle güncellenen saklanan sayaçlar"""
+
+    @pytest.fixture
+    def etiketler(self):
+        return [Etiket.objects.create(ad=ad) for ad in ("Sevimli", "Oyuncu", "Sakin")]
+
+    @pytest.fixture
+    def hayvanlar(self):
+        return [Hayvan.objects.create(ad=ad, tur="kedi") for ad in ("Pamuk", "Tarçın")]
+
+    @pytest.fixture
+    def commit(self, django_capture_on_commit_callbacks):
+        """Sayaçlar commit sonrası güncellenir: bloğun sonunda callback'leri çalıştır"""
+        return lambda: django_capture_on_commit_callbacks(execute=True)
+
+    def test_ekleme_ve_cikarma(self, etiketler, hayvanlar, commit):
+        sevimli, oyuncu, sakin = etiketler
+        pamuk, tarcin = hayvanlar
+
+        with commit():
+            pamuk.etiketler.add(sevimli, oyuncu)
+            pamuk.etiketler.add(sevimli)           # zaten var: sayılmaz
+            tarcin.etiketler.add(sevimli)
+            pamuk.etiketler.remove(oyuncu, sakin)  # sakin bağlı değil: sayılmaz
+
+        assert _sayilar(sevimli, oyuncu, sakin) == [2, 0, 0]
+        assert Etiket.objects.get(pk=sevimli.pk).kullanim_sayisi == 2
+
+    def test_clear_iki_yonde(self, etiketler, hayvanlar, commit):
+        sevimli, oyuncu, _sakin = etiketler
+        pamuk, tarcin = hayvanlar
+        with commit():
+            pamuk.etiketler.add(sevimli, oyuncu)
+            tarcin.etiketler.add(sevimli)
+            pamuk.etiketler.clear()
+        assert _sayilar(sevimli, oyuncu) == [1, 0]
+
+        with commit():
+            tarcin.etiketler.add(oyuncu)
+            sevimli.hayvanlar.add(pamuk)
+            sevimli.hayvanlar.clear()
+        assert _sayilar(sevimli, oyuncu) == [0, 1]
+
+    def test_toplu_atama_sayaclari_gunceller(self, hayvanlar, commit):
+        pamuk, tarcin = hayvanlar
+        with commit():
+            EtiketService.etiketleri_toplu_guncelle(Hayvan, {pamuk.pk: ["Sevimli", "Sakin"], tarcin.pk: ["Sevimli"]})
+            EtiketService.etiketleri_guncelle(pamuk, ["Sakin"])
+
+        sayilar = dict(Etiket.objects.values_list('ad', 'hayvan_sayisi'))
+        assert sayilar == {"Sevimli": 1, "Sakin": 1}
+
+    def test_esitleme_kaymayi_duzeltir(self, etiketler, hayvanlar, commit):
+        sevimli, oyuncu, _sakin = etiketler
+        with commit():
+            hayvanlar[0].etiketler.add(sevimli)
+        Etiket.tum_etiketler.filter(pk__in=[sevimli.pk, oyuncu.pk]).update(hayvan_sayisi=7)
+
+        assert EtiketService.sayaclari_esitle() == 2
+        assert _sayilar(sevimli, oyuncu) == [1, 0]
+        assert EtiketService.sayaclari_esitle() == 0
+
+    def test_populer_ve_kullanim_sorgusuz(self, etiketler, hayvanlar, commit):
+        sevimli, oyuncu, _sakin = etiketler
+        with commit():
+            for hayvan in hayvanlar:
+                hayvan.etiketler.add(oyuncu)
+            hayvanlar[0].etiketler.add(sevimli)
+
+        populer = list(Etiket.objects.en_populer(limit=2))
+        with CaptureQueriesContext(connection) as ctx:
+            kullanimlar = [etiket.kullanim_sayisi for etiket in populer]
+
+        assert [etiket.ad for etiket in populer] == ["Oyuncu", "Sevimli"]
+        assert kullanimlar == [2, 1]
+        assert len(ctx.captured_queries) == 0
+
+
+@pytest.mark.django_db
+class TestEtiketBirlikteligi:
+    """Artımlı güncellenen etiket birliktelik matrisi"""
+
+    @pytest.fixture
+    def etiketler(self):
+        return [Etiket.objects.create(ad=ad) for ad in ("Sevimli", "Oyuncu", "Sakin", "Yavru")]
+
+    @pytest.fixture
+    def hayvanlar(self):
+        return [Hayvan.objects.create(ad=f"Hayvan {i}", tur="kedi") for i in range(4)]
+
+    @pytest.fixture
+    def commit(self, django_capture_on_commit_callbacks):
+        return lambda: django_capture_on_commit_callbacks(execute=True)
+
+    @staticmethod
+    def _matris():
+        return {
+            (satir.etiket.ad, satir.diger.ad): satir.adet
+            for satir in EtiketBirlikteligi.objects.select_related('etiket', 'diger')
+        }
+
+    def test_artimli_guncelleme_yeniden_kurulumla_ayni(self, etiketler, hayvanlar, commit):
+        sevimli, oyuncu, sakin, yavru = etiketler
+        with commit():
+            hayvanlar[0].etiketler.add(sevimli, oyuncu, yavru)
+            hayvanlar[1].etiketler.add(sevimli, oyuncu)
+            hayvanlar[2].etiketler.add(sakin)
+            sevimli.hayvanlar.add(hayvanlar[2])
+        with commit():
+            hayvanlar[0].etiketler.remove(yavru)
+            EtiketService.etiketleri_guncelle(hayvanlar[1], ["Sevimli", "Oyuncu", "Sakin"])
+            hayvanlar[3].etiketler.add(yavru)
+
+        artimli = self._matris()
+        assert artimli[("Sevimli", "Oyuncu")] == artimli[("Oyuncu", "Sevimli")] == 2
+        assert artimli[("Sakin", "Sevimli")] == 2
+        assert not any("Yavru" in cift for cift in artimli)
+
+        EtiketService.birlikteligi_yeniden_olustur()
+        assert self._matris() == artimli
+
+    def test_clear_ciftleri_siler(self, etiketler, hayvanlar, commit):
+        sevimli, oyuncu, _sakin, _yavru = etiketler
+        with commit():
+            hayvanlar[0].etiketler.add(sevimli, oyuncu)
+        with commit():
+            hayvanlar[0].etiketler.clear()
+
+        assert not EtiketBirlikteligi.objects.exists()
+
+    def test_ilgili_tek_sorgu_ve_lift(self, etiketler, hayvanlar, commit):
+        sevimli, oyuncu, sakin, yavru = etiketler
+        with commit():
+            for hayvan in hayvanlar[:3]:
+                hayvan.etiketler.add(sevimli, oyuncu)
+            hayvanlar[0].etiketler.add(sakin)
+            hayvanlar[3].etiketler.add(yavru)
+
+        with CaptureQueriesContext(connection) as ctx:
+            ilgili = list(Etiket.objects.ilgili(sevimli.pk))
+        assert len(ctx.captured_queries) == 1
+        assert [(etiket.ad, etiket.birlikte) for etiket in ilgili] == [("Oyuncu", 3), ("Sakin", 1)]
+        # N=4, sevimli=3, sakin=1: lift = 1 * 4 / (3 * 1)
+        assert ilgili[1].lift == pytest.approx(4 / 3)
+        assert [e.ad for e in Etiket.objects.ile_ilgili("sevimli")] == ["Oyuncu", "Sakin"]
+
+    def test_yazma_yolunda_tam_sayim_yok(self, etiketler, hayvanlar, commit, settings):
+        """N cache'ten delta ile izlenir; değişen etiketlerin tüm çiftlerinde lift kesin"""
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        cache.clear()
+        sevimli, oyuncu, sakin, yavru = etiketler
+        with commit():
+            hayvanlar[0].etiketler.add(sevimli, oyuncu)
+            hayvanlar[1].etiketler.add(sevimli, sakin)
+
+        with CaptureQueriesContext(connection) as ctx, commit():
+            hayvanlar[2].etiketler.add(sakin, yavru)
+        assert not any('DISTINCT' in q['sql'].upper() for q in ctx.captured_queries)
+        assert EtiketBirlikteligi.objects.toplam_nesne() == 3
+
+        def liftler():
+            return {
+                (satir.etiket_id, satir.diger_id): satir.lift
+                for satir in EtiketBirlikteligi.objects.filter(
+                    Q(etiket__in=[sakin, yavru]) | Q(diger__in=[sakin, yavru]))
+            }
+
+        artimli = liftler()
+        EtiketService.birlikteligi_yeniden_olustur()
+        assert artimli == pytest.approx(liftler())
+
+    def test_kume_ile_ilgili(self, etiketler, hayvanlar, commit):
+        sevimli, oyuncu, sakin, yavru = etiketler
+        with commit():
+            hayvanlar[0].etiketler.add(sevimli, oyuncu, sakin)
+            hayvanlar[1].etiketler.add(sevimli, oyuncu, sakin)
+            hayvanlar[2].etiketler.add(sevimli, yavru)
+
+        sonuc = list(Etiket.objects.kume_ile_ilgili([sevimli.pk, oyuncu.pk]))
+        assert [(etiket.ad, etiket.birlikte) for etiket in sonuc] == [("Sakin", 2)]
@@ -6,10 +6,14 @@ Etiket servisleri için test sınıfları
 """
 
 import pytest
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models.signals import m2m_changed
+from django.test.utils import CaptureQueriesContext
 
 from apps.etiketler.models import Etiket
-from apps.etiketler.servisler import EtiketService
+from apps.etiketler.oneri import EtiketOneriIndeksi, normalize
+from apps.etiketler.servisler import EtiketOneriService, EtiketService
+from apps.etiketler.signals import etiketler_degisti
 from apps.hayvanlar.models import Hayvan
 from apps.kategoriler.models import Kategori
 from apps.kullanicilar.models import CustomUser
@@ -131,4 +135,158 @@ class TestEtiketService:
         # En az bir öneri olmalı
         assert len(oneriler) > 0
         # Metnin içerisinde geçen etiketlerden en az biri önerilerde olmalı
-        assert any(oneri.lower() in ["sevimli", "oyuncu", "sakin", "aşılı", "evcil"] for oneri in oneriler)
\ No newline at end of file
+        assert any(oneri.lower() in ["sevimli", "oyuncu", "sakin", "aşılı", "evcil"] for oneri in oneriler)
+
+
+@pytest.fixture
+def olay_kaydi():
+    """etiketler_degisti ve m2m_changed olaylarını topla"""
+    olaylar = {'toplu': [], 'm2m': []}
+
+    def toplu(sender, **kwargs):
+        olaylar['toplu'].append(kwargs)
+
+    def m2m(sender, **kwargs):
+        olaylar['m2m'].append(kwargs['action'])
+
+    etiketler_degisti.connect(toplu)
+    m2m_changed.connect(m2m)
+    yield olaylar
+    etiketler_degisti.disconnect(toplu)
+    m2m_changed.disconnect(m2m)
+
+
+@pytest.mark.django_db
+class TestEtiketFarkMotoru:
+    """Fark tabanlı toplu etiket ataması"""
+
+    def test_sabit_sorgu_ve_tek_olay(self, hayvan, olay_kaydi, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            EtiketService.etiketleri_guncelle(hayvan, ["Sevimli", "Oyuncu"])
+        Etiket.objects.create(ad="Sakin")
+        olay_kaydi['toplu'].clear()
+        etiketler = [f"Yeni {i}" for i in range(20)] + ["sevimli", "SAKIN", "Sakin", " "]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with CaptureQueriesContext(connection) as ctx:
+                sonuc = EtiketService.etiketleri_guncelle(hayvan, etiketler)
+
+        assert len(sonuc['eklenen']) == 21
+        assert sonuc['degismedi'] == ["sevimli"]
+        assert sonuc['kaldirilan'] == ["Oyuncu"]
+        assert sonuc['toplam'] == 23
+        assert hayvan.etiketler.count() == 22
+        assert Etiket.tum_etiketler.filter(ad__iexact="sakin").count() == 1
+        # Etiket sayısından bağımsız: çöz + slug + oluştur + yeniden oku + ara tablo oku/yaz/sil
+        # + delta değeri başına bir sayaç UPDATE'i
+        assert len(ctx.captured_queries) <= 11
+        assert olay_kaydi['m2m'] == []
+        assert len(olay_kaydi['toplu']) == 1
+        deltalar = olay_kaydi['toplu'][0]['deltalar']
+        assert sum(deltalar.values()) == 21 - 1
+
+    def test_degisiklik_yoksa_yazma_ve_olay_yok(self, hayvan, olay_kaydi, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            EtiketService.etiketleri_guncelle(hayvan, ["Sevimli", "Oyuncu"])
+        olay_kaydi['toplu'].clear()
+
+        with django_capture_on_commit_callbacks(execute=True), CaptureQueriesContext(connection) as ctx:
+            EtiketService.etiketleri_guncelle(hayvan, ["Oyuncu", "Sevimli"])
+
+        assert not any(q['sql'].startswith(('INSERT', 'DELETE')) for q in ctx.captured_queries)
+        assert olay_kaydi['toplu'] == []
+
+    def test_slug_cakismasi_toplu_olusturmada_cozulur(self, hayvan):
+        Etiket.objects.create(ad="Kedi Dostu", slug="kedi-dostu")
+
+        EtiketService.etiketleri_guncelle(hayvan, ["Kedi-Dostu", "Kedi_Dostu"])
+
+        assert set(hayvan.etiketler.values_list('slug', flat=True)) == {"kedi-dostu-1", "kedi_dostu"}
+
+    def test_toplu_uygulama(self, test_user, kategori):
+        hayvanlar = [
+            Hayvan.objects.create(ad=f"Barınak {i}", tur="kedi", kategori=kategori, sorumlu=test_user)
+            for i in range(30)
+        ]
+        atamalar = {h.pk: ["Barınak", "Aşılı" if i % 2 else "Kısır"] for i, h in enumerate(hayvanlar)}
+
+        with CaptureQueriesContext(connection) as ctx:
+            sonuc = EtiketService.etiketleri_toplu_guncelle(Hayvan, atamalar)
+
+        assert sonuc == {'nesne': 30, 'eklenen': 60, 'kaldirilan': 0}
+        assert len(ctx.captured_queries) <= 10
+        assert hayvanlar[1].etiketler.filter(ad="Aşılı").exists()
+
+        sonuc = EtiketService.etiketleri_toplu_guncelle(Hayvan, {hayvanlar[0].pk: ["Sakin"]}, sadece_ekle=True)
+
+        assert sonuc == {'nesne': 1, 'eklenen': 1, 'kaldirilan': 0}
+        assert hayvanlar[0].etiketler.count() == 3
+
+    def test_etiketlenemeyen_model(self):
+        with pytest.raises(AttributeError):
+            EtiketService.etiketleri_toplu_guncelle(Kategori, {1: ["x"]})
+
+
+class TestEtiketOneriIndeksi:
+    """Süreç içi öneri indeksi"""
+
+    @pytest.fixture
+    def indeks(self):
+        return EtiketOneriIndeksi([
+            (1, "Aşılı", 5),
+            (2, "Işıklı Göz", 1),
+            (3, "Kedi Dostu", 9),
+            (4, "Kedisever", 2),
+            (5, "Uzun Tüylü Kedi", 3),
+        ])
+
+    def test_turkce_normalizasyon(self):
+        assert normalize("  IŞIKLI   İzmir ") == "isikli izmir"
+
+    def test_tam_eslesme_turkce_duyarsiz(self, indeks):
+        assert indeks.tam("ASILI") == "Aşılı"
+        assert indeks.tam("ışıklı göz") == "Işıklı Göz"
+
+    def test_onek_populerlige_gore(self, indeks):
+        assert indeks.onek("ked", 3) == ["Kedi Dostu", "Uzun Tüylü Kedi", "Kedisever"]
+        assert indeks.onek("kedisev") == ["Kedisever"]
+        assert indeks.onek("tuy") == ["Uzun Tüylü Kedi"]
+
+    def test_alt_dizi(self, indeks):
+        assert indeks.icerir("sever") == "Kedisever"
+        assert indeks.icerir("xyz") is None
+
+    def test_populer(self, indeks):
+        assert indeks.populer(2) == ["Kedi Dostu", "Aşılı"]
+
+
+@pytest.mark.django_db
+class TestEtiketOneriServisi:
+    """Versiyonlu indeks yenileme"""
+
+    @pytest.fixture(autouse=True)
+    def yerel_cache(self, settings):
+        from django.core.cache import cache
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        cache.clear()
+        EtiketOneriService._bellek = (None, 0.0, None)
+
+    def test_indeks_surecte_tutulur_ve_degisince_yenilenir(self, django_capture_on_commit_callbacks):
+        Etiket.objects.create(ad="Sevimli")
+        ilk = EtiketOneriService.indeks()
+
+        with CaptureQueriesContext(connection) as ctx:
+            assert EtiketOneriService.indeks() is ilk
+        assert len(ctx.captured_queries) == 0
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Etiket.objects.create(ad="Sakin")
+        assert EtiketOneriService.indeks().tam("sakin") == "Sakin"
+
+    def test_toplu_olusturma_indeksi_yeniler(self, hayvan, django_capture_on_commit_callbacks):
+        EtiketOneriService.indeks()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            EtiketService.etiketleri_guncelle(hayvan, ["Bahçeli"])
+
+        assert EtiketOneriService.indeks().tam("bahceli") == "Bahçeli"
@@ -9,26 +9,19 @@ from rest_framework import viewsets, mixins, filters, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
-from django.db.models import Count
 from django.utils.translation import gettext_lazy as _
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, extend_schema_view
 
-from .models import Etiket
+from .models import Etiket, KULLANIM_SAYISI
 from .serializers import (
     EtiketSerializer, 
     EtiketCreateUpdateSerializer, 
-    EtiketDetailSerializer
+    EtiketDetailSerializer,
+    IliskiliEtiketSerializer,
 )
 from .filters import EtiketFilter
 
-from .models import Etiket
-from .serializers import (
-    EtiketSerializer, 
-    EtiketCreateUpdateSerializer, 
-    EtiketDetailSerializer
-)
-
 
 @extend_schema_view(
     list=extend_schema(summary="Etiketleri listele", description="Tüm aktif etiketleri listeler."),
@@ -44,7 +37,7 @@ class EtiketViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['ad', 'aciklama']
-    ordering_fields = ['ad', 'olusturma_tarihi', 'kullanim_sayisi']
+    ordering_fields = ['ad', 'olusturma_tarihi', 'kullanim_sayisi', 'hayvan_sayisi']
     ordering = ['ad']
     
     def get_serializer_class(self):
@@ -56,11 +49,13 @@ class EtiketViewSet(viewsets.ModelViewSet):
         return EtiketSerializer
     
     def get_queryset(self):
-        """Etiketleri kullanım sayısı bilgisiyle birlikte getir"""
-        queryset = Etiket.objects.annotate(
-            kullanim_sayisi=Count('hayvanlar', distinct=True) + Count('ilanlar', distinct=True)
-        )
-        return queryset
+        """
+        Etiketleri getir
+        
+        Kullanım sayısı saklanan sayaçlardan okunur; sıralama için aynı
+        ifade alias olarak tanımlanır (fonksiyonel indeksle eşleşir).
+        """
+        return Etiket.objects.alias(kullanim_sayisi=KULLANIM_SAYISI)
     
     @extend_schema(summary="Popüler etiketleri listele")
     @action(detail=False, methods=['get'])
@@ -70,6 +65,35 @@ class EtiketViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(populer_etiketler, many=True)
         return Response(serializer.data)
     
+    @extend_schema(summary="Etiket kümesiyle ilişkili etiketleri listele")
+    @action(detail=False, methods=['get'])
+    def iliskili(self, request):
+        """
+        Verilen etiketlerin tamamıyla birlikte kullanılan etiketler (facet)
+        
+        ?etiketler=slug1,slug2&limit=10
+        """
+        sluglar = {slug for slug in request.query_params.get('etiketler', '').split(',') if slug}
+        if not sluglar:
+            return Response(
+                {'detail': _("En az bir etiket slug'ı gereklidir.")},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+        except ValueError:
+            limit = 10
+        
+        etiket_idleri = list(Etiket.objects.filter(slug__in=sluglar).values_list('id', flat=True))
+        if len(etiket_idleri) != len(sluglar):
+            return Response({'etiketler': sorted(sluglar), 'iliskili': []})
+        
+        iliskili = Etiket.objects.kume_ile_ilgili(etiket_idleri, limit=limit)
+        return Response({
+            'etiketler': sorted(sluglar),
+            'iliskili': IliskiliEtiketSerializer(iliskili, many=True).data,
+        })
+    
     @extend_schema(summary="Harfe göre etiketleri listele")
     @action(detail=False, methods=['get'])
     def harfe_gore(self, request):
@@ -112,7 +136,7 @@ class EtiketViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Etiket kullanımda mı kontrol et
+        # Etiket kullanımda mı kontrol et (saklanan sayaçlar)
         if etiket.kullanim_sayisi > 0:
             return Response(
                 {'detail': _("Bu etiket kullanımda olduğu için pasifleştirilemez.")},
@@ -13,4 +13,9 @@ class HayvanlarConfig(AppConfig):
         # Sinyalleri import et
         import apps.hayvanlar.signals
         
+        # Etiket ilişkisini etiket sistemine kaydet
+        from apps.etiketler.etiketlenebilir import etiketlenebilir_yap
+        from .models import Hayvan
+        etiketlenebilir_yap(Hayvan)
+        
         print("🐾 Hayvanlar sistemi hazır - Can dostları dijital dünyada!")
@@ -0,0 +1,407 @@
+"""
+🐾 Sahiplenen ↔ Hayvan Eşleştirme Motoru
+==============================================================================
+Aktif hayvanlar satır başına birkaç küçük sayıya kodlanır (boyut, yaş ve tür
+sütunu, karakter bit maskesi, koordinat) ve sütun dizilerinde tutulur.
+Kullanıcı profili aynı özellik sütunlarında bir ağırlık vektörüne çevrilir;
+uyum puanı sütun ağırlıklarının dizi indekslemesiyle toplanması (karakter
+maskesi için önceden hesaplanan 2^k'lık puan tablosu) + vektörel mesafe
+terimidir, ilk k kayıt argpartition ile seçilir.
+
+Her ağırlık bir gerekçe metniyle eklenir; seçilen kayıtların aktif
+sütunlarından "neden önerildi" açıklamaları üretilir. Diziler değişen
+satırlar yazılarak artımlı güncellenir (bkz. EslesmeService).
+==============================================================================
+"""
+
+import io
+import math
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from apps.ortak.constants import PetAges, PetSizes, PetTypes
+from apps.ortak.servisler import DUNYA_YARICAPI_KM
+from apps.ortak.utils import turkce_normalize
+
+from .utils import KARAKTER_BITLERI
+
+try:
+    import numpy as np
+except ImportError:  # Opsiyonel: yoksa puanlar saf Python ile hesaplanır
+    np = None
+
+# Özellik sütunları (sıra ağırlık vektörü sırasıdır)
+BOYUT_BILINMIYOR = 'boyut:?'
+OZELLIKLER = (
+    [f'boyut:{boyut}' for boyut, _ad in PetSizes.CHOICES] + [BOYUT_BILINMIYOR] +
+    [f'yas:{yas}' for yas, _ad in PetAges.CHOICES] +
+    [f'tur:{tur}' for tur in PetTypes.values] +
+    [f'karakter:{karakter}' for karakter in KARAKTER_BITLERI]
+)
+OZELLIK_SIRASI = {ozellik: sira for sira, ozellik in enumerate(OZELLIKLER)}
+KARAKTER_BASLANGICI = OZELLIK_SIRASI[f'karakter:{next(iter(KARAKTER_BITLERI))}']
+KARAKTER_SAYISI = len(KARAKTER_BITLERI)
+# Birbirini dışlayan sütun grupları (her satırda en fazla biri 1)
+DISLAYAN_GRUPLAR = [
+    [sira for ozellik, sira in OZELLIK_SIRASI.items() if ozellik.startswith(onek)]
+    for onek in ('boyut:', 'yas:', 'tur:')
+]
+
+# İndeks sütun dizileri (ad, numpy tipi); satırlar id sırasındadır.
+# boyut/yas/tur özellik sütunu sırası (-1: bilinmiyor), koordinatlar radyan
+DIZILER = (
+    ('idler', 'int64'),
+    ('boyutlar', 'int8'),
+    ('yaslar', 'int8'),
+    ('turler', 'int8'),
+    ('maskeler', 'int16'),
+    ('enlem', 'float64'),
+    ('boylam', 'float64'),
+)
+
+# Mesafe terimi: ağırlık * exp(-mesafe / ölçek)
+MESAFE_AGIRLIGI = 1.5
+MESAFE_OLCEGI_KM = 100
+# Açıklamaya girecek en küçük etki ve en fazla gerekçe
+ACIKLAMA_ESIGI = 0.2
+ACIKLAMA_SAYISI = 3
+
+DIS_ALANLI_EVLER = ('mustakil', 'villa', 'bahceli')
+HAYVAN_YOK = re.compile(r'^(yok|hayir|-)\b')
+
+
+def satir_kodla(hayvan_id: int, boyut: str, yas: str, tur: str, karakter_maskesi: int,
+                enlem: Optional[float], boylam: Optional[float]) -> Tuple:
+    """Bir hayvanın indeks satırı (DIZILER sırasıyla)"""
+    konum_var = enlem is not None and boylam is not None
+    return (
+        hayvan_id,
+        OZELLIK_SIRASI.get(f'boyut:{boyut}', OZELLIK_SIRASI[BOYUT_BILINMIYOR]),
+        OZELLIK_SIRASI.get(f'yas:{yas}', -1),
+        OZELLIK_SIRASI.get(f'tur:{tur}', -1),
+        (karakter_maskesi or 0) & ((1 << KARAKTER_SAYISI) - 1),
+        math.radians(enlem) if konum_var else None,
+        math.radians(boylam) if konum_var else None,
+    )
+
+
+def karakter_puanlari(agirliklar: List[float]) -> List[float]:
+    """Her karakter maskesinin toplam ağırlığı (2^k tablo, maske indeksiyle okunur)"""
+    tablo = [0.0] * (1 << KARAKTER_SAYISI)
+    for maske in range(1, len(tablo)):
+        en_dusuk = maske & -maske
+        tablo[maske] = tablo[maske ^ en_dusuk] + agirliklar[KARAKTER_BASLANGICI + en_dusuk.bit_length() - 1]
+    return tablo
+
+
+class ProfilAgirliklari:
+    """
+    Kullanıcı profilinden türetilen sütun ağırlıkları ve gerekçeleri
+
+    Args:
+        ev_tipi: KullaniciProfil.ev_tipi
+        bahce_var_mi: Bahçe var mı
+        deneyim_yil: Hayvan bakma deneyimi (yıl)
+        daha_once_sahiplendi: Daha önce sahiplendi mi
+        diger_hayvanlar: Evdeki diğer hayvanlar (serbest metin)
+        konum: Kullanıcı konumu (enlem, boylam); bilinmiyorsa None
+    """
+
+    def __init__(self, ev_tipi: str = '', bahce_var_mi: bool = False,
+                 deneyim_yil: Optional[int] = None, daha_once_sahiplendi: bool = False,
+                 diger_hayvanlar: str = '', konum: Optional[Tuple[float, float]] = None):
+        self.agirliklar = [0.0] * len(OZELLIKLER)
+        self.nedenler: Dict[int, List[Tuple[str, float]]] = defaultdict(list)
+        self.konum = konum
+
+        dis_alan = bahce_var_mi or ev_tipi in DIS_ALANLI_EVLER
+        if ev_tipi == 'apartman' and not dis_alan:
+            for boyut, agirlik in (('xs', 1.0), ('sm', 0.8), ('md', 0.3), ('lg', -0.6), ('xl', -1.0)):
+                self.ekle(f'boyut:{boyut}', agirlik,
+                          'Apartman dairesi için uygun boyut' if agirlik > 0
+                          else 'Apartman dairesi için büyük olabilir')
+            self.ekle('karakter:calm', 0.5, 'Sakin; apartman yaşamına uygun')
+            self.ekle('karakter:energetic', -0.4, 'Yüksek enerjili; apartmanda alan dar gelebilir')
+        elif dis_alan:
+            for boyut, agirlik in (('md', 0.5), ('lg', 0.8), ('xl', 0.8)):
+                self.ekle(f'boyut:{boyut}', agirlik, 'Bahçeli evde büyük hayvana yer var')
+            self.ekle('karakter:energetic', 0.6, 'Enerjik; bahçede hareket alanı var')
+            self.ekle('karakter:playful', 0.3, 'Oyuncu; açık alanda oynayabilir')
+
+        deneyim = deneyim_yil or 0
+        if deneyim < 2 and not daha_once_sahiplendi:
+            self.ekle('karakter:friendly', 0.5, 'Arkadaş canlısı; ilk kez sahiplenenler için kolay')
+            self.ekle('karakter:affectionate', 0.3, 'Sevecen; bağ kurması kolay')
+            self.ekle('karakter:shy', -0.3, 'Çekingen; alışması sabır ve deneyim ister')
+            self.ekle('karakter:protective', -0.5, 'Korumacı; deneyimli sahip gerektirir')
+            self.ekle('yas:baby', -0.3, 'Yavru; eğitim ve yakın ilgi ister')
+        elif deneyim >= 5:
+            self.ekle('karakter:shy', 0.3, 'Çekingen; deneyimli sahibin yanında açılır')
+            self.ekle('karakter:protective', 0.2, 'Korumacı; deneyiminizle yönlendirilebilir')
+            self.ekle('yas:senior', 0.3, 'Yaşlı; deneyimli bakıma ihtiyaç duyar')
+
+        diger = turkce_normalize(diger_hayvanlar or '')
+        if diger and not HAYVAN_YOK.match(diger):
+            self.ekle('karakter:friendly', 0.6, 'Diğer hayvanlarla geçinmesi kolay')
+            self.ekle('karakter:protective', -0.4, 'Evdeki diğer hayvanlarla sorun yaşayabilir')
+            for tur in ('kedi', 'kopek'):
+                if tur in diger:
+                    self.ekle(f'tur:{tur}', 0.2, 'Evdeki hayvanla aynı tür')
+
+    def ekle(self, ozellik: str, agirlik: float, neden: str):
+        sira = OZELLIK_SIRASI[ozellik]
+        self.agirliklar[sira] += agirlik
+        self.nedenler[sira].append((neden, agirlik))
+
+    def sinirlar(self) -> Tuple[float, float]:
+        """Ulaşılabilecek en düşük / en yüksek ham puan (0-100 ölçeklemesi için)"""
+        alt = ust = 0.0
+        gruplu = set()
+        for grup in DISLAYAN_GRUPLAR:
+            degerler = [self.agirliklar[sira] for sira in grup]
+            alt += min(0.0, *degerler)
+            ust += max(0.0, *degerler)
+            gruplu.update(grup)
+        for sira, agirlik in enumerate(self.agirliklar):
+            if sira not in gruplu:
+                alt += min(0.0, agirlik)
+                ust += max(0.0, agirlik)
+        if self.konum is not None:
+            ust += MESAFE_AGIRLIGI
+        return alt, ust
+
+    def aciklamalar(self, sutunlar: Iterable[int], mesafe_km: Optional[float]) -> List[Dict]:
+        """Bir hayvanın puanına en çok etki eden gerekçeler"""
+        etkiler = [
+            {'kod': OZELLIKLER[sira], 'etki': round(agirlik, 2), 'mesaj': neden}
+            for sira in sutunlar
+            for neden, agirlik in self.nedenler.get(sira, ())
+        ]
+        if mesafe_km is not None:
+            etki = MESAFE_AGIRLIGI * math.exp(-mesafe_km / MESAFE_OLCEGI_KM)
+            etkiler.append({
+                'kod': 'mesafe',
+                'etki': round(etki, 2),
+                'mesaj': f'Size yakın (~{mesafe_km:.0f} km)' if mesafe_km < 50
+                else f'~{mesafe_km:.0f} km uzaklıkta',
+            })
+        etkiler = [e for e in etkiler if abs(e['etki']) >= ACIKLAMA_ESIGI]
+        etkiler.sort(key=lambda e: -abs(e['etki']))
+        return etkiler[:ACIKLAMA_SAYISI]
+
+
+class EslesmeIndeksi:
+    """
+    Aktif hayvanların özellik satırları (süreç içi)
+
+    numpy kuruluysa sütunlar DIZILER tiplerinde numpy dizileridir, değilse
+    listeler (eksik koordinat None). Satırlar id sırasında tutulur;
+    sahiplenilen / pasifleşen hayvanların satırları çıkarılır.
+    """
+
+    def __init__(self, diziler: Optional[Dict] = None):
+        if diziler is None:
+            diziler = self._dizilere([])
+        self._diziler = diziler
+        self._cos_enlem = None
+
+    def __len__(self):
+        return len(self._diziler['idler'])
+
+    @staticmethod
+    def _dizilere(satirlar: List[Tuple]) -> Dict:
+        sutunlar = list(zip(*satirlar)) or [()] * len(DIZILER)
+        if np is None:
+            return {ad: list(sutun) for (ad, _tip), sutun in zip(DIZILER, sutunlar)}
+        # float64 dizide None -> nan
+        return {ad: np.array(sutun, dtype=tip) for (ad, tip), sutun in zip(DIZILER, sutunlar)}
+
+    @staticmethod
+    def _birlestir(parcalar: List[Dict]) -> Dict:
+        if np is None:
+            return {ad: [deger for parca in parcalar for deger in parca[ad]] for ad, _tip in DIZILER}
+        return {ad: np.concatenate([parca[ad] for parca in parcalar]) for ad, _tip in DIZILER}
+
+    @classmethod
+    def kur(cls, partiler: Iterable[List[Tuple]]) -> 'EslesmeIndeksi':
+        """
+        id sırasıyla gelen partilerden indeks
+
+        Args:
+            partiler: (id, boyut, yas, tur, karakter_maskesi, enlem, boylam) listeleri
+        """
+        parcalar = [cls._dizilere([satir_kodla(*satir) for satir in parti]) for parti in partiler]
+        return cls(cls._birlestir(parcalar) if parcalar else None)
+
+    def disa_aktar(self) -> Dict:
+        """Paylaşılan cache için sütunlar: numpy varsa `.npy` baytları, yoksa listeler"""
+        if np is None:
+            return dict(self._diziler)
+        cikti = {}
+        for ad, dizi in self._diziler.items():
+            tampon = io.BytesIO()
+            np.save(tampon, dizi, allow_pickle=False)
+            cikti[ad] = tampon.getvalue()
+        return cikti
+
+    @classmethod
+    def iceri_aktar(cls, veri: Dict) -> 'EslesmeIndeksi':
+        """`disa_aktar` çıktısından indeks"""
+        if np is None:
+            return cls({ad: list(veri[ad]) for ad, _tip in DIZILER})
+        return cls({ad: np.load(io.BytesIO(veri[ad]), allow_pickle=False) for ad, _tip in DIZILER})
+
+    def _sira(self, hayvan_id: int) -> Optional[int]:
+        idler = self._diziler['idler']
+        sira = bisect_left(idler, hayvan_id)
+        return sira if sira < len(idler) and idler[sira] == hayvan_id else None
+
+    def _satir(self, hayvan_id: int) -> Optional[Tuple]:
+        """Kayıtlı satır (satir_kodla biçiminde) veya None"""
+        sira = self._sira(hayvan_id)
+        if sira is None:
+            return None
+        d = self._diziler
+        enlem, boylam = d['enlem'][sira], d['boylam'][sira]
+        konum_var = enlem is not None and not math.isnan(enlem)
+        return (
+            hayvan_id, int(d['boyutlar'][sira]), int(d['yaslar'][sira]), int(d['turler'][sira]),
+            int(d['maskeler'][sira]),
+            float(enlem) if konum_var else None,
+            float(boylam) if konum_var else None,
+        )
+
+    def yaz(self, satirlar: Iterable[Tuple]) -> int:
+        """
+        Satırları ekle / güncelle / çıkar
+
+        Args:
+            satirlar: (id, boyut, yas, tur, karakter_maskesi, enlem, boylam, gecerli);
+                gecerli=False olan satırlar indeksten çıkarılır
+
+        Returns:
+            int: İçeriği değişen satır sayısı
+        """
+        degisenler = {}
+        for *satir, gecerli in satirlar:
+            yeni = satir_kodla(*satir) if gecerli else None
+            if self._satir(satir[0]) != yeni:
+                degisenler[satir[0]] = yeni
+        if not degisenler:
+            return 0
+
+        eklenenler = self._dizilere(sorted(satir for satir in degisenler.values() if satir is not None))
+        d = self._diziler
+        if np is None:
+            kalan = [sira for sira, hayvan_id in enumerate(d['idler']) if hayvan_id not in degisenler]
+            birlesik = self._birlestir([{ad: [d[ad][sira] for sira in kalan] for ad, _tip in DIZILER},
+                                        eklenenler])
+            sira = sorted(range(len(birlesik['idler'])), key=birlesik['idler'].__getitem__)
+            self._diziler = {ad: [dizi[i] for i in sira] for ad, dizi in birlesik.items()}
+        else:
+            kalan = ~np.isin(d['idler'], np.fromiter(degisenler, dtype=np.int64, count=len(degisenler)))
+            birlesik = self._birlestir([{ad: d[ad][kalan] for ad, _tip in DIZILER}, eklenenler])
+            sira = np.argsort(birlesik['idler'], kind='stable')
+            self._diziler = {ad: dizi[sira] for ad, dizi in birlesik.items()}
+        self._cos_enlem = None
+        return len(degisenler)
+
+    def _sutunlar(self, sira: int) -> List[int]:
+        """Satırın 1 olan özellik sütunları"""
+        d = self._diziler
+        sutunlar = [int(d[ad][sira]) for ad in ('boyutlar', 'yaslar', 'turler') if d[ad][sira] >= 0]
+        maske = int(d['maskeler'][sira])
+        sutunlar.extend(KARAKTER_BASLANGICI + bit for bit in range(KARAKTER_SAYISI) if maske >> bit & 1)
+        return sutunlar
+
+    def puanla(self, profil: ProfilAgirliklari, limit: int = 10,
+               tur: Optional[str] = None) -> List[Dict]:
+        """
+        Profile en uygun `limit` hayvan
+
+        Returns:
+            List[Dict]: {'id', 'uyum_puani' (0-100), 'mesafe_km', 'aciklamalar'}
+        """
+        tur_sutunu = None
+        if tur is not None:
+            tur_sutunu = OZELLIK_SIRASI.get(f'tur:{tur}')
+            if tur_sutunu is None:
+                return []
+        if np is not None:
+            secilen = self._puanla_numpy(profil, limit, tur_sutunu)
+        else:
+            secilen = self._puanla_saf(profil, limit, tur_sutunu)
+
+        alt, ust = profil.sinirlar()
+        aralik = (ust - alt) or 1.0
+        return [
+            {
+                'id': int(self._diziler['idler'][sira]),
+                'uyum_puani': round(100 * (puan - alt) / aralik),
+                'mesafe_km': None if mesafe is None else round(mesafe, 1),
+                'aciklamalar': profil.aciklamalar(self._sutunlar(sira), mesafe),
+            }
+            for sira, puan, mesafe in secilen
+        ]
+
+    def _puanla_numpy(self, profil, limit, tur_sutunu):
+        d = self._diziler
+        # Son eleman 0: -1 (bilinmeyen yaş / tür) indeksi puana eklenmez
+        agirliklar = np.append(np.asarray(profil.agirliklar), 0.0)
+        puanlar = (agirliklar[d['boyutlar']] + agirliklar[d['yaslar']] + agirliklar[d['turler']] +
+                   np.asarray(karakter_puanlari(profil.agirliklar))[d['maskeler']])
+        mesafeler = None
+        if profil.konum is not None:
+            if self._cos_enlem is None:
+                self._cos_enlem = np.cos(d['enlem'])
+            enlem, boylam = (math.radians(x) for x in profil.konum)
+            a = (np.sin((d['enlem'] - enlem) / 2) ** 2 +
+                 math.cos(enlem) * self._cos_enlem * np.sin((d['boylam'] - boylam) / 2) ** 2)
+            mesafeler = 2 * DUNYA_YARICAPI_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+            puanlar = puanlar + np.nan_to_num(MESAFE_AGIRLIGI * np.exp(-mesafeler / MESAFE_OLCEGI_KM))
+
+        aday_sayisi = len(puanlar)
+        if tur_sutunu is not None:
+            uygun = d['turler'] == tur_sutunu
+            puanlar = np.where(uygun, puanlar, -np.inf)
+            aday_sayisi = int(uygun.sum())
+
+        limit = min(limit, aday_sayisi)
+        if limit <= 0:
+            return []
+        adaylar = np.argpartition(-puanlar, limit - 1)[:limit]
+        # Eşit puanda yeni kayıt (büyük id) önce
+        adaylar = adaylar[np.lexsort((-d['idler'][adaylar], -puanlar[adaylar]))]
+        return [
+            (int(sira), float(puanlar[sira]),
+             None if mesafeler is None or math.isnan(mesafeler[sira]) else float(mesafeler[sira]))
+            for sira in adaylar
+        ]
+
+    def _puanla_saf(self, profil, limit, tur_sutunu):
+        d = self._diziler
+        agirliklar = list(profil.agirliklar) + [0.0]
+        karakter = karakter_puanlari(profil.agirliklar)
+        if profil.konum is not None:
+            merkez_enlem, merkez_boylam = (math.radians(x) for x in profil.konum)
+            cos_merkez = math.cos(merkez_enlem)
+
+        sonuc = []
+        for sira, hayvan_id in enumerate(d['idler']):
+            if tur_sutunu is not None and d['turler'][sira] != tur_sutunu:
+                continue
+            puan = (agirliklar[d['boyutlar'][sira]] + agirliklar[d['yaslar'][sira]] +
+                    agirliklar[d['turler'][sira]] + karakter[d['maskeler'][sira]])
+            mesafe = None
+            enlem, boylam = d['enlem'][sira], d['boylam'][sira]
+            if profil.konum is not None and enlem is not None:
+                a = (math.sin((enlem - merkez_enlem) / 2) ** 2 +
+                     cos_merkez * math.cos(enlem) * math.sin((boylam - merkez_boylam) / 2) ** 2)
+                mesafe = 2 * DUNYA_YARICAPI_KM * math.asin(math.sqrt(min(a, 1.0)))
+                puan += MESAFE_AGIRLIGI * math.exp(-mesafe / MESAFE_OLCEGI_KM)
+            sonuc.append((puan, hayvan_id, sira, mesafe))
+
+        sonuc.sort(key=lambda s: (s[0], s[1]), reverse=True)
+        return [(sira, puan, mesafe) for puan, _id, sira, mesafe in sonuc[:limit]]
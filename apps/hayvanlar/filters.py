@@ -5,8 +5,16 @@ API filtreleme ve arama işlevleri
 ==============================================================================
 """
 
+from urllib.parse import urlencode
+
 from django_filters import rest_framework as filters
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
+from rest_framework.filters import OrderingFilter
+from apps.ortak.constants import PetAges, PetSizes
+from apps.ortak.models import Ilce
+from apps.ortak.servisler import KonumService
+from apps.ortak.utils import turkce_normalize
 from .models import Hayvan
 
 
@@ -20,8 +28,15 @@ class HayvanFilter(filters.FilterSet):
     cinsiyet = filters.CharFilter(lookup_expr='exact')
     yas = filters.CharFilter(lookup_expr='exact')
     boyut = filters.CharFilter(lookup_expr='exact')
-    il = filters.CharFilter(lookup_expr='iexact')
-    ilce = filters.CharFilter(lookup_expr='icontains')
+    il = filters.CharFilter(method='filter_il')
+    il_kod = filters.NumberFilter(field_name='il_kod')
+    ilce = filters.CharFilter(method='filter_ilce')
+    
+    # Aralık filtreleri - yaş ay cinsinden, boyut kod ('md') veya sıra (3)
+    yas_min = filters.NumberFilter(method='filter_yas_araligi')
+    yas_max = filters.NumberFilter(method='filter_yas_araligi')
+    boyut_min = filters.CharFilter(method='filter_boyut_araligi')
+    boyut_max = filters.CharFilter(method='filter_boyut_araligi')
     
     # Boolean filtreleri
     kisirlastirilmis = filters.BooleanFilter()
@@ -40,28 +55,122 @@ class HayvanFilter(filters.FilterSet):
         fields = [
             'tur', 'kategori', 'irk', 'cinsiyet', 'yas', 'boyut',
             'kisirlastirilmis', 'asilar_tamam', 'mikrocipli', 'sahiplenildi',
-            'il', 'ilce'
+            'il', 'il_kod', 'ilce', 'yas_min', 'yas_max', 'boyut_min', 'boyut_max'
         ]
     
+    @classmethod
+    def kanonik_parametreler(cls, params) -> str:
+        """
+        Filtre parametrelerinin sıralı, boşlardan arındırılmış biçimi
+        
+        Aynı filtre kümesi parametre sırasından bağımsız aynı metni verir
+        (cache anahtarı için). Sayfalama/sıralama gibi filtre dışı
+        parametreler yok sayılır.
+        """
+        ciftler = []
+        for ad in sorted(set(params) & set(cls.base_filters)):
+            degerler = params.getlist(ad) if hasattr(params, 'getlist') else [params[ad]]
+            temiz = sorted({str(deger).strip() for deger in degerler} - {''})
+            ciftler.extend((ad, deger) for deger in temiz)
+        return urlencode(ciftler)
+    
+    def filter_il(self, queryset, name, value):
+        """İl adı veya plaka kodu; indeksli il_kod eşitliğine çevrilir"""
+        if not value:
+            return queryset
+        
+        il_kodu = KonumService.il_kodu(value)
+        if il_kodu is None:
+            return queryset.none()
+        return queryset.filter(il_kod=il_kodu)
+    
+    def filter_ilce(self, queryset, name, value):
+        """İlçe adında (Türkçe duyarlı) arama; küçük ilçe tablosunda çözülür"""
+        if not value:
+            return queryset
+        
+        ilceler = Ilce.objects.filter(ad_normal__contains=turkce_normalize(value))
+        return queryset.filter(ilce_kod__in=ilceler)
+    
+    def filter_yas_araligi(self, queryset, name, value):
+        """
+        Ay cinsinden alt/üst sınır
+        
+        Ayı bilinmeyen hayvanlar, yaş kategorisinin aralığı sınırla
+        kesişiyorsa eşleşir (yas_max=36 yetişkinleri de getirir).
+        yas_sira üzerindeki aralık koşulu eşleşenlerin hepsini kapsar;
+        hayvan_yas_liste_idx üzerinde aralık taraması yapılır, kesin
+        koşul index'in INCLUDE sütunlarıyla süzülür.
+        """
+        if value is None:
+            return queryset
+        
+        if name == 'yas_min':
+            kategoriler = PetAges.araliktaki_kategoriler(alt=value)
+            sinir = min([value, *(PetAges.TEMSILI_AY[k] for k in kategoriler)])
+            sira_kosulu = Q(yas_sira__gte=sinir)
+            ay_kosulu = Q(yas_ay__gte=value)
+        else:
+            kategoriler = PetAges.araliktaki_kategoriler(ust=value)
+            sinir = max([value, *(PetAges.TEMSILI_AY[k] for k in kategoriler)])
+            sira_kosulu = Q(yas_sira__lte=sinir)
+            ay_kosulu = Q(yas_ay__lte=value)
+        return queryset.filter(sira_kosulu).filter(
+            ay_kosulu | Q(yas_ay__isnull=True, yas__in=kategoriler)
+        )
+    
+    def filter_boyut_araligi(self, queryset, name, value):
+        """Boyut sırasına göre alt/üst sınır; tanınmayan değer boş sonuç verir"""
+        if not value:
+            return queryset
+        
+        value = value.strip().lower()
+        sira = PetSizes.SIRALAR.get(value)
+        if sira is None and value.isdigit():
+            sira = int(value)
+        if sira is None:
+            return queryset.none()
+        
+        islem = 'gte' if name == 'boyut_min' else 'lte'
+        return queryset.filter(**{f'boyut_sira__{islem}': sira})
+    
     def filter_karakter(self, queryset, name, value):
         """Karakter özelliklerine göre filtrele"""
         if not value:
             return queryset
         
-        karakter_ozellikleri = value.split(',')
-        for ozellik in karakter_ozellikleri:
-            queryset = queryset.filter(karakter_ozellikleri__contains=[ozellik])
-        
-        return queryset
+        return queryset.karakter_ozellikleriyle(value.split(','))
     
     def filter_search(self, queryset, name, value):
-        """Ad, açıklama ve diğer alanlarda arama"""
+        """Ad, açıklama, ırk ve kategori adında arama (bkz. HayvanQuerySet.ara)"""
         if not value:
             return queryset
         
-        return queryset.filter(
-            models.Q(ad__icontains=value) |
-            models.Q(aciklama__icontains=value) |
-            models.Q(irk__ad__icontains=value) |
-            models.Q(kategori__ad__icontains=value)
-        )
+        return queryset.ara(value)
+
+
+class HayvanOrderingFilter(OrderingFilter):
+    """
+    Arama yapılırken varsayılan sıralamayı uygulamaz
+
+    `search` parametresi varsa ve `ordering` açıkça istenmediyse
+    sonuçlar arama skoruna göre sıralı kalır.
+    """
+
+    # Kategorik alanların sayısal karşılıkları: ?ordering=yas yaşa göre sıralar
+    SAYISAL_SIRALAMA = {'yas': 'yas_sira', 'boyut': 'boyut_sira'}
+
+    def get_default_ordering(self, view):
+        if view.request.query_params.get('search'):
+            return None
+        return super().get_default_ordering(view)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        return [
+            ('-' if alan.startswith('-') else '') +
+            self.SAYISAL_SIRALAMA.get(alan.lstrip('-'), alan.lstrip('-'))
+            for alan in ordering
+        ]
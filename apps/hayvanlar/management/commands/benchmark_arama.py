@@ -0,0 +1,117 @@
+"""
+🐾 Hayvan Arama Benchmark Komutu
+==============================================================================
+Eski `icontains` araması ile HayvanQuerySet.ara() gecikmesini karşılaştırır.
+Test verisi bir transaction içinde oluşturulur ve sonunda geri alınır.
+==============================================================================
+"""
+
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from apps.hayvanlar.models import Hayvan, KopekIrk
+
+
+ADLAR = [
+    'Boncuk', 'Pamuk', 'Karabaş', 'Tarçın', 'Zeytin', 'Duman', 'Fındık',
+    'Limon', 'Paşa', 'Minnoş', 'Şeker', 'Çakıl', 'Gölge', 'Bulut', 'Kömür',
+]
+KELIMELER = [
+    'oyuncu', 'sakin', 'sevecen', 'enerjik', 'uysal', 'çocuklarla', 'anlaşır',
+    'bahçeli', 'evde', 'yaşamaya', 'alışkın', 'aşıları', 'tamam', 'kısır',
+    'tuvalet', 'eğitimli', 'sokakta', 'bulundu', 'tedavisi', 'bitti',
+]
+IRKLAR = ['Golden Retriever', 'Kangal', 'Labrador', 'Terrier', 'Akbaş']
+
+# Gerçek kullanımı yansıtan arama terimleri (son ikisi yazım hatalı)
+ARAMA_TERIMLERI = ['boncuk', 'sevecen', 'golden', 'kangal oyuncu', 'tarcin', 'karabas']
+
+
+class Command(BaseCommand):
+    help = 'Hayvan aramasında icontains ile tam metin arama gecikmesini karşılaştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--adet', type=int, default=100_000,
+                            help='Oluşturulacak hayvan sayısı')
+        parser.add_argument('--tekrar', type=int, default=20,
+                            help='Her terim için ölçüm tekrarı')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            self.stdout.write(self.style.WARNING(
+                f'Veritabanı {connection.vendor}: iki yol da icontains kullanır, '
+                'anlamlı sonuç için PostgreSQL ile çalıştırın.'
+            ))
+
+        with transaction.atomic():
+            self._veri_olustur(options['adet'])
+
+            self.stdout.write(f"{'terim':<16}{'yol':<12}{'medyan ms':>12}{'p95 ms':>10}{'sonuç':>10}")
+            for terim in ARAMA_TERIMLERI:
+                for yol, queryset in (
+                    ('icontains', self._icontains(terim)),
+                    ('ara', Hayvan.objects.filter(aktif=True).ara(terim)),
+                ):
+                    sureler, sonuc = self._olc(queryset, options['tekrar'])
+                    p95 = sureler[int(len(sureler) * 0.95) - 1] if len(sureler) > 1 else sureler[0]
+                    self.stdout.write(
+                        f'{terim:<16}{yol:<12}{statistics.median(sureler):>12.2f}{p95:>10.2f}{sonuc:>10}'
+                    )
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark tamamlandı, test verisi geri alındı.'))
+
+    def _veri_olustur(self, adet):
+        """Rastgele ad ve açıklamalarla hayvan kayıtları oluştur"""
+        self.stdout.write(f'{adet} hayvan oluşturuluyor...')
+        rastgele = random.Random(42)
+        irklar = [
+            KopekIrk.objects.get_or_create(id=f'bench-{i}', defaults={'ad': ad})[0]
+            for i, ad in enumerate(IRKLAR)
+        ]
+
+        Hayvan.objects.bulk_create(
+            (
+                Hayvan(
+                    ad=rastgele.choice(ADLAR),
+                    slug=f'benchmark-{i}',
+                    tur='kopek',
+                    irk=rastgele.choice(irklar),
+                    aciklama=' '.join(rastgele.choices(KELIMELER, k=25)),
+                )
+                for i in range(adet)
+            ),
+            batch_size=2000,
+        )
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE hayvanlar_hayvan')
+
+    @staticmethod
+    def _icontains(terim):
+        """Değişiklik öncesi arama yolu"""
+        return Hayvan.objects.filter(aktif=True).filter(
+            Q(ad__icontains=terim) |
+            Q(aciklama__icontains=terim) |
+            Q(irk__ad__icontains=terim) |
+            Q(kategori__ad__icontains=terim)
+        ).order_by('-created_at')
+
+    @staticmethod
+    def _olc(queryset, tekrar):
+        """Liste endpoint'inin yaptığı gibi COUNT + ilk sayfa"""
+        sureler = []
+        sonuc = 0
+        for _ in range(tekrar):
+            baslangic = time.perf_counter()
+            sonuc = queryset.count()
+            list(queryset[:20])
+            sureler.append((time.perf_counter() - baslangic) * 1000)
+        return sorted(sureler), sonuc
@@ -0,0 +1,142 @@
+"""
+🐾 Eşleştirme Motoru Benchmark Komutu
+==============================================================================
+EslesmeService için özellik dizilerinin kurulma, paylaşılan cache biçimine
+aktarılıp yüklenme ve artımlı güncelleme sürelerini ve profil başına
+puanlama gecikmesini (sütun ağırlıkları + mesafe + ilk k) ölçer. Test verisi bir transaction içinde oluşturulur ve
+sonunda geri alınır.
+==============================================================================
+"""
+
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.hayvanlar import eslesme
+from apps.hayvanlar.eslesme import EslesmeIndeksi, ProfilAgirliklari
+from apps.hayvanlar.models import Hayvan
+from apps.hayvanlar.servisler import EslesmeService
+from apps.hayvanlar.utils import KARAKTER_BITLERI
+from apps.ortak.constants import IL_MERKEZLERI, PetAges, PetSizes
+from apps.ortak.servisler import KonumService
+
+# (ad, profil) - farklı ağırlık vektörleri üreten örnek sahiplenenler
+PROFILLER = [
+    ('apartman/ilk', dict(ev_tipi='apartman', deneyim_yil=0, konum=IL_MERKEZLERI[34])),
+    ('bahçeli/usta', dict(ev_tipi='mustakil', bahce_var_mi=True, deneyim_yil=8,
+                          konum=IL_MERKEZLERI[35])),
+    ('kedili', dict(ev_tipi='apartman', deneyim_yil=3, diger_hayvanlar='2 kedi',
+                    konum=IL_MERKEZLERI[6])),
+    ('konumsuz', dict()),
+]
+IL_AGIRLIKLARI = {34: 30, 6: 10, 35: 8, 16: 5, 7: 5}
+
+
+class Command(BaseCommand):
+    help = 'Eşleştirme dizileri kurulumu, artımlı güncelleme ve puanlama gecikmesini ölçer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--adet', type=int, default=200_000,
+                            help='Oluşturulacak hayvan sayısı')
+        parser.add_argument('--tekrar', type=int, default=50,
+                            help='Her profil için puanlama tekrarı')
+        parser.add_argument('--limit', type=int, default=10,
+                            help='İlk k')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Puanlama: {'numpy (vektörel)' if eslesme.np is not None else 'saf Python'}")
+
+        with transaction.atomic():
+            self._veri_olustur(options['adet'])
+
+            baslangic = time.perf_counter()
+            indeks, son = EslesmeService._kur()
+            self.stdout.write(
+                f'Dizi kurulumu: {time.perf_counter() - baslangic:.2f} sn, {len(indeks)} satır'
+            )
+
+            # Paylaşılan cache'e yazılan ve web süreçlerinin yüklediği biçim
+            baslangic = time.perf_counter()
+            sutunlar = indeks.disa_aktar()
+            aktarma = time.perf_counter() - baslangic
+            baslangic = time.perf_counter()
+            EslesmeIndeksi.iceri_aktar(sutunlar)
+            yukleme = time.perf_counter() - baslangic
+            boyut = sum(len(sutun) for sutun in sutunlar.values()) if eslesme.np is not None else None
+            self.stdout.write(
+                f'Dışa aktarma: {aktarma * 1000:.1f} ms, yükleme: {yukleme * 1000:.1f} ms'
+                + (f', {boyut / 1024 / 1024:.1f} MB' if boyut is not None else '')
+            )
+
+            # Artımlı güncelleme: 500 kaydın karakteri değişir, 100 kayıt sahiplenilir
+            degisenler = list(Hayvan.objects.order_by('?').values_list('pk', flat=True)[:600])
+            sonra = timezone.now() + timedelta(minutes=1)
+            Hayvan.objects.filter(pk__in=degisenler[:500]).update(
+                karakter_maskesi=KARAKTER_BITLERI['calm'], updated_at=sonra
+            )
+            Hayvan.objects.filter(pk__in=degisenler[500:]).update(sahiplenildi=True, updated_at=sonra)
+            baslangic = time.perf_counter()
+            degisen, _ = EslesmeService._degisiklikleri_yaz(indeks, son)
+            self.stdout.write(
+                f'Artımlı güncelleme ({degisen} satır): {(time.perf_counter() - baslangic) * 1000:.1f} ms'
+            )
+
+            self.stdout.write(f"{'profil':<14}{'medyan ms':>10}{'p95 ms':>9}{'en iyi':>8}")
+            for ad, profil in PROFILLER:
+                agirliklar = ProfilAgirliklari(**profil)
+                sureler = []
+                for _ in range(options['tekrar']):
+                    baslangic = time.perf_counter()
+                    indeks.puanla(agirliklar, options['limit'])
+                    sureler.append((time.perf_counter() - baslangic) * 1000)
+                sureler.sort()
+                p95 = sureler[int(len(sureler) * 0.95) - 1] if len(sureler) > 1 else sureler[0]
+                self.stdout.write(
+                    f'{ad:<14}{statistics.median(sureler):>10.2f}{p95:>9.2f}{sureler[0]:>8.2f}'
+                )
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark tamamlandı, test verisi geri alındı.'))
+
+    def _veri_olustur(self, adet):
+        """Rastgele boyut/yaş/karakter ve il merkezleri etrafına dağılmış konumlar"""
+        self.stdout.write(f'{adet} hayvan oluşturuluyor...')
+        rastgele = random.Random(42)
+        iller = list(IL_MERKEZLERI)
+        il_agirliklari = [IL_AGIRLIKLARI.get(kod, 1) for kod in iller]
+        boyutlar = [boyut for boyut, _ad in PetSizes.CHOICES]
+        yaslar = [yas for yas, _ad in PetAges.CHOICES]
+        karakterler = list(KARAKTER_BITLERI)
+
+        def hayvan(i):
+            il_kodu = rastgele.choices(iller, weights=il_agirliklari)[0]
+            enlem, boylam = IL_MERKEZLERI[il_kodu]
+            ozellikler = rastgele.sample(karakterler, rastgele.randint(0, 4))
+            return Hayvan(
+                ad=f'Eşleşme {i}',
+                slug=f'benchmark-eslesme-{i}',
+                tur=rastgele.choice(['kedi', 'kopek']),
+                boyut=rastgele.choice(boyutlar),
+                yas=rastgele.choice(yaslar),
+                karakter_ozellikleri=ozellikler,
+                il=KonumService.il_adi(il_kodu),
+                il_kod_id=il_kodu,
+                enlem=enlem + rastgele.gauss(0, 0.15),
+                boylam=boylam + rastgele.gauss(0, 0.15),
+            )
+
+        Hayvan.objects.bulk_create((hayvan(i) for i in range(adet)), batch_size=2000)
+        # Kayıtlar eski görünsün, yalnızca en son kayıt yeni düzenlenmiş olsun;
+        # artımlı güncelleme yalnızca sonradan değişenleri okumalı
+        Hayvan.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        Hayvan.objects.filter(slug=f'benchmark-eslesme-{adet - 1}').update(updated_at=timezone.now())
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE hayvanlar_hayvan')
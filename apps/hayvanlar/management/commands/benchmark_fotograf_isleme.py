@@ -0,0 +1,91 @@
+"""
+🐾 Fotoğraf İşleme Benchmark Komutu
+==============================================================================
+Varyant üretim hattının worker başına işlenen fotoğraf/sn değerini ölçer.
+Sentetik JPEG'ler bellekte üretilir, varyantlar bellek içi storage'a yazılır;
+böylece ölçüm disk/ağ yerine CPU maliyetini gösterir.
+==============================================================================
+"""
+
+import statistics
+import time
+from io import BytesIO
+
+from django.core.files.storage import InMemoryStorage
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from apps.hayvanlar.utils import create_thumbnail, fotograf_varyantlari_uret
+
+
+class _BellekDosyasi(BytesIO):
+    """Adı olan bellek içi dosya"""
+
+    def __init__(self, veri, name):
+        super().__init__(veri)
+        self.name = name
+
+
+class Command(BaseCommand):
+    help = 'Fotoğraf varyant üretiminin worker başına hızını ölçer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--adet', type=int, default=30,
+                            help='İşlenecek fotoğraf sayısı')
+        parser.add_argument('--genislik', type=int, default=4000,
+                            help='Kaynak fotoğraf genişliği (px, 4:3)')
+
+    def handle(self, *args, **options):
+        kaynak = self._sentetik_jpeg(options['genislik'])
+        self.stdout.write(
+            f"kaynak: {options['genislik']}x{options['genislik'] * 3 // 4} JPEG, "
+            f"{len(kaynak) / 1024:.0f} KB"
+        )
+
+        storage = InMemoryStorage()
+        sureler = []
+        for i in range(options['adet']):
+            baslangic = time.perf_counter()
+            sonuc = fotograf_varyantlari_uret(_BellekDosyasi(kaynak, f'foto_{i}.jpg'), storage=storage)
+            sureler.append(time.perf_counter() - baslangic)
+
+        toplam = sum(sureler)
+        self.stdout.write(f"varyant/fotoğraf: {len(sonuc['varyantlar'])}")
+        self.stdout.write(
+            f"medyan ms: {statistics.median(sureler) * 1000:.1f}  "
+            f"fotoğraf/sn (worker başına): {len(sureler) / toplam:.2f}"
+        )
+        for varyant in sonuc['varyantlar']:
+            self.stdout.write(f"  {varyant['format']:<5}{varyant['genislik']:>6}px{varyant['boyut'] / 1024:>9.1f} KB")
+
+        # Karşılaştırma: eski tek thumbnail yolu (tam çözünürlük açılır)
+        sureler = []
+        for i in range(min(options['adet'], 10)):
+            alan = _EskiAlan(kaynak, f'eski_{i}.jpg', storage)
+            baslangic = time.perf_counter()
+            create_thumbnail(alan)
+            sureler.append(time.perf_counter() - baslangic)
+        self.stdout.write(f"eski create_thumbnail medyan ms: {statistics.median(sureler) * 1000:.1f}")
+
+    @staticmethod
+    def _sentetik_jpeg(genislik):
+        """Gerçekçi sıkıştırma için gürültü + gradyan içeren fotoğraf"""
+        yukseklik = genislik * 3 // 4
+        gurultu = Image.effect_noise((genislik, yukseklik), 40).convert('RGB')
+        gradyan = Image.linear_gradient('L').resize((genislik, yukseklik)).convert('RGB')
+        img = Image.blend(gurultu, gradyan, 0.6)
+        cikti = BytesIO()
+        img.save(cikti, format='JPEG', quality=90)
+        return cikti.getvalue()
+
+
+class _EskiAlan:
+    """create_thumbnail için FieldFile benzeri nesne"""
+
+    def __init__(self, veri, name, storage):
+        self.name = name
+        self.storage = storage
+        self._veri = veri
+
+    def open(self, mode='rb'):
+        return _BellekDosyasi(self._veri, self.name)
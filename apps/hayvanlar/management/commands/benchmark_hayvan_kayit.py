@@ -0,0 +1,113 @@
+"""
+🐾 Hayvan Kayıt Benchmark Komutu
+==============================================================================
+Hayvan.save() yazma yolunun eski (tekrar okuma + slug döngüsü + COUNT(*))
+ve yeni (bellek içi değişiklik takibi + tek sorguda slug + F() delta)
+halini karşılaştırır. Test verisi transaction sonunda geri alınır.
+==============================================================================
+"""
+
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+from django.db.models.signals import post_save
+from django.utils.text import slugify
+
+from apps.hayvanlar.models import Hayvan
+from apps.hayvanlar.signals import hayvan_kategori_sayaci_kayit
+from apps.kategoriler.models import Kategori
+
+
+def _eski_sayac_guncelle(kategori_id):
+    """Eski KategoriManager.istatistikleri_guncelle: COUNT(*) + cache silme"""
+    Kategori.objects.filter(pk=kategori_id).update(
+        kullanim_sayisi=Hayvan.objects.filter(kategori_id=kategori_id).count()
+    )
+    cache.delete_many([
+        "kategoriler:ana_kategoriler",
+        "kategoriler:agac",
+        "kategoriler:populer:10"
+    ])
+
+
+def eski_kaydet(hayvan):
+    """Değişiklik öncesi Hayvan.save() davranışının birebir taklidi"""
+    if not hayvan.slug:
+        base_slug = slugify(hayvan.ad)
+        slug = base_slug
+        counter = 1
+        while Hayvan.objects.filter(slug=slug).exclude(pk=hayvan.pk).exists():
+            slug = f"{base_slug}-{counter}"
+            counter += 1
+        hayvan.slug = slug
+
+    if hayvan.pk:
+        eski_kayit = Hayvan.objects.get(pk=hayvan.pk)
+        if eski_kayit.kategori and eski_kayit.kategori != hayvan.kategori:
+            _eski_sayac_guncelle(eski_kayit.kategori.id)
+
+    models.Model.save(hayvan)
+
+    if hayvan.kategori:
+        _eski_sayac_guncelle(hayvan.kategori.id)
+
+
+class Command(BaseCommand):
+    help = 'Hayvan.save() yazma yolunu eski ve yeni haliyle karşılaştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--adet', type=int, default=10_000,
+                            help='Kaydedilecek hayvan sayısı')
+
+    def handle(self, *args, **options):
+        adet = options['adet']
+
+        with transaction.atomic():
+            kategoriler = [
+                Kategori.objects.create(ad=f'Benchmark {i}', pet_type='kedi')
+                for i in range(2)
+            ]
+
+            self.stdout.write(f"{'yol':<8}{'işlem':<12}{'süre sn':>10}{'kayıt/sn':>12}{'sorgu':>10}")
+            for yol, kaydet in (('eski', eski_kaydet), ('yeni', Hayvan.save)):
+                # Yeni sayaç sinyali eski yolun ölçümüne karışmasın
+                if yol == 'eski':
+                    post_save.disconnect(hayvan_kategori_sayaci_kayit, sender=Hayvan)
+                else:
+                    post_save.connect(hayvan_kategori_sayaci_kayit, sender=Hayvan)
+
+                # Aynı adlar slug çakışması üretir (gerçek verideki "Boncuk" gibi)
+                hayvanlar = [
+                    Hayvan(ad=f'Boncuk {yol} {i % 1000}', tur='kedi', kategori=kategoriler[0])
+                    for i in range(adet)
+                ]
+                self._olc(yol, 'oluşturma', hayvanlar, kaydet)
+
+                hayvanlar = list(Hayvan.objects.filter(pk__in=[h.pk for h in hayvanlar]))
+                for hayvan in hayvanlar:
+                    hayvan.kategori = kategoriler[1]
+                self._olc(yol, 'güncelleme', hayvanlar, kaydet)
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark tamamlandı, test verisi geri alındı.'))
+
+    def _olc(self, yol, islem, hayvanlar, kaydet):
+        sorgu_sayisi = 0
+
+        def sorgu_say(execute, sql, params, many, context):
+            nonlocal sorgu_sayisi
+            sorgu_sayisi += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(sorgu_say):
+            baslangic = time.perf_counter()
+            for hayvan in hayvanlar:
+                kaydet(hayvan)
+            sure = time.perf_counter() - baslangic
+
+        self.stdout.write(
+            f'{yol:<8}{islem:<12}{sure:>10.2f}{len(hayvanlar) / sure:>12.0f}{sorgu_sayisi:>10}'
+        )
@@ -0,0 +1,124 @@
+"""
+🐾 Popülerlik Sıralaması Benchmark Komutu
+==============================================================================
+PopulerlikService.siralamayi_hesapla'nın büyük aktif kümede (varsayılan
+500k hayvan) çalışma süresini ölçer (parti okuma + puanlama + gruplama).
+Ardından `populer` okuma yolu ölçülür: yalnızca sıralama okuması
+(PopulerlikService.populer_idler, tek cache okuması) ve kayıtlarla birlikte
+(cache + in_bulk). Test verisi bir transaction içinde oluşturulur ve sonunda
+geri alınır.
+==============================================================================
+"""
+
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.hayvanlar import servisler
+from apps.hayvanlar.models import Hayvan
+from apps.hayvanlar.servisler import HayvanService, PopulerlikService
+from apps.ortak.constants import IL_MERKEZLERI
+from apps.ortak.servisler import KonumService
+
+TURLER = ['kedi', 'kopek', 'kus', 'kemirgen', 'diger']
+TUR_AGIRLIKLARI = [45, 40, 8, 4, 3]
+# Büyükşehirler kayıtların çoğunu barındırır
+IL_AGIRLIKLARI = {34: 30, 6: 10, 35: 8, 16: 5, 7: 5}
+
+
+class Command(BaseCommand):
+    help = 'Popülerlik sıralaması hesaplama süresini ve populer okuma yolunu ölçer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--adet', type=int, default=500_000,
+                            help='Oluşturulacak hayvan sayısı')
+        parser.add_argument('--tekrar', type=int, default=3,
+                            help='Sıralama hesaplama tekrarı')
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"Puanlama: {'numpy (vektörel)' if servisler.np is not None else 'saf Python'}, "
+            f"parti boyu {servisler.POPULERLIK_PARTI_BOYUTU}"
+        )
+
+        with transaction.atomic():
+            self._veri_olustur(options['adet'])
+            connection.queries_log.clear()
+
+            sureler, sorgu, siralar = [], 0, {}
+            for _ in range(options['tekrar']):
+                with CaptureQueriesContext(connection) as ctx:
+                    baslangic = time.perf_counter()
+                    siralar = PopulerlikService.siralamayi_hesapla()
+                    sureler.append(time.perf_counter() - baslangic)
+                sorgu = len(ctx.captured_queries)
+
+            self.stdout.write(
+                f"Sıralama: medyan {statistics.median(sureler):.2f} sn, "
+                f"en iyi {min(sureler):.2f} sn, {sorgu} sorgu, {len(siralar)} grup"
+            )
+
+            # Yalnızca ölçülen grup yazılır (LocMemCache varsayılan 300 anahtar tutar)
+            anahtar = PopulerlikService.anahtar('kedi', 34)
+            cache.set(anahtar, siralar.get(anahtar, []), 300)
+            self._okuma_olc(options['tekrar'] * 10)
+
+            transaction.set_rollback(True)
+
+        cache.delete(anahtar)
+        self.stdout.write(self.style.SUCCESS('Benchmark tamamlandı, test verisi geri alındı.'))
+
+    def _veri_olustur(self, adet):
+        """Uzun kuyruklu sayaçlar ve son bir yıla yayılmış kayıt tarihleri"""
+        self.stdout.write(f'{adet} hayvan oluşturuluyor...')
+        rastgele = random.Random(42)
+        iller = list(IL_MERKEZLERI)
+        il_agirliklari = [IL_AGIRLIKLARI.get(kod, 1) for kod in iller]
+        simdi = timezone.now()
+
+        def hayvan(i):
+            goruntulenme = int(rastgele.paretovariate(1.2)) - 1
+            il_kodu = rastgele.choices(iller, weights=il_agirliklari)[0]
+            return Hayvan(
+                ad=f'Popüler {i}',
+                slug=f'benchmark-populer-{i}',
+                tur=rastgele.choices(TURLER, weights=TUR_AGIRLIKLARI)[0],
+                il=KonumService.il_adi(il_kodu),
+                il_kod_id=il_kodu,
+                view_count=goruntulenme,
+                like_count=goruntulenme // rastgele.randint(10, 50),
+                share_count=goruntulenme // rastgele.randint(50, 200),
+                created_at=simdi - timedelta(minutes=rastgele.randint(0, 365 * 24 * 60)),
+            )
+
+        Hayvan.objects.bulk_create((hayvan(i) for i in range(adet)), batch_size=2000)
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE hayvanlar_hayvan')
+
+    def _okuma_olc(self, tekrar):
+        """populer okuma yolu: yalnızca sıralama ve kayıtlarla birlikte"""
+        queryset = Hayvan.objects.filter(aktif=True).liste_icin()
+        yollar = (
+            ('sıralama', lambda: PopulerlikService.populer_idler('kedi', 34)),
+            ('sıralama + kayıt', lambda: HayvanService.populer_hayvanlar(10, queryset, tur='kedi', il_kodu=34)),
+        )
+        for ad, ara in yollar:
+            sureler = []
+            with CaptureQueriesContext(connection) as ctx:
+                for _ in range(tekrar):
+                    baslangic = time.perf_counter()
+                    ara()
+                    sureler.append((time.perf_counter() - baslangic) * 1000)
+            self.stdout.write(
+                f'{ad:<16} medyan {statistics.median(sureler):8.2f} ms  '
+                f'{len(ctx.captured_queries) // tekrar} sorgu'
+            )
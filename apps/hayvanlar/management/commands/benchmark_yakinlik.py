@@ -0,0 +1,125 @@
+"""
+🐾 Yakınlık Araması Benchmark Komutu
+==============================================================================
+"Yakınımdaki hayvanlar" için tüm koordinatları okuyup mesafe hesaplayan tam
+tarama ile sınır kutusu ön filtresi + toplu haversine (HayvanService.
+yakindakiler) yolunu karşılaştırır. Test verisi bir transaction içinde
+oluşturulur ve sonunda geri alınır.
+==============================================================================
+"""
+
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.hayvanlar.models import Hayvan
+from apps.hayvanlar.servisler import HayvanService
+from apps.ortak.constants import IL_MERKEZLERI
+from apps.ortak.servisler import KonumService, np
+
+
+# (ad, enlem, boylam) - kullanıcı konumları
+NOKTALAR = [
+    ('Kadıköy', 40.99, 29.03),
+    ('Çankaya', 39.90, 32.86),
+    ('Bornova', 38.47, 27.22),
+    ('Erzurum', 39.90, 41.27),
+]
+YARICAPLAR = [10, 50, 150]
+# Büyükşehirler kayıtların çoğunu barındırır
+IL_AGIRLIKLARI = {34: 30, 6: 10, 35: 8, 16: 5, 7: 5}
+
+
+def tam_tarama(enlem, boylam, yaricap_km, limit=20):
+    """Ön filtresiz yol: tüm aktif kayıtların koordinatı okunur"""
+    satirlar = list(
+        Hayvan.objects.filter(aktif=True, enlem__isnull=False)
+        .values_list('id', 'enlem', 'boylam')
+    )
+    sonuc = []
+    for hayvan_id, e, b in satirlar:
+        (mesafe,) = KonumService.mesafeler(enlem, boylam, [e], [b])
+        if mesafe <= yaricap_km:
+            sonuc.append((mesafe, -hayvan_id))
+    sonuc.sort()
+    idler = [-eksi_id for _, eksi_id in sonuc[:limit]]
+    hayvanlar = Hayvan.objects.liste_icin().in_bulk(idler)
+    return [hayvanlar[hayvan_id] for hayvan_id in idler]
+
+
+class Command(BaseCommand):
+    help = 'Yakınlık aramasında tam tarama ile sınır kutusu + haversine yolunu karşılaştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--adet', type=int, default=200_000,
+                            help='Oluşturulacak hayvan sayısı')
+        parser.add_argument('--tekrar', type=int, default=10,
+                            help='Her nokta/yarıçap için ölçüm tekrarı')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Mesafe hesabı: {'numpy (vektörel)' if np is not None else 'saf Python'}")
+
+        with transaction.atomic():
+            self._veri_olustur(options['adet'])
+
+            self.stdout.write(
+                f"{'nokta':<10}{'km':>5}  {'yol':<14}{'medyan ms':>10}{'p95 ms':>9}"
+                f"{'sorgu':>7}{'sonuç':>7}"
+            )
+            for ad, enlem, boylam in NOKTALAR:
+                for yaricap in YARICAPLAR:
+                    for yol, ara in (
+                        ('tam-tarama', tam_tarama),
+                        ('kutu+haversine', lambda e, b, r: HayvanService.yakindakiler(e, b, r)),
+                    ):
+                        sureler, sorgu, sonuc = self._olc(ara, enlem, boylam, yaricap, options['tekrar'])
+                        p95 = sureler[int(len(sureler) * 0.95) - 1] if len(sureler) > 1 else sureler[0]
+                        self.stdout.write(
+                            f'{ad:<10}{yaricap:>5}  {yol:<14}{statistics.median(sureler):>10.2f}'
+                            f'{p95:>9.2f}{sorgu:>7}{sonuc:>7}'
+                        )
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark tamamlandı, test verisi geri alındı.'))
+
+    def _veri_olustur(self, adet):
+        """İl merkezleri etrafına dağılmış hayvan kayıtları oluştur"""
+        self.stdout.write(f'{adet} hayvan oluşturuluyor...')
+        rastgele = random.Random(42)
+        iller = list(IL_MERKEZLERI)
+        agirliklar = [IL_AGIRLIKLARI.get(kod, 1) for kod in iller]
+
+        def hayvan(i):
+            il_kodu = rastgele.choices(iller, weights=agirliklar)[0]
+            enlem, boylam = IL_MERKEZLERI[il_kodu]
+            return Hayvan(
+                ad=f'Yakın {i}',
+                slug=f'benchmark-yakin-{i}',
+                tur=rastgele.choice(['kedi', 'kopek']),
+                il=KonumService.il_adi(il_kodu),
+                il_kod_id=il_kodu,
+                enlem=enlem + rastgele.gauss(0, 0.15),
+                boylam=boylam + rastgele.gauss(0, 0.15),
+            )
+
+        Hayvan.objects.bulk_create((hayvan(i) for i in range(adet)), batch_size=2000)
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE hayvanlar_hayvan')
+
+    @staticmethod
+    def _olc(ara, enlem, boylam, yaricap, tekrar):
+        sureler = []
+        sonuc = []
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(tekrar):
+                baslangic = time.perf_counter()
+                sonuc = ara(enlem, boylam, yaricap)
+                sureler.append((time.perf_counter() - baslangic) * 1000)
+        return sorted(sureler), len(ctx.captured_queries) // tekrar, len(sonuc)
@@ -0,0 +1,33 @@
+"""
+🐾 Fotoğraf Varyantlarını Oluşturma Komutu
+==============================================================================
+Varyantı henüz üretilmemiş (veya hata almış) fotoğrafları işleme kuyruğuna
+ekler. Pipeline öncesinden kalan fotoğraflar için bir kez çalıştırılır.
+==============================================================================
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.hayvanlar.models import HayvanFotograf
+from apps.hayvanlar.tasks import fotograf_varyantlari_olustur
+from apps.ortak.constants import PhotoProcessingStatus
+
+
+class Command(BaseCommand):
+    help = 'Varyantı olmayan hayvan fotoğraflarını işleme kuyruğuna ekler'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hepsi', action='store_true',
+                            help='Hazır olanlar dahil tüm fotoğrafları yeniden işle')
+
+    def handle(self, *args, **options):
+        fotograflar = HayvanFotograf.objects.exclude(fotograf='')
+        if not options['hepsi']:
+            fotograflar = fotograflar.exclude(isleme_durumu=PhotoProcessingStatus.HAZIR)
+
+        adet = 0
+        for fotograf_id in fotograflar.values_list('id', flat=True).iterator():
+            fotograf_varyantlari_olustur.delay(fotograf_id)
+            adet += 1
+
+        self.stdout.write(self.style.SUCCESS(f'{adet} fotoğraf işleme kuyruğuna eklendi.'))
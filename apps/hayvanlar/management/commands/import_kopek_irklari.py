@@ -2,45 +2,43 @@
 Köpek ırklarını veritabanına eklemek için komut
 """
 
+import time
+
 from django.core.management.base import BaseCommand
-from apps.hayvanlar.models import KopekIrk
-from apps.ortak.constants import KopekIrklari
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.hayvanlar.servisler import KopekIrkSenkronService
+
 
 class Command(BaseCommand):
     help = 'Köpek ırklarını veritabanına ekler'
 
     def handle(self, *args, **options):
         self.stdout.write('Köpek ırkları ekleniyor...')
-        
-        # Kayıtlı ırk sayısı
-        existing_count = KopekIrk.objects.count()
-        self.stdout.write(f'Mevcut ırk sayısı: {existing_count}')
-        
-        # Yeni kayıt sayısı
-        created_count = 0
-        
-        # Yerli ırklar listesi
-        yerli_irklar = KopekIrklari.YERLI_IRKLAR
-        
-        # Popüler ırklar listesi
-        populer_irklar = KopekIrklari.POPULER_IRKLAR
-        
-        # Her bir ırkı ekle
-        for irk_id, irk_ad in KopekIrklari.choices:
-            # Eğer zaten varsa güncelle, yoksa oluştur
-            irk, created = KopekIrk.objects.update_or_create(
-                id=irk_id,
-                defaults={
-                    'ad': irk_ad,
-                    'yerli': irk_id in yerli_irklar,
-                    'populer': irk_id in populer_irklar
-                }
+
+        with CaptureQueriesContext(connection) as ctx:
+            baslangic = time.perf_counter()
+            sonuc = KopekIrkSenkronService.irklari_iceri_aktar()
+            aktarma_suresi = time.perf_counter() - baslangic
+            aktarma_sorgulari = len(ctx.captured_queries)
+
+            # Popüler ırkların kategorileri (satır başına save yerine tek seferde)
+            baslangic = time.perf_counter()
+            kategoriler = KopekIrkSenkronService.kategorileri_senkronize_et()
+            senkron_suresi = time.perf_counter() - baslangic
+            senkron_sorgulari = len(ctx.captured_queries) - aktarma_sorgulari
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{sonuc['eklenen']} yeni ırk eklendi, {sonuc['guncellenen']} ırk güncellendi, "
+            f"{sonuc['degismeyen']} ırk değişmedi."
+        ))
+        self.stdout.write(f'Irk aktarımı: {aktarma_suresi * 1000:.1f} ms, {aktarma_sorgulari} sorgu')
+        if kategoriler is None:
+            self.stdout.write(self.style.WARNING('Köpekler ana kategorisi yok, kategori senkronizasyonu atlandı.'))
+        else:
+            self.stdout.write(
+                f"Kategori senkronizasyonu: {kategoriler['eklenen']} eklendi, "
+                f"{senkron_suresi * 1000:.1f} ms, {senkron_sorgulari} sorgu"
             )
-            
-            if created:
-                created_count += 1
-                if created_count % 50 == 0:
-                    self.stdout.write(f'Şu ana kadar {created_count} ırk eklendi...')
-        
-        self.stdout.write(self.style.SUCCESS(f'{created_count} yeni ırk eklendi.'))
-        self.stdout.write(self.style.SUCCESS('İşlem tamamlandı! Toplam: {}'.format(existing_count + created_count)))
+        self.stdout.write(self.style.SUCCESS('İşlem tamamlandı!'))
@@ -0,0 +1,251 @@
+"""
+🐾 Hayvan Managers
+==============================================================================
+Hayvan sorgulama ve listeleme için özel manager'lar
+==============================================================================
+"""
+
+import json
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connections, models
+from django.db.models import Count, F, OuterRef, Q, Subquery
+
+from apps.ortak.constants import Iller
+from apps.ortak.servisler import KonumService
+
+from .utils import KARAKTER_BITLERI, karakter_maskesi_hesapla
+
+
+# PostgreSQL tam metin arama yapılandırması (docker/init-db.sql ile aynı)
+ARAMA_YAPILANDIRMASI = 'turkish'
+
+# Faset adı -> sayılan alan (il, plaka kodu sütunu üzerinden sayılır)
+FASET_ALANLARI = {
+    'tur': 'tur',
+    'cinsiyet': 'cinsiyet',
+    'yas': 'yas',
+    'boyut': 'boyut',
+    'il': 'il_kod',
+    'sahiplenildi': 'sahiplenildi',
+}
+# Faset sayıları cache etiketi ve süresi (sn); hayvan yazımlarında geçersiz kılınır
+HAYVAN_FASET_CACHE_ETIKETI = "hayvanlar:fasetler"
+FASET_CACHE_SURESI = 60
+
+# Popülerlik puanı: sayaç alanı -> ağırlık
+POPULERLIK_AGIRLIKLARI = {
+    'view_count': 1,
+    'like_count': 5,
+    'share_count': 10,
+}
+
+
+def grouping_satirlarini_coz(alanlar, satirlar):
+    """
+    GROUPING SETS satırlarını (maske, *değerler, adet) faset sözlüğüne çevir
+
+    GROUPING() gruplanmayan her sütun için 1 biti verir (ilk sütun en
+    anlamlı bit); tüm bitleri 1 olan satır boş kümenin, yani toplamın satırıdır.
+    """
+    hepsi = (1 << len(alanlar)) - 1
+    toplam, fasetler = 0, {alan: {} for alan in alanlar}
+    for maske, *degerler, adet in satirlar:
+        if maske == hepsi:
+            toplam = adet
+            continue
+        sira = len(alanlar) - (hepsi ^ maske).bit_length()
+        if degerler[sira] is not None:
+            fasetler[alanlar[sira]][degerler[sira]] = adet
+    return toplam, fasetler
+
+
+class HayvanQuerySet(models.QuerySet):
+    """
+    Hayvan QuerySet - chainable sorgular için
+    """
+
+    def aktif(self):
+        """Aktif hayvanlar"""
+        return self.filter(aktif=True)
+
+    def kapak_fotografi_ile(self):
+        """
+        Kapak fotoğrafı yolunu tek sorguda ekle
+
+        Her satır için ayrı fotoğraf sorgusu (N+1) yerine korelasyonlu
+        alt sorgu kullanılır. Sıralama `Hayvan.kapak_fotografi` property'si
+        ile aynıdır: önce kapak olarak işaretlenen, yoksa ilk fotoğraf.
+        """
+        from .models import HayvanFotograf
+
+        kapak = (
+            HayvanFotograf.objects
+            .filter(hayvan=OuterRef('pk'))
+            .order_by('-kapak_fotografi', 'sira', '-created_at')
+        )
+        return self.annotate(
+            kapak_fotograf_yolu=Subquery(kapak.values('fotograf')[:1])
+        )
+
+    def ara(self, terim):
+        """
+        Serbest metin araması
+
+        PostgreSQL'de GIN indeksli `search_vector` üzerinde Türkçe tam metin
+        araması yapılır; yazım hatalarını yakalamak için `ad` alanındaki
+        trigram benzerliği de eşleşme sayılır. Sonuçlar `arama_skoru`na göre
+        sıralanır. Diğer veritabanlarında (SQLite geliştirme/test) eski
+        `icontains` araması kullanılır.
+        """
+        terim = (terim or '').strip()
+        if not terim:
+            return self
+
+        if connections[self.db].vendor != 'postgresql':
+            return self.filter(
+                Q(ad__icontains=terim) |
+                Q(aciklama__icontains=terim) |
+                Q(irk__ad__icontains=terim) |
+                Q(kategori__ad__icontains=terim)
+            )
+
+        sorgu = SearchQuery(terim, config=ARAMA_YAPILANDIRMASI, search_type='websearch')
+        return self.filter(
+            Q(search_vector=sorgu) | Q(ad__trigram_similar=terim)
+        ).annotate(
+            arama_skoru=SearchRank(F('search_vector'), sorgu) + TrigramSimilarity('ad', terim)
+        ).order_by('-arama_skoru', '-created_at')
+
+    def liste_icin(self):
+        """Liste endpoint'leri için gerekli ilişkiler ve annotation'lar"""
+        return self.select_related('irk').kapak_fotografi_ile()
+
+    def karakter_ozellikleriyle(self, ozellikler):
+        """
+        Verilen karakter özelliklerinin hepsine sahip hayvanlar
+
+        PostgreSQL'de tek `@>` kapsama koşulu (jsonb_path_ops GIN indeksi),
+        diğer veritabanlarında `karakter_maskesi & istenen = istenen`.
+        Tanımlı listede olmayan özellikler JSON alanında aranır.
+        """
+        ozellikler = sorted({o.strip() for o in ozellikler if o and o.strip()})
+        if not ozellikler:
+            return self
+
+        baglanti = connections[self.db]
+        if baglanti.vendor == 'postgresql':
+            return self.filter(karakter_ozellikleri__contains=ozellikler)
+
+        queryset = self
+        istenen = karakter_maskesi_hesapla(ozellikler)
+        if istenen:
+            queryset = queryset.alias(
+                karakter_eslesmesi=F('karakter_maskesi').bitand(istenen)
+            ).filter(karakter_eslesmesi=istenen)
+
+        for ozellik in ozellikler:
+            if ozellik in KARAKTER_BITLERI:
+                continue
+            if baglanti.features.supports_json_field_contains:
+                queryset = queryset.filter(karakter_ozellikleri__contains=[ozellik])
+            else:
+                # Metin olarak saklanan JSON'da (ensure_ascii) öğenin kendisini ara
+                queryset = queryset.filter(karakter_ozellikleri__icontains=json.dumps(ozellik))
+        return queryset
+
+    def faset_sayilari(self, alanlar=tuple(FASET_ALANLARI.values())):
+        """
+        Kümedeki kayıtların alan/değer başına sayıları - tek sorgu
+
+        PostgreSQL'de her alan GROUPING SETS ile ayrı gruplanır (toplam için
+        boş küme dahil). Diğer veritabanlarında alanların bilinen değerleri
+        için koşullu COUNT'lar tek SELECT'te toplanır. Boş (NULL) değerler
+        sayılmaz.
+
+        Returns:
+            Tuple[int, Dict[str, Dict]]: (toplam, {alan: {değer: adet}})
+        """
+        taban = self.order_by()
+        if connections[self.db].vendor == 'postgresql':
+            return taban._faset_grouping_sets(alanlar)
+        return taban._faset_kosullu_sayim(alanlar)
+
+    def _faset_grouping_sets(self, alanlar):
+        takma_adlar = [f'f{i}' for i in range(len(alanlar))]
+        ic_sql, params = self.values(
+            **{ad: F(alan) for ad, alan in zip(takma_adlar, alanlar)}
+        ).query.sql_with_params()
+
+        kolonlar = ', '.join(takma_adlar)
+        kumeler = ', '.join(f'({ad})' for ad in takma_adlar)
+        sql = (
+            f'SELECT GROUPING({kolonlar}), {kolonlar}, COUNT(*) '
+            f'FROM ({ic_sql}) AS faset GROUP BY GROUPING SETS ({kumeler}, ())'
+        )
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(sql, params)
+            return grouping_satirlarini_coz(alanlar, cursor.fetchall())
+
+    def _faset_kosullu_sayim(self, alanlar):
+        toplamlar = {'toplam': Count('pk')}
+        hedefler = []
+        for i, alan in enumerate(alanlar):
+            for j, deger in enumerate(self._faset_degerleri(alan)):
+                toplamlar[f'f{i}_{j}'] = Count('pk', filter=Q(**{alan: deger}))
+                hedefler.append((f'f{i}_{j}', alan, deger))
+
+        sonuc = self.aggregate(**toplamlar)
+        fasetler = {alan: {} for alan in alanlar}
+        for anahtar, alan, deger in hedefler:
+            if sonuc[anahtar]:
+                fasetler[alan][deger] = sonuc[anahtar]
+        return sonuc['toplam'], fasetler
+
+    def _faset_degerleri(self, alan):
+        """Koşullu sayım için alanın olası değerleri"""
+        if alan == 'il_kod':
+            return [int(kod) for kod, _ad in Iller.choices]
+        field = self.model._meta.get_field(alan)
+        if isinstance(field, models.BooleanField):
+            return [True, False]
+        return [deger for deger, _etiket in field.flatchoices]
+
+    def sinir_kutusunda(self, enlem, boylam, yaricap_km):
+        """
+        Yarıçapı kapsayan enlem/boylam kutusundaki hayvanlar
+
+        (enlem, boylam) indeksini kullanan kaba ön filtredir; kutu köşeleri
+        yarıçapın dışında kalabilir, kesin mesafe sonradan hesaplanır.
+        """
+        min_enlem, max_enlem, min_boylam, max_boylam = KonumService.sinir_kutusu(
+            enlem, boylam, yaricap_km
+        )
+        return self.filter(
+            enlem__range=(min_enlem, max_enlem),
+            boylam__range=(min_boylam, max_boylam),
+        )
+
+
+class HayvanManager(models.Manager):
+    """
+    Hayvan Manager - kompleks işlemler için
+    """
+
+    def get_queryset(self):
+        return HayvanQuerySet(self.model, using=self._db)
+
+    def aktif(self):
+        return self.get_queryset().aktif()
+
+    def ara(self, terim):
+        return self.get_queryset().ara(terim)
+
+    def liste_icin(self):
+        return self.get_queryset().liste_icin()
+
+    def sinir_kutusunda(self, enlem, boylam, yaricap_km):
+        return self.get_queryset().sinir_kutusunda(enlem, boylam, yaricap_km)
+
+    def karakter_ozellikleriyle(self, ozellikler):
+        return self.get_queryset().karakter_ozellikleriyle(ozellikler)
@@ -0,0 +1,90 @@
+# Generated by Django 4.2.16 on 2026-10-18 18:54
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# Hayvan arama vektörü: ad (A), ırk ve kategori adı (B), açıklama (C)
+ARAMA_SQL = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE OR REPLACE FUNCTION hayvanlar_hayvan_search_vector_guncelle() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('turkish', coalesce(NEW.ad, '')), 'A') ||
+        setweight(to_tsvector('turkish', coalesce(
+            (SELECT ad FROM hayvanlar_kopekirk WHERE id = NEW.irk_id), '')), 'B') ||
+        setweight(to_tsvector('turkish', coalesce(
+            (SELECT ad FROM kategoriler_kategori WHERE id = NEW.kategori_id), '')), 'B') ||
+        setweight(to_tsvector('turkish', coalesce(NEW.aciklama, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER hayvanlar_hayvan_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF ad, aciklama, irk_id, kategori_id ON hayvanlar_hayvan
+    FOR EACH ROW EXECUTE FUNCTION hayvanlar_hayvan_search_vector_guncelle();
+
+-- Irk / kategori adı değişince bağlı hayvanların vektörünü yenile
+CREATE OR REPLACE FUNCTION hayvanlar_hayvan_iliskili_ad_guncelle() RETURNS trigger AS $$
+BEGIN
+    EXECUTE format('UPDATE hayvanlar_hayvan SET ad = ad WHERE %I = $1', TG_ARGV[0])
+        USING NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER hayvanlar_kopekirk_ad_trigger
+    AFTER UPDATE OF ad ON hayvanlar_kopekirk
+    FOR EACH ROW WHEN (OLD.ad IS DISTINCT FROM NEW.ad)
+    EXECUTE FUNCTION hayvanlar_hayvan_iliskili_ad_guncelle('irk_id');
+
+CREATE TRIGGER kategoriler_kategori_ad_trigger
+    AFTER UPDATE OF ad ON kategoriler_kategori
+    FOR EACH ROW WHEN (OLD.ad IS DISTINCT FROM NEW.ad)
+    EXECUTE FUNCTION hayvanlar_hayvan_iliskili_ad_guncelle('kategori_id');
+
+CREATE INDEX hayvan_search_vector_gin ON hayvanlar_hayvan USING gin (search_vector);
+CREATE INDEX hayvan_ad_trgm_gin ON hayvanlar_hayvan USING gin (ad gin_trgm_ops);
+
+-- Mevcut kayıtları doldur
+UPDATE hayvanlar_hayvan SET ad = ad;
+"""
+
+ARAMA_GERI_AL_SQL = """
+DROP INDEX IF EXISTS hayvan_ad_trgm_gin;
+DROP INDEX IF EXISTS hayvan_search_vector_gin;
+DROP TRIGGER IF EXISTS kategoriler_kategori_ad_trigger ON kategoriler_kategori;
+DROP TRIGGER IF EXISTS hayvanlar_kopekirk_ad_trigger ON hayvanlar_kopekirk;
+DROP TRIGGER IF EXISTS hayvanlar_hayvan_search_vector_trigger ON hayvanlar_hayvan;
+DROP FUNCTION IF EXISTS hayvanlar_hayvan_iliskili_ad_guncelle();
+DROP FUNCTION IF EXISTS hayvanlar_hayvan_search_vector_guncelle();
+"""
+
+
+def arama_altyapisi_kur(apps, schema_editor):
+    """Trigger ve GIN indeksleri sadece PostgreSQL'de kurulur"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(ARAMA_SQL, params=None)
+
+
+def arama_altyapisi_kaldir(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(ARAMA_GERI_AL_SQL, params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kategoriler', '0001_initial'),
+        ('hayvanlar', '0005_saglikdurumu_remove_hayvan_asilar_tamam_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hayvan',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='Arama Vektörü'),
+        ),
+        migrations.RunPython(arama_altyapisi_kur, arama_altyapisi_kaldir),
+    ]
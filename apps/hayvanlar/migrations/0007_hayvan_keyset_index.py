@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-18 18:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hayvanlar', '0006_hayvan_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hayvan',
+            index=models.Index(fields=['-created_at', 'id'], name='hayvanlar_h_created_d72943_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.16 on 2026-10-18 19:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hayvanlar', '0007_hayvan_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hayvanfotograf',
+            name='isleme_durumu',
+            field=models.CharField(choices=[('bekliyor', 'İşlenmeyi Bekliyor'), ('hazir', 'Hazır'), ('hata', 'Hata')], default='bekliyor', max_length=10, verbose_name='İşleme Durumu'),
+        ),
+        migrations.AddField(
+            model_name='hayvanfotograf',
+            name='varyantlar',
+            field=models.JSONField(blank=True, default=dict, help_text='Üretilen boyut/format varyantlarının yol ve boyut bilgileri', verbose_name='Varyantlar'),
+        ),
+    ]
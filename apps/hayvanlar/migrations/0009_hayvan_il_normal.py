@@ -0,0 +1,32 @@
+# Generated by Django 4.2.16 on 2026-10-18 19:32
+
+import apps.ortak.fields
+from django.db import migrations
+
+from apps.ortak.utils import turkce_normalize
+
+
+def hayvan_il_normal_doldur(apps, schema_editor):
+    """Mevcut kayıtların gölge sütununu doldur"""
+    Hayvan = apps.get_model('hayvanlar', 'Hayvan')
+    degisenler = []
+    for nesne in Hayvan.objects.only('id', 'il', 'il_normal').iterator(chunk_size=2000):
+        nesne.il_normal = turkce_normalize(nesne.il or '')
+        degisenler.append(nesne)
+    Hayvan.objects.bulk_update(degisenler, ['il_normal'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hayvanlar', '0008_hayvanfotograf_varyantlar'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hayvan',
+            name='il_normal',
+            field=apps.ortak.fields.NormalizeAlan(kaynak='il', max_length=50, verbose_name='Normalize İl'),
+        ),
+        migrations.RunPython(hayvan_il_normal_doldur, migrations.RunPython.noop),
+    ]
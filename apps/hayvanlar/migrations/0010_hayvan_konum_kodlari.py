@@ -0,0 +1,74 @@
+# Generated by Django 4.2.16 on 2026-10-18 19:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from apps.ortak.utils import turkce_normalize
+
+
+def konum_kodlarini_doldur(apps, schema_editor):
+    """İl metninden (ad veya plaka kodu) il_kod, ilçe metninden ilce_kod doldur"""
+    Il = apps.get_model('ortak', 'Il')
+    Ilce = apps.get_model('ortak', 'Ilce')
+    Hayvan = apps.get_model('hayvanlar', 'Hayvan')
+
+    iller = {}
+    for kod, ad, ad_normal in Il.objects.values_list('kod', 'ad', 'ad_normal'):
+        iller[ad_normal] = iller[str(kod)] = (kod, ad)
+    ilceler = {(il_id, ad_normal): ilce_id for ilce_id, il_id, ad_normal in
+               Ilce.objects.values_list('id', 'il_id', 'ad_normal')}
+
+    degisenler = []
+    for nesne in Hayvan.objects.only('id', 'il', 'ilce').iterator(chunk_size=2000):
+        metin = (nesne.il or '').strip()
+        il = iller.get(str(int(metin)) if metin.isdigit() else turkce_normalize(metin))
+        if il is None:
+            continue
+        nesne.il_kod_id, nesne.il = il
+        nesne.il_normal = turkce_normalize(nesne.il)
+
+        ilce = (nesne.ilce or '').strip()
+        if ilce:
+            anahtar = (nesne.il_kod_id, turkce_normalize(ilce))
+            if anahtar not in ilceler:
+                ilceler[anahtar] = Ilce.objects.create(il_id=anahtar[0], ad=ilce).id
+            nesne.ilce_kod_id = ilceler[anahtar]
+        degisenler.append(nesne)
+
+    Hayvan.objects.bulk_update(
+        degisenler, ['il', 'il_normal', 'il_kod', 'ilce_kod'], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ortak', '0001_initial'),
+        ('hayvanlar', '0009_hayvan_il_normal'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='hayvan',
+            name='hayvanlar_h_il_24dd62_idx',
+        ),
+        migrations.AddField(
+            model_name='hayvan',
+            name='il_kod',
+            field=models.ForeignKey(blank=True, db_column='il_kod', editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='hayvanlar', to='ortak.il', verbose_name='İl Kodu'),
+        ),
+        migrations.AddField(
+            model_name='hayvan',
+            name='ilce_kod',
+            field=models.ForeignKey(blank=True, db_column='ilce_kod', editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='hayvanlar', to='ortak.ilce', verbose_name='İlçe Kodu'),
+        ),
+        migrations.AddIndex(
+            model_name='hayvan',
+            index=models.Index(fields=['il_kod', 'kategori'], name='hayvanlar_h_il_kod_697640_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hayvan',
+            index=models.Index(fields=['aktif', 'sahiplenildi', 'il_kod', 'tur', '-created_at'], name='hayvan_konum_liste_idx'),
+        ),
+        migrations.RunPython(konum_kodlarini_doldur, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 4.2.16 on 2026-10-18 19:39
+
+from django.db import migrations, models
+
+from apps.ortak.utils import turkce_normalize
+
+
+# constants.IL_MERKEZLERI / ILCE_MERKEZLERI'nin bu migration anındaki kopyası
+IL_MERKEZLERI = {
+    1: (37.00, 35.32), 2: (37.76, 38.28), 3: (38.76, 30.54), 4: (39.72, 43.05), 5: (40.65, 35.83),
+    6: (39.93, 32.86), 7: (36.89, 30.71), 8: (41.18, 41.82), 9: (37.85, 27.85), 10: (39.65, 27.88),
+    11: (40.14, 29.98), 12: (38.88, 40.50), 13: (38.40, 42.11), 14: (40.74, 31.61),
+    15: (37.72, 30.29), 16: (40.19, 29.06), 17: (40.15, 26.41), 18: (40.60, 33.62),
+    19: (40.55, 34.96), 20: (37.78, 29.09), 21: (37.91, 40.24), 22: (41.68, 26.56),
+    23: (38.68, 39.22), 24: (39.75, 39.49), 25: (39.90, 41.27), 26: (39.78, 30.52),
+    27: (37.07, 37.38), 28: (40.91, 38.39), 29: (40.46, 39.48), 30: (37.58, 43.74),
+    31: (36.20, 36.16), 32: (37.76, 30.55), 33: (36.81, 34.64), 34: (41.01, 28.98),
+    35: (38.42, 27.14), 36: (40.60, 43.10), 37: (41.38, 33.78), 38: (38.73, 35.49),
+    39: (41.73, 27.22), 40: (39.15, 34.16), 41: (40.77, 29.92), 42: (37.87, 32.48),
+    43: (39.42, 29.98), 44: (38.36, 38.31), 45: (38.61, 27.43), 46: (37.58, 36.94),
+    47: (37.31, 40.74), 48: (37.22, 28.36), 49: (38.75, 41.49), 50: (38.62, 34.71),
+    51: (37.97, 34.68), 52: (40.98, 37.88), 53: (41.02, 40.52), 54: (40.78, 30.40),
+    55: (41.29, 36.33), 56: (37.93, 41.94), 57: (42.03, 35.15), 58: (39.75, 37.02),
+    59: (40.98, 27.51), 60: (40.31, 36.55), 61: (41.00, 39.72), 62: (39.11, 39.55),
+    63: (37.16, 38.79), 64: (38.68, 29.41), 65: (38.49, 43.38), 66: (39.82, 34.81),
+    67: (41.45, 31.79), 68: (38.37, 34.03), 69: (40.26, 40.23), 70: (37.18, 33.22),
+    71: (39.85, 33.51), 72: (37.88, 41.13), 73: (37.52, 42.46), 74: (41.64, 32.34),
+    75: (41.11, 42.70), 76: (39.92, 44.05), 77: (40.65, 29.27), 78: (41.20, 32.62),
+    79: (36.72, 37.12), 80: (37.07, 36.25), 81: (40.84, 31.16),
+}
+
+ILCE_MERKEZLERI = {
+    (34, 'kadikoy'): (40.99, 29.03), (34, 'besiktas'): (41.04, 29.01),
+    (34, 'uskudar'): (41.02, 29.02), (34, 'fatih'): (41.01, 28.95), (34, 'sisli'): (41.06, 28.99),
+    (34, 'beyoglu'): (41.03, 28.98), (34, 'bakirkoy'): (40.98, 28.87),
+    (34, 'atasehir'): (40.99, 29.11), (34, 'maltepe'): (40.94, 29.13),
+    (34, 'kartal'): (40.89, 29.19), (34, 'pendik'): (40.88, 29.25),
+    (34, 'sariyer'): (41.17, 29.05), (34, 'umraniye'): (41.02, 29.12),
+    (34, 'esenyurt'): (41.03, 28.67), (34, 'beylikduzu'): (40.98, 28.64),
+    (34, 'basaksehir'): (41.09, 28.80), (34, 'bagcilar'): (41.04, 28.86),
+    (34, 'kucukcekmece'): (41.00, 28.78), (6, 'cankaya'): (39.90, 32.86),
+    (6, 'kecioren'): (39.98, 32.87), (6, 'yenimahalle'): (39.97, 32.81),
+    (6, 'mamak'): (39.93, 32.92), (6, 'etimesgut'): (39.95, 32.67), (6, 'sincan'): (39.97, 32.58),
+    (35, 'konak'): (38.42, 27.13), (35, 'karsiyaka'): (38.46, 27.11),
+    (35, 'bornova'): (38.47, 27.22), (35, 'buca'): (38.39, 27.17),
+    (35, 'bayrakli'): (38.46, 27.17), (35, 'cigli'): (38.50, 27.07),
+    (16, 'osmangazi'): (40.19, 29.06), (16, 'nilufer'): (40.21, 28.98),
+    (16, 'yildirim'): (40.19, 29.10), (7, 'muratpasa'): (36.89, 30.71),
+    (7, 'konyaalti'): (36.88, 30.63), (7, 'kepez'): (36.93, 30.71),
+}
+
+
+def koordinat(il_kodu, ilce):
+    """İlçe merkezi, bulunamazsa il merkezi (il bilinmiyorsa None)"""
+    if ilce:
+        merkez = ILCE_MERKEZLERI.get((il_kodu, turkce_normalize(ilce)))
+        if merkez:
+            return merkez
+    return IL_MERKEZLERI.get(il_kodu)
+
+
+def koordinatlari_doldur(apps, schema_editor):
+    """il_kod/ilçe üzerinden ilçe veya il merkezi koordinatını yaz"""
+    Hayvan = apps.get_model('hayvanlar', 'Hayvan')
+    degisenler = []
+    for nesne in Hayvan.objects.filter(il_kod__isnull=False).only('id', 'il_kod', 'ilce').iterator(chunk_size=2000):
+        nesne.enlem, nesne.boylam = koordinat(nesne.il_kod_id, nesne.ilce) or (None, None)
+        degisenler.append(nesne)
+    Hayvan.objects.bulk_update(degisenler, ['enlem', 'boylam'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hayvanlar', '0010_hayvan_konum_kodlari'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hayvan',
+            name='boylam',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Boylam'),
+        ),
+        migrations.AddField(
+            model_name='hayvan',
+            name='enlem',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Enlem'),
+        ),
+        migrations.AddIndex(
+            model_name='hayvan',
+            index=models.Index(fields=['enlem', 'boylam'], name='hayvan_koordinat_idx'),
+        ),
+        migrations.RunPython(koordinatlari_doldur, migrations.RunPython.noop),
+    ]
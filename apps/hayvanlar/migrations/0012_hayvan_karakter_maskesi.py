@@ -0,0 +1,66 @@
+# Generated by Django 4.2.16 on 2026-10-18 19:43
+
+import apps.hayvanlar.utils
+import apps.ortak.fields
+from django.db import migrations
+
+
+# utils.KARAKTER_BITLERI'nin bu migration anındaki kopyası
+KARAKTER_BITLERI = {
+    'playful': 1 << 0, 'calm': 1 << 1, 'energetic': 1 << 2, 'friendly': 1 << 3,
+    'shy': 1 << 4, 'protective': 1 << 5, 'independent': 1 << 6, 'affectionate': 1 << 7,
+    'intelligent': 1 << 8, 'curious': 1 << 9,
+}
+
+
+def karakter_maskesi(ozellikler):
+    """Özellik listesinin bit maskesi (tanımsız özellikler yok sayılır)"""
+    maske = 0
+    for ozellik in ozellikler or []:
+        if isinstance(ozellik, str):
+            maske |= KARAKTER_BITLERI.get(ozellik.strip(), 0)
+    return maske
+
+
+def karakter_maskesini_doldur(apps, schema_editor):
+    """Mevcut kayıtların maskesini karakter_ozellikleri'nden hesapla"""
+    Hayvan = apps.get_model('hayvanlar', 'Hayvan')
+    degisenler = []
+    for nesne in Hayvan.objects.filter(karakter_ozellikleri__isnull=False).only(
+        'id', 'karakter_ozellikleri'
+    ).iterator(chunk_size=2000):
+        nesne.karakter_maskesi = karakter_maskesi(nesne.karakter_ozellikleri)
+        degisenler.append(nesne)
+    Hayvan.objects.bulk_update(degisenler, ['karakter_maskesi'], batch_size=1000)
+
+
+def karakter_gin_indeksi_kur(apps, schema_editor):
+    """PostgreSQL'de `@>` kapsama sorguları için jsonb_path_ops GIN indeksi"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS hayvan_karakter_gin "
+            "ON hayvanlar_hayvan USING gin (karakter_ozellikleri jsonb_path_ops);",
+            params=None,
+        )
+
+
+def karakter_gin_indeksi_kaldir(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS hayvan_karakter_gin;", params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hayvanlar', '0011_hayvan_koordinat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hayvan',
+            name='karakter_maskesi',
+            field=apps.ortak.fields.BitMaskesiAlan(kaynak='karakter_ozellikleri', maskeleyici=apps.hayvanlar.utils.karakter_maskesi_hesapla, verbose_name='Karakter Maskesi'),
+        ),
+        migrations.RunPython(karakter_maskesini_doldur, migrations.RunPython.noop),
+        migrations.RunPython(karakter_gin_indeksi_kur, karakter_gin_indeksi_kaldir),
+    ]
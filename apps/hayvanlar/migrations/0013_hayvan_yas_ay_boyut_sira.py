@@ -0,0 +1,34 @@
+# Generated by Django 4.2.16 on 2026-10-18 19:45
+
+import apps.ortak.validators
+from django.db import migrations, models
+
+from apps.ortak.constants import PetSizes
+
+
+def boyut_sirasini_doldur(apps, schema_editor):
+    """Boyut başına tek UPDATE; yas_ay yalnızca girilen yaşlar için dolu kalır"""
+    Hayvan = apps.get_model('hayvanlar', 'Hayvan')
+    for boyut, sira in PetSizes.SIRALAR.items():
+        Hayvan.objects.filter(boyut=boyut).update(boyut_sira=sira)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hayvanlar', '0012_hayvan_karakter_maskesi'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hayvan',
+            name='boyut_sira',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='Boyut Sırası'),
+        ),
+        migrations.AddField(
+            model_name='hayvan',
+            name='yas_ay',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Girilirse yaş kategorisi buradan belirlenir; yalnızca kategori girilirse boş kalır', null=True, validators=[apps.ortak.validators.validate_pet_age], verbose_name='Yaş (Ay)'),
+        ),
+        migrations.RunPython(boyut_sirasini_doldur, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.16 on 2026-10-18 19:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hayvanlar', '0013_hayvan_yas_ay_boyut_sira'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hayvan',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, help_text='Toplam beğeni sayısı', verbose_name='Beğeni Sayısı'),
+        ),
+        migrations.AddField(
+            model_name='hayvan',
+            name='share_count',
+            field=models.PositiveIntegerField(default=0, help_text='Kaç kez paylaşıldığı', verbose_name='Paylaşım Sayısı'),
+        ),
+        migrations.AddField(
+            model_name='hayvan',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0, help_text='Kaç kez görüntülendiği', verbose_name='Görüntülenme Sayısı'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-18 20:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hayvanlar', '0014_hayvan_sayaclar'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hayvan',
+            index=models.Index(fields=['updated_at'], name='hayvan_guncelleme_idx'),
+        ),
+    ]
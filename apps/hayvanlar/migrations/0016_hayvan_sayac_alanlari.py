@@ -0,0 +1,29 @@
+# Generated by Django 4.2.16 on 2026-10-18 20:19
+
+import apps.ortak.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hayvanlar', '0015_hayvan_guncelleme_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='hayvan',
+            name='like_count',
+            field=apps.ortak.fields.SayacAlan(default=0, help_text='Toplam beğeni sayısı', verbose_name='Beğeni Sayısı'),
+        ),
+        migrations.AlterField(
+            model_name='hayvan',
+            name='share_count',
+            field=apps.ortak.fields.SayacAlan(default=0, help_text='Kaç kez paylaşıldığı', verbose_name='Paylaşım Sayısı'),
+        ),
+        migrations.AlterField(
+            model_name='hayvan',
+            name='view_count',
+            field=apps.ortak.fields.SayacAlan(default=0, help_text='Kaç kez görüntülendiği', verbose_name='Görüntülenme Sayısı'),
+        ),
+    ]
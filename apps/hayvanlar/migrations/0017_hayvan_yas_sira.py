@@ -0,0 +1,37 @@
+# Generated by Django 4.2.16 on 2026-10-18 20:27
+
+from django.db import migrations, models
+
+from apps.ortak.constants import PetAges
+
+
+def yas_sirasini_doldur(apps, schema_editor):
+    """Sıralama sütunu: girilen ay, yoksa kategorinin temsili yaşı"""
+    Hayvan = apps.get_model('hayvanlar', 'Hayvan')
+    Hayvan.objects.filter(yas_ay__isnull=False).update(yas_sira=models.F('yas_ay'))
+    for yas, ay in PetAges.TEMSILI_AY.items():
+        Hayvan.objects.filter(yas=yas, yas_ay__isnull=True).update(yas_sira=ay)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hayvanlar', '0016_hayvan_sayac_alanlari'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hayvan',
+            name='yas_sira',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='Yaş Sırası'),
+        ),
+        migrations.RunPython(yas_sirasini_doldur, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='hayvan',
+            index=models.Index(fields=['aktif', 'sahiplenildi', 'tur', 'yas_sira'], include=('yas_ay', 'yas', 'boyut_sira', 'created_at'), name='hayvan_yas_liste_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hayvan',
+            index=models.Index(fields=['aktif', 'sahiplenildi', 'tur', 'boyut_sira'], include=('yas_sira', 'yas_ay', 'yas', 'created_at'), name='hayvan_boyut_liste_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.16 on 2026-10-18 21:05
+
+from django.db import migrations
+
+
+# Göz atma: aktif + sahiplenilmemiş + tür + yaş/boyut aralığı ve ?ordering=yas;
+# INCLUDE yaş aralığının kesin koşulunu ve sayım sorgularını index-only tutar.
+# SQLite INCLUDE desteklemediğinden (models.W040) indeksler modelden çıkarıldı;
+# 0017'nin PostgreSQL'de kurduğu indeksler yerinde kalır, diğer veritabanlarında
+# oluşan düz indeksler kaldırılır.
+LISTE_INDEKSLERI = {
+    'hayvan_yas_liste_idx': ('aktif', 'sahiplenildi', 'tur', 'yas_sira'),
+    'hayvan_boyut_liste_idx': ('aktif', 'sahiplenildi', 'tur', 'boyut_sira'),
+}
+
+
+def duz_indeksleri_kaldir(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        for ad in LISTE_INDEKSLERI:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {ad};", params=None)
+
+
+def duz_indeksleri_kur(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        for ad, alanlar in LISTE_INDEKSLERI.items():
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS {ad} ON hayvanlar_hayvan ({', '.join(alanlar)});",
+                params=None,
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hayvanlar', '0017_hayvan_yas_sira'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveIndex(model_name='hayvan', name='hayvan_yas_liste_idx'),
+                migrations.RemoveIndex(model_name='hayvan', name='hayvan_boyut_liste_idx'),
+            ],
+            database_operations=[
+                migrations.RunPython(duz_indeksleri_kaldir, duz_indeksleri_kur),
+            ],
+        ),
+    ]
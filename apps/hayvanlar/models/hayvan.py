@@ -3,17 +3,25 @@ Ana hayvan modeli
 """
 
 from django.db import models
+from django.contrib.postgres.search import SearchVectorField
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 from django.utils.text import slugify
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.urls import reverse
 from apps.ortak.constants import PetTypes, PetGenders, PetSizes, PetAges
+from apps.ortak.fields import BitMaskesiAlan, NormalizeAlan
+from apps.ortak.models import AnalyticsModel
+from apps.ortak.validators import validate_pet_age
+from apps.hayvanlar.managers import HayvanManager
+from apps.hayvanlar.utils import karakter_maskesi_hesapla
 
-class Hayvan(models.Model):
+class Hayvan(AnalyticsModel):
     """
     Platform üzerindeki tüm hayvanlar için temel model
     Her hayvanın kendine özgü bir hikayesi ve karakteri var
+    
+    Görüntülenme/beğeni/paylaşım sayaçları AnalyticsModel'den gelir.
     """
     # Temel bilgiler
     ad = models.CharField(
@@ -57,6 +65,22 @@ class Hayvan(models.Model):
         blank=True, 
         null=True
     )
+    # Sayısal yaş - yalnızca girildiyse dolu; yaş aralığı filtreleri bunu kullanır
+    yas_ay = models.PositiveSmallIntegerField(
+        blank=True,
+        null=True,
+        validators=[validate_pet_age],
+        verbose_name=_("Yaş (Ay)"),
+        help_text=_("Girilirse yaş kategorisi buradan belirlenir; yalnızca kategori "
+                    "girilirse boş kalır")
+    )
+    # Yaşa göre sıralama: yas_ay, yoksa kategorinin temsili yaşı (API'de gösterilmez)
+    yas_sira = models.PositiveSmallIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name=_("Yaş Sırası")
+    )
     cinsiyet = models.CharField(
         max_length=10,
         choices=PetGenders.CHOICES,
@@ -70,6 +94,12 @@ class Hayvan(models.Model):
         null=True,
         verbose_name=_("Boyut")
     )
+    boyut_sira = models.PositiveSmallIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name=_("Boyut Sırası")
+    )
     renk = models.CharField(
         max_length=50,
         blank=True,
@@ -83,6 +113,12 @@ class Hayvan(models.Model):
         verbose_name=_("Karakter Özellikleri"),
         help_text=_("Oyuncu, sakin, arkadaş canlısı vb.")
     )
+    # karakter_ozellikleri'nin bit maskesi - özellik filtreleri bunu kullanır
+    karakter_maskesi = BitMaskesiAlan(
+        kaynak='karakter_ozellikleri',
+        maskeleyici=karakter_maskesi_hesapla,
+        verbose_name=_("Karakter Maskesi")
+    )
     
     # Açıklamalar
     aciklama = models.TextField(
@@ -97,11 +133,51 @@ class Hayvan(models.Model):
         blank=True,
         verbose_name=_("İl")
     )
+    # Türkçe duyarlı il filtresi için gölge sütun (il__tr_iexact)
+    il_normal = NormalizeAlan(
+        kaynak='il',
+        max_length=50,
+        verbose_name=_("Normalize İl")
+    )
     ilce = models.CharField(
         max_length=50,
         blank=True,
         verbose_name=_("İlçe")
     )
+    # Konum kodları - il/ilçe metninden kayıtta türetilir, filtreler bunları kullanır
+    il_kod = models.ForeignKey(
+        'ortak.Il',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        editable=False,
+        db_column='il_kod',
+        related_name='hayvanlar',
+        verbose_name=_("İl Kodu")
+    )
+    ilce_kod = models.ForeignKey(
+        'ortak.Ilce',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        db_column='ilce_kod',
+        related_name='hayvanlar',
+        verbose_name=_("İlçe Kodu")
+    )
+    # İlçe/il merkez koordinatı - yakınlık araması için (bkz. KonumService.koordinat)
+    enlem = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name=_("Enlem")
+    )
+    boylam = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name=_("Boylam")
+    )
     
     # Durum ve statü
     aktif = models.BooleanField(
@@ -142,6 +218,16 @@ class Hayvan(models.Model):
         blank=True
     )
     
+    # Arama vektörü - PostgreSQL'de trigger ile güncellenir (0006 migration)
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name=_('Arama Vektörü')
+    )
+    
+    # Custom manager
+    objects = HayvanManager()
+    
     class Meta:
         verbose_name = _("🐾 Hayvan")
         verbose_name_plural = _("🐾 Hayvanlar")
@@ -150,88 +236,191 @@ class Hayvan(models.Model):
             models.Index(fields=['tur']),
             models.Index(fields=['aktif']),
             models.Index(fields=['sahiplenildi']),
-            models.Index(fields=['il', 'kategori']),
+            models.Index(fields=['il_kod', 'kategori']),
+            # Liste filtreleri: aktif + sahiplenilmemiş + il + tür, en yeni önce
+            models.Index(
+                fields=['aktif', 'sahiplenildi', 'il_kod', 'tur', '-created_at'],
+                name='hayvan_konum_liste_idx'
+            ),
+            # Göz atma (aktif + sahiplenilmemiş + tür + yas_sira / boyut_sira)
+            # indeksleri INCLUDE kullandığından yalnızca PostgreSQL'de vardır:
+            # bkz. migrations/0018_hayvan_liste_idx_postgresql
+            # Yakınlık araması: sınır kutusu ön filtresi
+            models.Index(fields=['enlem', 'boylam'], name='hayvan_koordinat_idx'),
+            # Eşleştirme matrisinin artımlı güncellemesi: updated_at >= son kontrol
+            models.Index(fields=['updated_at'], name='hayvan_guncelleme_idx'),
             models.Index(fields=['slug']),
+            # Keyset sayfalama: ORDER BY created_at DESC, id
+            models.Index(fields=['-created_at', 'id']),
         ]
     
     def __str__(self):
         return f"{self.ad} ({self.get_tur_display()})"
     
+    # Kayıt sırasında değişikliği izlenen alanlar (bkz. from_db)
+    IZLENEN_ALANLAR = ('kategori_id', 'irk_id', 'tur', 'il', 'ilce', 'yas', 'yas_ay')
+    # update_fields kategoriyi alan adı ya da attname ile verebilir
+    KATEGORI_ALANLARI = frozenset({'kategori', 'kategori_id'})
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Veritabanından gelen değerleri sakla, save() tekrar okumasın"""
+        instance = super().from_db(db, field_names, values)
+        instance._yuklenen_degerler = {
+            alan: instance.__dict__[alan]
+            for alan in cls.IZLENEN_ALANLAR
+            if alan in instance.__dict__
+        }
+        return instance
+
+    def _eski_deger(self, alan):
+        """Alanın veritabanındaki son değeri (ertelenmiş alanlar için sorgu)"""
+        yuklenen = getattr(self, '_yuklenen_degerler', {})
+        if alan not in yuklenen:
+            yuklenen[alan] = (
+                Hayvan.objects.filter(pk=self.pk).values_list(alan, flat=True).first()
+            )
+            self._yuklenen_degerler = yuklenen
+        return yuklenen[alan]
+
     def save(self, *args, **kwargs):
-        """Slug oluştur ve kategori sayaçlarını güncelle"""
+        """Slug oluştur ve köpek kategorisini eşle (sayaçlar: signals.py)"""
+        yeni_kayit = self._state.adding
+        update_fields = kwargs.get('update_fields')
+        kategori_yaziliyor = update_fields is None or bool(self.KATEGORI_ALANLARI & set(update_fields))
+
         if not self.slug:
-            base_slug = slugify(self.ad)
-            slug = base_slug
-            counter = 1
-            
-            while Hayvan.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-                
-            self.slug = slug
-        
-        # Önceki kaydı kontrol et - kategori değiştiyse eski kategorinin sayacını azalt
-        if self.pk:
-            try:
-                eski_kayit = Hayvan.objects.get(pk=self.pk)
-                if eski_kayit.kategori and eski_kayit.kategori != self.kategori:
-                    from apps.kategoriler.servisler import KategoriService
-                    if eski_kayit.kategori:
-                        KategoriService.kategori_kullanim_guncelle(eski_kayit.kategori.id)
-            except Hayvan.DoesNotExist:
-                pass
-        
-        # Kaydet
+            self.slug = self._benzersiz_slug_olustur()
+
+        # post_save sinyali kategori sayaçlarını bu değere göre günceller
+        self._kayit_oncesi_kategori_id = (
+            None if yeni_kayit or not kategori_yaziliyor else self._eski_deger('kategori_id')
+        )
+
+        # Köpek ırk-kategori senkronizasyonu - sadece ırk/tür değiştiyse,
+        # kategori kayıttan önce atanır ki ikinci bir save gerekmesin
+        if kategori_yaziliyor and self.tur == PetTypes.KOPEK and self.irk_id and (
+            yeni_kayit or
+            self._eski_deger('irk_id') != self.irk_id or
+            self._eski_deger('tur') != self.tur
+        ):
+            self._kopek_kategori_senkronizasyonu()
+
+        # İl/ilçe metni değiştiyse konum kodlarını yeniden çöz
+        konum_yaziliyor = update_fields is None or bool({'il', 'ilce'} & set(update_fields))
+        if konum_yaziliyor and (
+            yeni_kayit or
+            self._eski_deger('il') != self.il or
+            self._eski_deger('ilce') != self.ilce
+        ):
+            self._konum_kodlarini_esitle()
+            if update_fields is not None:
+                kwargs['update_fields'] = {
+                    *update_fields, 'il', 'il_normal', 'il_kod', 'ilce_kod', 'enlem', 'boylam'
+                }
+
+        # Yaş / boyut sayısal sütunları
+        if update_fields is None or {'yas', 'yas_ay'} & set(update_fields):
+            self._yas_esitle(yeni_kayit)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'yas', 'yas_ay', 'yas_sira'}
+        if update_fields is None or 'boyut' in update_fields:
+            self.boyut_sira = PetSizes.SIRALAR.get(self.boyut)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'boyut_sira'}
+
+        # Karakter maskesi kaynağıyla birlikte yazılır (pre_save'de hesaplanır)
+        if update_fields is not None and 'karakter_ozellikleri' in update_fields:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'karakter_maskesi'}
+
         super().save(*args, **kwargs)
+
+        self._yuklenen_degerler = {
+            alan: getattr(self, alan) for alan in self.IZLENEN_ALANLAR
+        }
+
+    def _yas_esitle(self, yeni_kayit):
+        """
+        yas_ay, yaş kategorisi ve sıralama sütununu tutarlı tut (kaydetmez)
         
-        # Yeni kategoriyi güncelle
-        if self.kategori:
-            from apps.kategoriler.servisler import KategoriService
-            KategoriService.kategori_kullanim_guncelle(self.kategori.id)
+        Ay değişti/girildiyse kategori aydan türetilir; yalnızca kategori
+        değiştiyse artık tutmayan ay silinir - ay uydurulmaz. Sıralama
+        sütunu ay yoksa kategorinin temsili yaşını kullanır.
+        """
+        ay_degisti = yeni_kayit or self._eski_deger('yas_ay') != self.yas_ay
+        if ay_degisti and self.yas_ay is not None:
+            self.yas = PetAges.ay_kategorisi(self.yas_ay)
+        elif self.yas_ay is not None and PetAges.ay_kategorisi(self.yas_ay) != self.yas:
+            self.yas_ay = None
+        self.yas_sira = self.yas_ay if self.yas_ay is not None else PetAges.TEMSILI_AY.get(self.yas)
 
-        # Köpek ırk-kategori senkronizasyonu
-        if self.tur == PetTypes.KOPEK and self.irk:
-            self._kopek_kategori_senkronizasyonu()
+    def _konum_kodlarini_esitle(self):
+        """
+        İl/ilçe metninden konum kodlarını ve koordinatı ata (kaydetmez)
+        Tanınan il standart adıyla yazılır
+        """
+        from apps.ortak.servisler import KonumService
+
+        self.il_kod_id = KonumService.il_kodu(self.il)
+        if self.il_kod_id:
+            self.il = KonumService.il_adi(self.il_kod_id)
+        self.ilce_kod_id = KonumService.ilce_id(self.il_kod_id, self.ilce, olustur=True)
+        self.enlem, self.boylam = KonumService.koordinat(self.il_kod_id, self.ilce) or (None, None)
+
+    def _benzersiz_slug_olustur(self):
+        """Çakışmayan slug'ı tek sorguda bul"""
+        base_slug = slugify(self.ad) or 'hayvan'
+        mevcutlar = set(
+            Hayvan.objects.filter(slug__startswith=base_slug)
+            .exclude(pk=self.pk)
+            .values_list('slug', flat=True)
+        )
+        if base_slug not in mevcutlar:
+            return base_slug
+
+        ekler = {
+            int(slug[len(base_slug) + 1:])
+            for slug in mevcutlar
+            if slug[len(base_slug) + 1:].isdigit() and slug[len(base_slug)] == '-'
+        }
+        counter = 1
+        while counter in ekler:
+            counter += 1
+        return f"{base_slug}-{counter}"
 
     def _kopek_kategori_senkronizasyonu(self):
-        """Köpek ırkı için kategori senkronizasyonu"""
+        """Köpek ırkına göre kategoriyi ata (kaydetmez)"""
         from apps.kategoriler.models import Kategori
         from django.db.models import Q
             
         # Köpekler ana kategorisini bul
         kopekler_kategori = Kategori.objects.filter(
             parent__isnull=True,
-            ad__iexact='Köpekler'
+            ad__tr_iexact='Köpekler'
         ).first()
             
-        if kopekler_kategori:
-            # Bu köpek ırkı için alt kategori var mı kontrol et
-            irk_kategori = Kategori.objects.filter(
-                Q(parent=kopekler_kategori) & 
-                (Q(ad__iexact=self.irk.ad) | Q(slug__icontains=self.irk.ad.lower().replace(' ', '-')))
-            ).first()
-                
-            # Yoksa ve bu popüler bir ırk ise, oluştur
-            if not irk_kategori and self.irk.populer:
-                irk_kategori = Kategori.objects.create(
-                    ad=self.irk.ad,
-                    slug=f"kopekler-{slugify(self.irk.ad)}",
-                    parent=kopekler_kategori,
-                    pet_type='kopek',
-                    renk_kodu=kopekler_kategori.renk_kodu,
-                    aciklama=self.irk.aciklama or f"{self.irk.ad} ırkı köpekler"
-                )
-                
-            # Kategoriyi güncelle
-            if irk_kategori:
-                self.kategori = irk_kategori
-            else:
-                # Uygun alt kategori bulunamadı, ana kategori ata
-                self.kategori = kopekler_kategori
-                
-            # Kategori değişikliğini kaydet
-            if self.kategori_id != self.kategori.id:
-                super().save(update_fields=['kategori'])
+        if not kopekler_kategori:
+            return
+
+        # Bu köpek ırkı için alt kategori var mı kontrol et
+        irk_kategori = Kategori.objects.filter(
+            Q(parent=kopekler_kategori) &
+            (Q(ad__tr_iexact=self.irk.ad) | Q(slug=f"kopekler-{slugify(self.irk.ad)}"))
+        ).first()
+            
+        # Yoksa ve bu popüler bir ırk ise, oluştur
+        if not irk_kategori and self.irk.populer:
+            irk_kategori = Kategori.objects.create(
+                ad=self.irk.ad,
+                slug=f"kopekler-{slugify(self.irk.ad)}",
+                parent=kopekler_kategori,
+                pet_type='kopek',
+                renk_kodu=kopekler_kategori.renk_kodu,
+                aciklama=self.irk.aciklama or f"{self.irk.ad} ırkı köpekler"
+            )
+            
+        # Uygun alt kategori bulunamadıysa ana kategori
+        self.kategori = irk_kategori or kopekler_kategori
 
     def get_absolute_url(self):
         """Detay sayfası URL'i"""
@@ -2,10 +2,13 @@
 Hayvan fotoğrafları için model
 """
 
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 
+from apps.ortak.constants import PhotoProcessingStatus
+
+
 class HayvanFotograf(models.Model):
     """
     Hayvan fotoğrafları modeli
@@ -27,6 +30,18 @@ class HayvanFotograf(models.Model):
         null=True,
         verbose_name=_("Küçük Resim")
     )
+    isleme_durumu = models.CharField(
+        max_length=10,
+        choices=PhotoProcessingStatus.choices,
+        default=PhotoProcessingStatus.BEKLIYOR,
+        verbose_name=_("İşleme Durumu")
+    )
+    varyantlar = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name=_("Varyantlar"),
+        help_text=_("Üretilen boyut/format varyantlarının yol ve boyut bilgileri")
+    )
     kapak_fotografi = models.BooleanField(
         default=False,
         verbose_name=_("Kapak Fotoğrafı")
@@ -52,10 +67,44 @@ class HayvanFotograf(models.Model):
     def __str__(self):
         return f"{self.hayvan.ad} - Fotoğraf {self.id}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._yuklenen_fotograf = instance.__dict__.get('fotograf')
+        return instance
+    
     def save(self, *args, **kwargs):
-        """Fotoğrafı kaydederken thumbnail oluştur"""
+        """
+        Fotoğraf yeni veya değiştiyse varyant üretimini kuyruğa al
+        
+        İşleme istek thread'inde yapılmaz; commit sonrası Celery görevi
+        varyantları üretir, o zamana kadar API yer tutucu döner.
+        """
+        yuklenen = getattr(self, '_yuklenen_fotograf', None)
+        fotograf_degisti = self._state.adding or self.fotograf.name != getattr(yuklenen, 'name', yuklenen)
+        if fotograf_degisti:
+            self.isleme_durumu = PhotoProcessingStatus.BEKLIYOR
+            self.varyantlar = {}
+            self.thumbnail = None
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'isleme_durumu', 'varyantlar', 'thumbnail'}
+        
         super().save(*args, **kwargs)
-        if not self.thumbnail:
-            from apps.hayvanlar.utils import create_thumbnail
-            self.thumbnail = create_thumbnail(self.fotograf)
-            super().save(update_fields=['thumbnail'])
+        self._yuklenen_fotograf = self.fotograf.name
+        
+        if fotograf_degisti and self.fotograf:
+            from apps.hayvanlar.tasks import fotograf_varyantlari_olustur
+            transaction.on_commit(lambda: fotograf_varyantlari_olustur.delay(self.pk))
+    
+    @property
+    def hazir(self):
+        return self.isleme_durumu == PhotoProcessingStatus.HAZIR
+    
+    def varyant(self, genislik, format='jpg'):
+        """İstenen genişliğe en yakın (ondan küçük olmayan) varyant"""
+        adaylar = [v for v in self.varyantlar.get('varyantlar', []) if v['format'] == format]
+        if not adaylar:
+            return None
+        buyukler = [v for v in adaylar if v['genislik'] >= genislik]
+        return min(buyukler, key=lambda v: v['genislik']) if buyukler else max(adaylar, key=lambda v: v['genislik'])
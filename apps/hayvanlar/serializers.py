@@ -8,6 +8,7 @@ Hayvanlar için API veri formatları
 from rest_framework import serializers
 from django.utils.translation import gettext_lazy as _
 from .models import Hayvan, HayvanFotograf, KopekIrk
+from .utils import FOTOGRAF_PLACEHOLDER
 from apps.kategoriler.models import Kategori
 from apps.kategoriler.serializers import KategoriBasicSerializer
 
@@ -20,10 +21,42 @@ class KopekIrkSerializer(serializers.ModelSerializer):
 
 
 class HayvanFotografSerializer(serializers.ModelSerializer):
-    """Hayvan fotoğrafları serializer"""
+    """
+    Hayvan fotoğrafları serializer
+    
+    Varyantlar hazır olana kadar `thumbnail` yer tutucu döner ve
+    `varyantlar` boştur; istemci `isleme_durumu` ile takip edebilir.
+    """
+    thumbnail = serializers.SerializerMethodField()
+    varyantlar = serializers.SerializerMethodField()
+    
     class Meta:
         model = HayvanFotograf
-        fields = ['id', 'fotograf', 'thumbnail', 'kapak_fotografi', 'sira']
+        fields = ['id', 'fotograf', 'thumbnail', 'varyantlar', 'isleme_durumu', 'kapak_fotografi', 'sira']
+    
+    def _url(self, storage, yol):
+        url = storage.url(yol)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+    
+    def get_thumbnail(self, obj):
+        if not obj.hazir or not obj.thumbnail:
+            return FOTOGRAF_PLACEHOLDER
+        return self._url(obj.thumbnail.storage, obj.thumbnail.name)
+    
+    def get_varyantlar(self, obj):
+        if not obj.hazir:
+            return []
+        storage = obj.fotograf.storage
+        return [
+            {
+                'genislik': varyant['genislik'],
+                'yukseklik': varyant['yukseklik'],
+                'format': varyant['format'],
+                'url': self._url(storage, varyant['yol']),
+            }
+            for varyant in obj.varyantlar.get('varyantlar', [])
+        ]
 
 
 class HayvanListSerializer(serializers.ModelSerializer):
@@ -37,7 +70,7 @@ class HayvanListSerializer(serializers.ModelSerializer):
         model = Hayvan
         fields = [
             'id', 'ad', 'slug', 'tur', 'tur_adi', 
-            'irk_adi', 'il', 'ilce', 'cinsiyet', 'yas',
+            'irk_adi', 'il', 'il_kod', 'ilce', 'cinsiyet', 'yas', 'yas_ay',
             'kapak_fotografi_url', 'created_at', 'sahiplenildi'
         ]
     
@@ -47,12 +80,43 @@ class HayvanListSerializer(serializers.ModelSerializer):
         return None
     
     def get_kapak_fotografi_url(self, obj):
-        if obj.kapak_fotografi:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.kapak_fotografi.fotograf.url)
-            return obj.kapak_fotografi.fotograf.url
-        return None
+        # Liste queryset'i kapak yolunu annotation ile getirir (N+1 yok)
+        if hasattr(obj, 'kapak_fotograf_yolu'):
+            if not obj.kapak_fotograf_yolu:
+                return None
+            storage = HayvanFotograf._meta.get_field('fotograf').storage
+            url = storage.url(obj.kapak_fotograf_yolu)
+        elif obj.kapak_fotografi:
+            url = obj.kapak_fotografi.fotograf.url
+        else:
+            return None
+        
+        request = self.context.get('request')
+        if request:
+            return request.build_absolute_uri(url)
+        return url
+
+
+class HayvanYakinSerializer(HayvanListSerializer):
+    """Yakındaki hayvanlar - liste özeti + mesafe (HayvanService.yakindakiler)"""
+    
+    mesafe_km = serializers.FloatField(read_only=True)
+    # 'ilce': ilçe merkezine göre, 'il': ilçe merkezi bilinmiyor, il merkezine göre (yaklaşık)
+    konum_hassasiyeti = serializers.CharField(read_only=True)
+    
+    class Meta(HayvanListSerializer.Meta):
+        fields = HayvanListSerializer.Meta.fields + ['mesafe_km', 'konum_hassasiyeti']
+
+
+class HayvanEslesmeSerializer(HayvanListSerializer):
+    """Eşleşen hayvanlar - liste özeti + uyum puanı ve gerekçeler (EslesmeService)"""
+    
+    uyum_puani = serializers.IntegerField(read_only=True, allow_null=True)
+    mesafe_km = serializers.FloatField(read_only=True, allow_null=True)
+    aciklamalar = serializers.ListField(child=serializers.DictField(), read_only=True)
+    
+    class Meta(HayvanListSerializer.Meta):
+        fields = HayvanListSerializer.Meta.fields + ['uyum_puani', 'mesafe_km', 'aciklamalar']
 
 
 class HayvanDetailSerializer(serializers.ModelSerializer):
@@ -70,10 +134,10 @@ class HayvanDetailSerializer(serializers.ModelSerializer):
         model = Hayvan
         fields = [
             'id', 'ad', 'slug', 'tur', 'tur_adi', 'kategori',
-            'irk', 'yas', 'yas_adi', 'cinsiyet', 'cinsiyet_adi',
-            'boyut', 'boyut_adi', 'renk', 'kisirlastirilmis',
-            'asilar_tamam', 'mikrocipli', 'karakter_ozellikleri',
-            'aciklama', 'il', 'ilce', 'sahiplenildi', 'aktif',
+            'irk', 'yas', 'yas_ay', 'yas_adi', 'cinsiyet', 'cinsiyet_adi',
+            'boyut', 'boyut_adi', 'renk', 'karakter_ozellikleri',
+            'aciklama', 'il', 'il_kod', 'ilce', 'sahiplenildi', 'aktif',
+            'view_count', 'like_count', 'share_count',
             'created_at', 'updated_at', 'fotograflar'
         ]
 
@@ -84,9 +148,8 @@ class HayvanCreateUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Hayvan
         fields = [
-            'ad', 'tur', 'kategori', 'irk', 'yas', 'cinsiyet',
-            'boyut', 'renk', 'kisirlastirilmis', 'asilar_tamam',
-            'mikrocipli', 'karakter_ozellikleri', 'aciklama',
+            'ad', 'tur', 'kategori', 'irk', 'yas', 'yas_ay', 'cinsiyet',
+            'boyut', 'renk', 'karakter_ozellikleri', 'aciklama',
             'il', 'ilce', 'aktif'
         ]
     
@@ -5,19 +5,71 @@ Hayvanlarla ilgili iş mantığı ve servisler
 ==============================================================================
 """
 
+import hashlib
+import logging
+import math
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import timedelta
 from typing import List, Dict, Optional
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
+from django.db.models import Max
 from django.utils.translation import gettext_lazy as _
-from django.core.exceptions import ValidationError
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.utils import timezone
+from django.utils.text import slugify
+from apps.ortak import sayac_tamponu
+from apps.ortak.cache import etiketli_get_or_set
+from apps.ortak.constants import KopekIrklari
 from apps.ortak.exceptions import PlatformBaseException
+from apps.ortak.servisler import KonumService
+from apps.ortak.utils import turkce_normalize
+from .eslesme import EslesmeIndeksi, ProfilAgirliklari
+from .managers import (
+    FASET_ALANLARI, FASET_CACHE_SURESI, HAYVAN_FASET_CACHE_ETIKETI,
+    POPULERLIK_AGIRLIKLARI,
+)
 from .models import Hayvan, HayvanFotograf, KopekIrk
 
+try:
+    import numpy as np
+except ImportError:  # Opsiyonel: yoksa popülerlik puanları saf Python ile hesaplanır
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Popülerlik sıralaması (bkz. PopulerlikService)
+POPULERLIK_CACHE_ONEKI = "hayvanlar:populer"
+POPULERLIK_LISTE_BOYU = 100
+# Yeni kayıt görünürlüğünün ve son etkileşimin yarı ömürleri (gün)
+POPULERLIK_YARI_OMUR_GUN = 14
+POPULERLIK_ETKILESIM_YARI_OMUR_GUN = 7
+POPULERLIK_PARTI_BOYUTU = 50_000
+# Görev aralığının iki katı: bir çalışma atlanırsa liste düşmez
+POPULERLIK_CACHE_SURESI = 2 * getattr(settings, 'POPULERLIK_HESAPLAMA_SANIYE', 600)
+# Sıralamanın hesaplandığı işareti: işaret varken eksik grup anahtarı boş grup demektir
+POPULERLIK_HESAPLANDI_ANAHTARI = f"{POPULERLIK_CACHE_ONEKI}:hesaplandi"
+# Önceki çalışmanın listelerdeki kayıtlar için sayaç anlık görüntüsü:
+# (zaman, id'ler, etkileşimler, son etkileşimler)
+POPULERLIK_ANLIK_ANAHTARI = f"{POPULERLIK_CACHE_ONEKI}:anlik"
+POPULERLIK_ANLIK_SURESI = 7 * 86400
+# Cache boşken hesaplama görevini en fazla bu aralıkla bir kez kuyruğa ekle
+POPULERLIK_ISTEK_KILIDI = f"{POPULERLIK_CACHE_ONEKI}:istendi"
+POPULERLIK_ISTEK_KILIT_SURESI = 120
+
 
 class HayvanService:
     """
     Hayvanlarla ilgili iş mantığı servisleri
     """
     
+    # hayvan_listele'de doğrudan alan eşitliğine çevrilen filtreler
+    ESITLIK_FILTRELERI = ('tur', 'kategori', 'cinsiyet', 'yas', 'boyut', 'sahiplenildi', 'irk_id')
+    
     @staticmethod
     @transaction.atomic
     def hayvan_olustur(data: Dict, user=None) -> Hayvan:
@@ -64,42 +116,158 @@ class HayvanService:
         if not filtreler:
             return queryset.order_by('-created_at')
         
-        # Temel filtreler
-        temel_filtreler = {
-            'tur', 'kategori', 'cinsiyet', 'yas', 'boyut',
-            'il', 'sahiplenildi'
-        }
+        # Eşitlik filtreleri (boş değerler yok sayılır)
+        queryset = queryset.filter(**{
+            alan: filtreler[alan] for alan in HayvanService.ESITLIK_FILTRELERI if filtreler.get(alan)
+        })
         
-        for filtre in temel_filtreler:
-            if filtre in filtreler and filtreler[filtre]:
-                queryset = queryset.filter(**{filtre: filtreler[filtre]})
+        # İl: ad veya plaka kodu, indeksli il_kod eşitliğine çevrilir
+        if filtreler.get('il'):
+            il_kodu = KonumService.il_kodu(filtreler['il'])
+            if il_kodu is None:
+                return queryset.none()
+            queryset = queryset.filter(il_kod=il_kodu)
         
-        # Özel filtreler
-        if 'irk_id' in filtreler and filtreler['irk_id']:
-            queryset = queryset.filter(irk_id=filtreler['irk_id'])
-            
-        if 'karakter' in filtreler and filtreler['karakter']:
-            for ozellik in filtreler['karakter'].split(','):
-                queryset = queryset.filter(karakter_ozellikleri__contains=[ozellik.strip()])
-        
-        # Boolean filtreler
-        bool_filtreler = ['kisirlastirilmis', 'asilar_tamam', 'mikrocipli']
-        for filtre in bool_filtreler:
-            if filtre in filtreler and filtreler[filtre] is not None:
-                queryset = queryset.filter(**{filtre: filtreler[filtre]})
-        
-        # Arama
-        if 'search' in filtreler and filtreler['search']:
-            from django.db.models import Q
-            term = filtreler['search']
-            queryset = queryset.filter(
-                Q(ad__icontains=term) | Q(aciklama__icontains=term) |
-                Q(irk__ad__icontains=term) | Q(kategori__ad__icontains=term)
-            )
+        if filtreler.get('karakter'):
+            queryset = queryset.karakter_ozellikleriyle(filtreler['karakter'].split(','))
+        
+        return HayvanService._ara_ve_sirala(queryset, filtreler.get('search'), filtreler.get('sort'))
+    
+    @staticmethod
+    def _ara_ve_sirala(queryset, terim: Optional[str], siralama: Optional[str]):
+        """Arama (HayvanQuerySet.ara) ve sıralama; sıralama verilmezse arama skoruna göre"""
+        if terim:
+            queryset = queryset.ara(terim)
+            if not siralama:
+                return queryset
+        return queryset.order_by(siralama or '-created_at')
+    
+    @staticmethod
+    def faset_sayilari(queryset, parametre_anahtari: str) -> Dict:
+        """
+        Filtrelenmiş hayvanların faset (tur, cinsiyet, yaş, boyut, il,
+        sahiplenme) sayıları - tek sorgu, kısa süreli cache
+        
+        Args:
+            queryset: Filtreleri uygulanmış queryset
+            parametre_anahtari: Filtrelerin kanonik biçimi
+                (HayvanFilter.kanonik_parametreler)
+        
+        Returns:
+            Dict: {'toplam': int, 'fasetler': {faset: [{'deger', 'ad', 'adet'}]}}
+        """
+        ozet = hashlib.sha1(parametre_anahtari.encode()).hexdigest()
+        return etiketli_get_or_set(
+            f"hayvanlar:fasetler:{ozet}",
+            lambda: HayvanService._fasetleri_hesapla(queryset),
+            [HAYVAN_FASET_CACHE_ETIKETI],
+            FASET_CACHE_SURESI
+        )
+    
+    @staticmethod
+    def _fasetleri_hesapla(queryset) -> Dict:
+        toplam, sayilar = queryset.faset_sayilari()
+        fasetler = {}
+        for faset, alan in FASET_ALANLARI.items():
+            # Çoktan aza, eşitlikte değere göre
+            sirali = sorted(sayilar[alan].items(), key=lambda cift: (-cift[1], str(cift[0])))
+            fasetler[faset] = [
+                {'deger': deger, 'ad': HayvanService._faset_etiketi(alan, deger), 'adet': adet}
+                for deger, adet in sirali
+            ]
+        return {'toplam': toplam, 'fasetler': fasetler}
+    
+    @staticmethod
+    def _faset_etiketi(alan: str, deger) -> str:
+        """Faset değerinin görünen adı"""
+        if alan == 'il_kod':
+            return KonumService.il_adi(deger) or str(deger)
+        if alan == 'sahiplenildi':
+            return str(_("Evet") if deger else _("Hayır"))
+        return str(dict(Hayvan._meta.get_field(alan).flatchoices).get(deger, deger))
+    
+    @staticmethod
+    def yakindakiler(enlem: float, boylam: float, yaricap_km: float = 25,
+                     limit: int = 20, queryset=None) -> List[Hayvan]:
+        """
+        Bir noktaya yakın hayvanlar, mesafeye göre sıralı
         
-        # Sıralama
-        sort_by = filtreler.get('sort', '-created_at')
-        return queryset.order_by(sort_by)
+        Sınır kutusu (enlem, boylam) indeksiyle daraltılır; yalnızca aday
+        koordinatları okunup haversine mesafesi toplu hesaplanır, sonra
+        ilk `limit` kayıt liste ilişkileriyle tek sorguda getirilir.
+        
+        Args:
+            enlem: Merkez enlemi
+            boylam: Merkez boylamı
+            yaricap_km: Arama yarıçapı (km)
+            limit: En fazla kayıt
+            queryset: Ek filtreli temel queryset (varsayılan: aktif hayvanlar)
+        
+        Returns:
+            List[Hayvan]: `mesafe_km` ve `konum_hassasiyeti` ('ilce' / 'il',
+            bkz. KonumService.koordinat_hassasiyeti) nitelikleri eklenmiş hayvanlar
+        """
+        if queryset is None:
+            queryset = Hayvan.objects.filter(aktif=True)
+        
+        adaylar = list(
+            queryset.sinir_kutusunda(enlem, boylam, yaricap_km)
+            .order_by().values_list('id', 'enlem', 'boylam')
+        )
+        if not adaylar:
+            return []
+        
+        idler, enlemler, boylamlar = zip(*adaylar)
+        mesafeler = KonumService.mesafeler(enlem, boylam, enlemler, boylamlar)
+        # Aynı mesafede (aynı ilçe merkezi) yeni kayıt önce
+        sirali = sorted(
+            (mesafe, -hayvan_id) for hayvan_id, mesafe in zip(idler, mesafeler)
+            if mesafe <= yaricap_km
+        )[:limit]
+        
+        hayvanlar = Hayvan.objects.liste_icin().in_bulk([-eksi_id for _, eksi_id in sirali])
+        sonuc = []
+        for mesafe, eksi_id in sirali:
+            hayvan = hayvanlar.get(-eksi_id)
+            if hayvan is not None:
+                hayvan.mesafe_km = round(mesafe, 2)
+                hayvan.konum_hassasiyeti = KonumService.koordinat_hassasiyeti(hayvan.il_kod_id, hayvan.ilce)
+                sonuc.append(hayvan)
+        return sonuc
+    
+    @staticmethod
+    def populer_hayvanlar(limit: int = 10, queryset=None, tur: Optional[str] = None,
+                          il_kodu: Optional[int] = None) -> List[Hayvan]:
+        """
+        En popüler hayvanlar (tür ve/veya il grubunda)
+        
+        Önceden hesaplanmış sıralama (PopulerlikService) varsa tek cache
+        okuması + tek `in_bulk`; sıralama arada pasifleşen kayıtları
+        içerebileceği için biraz fazla ID istenir.
+        
+        Sıralama cache'te yoksa (ilk açılış, cache temizliği) istek tam
+        tablo sıralaması yapmaz: hesaplama görevi bir kez kuyruğa eklenir ve
+        o sırada gruptaki en yeni kayıtlar döner.
+        
+        Returns:
+            List[Hayvan]: Popülerliğe göre sıralı hayvanlar
+        """
+        if queryset is None:
+            queryset = Hayvan.objects.filter(aktif=True).liste_icin()
+        queryset = queryset.filter(sahiplenildi=False)
+        
+        idler = PopulerlikService.populer_idler(tur, il_kodu)
+        if idler is not None:
+            idler = idler[:limit * 2]
+            hayvanlar = queryset.in_bulk(idler)
+            return [hayvanlar[i] for i in idler if i in hayvanlar][:limit]
+        
+        PopulerlikService.hesaplamayi_iste()
+        if tur:
+            queryset = queryset.filter(tur=tur)
+        if il_kodu:
+            queryset = queryset.filter(il_kod=il_kodu)
+        return list(queryset.order_by('-created_at', 'id')[:limit])
     
     @staticmethod
     @transaction.atomic
@@ -213,3 +381,685 @@ class HayvanService:
         return list(KopekIrk.objects.filter(
             aktif=True, yerli=True
         ).values('id', 'ad'))
+
+
+class KopekIrkSenkronService:
+    """
+    Köpek ırkı içe aktarma ve ırk ↔ kategori senkronizasyonu
+    
+    Hedef durum ile veritabanı bellekte karşılaştırılır; yalnızca yeni veya
+    değişen satırlar toplu yazılır. Toplu yazmalar satır başına save() ve
+    post_save sinyali çalıştırmaz; kategori cache'i sonda bir kez temizlenir.
+    """
+    
+    @staticmethod
+    @transaction.atomic
+    def irklari_iceri_aktar() -> Dict[str, int]:
+        """
+        KopekIrklari sabitlerini tek upsert ile veritabanına yansıt
+        
+        Returns:
+            Dict[str, int]: eklenen / guncellenen / degismeyen sayıları
+        """
+        mevcut = {
+            irk_id: (ad, yerli, populer)
+            for irk_id, ad, yerli, populer in KopekIrk.objects.values_list('id', 'ad', 'yerli', 'populer')
+        }
+        yerli_irklar = set(KopekIrklari.YERLI_IRKLAR)
+        populer_irklar = set(KopekIrklari.POPULER_IRKLAR)
+        hedef = {
+            irk_id: (irk_ad, irk_id in yerli_irklar, irk_id in populer_irklar)
+            for irk_id, irk_ad in KopekIrklari.choices
+        }
+        
+        yazilacak = [
+            KopekIrk(id=irk_id, ad=ad, yerli=yerli, populer=populer)
+            for irk_id, (ad, yerli, populer) in hedef.items()
+            if mevcut.get(irk_id) != (ad, yerli, populer)
+        ]
+        if yazilacak:
+            KopekIrk.objects.bulk_create(
+                yazilacak,
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=['id'],
+                update_fields=['ad', 'yerli', 'populer'],
+            )
+        
+        eklenen = sum(1 for irk in yazilacak if irk.id not in mevcut)
+        return {
+            'eklenen': eklenen,
+            'guncellenen': len(yazilacak) - eklenen,
+            'degismeyen': len(hedef) - len(yazilacak),
+        }
+    
+    @staticmethod
+    @transaction.atomic
+    def kategorileri_senkronize_et(tum_irklar: bool = False, zorla: bool = False,
+                                   irk_idleri: Optional[List[str]] = None) -> Optional[Dict[str, int]]:
+        """
+        Aktif ırklar için "Köpekler" altında alt kategori oluştur/güncelle
+        
+        Args:
+            tum_irklar: Popüler olmayan ırkları da dahil et
+            zorla: Mevcut kategorilerin ad/açıklamasını da güncelle
+            irk_idleri: Sadece bu ırkları senkronize et (popülerlik filtresi uygulanmaz)
+        
+        Returns:
+            Optional[Dict[str, int]]: eklenen / guncellenen / toplam; ana kategori yoksa None
+        """
+        from apps.kategoriler.models import Kategori
+        
+        kopekler = Kategori.objects.filter(ad__tr_iexact='Köpekler', parent__isnull=True).first()
+        if not kopekler:
+            return None
+        
+        irklar = KopekIrk.objects.filter(aktif=True)
+        if irk_idleri is not None:
+            irklar = irklar.filter(id__in=irk_idleri)
+        elif not tum_irklar:
+            irklar = irklar.filter(populer=True)
+        
+        mevcut = {k.ad_normal: k for k in Kategori.objects.filter(parent=kopekler)}
+        yeni, guncellenecek = KopekIrkSenkronService._kategorileri_eslestir(
+            kopekler, irklar.values_list('ad', 'aciklama'), mevcut, zorla
+        )
+        KopekIrkSenkronService._kategorileri_yaz(kopekler, yeni, guncellenecek, zorla)
+        
+        return {
+            'eklenen': len(yeni),
+            'guncellenen': len(guncellenecek),
+            'toplam': len(mevcut) + len(yeni),
+        }
+    
+    @staticmethod
+    def _kategorileri_eslestir(kopekler, irklar, mevcut: Dict, zorla: bool):
+        """
+        Irkları normalize adla mevcut alt kategorilerle eşleştir
+        
+        Args:
+            irklar: (ad, aciklama) çiftleri
+            mevcut: ad_normal -> Kategori
+        
+        Returns:
+            Tuple[List, List]: oluşturulacak ve güncellenecek kategoriler
+        """
+        from apps.kategoriler.models import Kategori
+        
+        alinmis_sluglar = set(
+            Kategori.objects.filter(slug__startswith='kopekler-').values_list('slug', flat=True)
+        )
+        simdi = timezone.now()
+        yeni, guncellenecek, gorulen = [], [], set()
+        
+        for ad, aciklama in irklar:
+            anahtar = turkce_normalize(ad)
+            if anahtar in gorulen:
+                continue
+            gorulen.add(anahtar)
+            aciklama = aciklama or f"{ad} ırkı köpekler"
+            kategori = mevcut.get(anahtar)
+            
+            if kategori is None:
+                yeni.append(Kategori(
+                    ad=ad,
+                    slug=KopekIrkSenkronService._bos_slug(f"kopekler-{slugify(ad)}", alinmis_sluglar),
+                    parent=kopekler,
+                    pet_type=kopekler.pet_type,
+                    renk_kodu=kopekler.renk_kodu or '#f59e0b',
+                    aciklama=aciklama,
+                    aktif=True,
+                ))
+            elif zorla and (kategori.ad, kategori.aciklama, kategori.aktif) != (ad, aciklama, True):
+                kategori.ad, kategori.aciklama, kategori.aktif = ad, aciklama, True
+                kategori.ad_normal = anahtar
+                kategori.updated_at = simdi
+                guncellenecek.append(kategori)
+            elif not kategori.aktif:
+                # Irk aktifse ama kategori pasifse, kategoriyi aktifleştir
+                kategori.aktif = True
+                kategori.updated_at = simdi
+                guncellenecek.append(kategori)
+        
+        return yeni, guncellenecek
+    
+    @staticmethod
+    def _bos_slug(temel_slug: str, alinmis_sluglar: set) -> str:
+        """Alınmamış ilk slug (temel, temel-1, ...); sonuç alınmışlara eklenir"""
+        slug = temel_slug
+        sayac = 1
+        while slug in alinmis_sluglar:
+            slug = f"{temel_slug}-{sayac}"
+            sayac += 1
+        alinmis_sluglar.add(slug)
+        return slug
+    
+    @staticmethod
+    def _kategorileri_yaz(kopekler, yeni: List, guncellenecek: List, zorla: bool):
+        """Yeni ve değişen kategorileri toplu yaz, sıralama ve cache'i yenile"""
+        from apps.kategoriler.models import Kategori
+        from apps.kategoriler.servisler import KategoriService
+        
+        if yeni:
+            Kategori.objects.bulk_create(yeni, batch_size=500)
+        if guncellenecek:
+            Kategori.objects.bulk_update(
+                guncellenecek, ['ad', 'ad_normal', 'aciklama', 'aktif', 'updated_at'], batch_size=500
+            )
+        if yeni or guncellenecek or zorla:
+            Kategori.objects.siralamayi_ada_gore_yenile(kopekler.pk)
+            KategoriService._cache_temizle()
+
+
+class PopulerlikService:
+    """
+    🔥 Önceden hesaplanmış popülerlik sıralaması
+    
+    Periyodik görev (populerlik_siralamasini_guncelle) aktif, sahiplenilmemiş
+    hayvanları partiler halinde okuyup son etkileşim ve yaş üzerinden
+    puanlar; genel, tür, il ve tür+il grupları için ilk POPULERLIK_LISTE_BOYU
+    kaydın ID'lerini cache'e yazar. `populer` endpoint'i tek anahtar okuyup
+    tek `in_bulk` ile kayıtları getirir.
+    
+    Puan: log(1 + son etkileşim) + 0.5 ^ (yaş_gün / yarı_ömür)
+    Son etkileşim, ağırlıklı sayaçların önceki çalışmadan bu yana artışı ile
+    önceki değerin POPULERLIK_ETKILESIM_YARI_OMUR_GUN'le sönümlenmiş
+    toplamıdır; her çalışma listelere giren kayıtların (grup başına ilk
+    POPULERLIK_LISTE_BOYU) sayaç anlık görüntüsünü cache'e yazar. Eski ama
+    bugün ilgi gören kayıt yükselir, eski toplamlar zamanla etkisini yitirir.
+    Anlık görüntüde olmayan kayıtta (ilk çalışma, yeni kayıt, listelere
+    girmemiş kayıt) toplam etkileşim kaydın yaşıyla sönümlenir. Logaritma tek bir viral kaydın listeyi kilitlemesini
+    önler; yeni kayıt terimi etkileşimi henüz olmayan kayıtlara görünürlük
+    verir.
+    """
+    
+    @staticmethod
+    def anahtar(tur: Optional[str] = None, il_kodu: Optional[int] = None) -> str:
+        return f"{POPULERLIK_CACHE_ONEKI}:{tur or '*'}:{il_kodu or '*'}"
+    
+    @staticmethod
+    def populer_idler(tur: Optional[str] = None, il_kodu: Optional[int] = None) -> Optional[List[int]]:
+        """
+        Gruptaki sıralı hayvan ID'leri (tek cache okuması)
+        
+        Sıralama hesaplanmış ama grupta kayıt yoksa boş liste, sıralama
+        henüz hesaplanmadıysa None.
+        """
+        anahtar = PopulerlikService.anahtar(tur, il_kodu)
+        degerler = cache.get_many([anahtar, POPULERLIK_HESAPLANDI_ANAHTARI])
+        if anahtar in degerler:
+            return degerler[anahtar]
+        return [] if POPULERLIK_HESAPLANDI_ANAHTARI in degerler else None
+    
+    @staticmethod
+    def hesaplamayi_iste():
+        """
+        Sıralama görevini kuyruğa ekle (commit sonrası)
+        
+        Kilit, cache boşken gelen isteklerin görevi tekrar tekrar
+        eklemesini önler; kuyruğa eklenemezse kilit bırakılır.
+        """
+        if not cache.add(POPULERLIK_ISTEK_KILIDI, 1, POPULERLIK_ISTEK_KILIT_SURESI):
+            return
+        
+        def kuyruga_ekle():
+            from .tasks import populerlik_siralamasini_guncelle
+            try:
+                populerlik_siralamasini_guncelle.delay()
+            except Exception:
+                cache.delete(POPULERLIK_ISTEK_KILIDI)
+                logger.exception("Popülerlik sıralama görevi kuyruğa eklenemedi")
+        
+        transaction.on_commit(kuyruga_ekle)
+    
+    @staticmethod
+    def puanla(son_etkilesim, yas_gun):
+        """Son etkileşim ve yaştan (gün) puan - numpy dizileri veya sayılar"""
+        if np is not None and isinstance(son_etkilesim, np.ndarray):
+            return np.log1p(son_etkilesim) + np.exp2(-yas_gun / POPULERLIK_YARI_OMUR_GUN)
+        return math.log1p(son_etkilesim) + 2.0 ** (-yas_gun / POPULERLIK_YARI_OMUR_GUN)
+    
+    @staticmethod
+    def son_etkilesim(etkilesim, onceki, yas_gun, sonum):
+        """
+        Tek kaydın sönümlenmiş son etkileşimi
+        
+        Args:
+            etkilesim: Ağırlıklı sayaç toplamı
+            onceki: Önceki çalışmadaki (etkileşim, son etkileşim); kayıt anlık
+                görüntüde yoksa None
+            yas_gun: Kaydın yaşı (anlık görüntüde yoksa kullanılır)
+            sonum: Önceki çalışmadan bu yana sönüm çarpanı
+        """
+        if onceki is None:
+            return etkilesim * 2.0 ** (-yas_gun / POPULERLIK_ETKILESIM_YARI_OMUR_GUN)
+        onceki_etkilesim, onceki_son = onceki
+        return onceki_son * sonum + max(etkilesim - onceki_etkilesim, 0)
+    
+    @staticmethod
+    def _son_etkilesim_numpy(idler, etkilesim, yas_gun, onceki, sonum):
+        """son_etkilesim'in parti için vektörel hali (onceki: sıralı diziler veya None)"""
+        sonumlenmis = etkilesim * np.exp2(-yas_gun / POPULERLIK_ETKILESIM_YARI_OMUR_GUN)
+        if onceki is None or not len(onceki[0]):
+            return sonumlenmis
+        onceki_idler, onceki_etkilesim, onceki_son = onceki
+        konum = np.minimum(np.searchsorted(onceki_idler, idler), len(onceki_idler) - 1)
+        vardi = onceki_idler[konum] == idler
+        return np.where(
+            vardi,
+            onceki_son[konum] * sonum + np.maximum(etkilesim - onceki_etkilesim[konum], 0),
+            sonumlenmis,
+        )
+    
+    @classmethod
+    def siralamayi_hesapla(cls, simdi=None, parti_boyutu: int = POPULERLIK_PARTI_BOYUTU,
+                           onceki=None) -> Dict[str, List[int]]:
+        """
+        Tüm grupların sıralamasını hesapla (cache'e yazmaz)
+        
+        Args:
+            onceki: Önceki çalışmanın anlık görüntüsü (bkz. POPULERLIK_ANLIK_ANAHTARI)
+        
+        Returns:
+            Dict[str, List[int]]: cache anahtarı -> puana göre sıralı ID'ler
+        """
+        return cls._hesapla(simdi, parti_boyutu, onceki)[0]
+    
+    @classmethod
+    def _hesapla(cls, simdi, parti_boyutu, onceki):
+        """
+        Sıralama ve yeni anlık görüntü
+        
+        Kayıtlar pk sırasıyla partiler halinde okunur, her parti numpy
+        kuruluysa vektörel puanlanır. Anlık görüntü yalnızca listelere giren
+        kayıtları pk sırasıyla tutar.
+        """
+        simdi = (simdi or timezone.now()).timestamp()
+        queryset = Hayvan.objects.filter(aktif=True, sahiplenildi=False).order_by('pk')
+        alanlar = ('id', 'tur', 'il_kod', *POPULERLIK_AGIRLIKLARI, 'created_at')
+        agirliklar = list(POPULERLIK_AGIRLIKLARI.values())
+        
+        sonum = 1.0
+        if onceki is not None:
+            gecen_gun = max(simdi - onceki[0], 0.0) / 86400
+            sonum = 2.0 ** (-gecen_gun / POPULERLIK_ETKILESIM_YARI_OMUR_GUN)
+            if np is not None:
+                onceki_diziler = (
+                    np.asarray(onceki[1], dtype=np.int64),
+                    np.asarray(onceki[2], dtype=float),
+                    np.asarray(onceki[3], dtype=float),
+                )
+            else:
+                onceki_sozluk = {
+                    hayvan_id: (etkilesim, son)
+                    for hayvan_id, etkilesim, son in zip(*onceki[1:])
+                }
+        
+        idler, turler, iller, puanlar, etkilesimler, son_etkilesimler = [], [], [], [], [], []
+        son_id = 0
+        while True:
+            parti = list(queryset.filter(pk__gt=son_id).values_list(*alanlar)[:parti_boyutu])
+            if not parti:
+                break
+            son_id = parti[-1][0]
+            
+            sutunlar = list(zip(*parti))
+            idler.extend(sutunlar[0])
+            turler.extend(sutunlar[1])
+            iller.extend(kod or 0 for kod in sutunlar[2])
+            yas_gun = [max(simdi - olusturma.timestamp(), 0.0) / 86400 for olusturma in sutunlar[-1]]
+            if np is not None:
+                etkilesim = sum(
+                    np.asarray(sutun, dtype=float) * agirlik
+                    for sutun, agirlik in zip(sutunlar[3:-1], agirliklar)
+                )
+                yas = np.asarray(yas_gun)
+                son = cls._son_etkilesim_numpy(
+                    np.asarray(sutunlar[0], dtype=np.int64), etkilesim, yas,
+                    None if onceki is None else onceki_diziler, sonum,
+                )
+                puanlar.append(cls.puanla(son, yas))
+                etkilesimler.append(etkilesim)
+                son_etkilesimler.append(son)
+            else:
+                for satir, gun in zip(parti, yas_gun):
+                    etkilesim = sum(d * a for d, a in zip(satir[3:-1], agirliklar))
+                    son = cls.son_etkilesim(
+                        etkilesim, None if onceki is None else onceki_sozluk.get(satir[0]), gun, sonum
+                    )
+                    puanlar.append(cls.puanla(son, gun))
+                    etkilesimler.append(float(etkilesim))
+                    son_etkilesimler.append(son)
+        
+        if not idler:
+            return {}, (simdi, [], [], [])
+        if np is not None:
+            idler = np.asarray(idler)
+            siralar = cls._gruplara_bol_numpy(
+                idler, np.asarray(turler), np.asarray(iller), np.concatenate(puanlar)
+            )
+            listede = np.isin(idler, np.fromiter(set().union(*siralar.values()), dtype=np.int64))
+            anlik = (simdi, idler[listede].tolist(), np.concatenate(etkilesimler)[listede].tolist(),
+                     np.concatenate(son_etkilesimler)[listede].tolist())
+            return siralar, anlik
+        siralar = cls._gruplara_bol(idler, turler, iller, puanlar)
+        listede = set().union(*siralar.values())
+        satirlar = [satir for satir in zip(idler, etkilesimler, son_etkilesimler) if satir[0] in listede]
+        anlik = (simdi, *(list(sutun) for sutun in zip(*satirlar)))
+        return siralar, anlik
+    
+    @classmethod
+    def _gruplara_bol_numpy(cls, idler, turler, iller, puanlar) -> Dict[str, List[int]]:
+        # Genel sıra: puan azalan, eşitlikte yeni kayıt (büyük id) önce
+        sira = np.lexsort((-idler, -puanlar))
+        tur_adlari, tur_kodlari = np.unique(turler, return_inverse=True)
+        il_var = iller > 0
+        
+        # (grup kodu, dahil edilen satırlar, kod -> cache anahtarı)
+        gruplamalar = (
+            (np.zeros(len(idler), dtype=np.int64), None, lambda kod: cls.anahtar()),
+            (tur_kodlari, None, lambda kod: cls.anahtar(tur=tur_adlari[kod])),
+            (iller, il_var, lambda kod: cls.anahtar(il_kodu=kod)),
+            (tur_kodlari * 1000 + iller, il_var,
+             lambda kod: cls.anahtar(tur=tur_adlari[kod // 1000], il_kodu=kod % 1000)),
+        )
+        
+        siralar = {}
+        for gruplar, maske, anahtar in gruplamalar:
+            secili = sira if maske is None else sira[maske[sira]]
+            # Kararlı sıralama: grup içinde genel sıra korunur
+            ic_sira = np.argsort(gruplar[secili], kind='stable')
+            grup_sirali = gruplar[secili][ic_sira]
+            sirali_idler = idler[secili][ic_sira]
+            baslangiclar = np.flatnonzero(np.diff(grup_sirali, prepend=-1)).tolist()
+            for baslangic, bitis in zip(baslangiclar, baslangiclar[1:] + [len(grup_sirali)]):
+                siralar[anahtar(int(grup_sirali[baslangic]))] = (
+                    sirali_idler[baslangic:min(bitis, baslangic + POPULERLIK_LISTE_BOYU)].tolist()
+                )
+        return siralar
+    
+    @classmethod
+    def _gruplara_bol(cls, idler, turler, iller, puanlar) -> Dict[str, List[int]]:
+        siralar = defaultdict(list)
+        for puan, hayvan_id, tur, il_kodu in sorted(
+            zip(puanlar, idler, turler, iller), reverse=True
+        ):
+            anahtarlar = [cls.anahtar(), cls.anahtar(tur=tur)]
+            if il_kodu:
+                anahtarlar += [cls.anahtar(il_kodu=il_kodu), cls.anahtar(tur, il_kodu)]
+            for anahtar in anahtarlar:
+                if len(siralar[anahtar]) < POPULERLIK_LISTE_BOYU:
+                    siralar[anahtar].append(hayvan_id)
+        return dict(siralar)
+    
+    @classmethod
+    def siralamayi_guncelle(cls) -> int:
+        """
+        Sayaç tamponunu boşaltıp sıralamayı yeniden hesapla, sıralamayı ve
+        sayaçların anlık görüntüsünü cache'e yaz
+        
+        Returns:
+            int: Yazılan grup sayısı
+        """
+        sayac_tamponu.bosalt()
+        siralar, anlik = cls._hesapla(None, POPULERLIK_PARTI_BOYUTU, cache.get(POPULERLIK_ANLIK_ANAHTARI))
+        cache.set_many(
+            {**siralar, POPULERLIK_HESAPLANDI_ANAHTARI: timezone.now().isoformat()},
+            POPULERLIK_CACHE_SURESI,
+        )
+        cache.set(POPULERLIK_ANLIK_ANAHTARI, anlik, POPULERLIK_ANLIK_SURESI)
+        cache.delete(POPULERLIK_ISTEK_KILIDI)
+        return len(siralar)
+
+
+class EslesmeService:
+    """
+    💞 Sahiplenen ↔ hayvan eşleştirme
+    
+    Özellik dizileri (eslesme.EslesmeIndeksi) yalnızca Celery görevinde
+    kurulur ve güncellenir (tasks.eslesme_indeksini_guncelle,
+    ESLESME_INDEKSI_GUNCELLEME_SANIYE aralığında): paylaşılan dizi yoksa veya
+    ESLESME_INDEKSI_KURMA_SANIYE'den eskiyse sıfırdan kurulur, değilse son
+    görülen `updated_at`'ten sonra değişen satırlar yazılır ve sahiplenilen /
+    pasifleşen hayvanlar çıkarılır. Değişiklik varsa diziler sütun başına
+    `.npy` baytları olarak yeni bir sürümle paylaşılan cache'e yazılır.
+    
+    Web süreçleri veritabanından dizi okumaz: en fazla YENILEME_ARALIGI
+    saniyede bir küçük sürüm anahtarını okur, yeni sürüm varsa dizileri
+    yükler. Henüz yayınlanmış dizi yoksa kurulum görevi kuyruğa eklenir ve
+    kullanıcının ilindeki popüler hayvanlar uyum puanı olmadan döner.
+    `update()` ile toplu değişen veya silinen kayıtlar sonuç getirilirken
+    elenir.
+    
+    Sonuçlar isteğe bağlı olarak kullanıcı + profil parmak izi anahtarıyla
+    KULLANICI_CACHE_SURESI boyunca cache'lenir; profil kaydedilince
+    tasks.kullanici_eslesmelerini_hesapla yeni sonucu önceden yazar.
+    """
+    
+    YENILEME_ARALIGI = 5
+    # Commit sırası updated_at sırasından farklı olabilir; pencere geriye genişletilir
+    DEGISIKLIK_PAYI = timedelta(seconds=30)
+    KULLANICI_CACHE_SURESI = 300
+    PARTI_BOYUTU = 50_000
+    SATIR_ALANLARI = ('id', 'boyut', 'yas', 'tur', 'karakter_maskesi', 'enlem', 'boylam')
+    
+    # Paylaşılan diziler: (sürüm, son görülen updated_at, kurulma zamanı, sütunlar)
+    # ve yalnızca sürüm; süreçler her kontrolde küçük sürüm anahtarını okur
+    INDEKS_ANAHTARI = "hayvanlar:eslesme:indeks"
+    SURUM_ANAHTARI = "hayvanlar:eslesme:indeks:surum"
+    KURMA_ARALIGI = getattr(settings, 'ESLESME_INDEKSI_KURMA_SANIYE', 3600)
+    # Kurma aralığının üç katı: birkaç çalışma atlansa da diziler düşmez
+    INDEKS_CACHE_SURESI = 3 * KURMA_ARALIGI
+    # Paylaşılan dizi yokken kurulum görevini en fazla bu aralıkla bir kez kuyruğa ekle
+    ISTEK_KILIDI = "hayvanlar:eslesme:indeks:istendi"
+    ISTEK_KILIT_SURESI = 600
+    # Görev çalışmaları üst üste binmez
+    GOREV_KILIDI = "hayvanlar:eslesme:indeks:calisiyor"
+    GOREV_KILIT_SURESI = 1800
+    
+    # (indeks, sürüm, son kontrol zamanı) - süreç içi; tek atamayla
+    # değiştirilir, okuyucular kilit almaz
+    _bellek = (None, None, 0.0)
+    # Sürüm kontrolü ve _bellek değişimi tek iş parçacığında
+    _kilit = threading.Lock()
+    
+    @classmethod
+    def indeks(cls) -> Optional[EslesmeIndeksi]:
+        """
+        Süreçteki son yayınlanmış diziler (henüz yayınlanmadıysa None)
+        
+        İstek yolu kilit beklemez: sürüm kontrolünü kilidi alabilen tek
+        istek yapar, diğerleri mevcut dizilerle devam eder.
+        """
+        indeks, _, kontrol = cls._bellek
+        simdi = time.monotonic()
+        if simdi - kontrol >= cls.YENILEME_ARALIGI and cls._kilit.acquire(blocking=False):
+            try:
+                indeks, surum, kontrol = cls._bellek
+                if simdi - kontrol >= cls.YENILEME_ARALIGI:
+                    paylasilan = cls._paylasilani_oku(surum)
+                    if paylasilan is not None:
+                        surum, indeks = paylasilan[0], EslesmeIndeksi.iceri_aktar(paylasilan[3])
+                    cls._bellek = (indeks, surum, time.monotonic())
+            finally:
+                cls._kilit.release()
+        return indeks
+    
+    @classmethod
+    def _paylasilani_oku(cls, surum):
+        """Cache'te `surum`dan farklı diziler varsa (sürüm, son, kurulma zamanı, sütunlar)"""
+        guncel = cache.get(cls.SURUM_ANAHTARI)
+        if guncel is None or guncel == surum:
+            return None
+        paylasilan = cache.get(cls.INDEKS_ANAHTARI)
+        if paylasilan is None or paylasilan[0] != guncel:
+            return None
+        return paylasilan
+    
+    @classmethod
+    def kurulumu_iste(cls):
+        """Kurulum görevini kuyruğa ekle (commit sonrası, kilitle tek sefer)"""
+        if not cache.add(cls.ISTEK_KILIDI, 1, cls.ISTEK_KILIT_SURESI):
+            return
+        
+        def kuyruga_ekle():
+            from .tasks import eslesme_indeksini_guncelle
+            try:
+                eslesme_indeksini_guncelle.delay()
+            except Exception:
+                cache.delete(cls.ISTEK_KILIDI)
+                logger.exception("Eşleştirme dizileri görevi kuyruğa eklenemedi")
+        
+        transaction.on_commit(kuyruga_ekle)
+    
+    @classmethod
+    def paylasilan_indeksi_guncelle(cls, sifirdan: bool = False) -> Optional[int]:
+        """
+        Paylaşılan dizileri kur veya güncelle, değiştiyse yeni sürüm yaz (Celery görevi)
+        
+        Args:
+            sifirdan: Paylaşılan diziler güncel olsa da sıfırdan kur
+        
+        Returns:
+            Optional[int]: Dizilerdeki hayvan sayısı; başka bir çalışma sürüyorsa None
+        """
+        if not cache.add(cls.GOREV_KILIDI, 1, cls.GOREV_KILIT_SURESI):
+            return None
+        try:
+            paylasilan = None if sifirdan else cache.get(cls.INDEKS_ANAHTARI)
+            if paylasilan is None or time.time() - paylasilan[2] >= cls.KURMA_ARALIGI:
+                indeks, son = cls._kur()
+                cls._yayinla(indeks, son, time.time())
+            else:
+                _, son, kuruldu, sutunlar = paylasilan
+                indeks = EslesmeIndeksi.iceri_aktar(sutunlar)
+                degisen, son = cls._degisiklikleri_yaz(indeks, son)
+                if degisen:
+                    cls._yayinla(indeks, son, kuruldu)
+            return len(indeks)
+        finally:
+            cache.delete(cls.GOREV_KILIDI)
+    
+    @classmethod
+    def _yayinla(cls, indeks: EslesmeIndeksi, son, kuruldu: float):
+        surum = uuid.uuid4().hex
+        # Önce veri, sonra sürüm: sürümü gören süreç veriyi de bulur
+        cache.set(cls.INDEKS_ANAHTARI, (surum, son, kuruldu, indeks.disa_aktar()), cls.INDEKS_CACHE_SURESI)
+        cache.set(cls.SURUM_ANAHTARI, surum, cls.INDEKS_CACHE_SURESI)
+        cache.delete(cls.ISTEK_KILIDI)
+    
+    @classmethod
+    def _kur(cls):
+        # Okuma sırasında değişenler bir sonraki güncellemede tekrar okunur
+        son = Hayvan.objects.aggregate(son=Max('updated_at'))['son']
+        queryset = Hayvan.objects.filter(aktif=True, sahiplenildi=False).order_by('pk')
+        
+        def partiler():
+            son_id = 0
+            while True:
+                parti = list(queryset.filter(pk__gt=son_id).values_list(*cls.SATIR_ALANLARI)[:cls.PARTI_BOYUTU])
+                if not parti:
+                    return
+                son_id = parti[-1][0]
+                yield parti
+        
+        return EslesmeIndeksi.kur(partiler()), son
+    
+    @classmethod
+    def _degisiklikleri_yaz(cls, indeks: EslesmeIndeksi, son):
+        """Son görülen updated_at'ten sonra değişenler: (değişen satır sayısı, yeni son)"""
+        queryset = Hayvan.objects.order_by()
+        if son is not None:
+            queryset = queryset.filter(updated_at__gte=son - cls.DEGISIKLIK_PAYI)
+        satirlar = list(queryset.values_list(*cls.SATIR_ALANLARI, 'aktif', 'sahiplenildi', 'updated_at'))
+        degisen = indeks.yaz((*satir[:7], satir[7] and not satir[8]) for satir in satirlar)
+        guncellemeler = [satir[9] for satir in satirlar]
+        if son is not None:
+            guncellemeler.append(son)
+        return degisen, max(guncellemeler, default=None)
+    
+    @staticmethod
+    def profil_agirliklari(kullanici) -> ProfilAgirliklari:
+        """Kullanıcı profili ve il konumundan ağırlıklar (profil yoksa yalnızca konum)"""
+        try:
+            profil = kullanici.profil_detay
+        except ObjectDoesNotExist:
+            profil = None
+        konum = KonumService.koordinat(kullanici.il_kod_id)
+        if profil is None:
+            return ProfilAgirliklari(konum=konum)
+        return ProfilAgirliklari(
+            ev_tipi=profil.ev_tipi,
+            bahce_var_mi=profil.bahce_var_mi,
+            deneyim_yil=profil.hayvan_deneyimi_yil,
+            daha_once_sahiplendi=profil.daha_once_sahiplendin_mi,
+            diger_hayvanlar=profil.diger_hayvanlar,
+            konum=konum,
+        )
+    
+    @staticmethod
+    def _cache_anahtari(kullanici, profil: ProfilAgirliklari, limit: int, tur: Optional[str]) -> str:
+        parmak_izi = hashlib.sha1(
+            repr((profil.agirliklar, profil.konum, limit, tur)).encode()
+        ).hexdigest()[:16]
+        return f"hayvanlar:eslesme:{kullanici.pk}:{parmak_izi}"
+    
+    @classmethod
+    def eslesmeler(cls, kullanici, limit: int = 10, tur: Optional[str] = None,
+                   onbellek: bool = True, yenile: bool = False) -> List[Hayvan]:
+        """
+        Kullanıcıya en uygun aktif, sahiplenilmemiş hayvanlar
+        
+        Args:
+            kullanici: CustomUser
+            limit: En fazla kayıt
+            tur: Yalnızca bu türden hayvanlar
+            onbellek: Kullanıcı başına sonuç cache'ini kullan
+            yenile: Cache'teki sonucu yok sayıp yeniden hesapla
+        
+        Returns:
+            List[Hayvan]: `uyum_puani`, `mesafe_km`, `aciklamalar` nitelikleri eklenmiş
+            hayvanlar; diziler henüz yayınlanmadıysa `uyum_puani` None
+        """
+        profil = cls.profil_agirliklari(kullanici)
+        anahtar = cls._cache_anahtari(kullanici, profil, limit, tur)
+        sonuclar = cache.get(anahtar) if onbellek and not yenile else None
+        if sonuclar is None:
+            indeks = cls.indeks()
+            if indeks is None:
+                cls.kurulumu_iste()
+                return cls._yedek_liste(kullanici, limit, tur)
+            # Diziler son sürümden sonra pasifleşenleri içerebilir: biraz fazla aday
+            sonuclar = indeks.puanla(profil, limit * 2, tur)
+            if onbellek:
+                cache.set(anahtar, sonuclar, cls.KULLANICI_CACHE_SURESI)
+        
+        hayvanlar = Hayvan.objects.filter(aktif=True, sahiplenildi=False).liste_icin().in_bulk(
+            [sonuc['id'] for sonuc in sonuclar]
+        )
+        eslesenler = []
+        for sonuc in sonuclar:
+            hayvan = hayvanlar.get(sonuc['id'])
+            if hayvan is None:
+                continue
+            hayvan.uyum_puani = sonuc['uyum_puani']
+            hayvan.mesafe_km = sonuc['mesafe_km']
+            hayvan.aciklamalar = sonuc['aciklamalar']
+            eslesenler.append(hayvan)
+            if len(eslesenler) == limit:
+                break
+        return eslesenler
+    
+    @staticmethod
+    def _yedek_liste(kullanici, limit: int, tur: Optional[str]) -> List[Hayvan]:
+        """Diziler yokken: kullanıcının ilindeki (yoksa tüm) popüler hayvanlar, puansız"""
+        hayvanlar = []
+        if kullanici.il_kod_id:
+            hayvanlar = HayvanService.populer_hayvanlar(limit, tur=tur, il_kodu=kullanici.il_kod_id)
+        if not hayvanlar:
+            hayvanlar = HayvanService.populer_hayvanlar(limit, tur=tur)
+        for hayvan in hayvanlar:
+            hayvan.uyum_puani = None
+            hayvan.mesafe_km = None
+            hayvan.aciklamalar = []
+        return hayvanlar
@@ -9,14 +9,53 @@ from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.db import transaction
 
+from apps.kullanicilar.models import KullaniciProfil
+from apps.ortak.cache import etiketleri_gecersiz_kil
+from .managers import HAYVAN_FASET_CACHE_ETIKETI
 from .models import KopekIrk, Hayvan
 
+@receiver(post_save, sender=Hayvan)
+@receiver(post_delete, sender=Hayvan)
+def hayvan_faset_cache_gecersiz_kil(sender, raw=False, **kwargs):
+    """Hayvan yazımında faset sayısı cache'ini geçersiz kıl (commit sonrası)"""
+    if not raw:
+        etiketleri_gecersiz_kil(HAYVAN_FASET_CACHE_ETIKETI)
+
+
+@receiver(post_save, sender=Hayvan)
+def hayvan_kategori_sayaci_kayit(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Kategori sayaçlarını F() ile güncelle: oluşturmada +1, değişiklikte eski -1 / yeni +1"""
+    if raw or (update_fields is not None and not Hayvan.KATEGORI_ALANLARI & set(update_fields)):
+        return
+    
+    if created:
+        eski_kategori_id = None
+    elif hasattr(instance, '_kayit_oncesi_kategori_id'):
+        eski_kategori_id = instance._kayit_oncesi_kategori_id
+    else:
+        # Hayvan.save() dışından kaydedildi, önceki değer bilinmiyor
+        return
+    
+    from apps.kategoriler.servisler import KategoriService
+    KategoriService.kategori_degisikligi_uygula(eski_kategori_id, instance.kategori_id)
+
+
+@receiver(post_delete, sender=Hayvan)
+def hayvan_kategori_sayaci_silme(sender, instance, **kwargs):
+    """Silinen hayvanın kategorisinin sayacını azalt"""
+    from apps.kategoriler.servisler import KategoriService
+    KategoriService.kategori_degisikligi_uygula(instance.kategori_id, None)
+
+
 @receiver(post_save, sender=KopekIrk)
-def kopek_irk_degisiklik_izleyici(sender, instance, created, **kwargs):
-    """Köpek ırkı değişikliklerini izle ve gerekli işlemleri yap"""
-    # Kategorileri otomatik güncelle (save metodunda çağrıldığı için burada çağrılmayabilir,
-    # ancak başka bir yerden güncellendiğinde de çalışması için ekliyoruz)
-    if instance.aktif and instance.populer:
+def kopek_irk_degisiklik_izleyici(sender, instance, created, raw=False, **kwargs):
+    """
+    Fixture ile yüklenen ırkları kategori sistemiyle senkronize et
+    
+    Normal kayıtta KopekIrk.save() senkronizasyonu zaten yapar; toplu
+    içe aktarma ise KopekIrkSenkronService ile tek seferde senkronize eder.
+    """
+    if raw and instance.aktif and instance.populer:
         transaction.on_commit(lambda: instance.kategori_ile_senkronize_et())
 
 
@@ -28,7 +67,7 @@ def kopek_irk_silme_izleyici(sender, instance, **kwargs):
         
         # Köpek kategorisini bul
         kopekler_kategori = Kategori.objects.filter(
-            ad__iexact='Köpekler',
+            ad__tr_iexact='Köpekler',
             parent__isnull=True
         ).first()
         
@@ -36,7 +75,7 @@ def kopek_irk_silme_izleyici(sender, instance, **kwargs):
             # Bu ırk için alt kategori var mı?
             alt_kategori = Kategori.objects.filter(
                 parent=kopekler_kategori,
-                ad__iexact=instance.ad
+                ad__tr_iexact=instance.ad
             ).first()
             
             # Varsa pasife çek
@@ -47,3 +86,13 @@ def kopek_irk_silme_izleyici(sender, instance, **kwargs):
     except Exception as e:
         import logging
         logging.warning(f"Köpek ırkı silindiğinde kategori güncellemesi sırasında hata: {e}")
+
+
+@receiver(post_save, sender=KullaniciProfil)
+def kullanici_eslesmelerini_on_hesapla(sender, instance, raw=False, **kwargs):
+    """Profil değişince eşleşmeleri yeni profil parmak iziyle önceden hesapla (commit sonrası)"""
+    if raw:
+        return
+    from .tasks import kullanici_eslesmelerini_hesapla
+    kullanici_id = instance.kullanici_id
+    transaction.on_commit(lambda: kullanici_eslesmelerini_hesapla.delay(kullanici_id))
@@ -0,0 +1,106 @@
+"""
+🐾 Evcil Hayvan Platformu - Hayvan Arka Plan Görevleri
+==============================================================================
+Fotoğraf varyantları, popülerlik sıralaması ve eşleştirme dizileri gibi
+istek thread'i dışında yapılan işler
+==============================================================================
+"""
+
+import logging
+
+from celery import shared_task
+
+from apps.ortak.constants import PhotoProcessingStatus
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True, acks_late=True)
+def fotograf_varyantlari_olustur(fotograf_id):
+    """
+    Fotoğrafın JPEG/WebP varyantlarını üret ve meta verisini kaydet
+
+    Kaynak ve varyantlar fotoğraf alanının storage'ı üzerinden stream
+    olarak okunup yazılır (yerel disk veya S3). En küçük JPEG varyantı
+    geriye dönük uyumluluk için `thumbnail` alanına da yazılır.
+    """
+    from .models import HayvanFotograf
+    from .utils import fotograf_varyantlari_uret
+
+    try:
+        foto = HayvanFotograf.objects.get(pk=fotograf_id)
+    except HayvanFotograf.DoesNotExist:
+        return
+
+    alan = foto.fotograf
+    try:
+        with alan.open('rb') as kaynak:
+            sonuc = fotograf_varyantlari_uret(kaynak, storage=alan.storage)
+    except Exception:
+        logger.exception("Fotoğraf varyantları üretilemedi: %s", fotograf_id)
+        HayvanFotograf.objects.filter(pk=fotograf_id).update(isleme_durumu=PhotoProcessingStatus.HATA)
+        return
+
+    jpegler = [v for v in sonuc['varyantlar'] if v['format'] == 'jpg']
+    en_kucuk = min(jpegler, key=lambda v: v['genislik']) if jpegler else None
+
+    # Bu arada fotoğraf değiştirildiyse eski sonucu yazma
+    HayvanFotograf.objects.filter(pk=fotograf_id, fotograf=alan.name).update(
+        isleme_durumu=PhotoProcessingStatus.HAZIR,
+        varyantlar=sonuc,
+        thumbnail=en_kucuk['yol'] if en_kucuk else None,
+    )
+
+
+@shared_task(ignore_result=True)
+def populerlik_siralamasini_guncelle():
+    """
+    Popülerlik sıralamasını yeniden hesaplayıp cache'e yaz
+
+    Celery beat ile POPULERLIK_HESAPLAMA_SANIYE aralığında çalışır
+    (bkz. CELERY_BEAT_SCHEDULE).
+    """
+    from .servisler import PopulerlikService
+
+    grup_sayisi = PopulerlikService.siralamayi_guncelle()
+    logger.info("Popülerlik sıralaması güncellendi: %s grup", grup_sayisi)
+    return grup_sayisi
+
+
+@shared_task(ignore_result=True)
+def eslesme_indeksini_guncelle():
+    """
+    Eşleştirme dizilerini kur / güncelle ve paylaşılan cache'e yaz
+
+    Celery beat ile ESLESME_INDEKSI_GUNCELLEME_SANIYE aralığında çalışır;
+    diziler ESLESME_INDEKSI_KURMA_SANIYE'den eskiyse sıfırdan kurulur. Web
+    süreçleri dizileri kurmaz, yeni sürümü cache'ten yükler.
+    """
+    from .servisler import EslesmeService
+
+    satir_sayisi = EslesmeService.paylasilan_indeksi_guncelle()
+    if satir_sayisi is not None:
+        logger.info("Eşleştirme dizileri güncellendi: %s hayvan", satir_sayisi)
+    return satir_sayisi
+
+
+@shared_task(ignore_result=True)
+def kullanici_eslesmelerini_hesapla(kullanici_id, limit=10):
+    """
+    Kullanıcının eşleşme sonuçlarını önceden hesaplayıp cache'e yaz
+
+    Profil kaydedilince (signals.kullanici_eslesmelerini_on_hesapla)
+    kuyruğa eklenir; `eslesmeler` endpoint'i sonucu cache'ten okur.
+    """
+    from django.contrib.auth import get_user_model
+
+    from .servisler import EslesmeService
+
+    # Diziler henüz yayınlanmadıysa önceden hesaplanacak sonuç yok; kurulumu
+    # endpoint'e gelen ilk istek ister
+    if EslesmeService.indeks() is None:
+        return 0
+    kullanici = get_user_model().objects.filter(pk=kullanici_id).select_related('profil_detay').first()
+    if kullanici is None:
+        return 0
+    return len(EslesmeService.eslesmeler(kullanici, limit=limit, yenile=True))
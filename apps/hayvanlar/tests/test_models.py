@@ -0,0 +1,209 @@
+"""
+🐾 Evcil Hayvan Platformu - Hayvan Model Testleri
+==============================================================================
+Hayvan modeli için unit testler
+==============================================================================
+"""
+
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+
+from apps.hayvanlar.filters import HayvanFilter
+from apps.hayvanlar.models import Hayvan, HayvanFotograf, KopekIrk
+from apps.hayvanlar.serializers import HayvanFotografSerializer
+from apps.hayvanlar.utils import FOTOGRAF_PLACEHOLDER, KARAKTER_BITLERI
+from apps.kategoriler.models import Kategori
+from apps.ortak.constants import PhotoProcessingStatus
+
+
+@pytest.fixture
+def kategori():
+    """Test kategorisi"""
+    return Kategori.objects.create(ad="Kediler", pet_type="kedi")
+
+
+@pytest.fixture
+def diger_kategori():
+    """İkinci test kategorisi"""
+    return Kategori.objects.create(ad="Kuşlar", pet_type="kus")
+
+
+@pytest.mark.django_db
+class TestHayvanKayit:
+    """Hayvan.save() yazma yolu testleri"""
+
+    def test_benzersiz_slug_tek_sorguda(self):
+        """Çakışan slug'lar için boş ilk ek tek sorguda bulunmalı"""
+        Hayvan.objects.create(ad="Boncuk", tur="kedi")
+        Hayvan.objects.create(ad="Boncuk", tur="kedi", slug="boncuk-1")
+        Hayvan.objects.create(ad="Boncukçu", tur="kedi", slug="boncukcu")
+
+        hayvan = Hayvan(ad="Boncuk", tur="kedi")
+        with CaptureQueriesContext(connection) as ctx:
+            slug = hayvan._benzersiz_slug_olustur()
+
+        assert slug == "boncuk-2"
+        assert len(ctx.captured_queries) == 1
+
+    def test_olusturmada_kategori_sayaci_artar(self, kategori):
+        """Yeni hayvan kategorinin kullanım sayısını bir artırmalı"""
+        Hayvan.objects.create(ad="Pamuk", tur="kedi", kategori=kategori)
+        Hayvan.objects.create(ad="Tarçın", tur="kedi", kategori=kategori)
+
+        kategori.refresh_from_db()
+        assert kategori.kullanim_sayisi == 2
+
+    def test_kategori_degisince_sayaclar_tasinir(self, kategori, diger_kategori):
+        """Kategori değişikliği eskiyi azaltıp yeniyi artırmalı"""
+        hayvan = Hayvan.objects.create(ad="Pamuk", tur="kedi", kategori=kategori)
+        hayvan = Hayvan.objects.get(pk=hayvan.pk)
+
+        hayvan.kategori = diger_kategori
+        hayvan.save()
+
+        kategori.refresh_from_db()
+        diger_kategori.refresh_from_db()
+        assert kategori.kullanim_sayisi == 0
+        assert diger_kategori.kullanim_sayisi == 1
+
+    def test_degisiklik_yoksa_tekrar_okuma_ve_sayac_yok(self, kategori):
+        """Kategorisi değişmeyen kayıt sadece UPDATE çalıştırmalı"""
+        hayvan = Hayvan.objects.create(ad="Pamuk", tur="kedi", kategori=kategori)
+        hayvan = Hayvan.objects.get(pk=hayvan.pk)
+
+        hayvan.aciklama = "Sakin ve uysal"
+        with CaptureQueriesContext(connection) as ctx:
+            hayvan.save()
+
+        assert len(ctx.captured_queries) == 1
+        assert ctx.captured_queries[0]['sql'].startswith('UPDATE')
+
+    def test_kopek_kategorisi_ilk_kayitta_atanir(self):
+        """Köpek ırk kategorisi ek bir save olmadan kalıcı olmalı"""
+        kopekler = Kategori.objects.create(ad="Köpekler", pet_type="kopek")
+        irk = KopekIrk.objects.create(id="kangal", ad="Kangal")
+
+        hayvan = Hayvan.objects.create(ad="Paşa", tur="kopek", irk=irk)
+
+        hayvan.refresh_from_db()
+        kopekler.refresh_from_db()
+        assert hayvan.kategori_id == kopekler.pk
+        assert kopekler.kullanim_sayisi == 1
+
+
+def _jpeg(genislik=800, yukseklik=600, ad="foto.jpg"):
+    """Bellekte gerçek bir JPEG yüklemesi"""
+    cikti = BytesIO()
+    Image.new('RGB', (genislik, yukseklik), (200, 120, 40)).save(cikti, format='JPEG')
+    return SimpleUploadedFile(ad, cikti.getvalue(), content_type='image/jpeg')
+
+
+@pytest.fixture
+def medya(settings, tmp_path):
+    """Geçici MEDIA_ROOT"""
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.mark.django_db
+class TestKarakterMaskesi:
+    """Karakter özellikleri bit maskesi ve özellik filtresi"""
+
+    @pytest.fixture
+    def hayvanlar(self):
+        return [
+            Hayvan.objects.create(ad="Pamuk", tur="kedi", karakter_ozellikleri=['playful', 'calm']),
+            Hayvan.objects.create(ad="Duman", tur="kedi", karakter_ozellikleri=['playful', 'çok tatlı']),
+            Hayvan.objects.create(ad="Tekir", tur="kedi"),
+        ]
+
+    def test_maske_kayitta_hesaplanir(self, hayvanlar):
+        assert hayvanlar[0].karakter_maskesi == KARAKTER_BITLERI['playful'] | KARAKTER_BITLERI['calm']
+        assert hayvanlar[2].karakter_maskesi == 0
+
+        hayvan = hayvanlar[2]
+        hayvan.karakter_ozellikleri = ['shy']
+        hayvan.save(update_fields=['karakter_ozellikleri'])
+        hayvan.refresh_from_db()
+        assert hayvan.karakter_maskesi == KARAKTER_BITLERI['shy']
+
+    def test_tum_ozellikler_tek_kosulla(self, hayvanlar):
+        with CaptureQueriesContext(connection) as ctx:
+            sonuc = list(Hayvan.objects.karakter_ozellikleriyle(['calm', ' playful']))
+
+        assert sonuc == [hayvanlar[0]]
+        sql = ctx.captured_queries[0]['sql']
+        assert sql.count('"karakter_maskesi" & ') == 1
+        assert '"karakter_ozellikleri"' not in sql.split('WHERE')[1]
+
+    def test_tanimsiz_ozellik_json_alaninda_aranir(self, hayvanlar):
+        assert list(Hayvan.objects.karakter_ozellikleriyle(['playful', 'çok tatlı'])) == [hayvanlar[1]]
+        assert not Hayvan.objects.karakter_ozellikleriyle(['yok']).exists()
+
+    def test_filtre(self, hayvanlar):
+        sonuc = HayvanFilter({'karakter': 'playful'}, queryset=Hayvan.objects.order_by('id')).qs
+        assert list(sonuc) == hayvanlar[:2]
+
+
+@pytest.mark.django_db
+class TestFotografIsleme:
+    """Asenkron fotoğraf varyant hattı"""
+
+    def test_varyantlar_commit_sonrasi_uretilir(self, medya, django_capture_on_commit_callbacks):
+        hayvan = Hayvan.objects.create(ad="Pamuk", tur="kedi")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            foto = HayvanFotograf.objects.create(hayvan=hayvan, fotograf=_jpeg())
+
+        foto.refresh_from_db()
+        assert foto.hazir
+        varyantlar = foto.varyantlar['varyantlar']
+        # 1280 hedefi kaynak genişliğine (800) indirgenir; büyütme yapılmaz
+        assert sorted((v['format'], v['genislik']) for v in varyantlar) == [
+            ('jpg', 320), ('jpg', 640), ('jpg', 800), ('webp', 320), ('webp', 640), ('webp', 800),
+        ]
+        assert all((medya / v['yol']).exists() for v in varyantlar)
+        assert foto.thumbnail.name == foto.varyant(320)['yol']
+        assert foto.varyant(1280)['genislik'] == 800
+
+    def test_islenene_kadar_yer_tutucu_doner(self, medya):
+        hayvan = Hayvan.objects.create(ad="Pamuk", tur="kedi")
+        foto = HayvanFotograf.objects.create(hayvan=hayvan, fotograf=_jpeg())
+
+        veri = HayvanFotografSerializer(foto).data
+
+        assert foto.isleme_durumu == PhotoProcessingStatus.BEKLIYOR
+        assert veri['thumbnail'] == FOTOGRAF_PLACEHOLDER
+        assert veri['varyantlar'] == []
+
+    def test_fotograf_degisince_yeniden_kuyruga_alinir(self, medya, django_capture_on_commit_callbacks):
+        hayvan = Hayvan.objects.create(ad="Pamuk", tur="kedi")
+        with django_capture_on_commit_callbacks(execute=True):
+            foto = HayvanFotograf.objects.create(hayvan=hayvan, fotograf=_jpeg())
+        foto = HayvanFotograf.objects.get(pk=foto.pk)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            foto.sira = 3
+            foto.save()
+        assert callbacks == []
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            foto.fotograf = _jpeg(ad="yeni.jpg")
+            foto.save()
+        assert len(callbacks) == 1
+        assert foto.isleme_durumu == PhotoProcessingStatus.BEKLIYOR
+
+    def test_bozuk_dosya_hata_durumuna_gecer(self, medya, django_capture_on_commit_callbacks):
+        hayvan = Hayvan.objects.create(ad="Pamuk", tur="kedi")
+        bozuk = SimpleUploadedFile("bozuk.jpg", b"resim degil", content_type='image/jpeg')
+
+        with django_capture_on_commit_callbacks(execute=True):
+            foto = HayvanFotograf.objects.create(hayvan=hayvan, fotograf=bozuk)
+
+        foto.refresh_from_db()
+        assert foto.isleme_durumu == PhotoProcessingStatus.HATA
@@ -0,0 +1,369 @@
+"""
+🐾 Evcil Hayvan Platformu - Hayvan Servis Testleri
+==============================================================================
+Hayvan servisleri için unit testler
+==============================================================================
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.hayvanlar import servisler
+from apps.hayvanlar.models import Hayvan, KopekIrk
+from apps.hayvanlar.servisler import (
+    EslesmeService, HayvanService, KopekIrkSenkronService, PopulerlikService,
+)
+from apps.kullanicilar.models import CustomUser, KullaniciProfil
+from apps.kategoriler.models import Kategori
+from apps.ortak.constants import KopekIrklari
+
+
+@pytest.fixture
+def kopekler():
+    """Köpekler ana kategorisi"""
+    return Kategori.objects.create(ad="Köpekler", pet_type="kopek")
+
+
+@pytest.mark.django_db
+class TestKopekIrkSenkron:
+    """Toplu ırk içe aktarma ve kategori senkronizasyonu"""
+
+    def test_iceri_aktarma_toplu_upsert(self):
+        KopekIrk.objects.bulk_create([KopekIrk(id='70', ad='Eski Ad')])
+
+        with CaptureQueriesContext(connection) as ctx:
+            sonuc = KopekIrkSenkronService.irklari_iceri_aktar()
+
+        toplam = len(KopekIrklari.choices)
+        assert sonuc == {'eklenen': toplam - 1, 'guncellenen': 1, 'degismeyen': 0}
+        assert KopekIrk.objects.count() == toplam
+        assert KopekIrk.objects.get(id='70').ad == 'Affenpinscher'
+        # Tek okuma + veritabanının parametre sınırına göre bölünmüş upsert'ler
+        insertler = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('INSERT')]
+        assert all('ON CONFLICT' in sql for sql in insertler)
+        assert len(ctx.captured_queries) <= 5
+
+    def test_tekrar_aktarmada_yazma_yok(self):
+        KopekIrkSenkronService.irklari_iceri_aktar()
+
+        with CaptureQueriesContext(connection) as ctx:
+            sonuc = KopekIrkSenkronService.irklari_iceri_aktar()
+
+        assert sonuc['degismeyen'] == len(KopekIrklari.choices)
+        assert not any(q['sql'].startswith(('INSERT', 'UPDATE')) for q in ctx.captured_queries)
+
+    def test_kategoriler_toplu_olusur_ve_ada_gore_siralanir(self, kopekler):
+        KopekIrk.objects.bulk_create([
+            KopekIrk(id='1', ad='Kangal', populer=True),
+            KopekIrk(id='2', ad='Akbaş', populer=True),
+            KopekIrk(id='3', ad='Beagle', populer=False),
+        ])
+        # Slug çakışması bir sonraki boş eke düşmeli
+        Kategori.objects.create(ad="Kangal Eski", slug="kopekler-kangal", pet_type="kopek")
+
+        with CaptureQueriesContext(connection) as ctx:
+            sonuc = KopekIrkSenkronService.kategorileri_senkronize_et()
+
+        assert sonuc == {'eklenen': 2, 'guncellenen': 0, 'toplam': 2}
+        alt = list(Kategori.objects.filter(parent=kopekler).order_by('sira').values_list('sira', 'ad', 'slug'))
+        assert alt == [(1, 'Akbaş', 'kopekler-akbas'), (2, 'Kangal', 'kopekler-kangal-1')]
+        assert len(ctx.captured_queries) <= 10
+
+    def test_pasif_kategori_yeniden_aktiflesir(self, kopekler):
+        KopekIrk.objects.bulk_create([KopekIrk(id='1', ad='Kangal', populer=True)])
+        Kategori.objects.create(ad="Kangal", parent=kopekler, aktif=False)
+
+        sonuc = KopekIrkSenkronService.kategorileri_senkronize_et()
+
+        assert sonuc['guncellenen'] == 1
+        assert Kategori.objects.get(ad="Kangal").aktif
+
+    def test_ana_kategori_yoksa_none(self):
+        assert KopekIrkSenkronService.kategorileri_senkronize_et() is None
+
+    def test_irk_kaydi_kategoriyi_senkronize_eder(self, kopekler, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            KopekIrk.objects.create(id='1', ad='Kangal', populer=True)
+
+        assert Kategori.objects.filter(parent=kopekler, ad='Kangal').count() == 1
+
+
+@pytest.mark.django_db
+class TestPopulerlikSiralamasi:
+    """Önceden hesaplanan popülerlik sıralaması"""
+
+    @pytest.fixture(autouse=True)
+    def yerel_cache(self, settings):
+        from django.core.cache import cache
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        cache.clear()
+
+    @pytest.fixture
+    def hayvanlar(self):
+        simdi = timezone.now()
+        hayvanlar = {
+            'populer': Hayvan.objects.create(ad="Pamuk", tur="kedi", il="İzmir",
+                                             created_at=simdi - timedelta(days=7)),
+            'eski': Hayvan.objects.create(ad="Tekir", tur="kedi", il="İzmir",
+                                          created_at=simdi - timedelta(days=120)),
+            'yeni': Hayvan.objects.create(ad="Minnoş", tur="kedi", il="Ankara"),
+            'kopek': Hayvan.objects.create(ad="Karabaş", tur="kopek", il="İzmir"),
+            'sahiplenilmis': Hayvan.objects.create(ad="Zeytin", tur="kedi", il="İzmir",
+                                                   sahiplenildi=True),
+        }
+        Hayvan.objects.filter(pk=hayvanlar['populer'].pk).update(view_count=400, like_count=20)
+        Hayvan.objects.filter(pk=hayvanlar['eski'].pk).update(view_count=5000)
+        Hayvan.objects.filter(pk=hayvanlar['sahiplenilmis'].pk).update(view_count=9000)
+        return hayvanlar
+
+    def test_puan_zamanla_azalir(self):
+        assert PopulerlikService.puanla(0, 0) == 1.0
+        assert PopulerlikService.puanla(0, servisler.POPULERLIK_YARI_OMUR_GUN) == 0.5
+        assert PopulerlikService.puanla(100, 3) > PopulerlikService.puanla(10, 3)
+
+    def test_gruplar(self, hayvanlar):
+        siralar = PopulerlikService.siralamayi_hesapla()
+        idler = {ad: hayvan.pk for ad, hayvan in hayvanlar.items()}
+
+        # Eski kaydın görüntülenmesi çok ama 120 günlük; sahiplenilmiş dahil edilmez
+        assert siralar[PopulerlikService.anahtar()][0] == idler['populer']
+        assert idler['sahiplenilmis'] not in siralar[PopulerlikService.anahtar()]
+        assert siralar[PopulerlikService.anahtar(tur='kopek')] == [idler['kopek']]
+        assert siralar[PopulerlikService.anahtar(il_kodu=6)] == [idler['yeni']]
+        assert siralar[PopulerlikService.anahtar('kedi', 35)] == [idler['populer'], idler['eski']]
+
+    def test_son_etkilesim_one_cikar(self, hayvanlar):
+        """Eski ama bu arada ilgi gören kayıt, toplamı çok olan kaydı geçmeli"""
+        PopulerlikService.siralamayi_guncelle()
+        assert PopulerlikService.populer_idler()[0] == hayvanlar['populer'].pk
+
+        Hayvan.objects.filter(pk=hayvanlar['eski'].pk).update(view_count=7000)
+        PopulerlikService.siralamayi_guncelle()
+
+        assert PopulerlikService.populer_idler()[0] == hayvanlar['eski'].pk
+
+    def test_son_etkilesim_sonumlenir(self):
+        # Anlık görüntüden bu yana artış yoksa önceki değer yarı ömürde yarıya iner
+        assert PopulerlikService.son_etkilesim(500, (500, 80.0), 30, 0.5) == 40.0
+        assert PopulerlikService.son_etkilesim(520, (500, 80.0), 30, 0.5) == 60.0
+        # Anlık görüntüde olmayan kayıt: toplam etkileşim yaşla sönümlenir
+        assert PopulerlikService.son_etkilesim(30, None, 0, 0.5) == 30.0
+        assert PopulerlikService.son_etkilesim(30, None, servisler.POPULERLIK_ETKILESIM_YARI_OMUR_GUN, 0.5) == 15.0
+
+    def test_anlik_goruntu_listelerle_sinirli(self, hayvanlar, monkeypatch):
+        monkeypatch.setattr(servisler, 'POPULERLIK_LISTE_BOYU', 1)
+
+        siralar, anlik = PopulerlikService._hesapla(None, 2, None)
+
+        listelerdekiler = sorted(set().union(*siralar.values()))
+        assert anlik[1] == listelerdekiler
+        assert hayvanlar['eski'].pk not in anlik[1]
+        assert len(anlik[2]) == len(anlik[3]) == len(listelerdekiler)
+
+    def test_numpy_ve_saf_python_ayni(self, hayvanlar, monkeypatch):
+        if servisler.np is None:
+            pytest.skip("numpy kurulu değil")
+        simdi = timezone.now()
+        vektorel = PopulerlikService.siralamayi_hesapla(simdi, parti_boyutu=2)
+
+        monkeypatch.setattr(servisler, 'np', None)
+        assert PopulerlikService.siralamayi_hesapla(simdi) == vektorel
+
+        # Anlık görüntüyle de aynı sıralama
+        monkeypatch.setattr(servisler, 'np', pytest.importorskip('numpy'))
+        _, anlik = PopulerlikService._hesapla(simdi - timedelta(days=1), 2, None)
+        Hayvan.objects.filter(pk=hayvanlar['eski'].pk).update(view_count=5400)
+        vektorel = PopulerlikService.siralamayi_hesapla(simdi, parti_boyutu=2, onceki=anlik)
+        monkeypatch.setattr(servisler, 'np', None)
+        assert PopulerlikService.siralamayi_hesapla(simdi, onceki=anlik) == vektorel
+
+    def test_populer_tek_sorgu(self, hayvanlar):
+        PopulerlikService.siralamayi_guncelle()
+
+        with CaptureQueriesContext(connection) as ctx:
+            sonuc = HayvanService.populer_hayvanlar(10, tur='kedi', il_kodu=35)
+
+        assert [h.pk for h in sonuc] == [hayvanlar['populer'].pk, hayvanlar['eski'].pk]
+        assert len(ctx.captured_queries) == 1
+
+    def test_hesaplanmamissa_gorev_istenir(self, hayvanlar, django_capture_on_commit_callbacks):
+        """Cache boşken tam tablo sıralaması yok: en yeniler döner, görev bir kez eklenir"""
+        with django_capture_on_commit_callbacks(execute=True) as geri_cagrilar:
+            ilk = HayvanService.populer_hayvanlar(2)
+            HayvanService.populer_hayvanlar(2)
+
+        assert [h.pk for h in ilk] == [hayvanlar['kopek'].pk, hayvanlar['yeni'].pk]
+        assert len(geri_cagrilar) == 1
+        # Görev (testte senkron) sıralamayı yazdı
+        assert HayvanService.populer_hayvanlar(2)[0].pk == hayvanlar['populer'].pk
+        assert PopulerlikService.populer_idler('kus', 81) == []
+
+    def test_pasiflesen_kayit_atlanir(self, hayvanlar):
+        PopulerlikService.siralamayi_guncelle()
+        Hayvan.objects.filter(pk=hayvanlar['populer'].pk).update(aktif=False)
+
+        response = APIClient().get('/api/v1/hayvanlar/populer/', {'tur': 'kedi', 'il': 'izmir'})
+
+        assert [h['id'] for h in response.json()['data']] == [hayvanlar['eski'].pk]
+
+
+@pytest.mark.django_db
+class TestEslesme:
+    """Profil ↔ hayvan uyum puanı ve paylaşılan, artımlı özellik dizileri"""
+
+    @pytest.fixture(autouse=True)
+    def temiz_indeks(self, monkeypatch, settings):
+        # Diziler süreçler arasında cache üzerinden paylaşılır
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        cache.clear()
+        EslesmeService._bellek = (None, None, 0.0)
+        # Her çağrıda sürüm kontrolü
+        monkeypatch.setattr(EslesmeService, 'YENILEME_ARALIGI', 0)
+        yield
+        EslesmeService._bellek = (None, None, 0.0)
+        cache.clear()
+
+    @pytest.fixture
+    def hayvanlar(self):
+        hayvanlar = {
+            'kucuk_sakin': Hayvan.objects.create(
+                ad="Pamuk", tur="kedi", boyut="xs", yas="adult", il="İstanbul",
+                karakter_ozellikleri=["calm", "friendly"]),
+            'buyuk_enerjik': Hayvan.objects.create(
+                ad="Karabaş", tur="kopek", boyut="xl", yas="young", il="İstanbul",
+                karakter_ozellikleri=["energetic", "protective"]),
+            'uzak': Hayvan.objects.create(
+                ad="Tekir", tur="kedi", boyut="xs", yas="adult", il="Van",
+                karakter_ozellikleri=["calm", "friendly"]),
+        }
+        EslesmeService.paylasilan_indeksi_guncelle()
+        return hayvanlar
+
+    def _kullanici(self, **profil):
+        kullanici = CustomUser.objects.create_user(
+            email=f"{len(profil)}@example.com", password="GucluSifre123!",
+            first_name="Ayşe", last_name="Kaya", sehir="istanbul",
+        )
+        if profil:
+            KullaniciProfil.objects.create(kullanici=kullanici, **profil)
+            kullanici.refresh_from_db()
+        return kullanici
+
+    def test_apartman_ve_ilk_sahiplenme(self, hayvanlar):
+        kullanici = self._kullanici(ev_tipi='apartman', hayvan_deneyimi_yil=0)
+
+        sonuc = EslesmeService.eslesmeler(kullanici, onbellek=False)
+
+        assert [h.pk for h in sonuc] == [
+            hayvanlar['kucuk_sakin'].pk, hayvanlar['uzak'].pk, hayvanlar['buyuk_enerjik'].pk
+        ]
+        assert sonuc[0].uyum_puani > sonuc[1].uyum_puani > sonuc[2].uyum_puani
+        assert 0 <= sonuc[2].uyum_puani <= sonuc[0].uyum_puani <= 100
+        assert sonuc[0].mesafe_km < 50 < sonuc[1].mesafe_km
+        kodlar = {a['kod'] for a in sonuc[0].aciklamalar}
+        assert 'boyut:xs' in kodlar
+        assert any(a['etki'] < 0 for a in sonuc[2].aciklamalar)
+
+    def test_bahceli_deneyimli(self, hayvanlar):
+        kullanici = self._kullanici(ev_tipi='mustakil', bahce_var_mi=True, hayvan_deneyimi_yil=8)
+
+        sonuc = EslesmeService.eslesmeler(kullanici, onbellek=False)
+
+        assert sonuc[0].pk == hayvanlar['buyuk_enerjik'].pk
+        assert EslesmeService.eslesmeler(kullanici, tur='kedi', onbellek=False)[0].tur == 'kedi'
+
+    def test_artimli_guncelleme(self, hayvanlar):
+        kullanici = self._kullanici(ev_tipi='apartman')
+        eski = EslesmeService.indeks()
+        kuruldu = cache.get(EslesmeService.INDEKS_ANAHTARI)[2]
+
+        yeni = Hayvan.objects.create(ad="Minnoş", tur="kedi", boyut="xs", il="İstanbul",
+                                     karakter_ozellikleri=["calm", "friendly", "affectionate"])
+        hayvanlar['kucuk_sakin'].sahiplenildi = True
+        hayvanlar['kucuk_sakin'].save()
+        # Görev değişen satırları yazar, sahiplenilen satırı çıkarır
+        assert EslesmeService.paylasilan_indeksi_guncelle() == 3
+
+        sonuc = EslesmeService.eslesmeler(kullanici, onbellek=False)
+
+        indeks = EslesmeService.indeks()
+        assert indeks is not eski
+        assert cache.get(EslesmeService.INDEKS_ANAHTARI)[2] == kuruldu
+        assert sonuc[0].pk == yeni.pk
+        assert hayvanlar['kucuk_sakin'].pk not in [h.pk for h in sonuc]
+        assert hayvanlar['kucuk_sakin'].pk not in indeks._diziler['idler']
+
+        # Değişiklik yoksa yeni sürüm yayınlanmaz
+        surum = cache.get(EslesmeService.SURUM_ANAHTARI)
+        EslesmeService.paylasilan_indeksi_guncelle()
+        assert cache.get(EslesmeService.SURUM_ANAHTARI) == surum
+
+    def test_paylasilan_surum_yuklenir(self, hayvanlar):
+        # Süreç dizileri kurmaz, görevin yazdığı sürümü yükler
+        eski = EslesmeService.indeks()
+        assert EslesmeService._bellek[1] == cache.get(EslesmeService.SURUM_ANAHTARI)
+        assert len(eski) == 3
+
+        # Yeni sürüm yayınlanınca sonraki kontrolde devreye girer
+        Hayvan.objects.filter(pk=hayvanlar['uzak'].pk).update(aktif=False)
+        EslesmeService.paylasilan_indeksi_guncelle(sifirdan=True)
+        yeni = EslesmeService.indeks()
+        assert yeni is not eski
+        assert len(yeni) == 2
+
+    def test_diziler_yokken_yedek_liste(self, hayvanlar, django_capture_on_commit_callbacks):
+        kullanici = self._kullanici(ev_tipi='apartman')
+        cache.clear()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            sonuc = EslesmeService.eslesmeler(kullanici, onbellek=False)
+
+        # İstek dizi kurmaz: puansız popüler liste döner, kurulum kuyruğa eklenir
+        assert sonuc
+        assert {h.pk for h in sonuc} <= {h.pk for h in hayvanlar.values()}
+        assert all(h.uyum_puani is None for h in sonuc)
+        assert EslesmeService.eslesmeler(kullanici, onbellek=False)[0].uyum_puani is not None
+
+    def test_profil_kaydi_eslesmeleri_hesaplatir(self, hayvanlar, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True) as geri_cagrilar:
+            kullanici = self._kullanici(ev_tipi='apartman')
+
+        assert len(geri_cagrilar) == 1
+        profil = EslesmeService.profil_agirliklari(kullanici)
+        assert cache.get(EslesmeService._cache_anahtari(kullanici, profil, 10, None)) is not None
+
+    def test_numpy_ve_saf_python_ayni(self, hayvanlar, monkeypatch):
+        from apps.hayvanlar import eslesme
+        if eslesme.np is None:
+            pytest.skip("numpy kurulu değil")
+        kullanici = self._kullanici(ev_tipi='apartman', diger_hayvanlar='Bir kedim var')
+        profil = EslesmeService.profil_agirliklari(kullanici)
+        indeks = EslesmeService.indeks()
+        assert all(isinstance(sutun, bytes) for sutun in cache.get(EslesmeService.INDEKS_ANAHTARI)[3].values())
+        vektorel = indeks.puanla(profil, 10)
+
+        monkeypatch.setattr(eslesme, 'np', None)
+        saf = EslesmeService._kur()[0].puanla(profil, 10)
+
+        assert [s['id'] for s in saf] == [v['id'] for v in vektorel]
+        assert [s['uyum_puani'] for s in saf] == [v['uyum_puani'] for v in vektorel]
+        assert [s['aciklamalar'] for s in saf] == [v['aciklamalar'] for v in vektorel]
+
+    def test_endpoint(self, hayvanlar):
+        client = APIClient()
+        url = '/api/v1/hayvanlar/eslesmeler/'
+        assert client.get(url).status_code in (401, 403)
+
+        client.force_authenticate(self._kullanici(ev_tipi='apartman'))
+        response = client.get(url, {'limit': 2})
+
+        assert response.status_code == 200
+        data = response.json()['data']
+        assert [h['id'] for h in data] == [hayvanlar['kucuk_sakin'].pk, hayvanlar['uzak'].pk]
+        assert {'uyum_puani', 'mesafe_km', 'aciklamalar'} <= set(data[0])
@@ -0,0 +1,598 @@
+"""
+🐾 Evcil Hayvan Platformu - Hayvan Views Testleri
+==============================================================================
+Hayvan API endpoint testleri
+==============================================================================
+"""
+
+import pytest
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.hayvanlar.models import Hayvan, HayvanFotograf, KopekIrk
+from apps.hayvanlar.servisler import HayvanService, PopulerlikService
+from apps.ortak import sayac_tamponu, tasks
+
+
+LISTE_URL = '/api/v1/hayvanlar/'
+
+
+@pytest.fixture
+def api_client():
+    """API istekleri için client"""
+    return APIClient()
+
+
+def _hayvanlar_olustur(adet):
+    """Her biri iki fotoğraflı test hayvanları oluştur"""
+    hayvanlar = [
+        Hayvan.objects.create(ad=f"Boncuk {i}", tur="kedi")
+        for i in range(adet)
+    ]
+    # save() içindeki thumbnail üretimini atlamak için bulk_create
+    HayvanFotograf.objects.bulk_create([
+        HayvanFotograf(hayvan=hayvan, fotograf=f"hayvanlar/fotograflar/{hayvan.pk}-{sira}.jpg",
+                       kapak_fotografi=(sira == 1), sira=sira)
+        for hayvan in hayvanlar
+        for sira in range(2)
+    ])
+    return hayvanlar
+
+
+def _sorgu_sayisi(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    return len(ctx.captured_queries), response
+
+
+@pytest.mark.django_db
+class TestHayvanListeSorgulari:
+    """Liste endpoint'lerinin sorgu sayısı regresyon testleri"""
+
+    def test_liste_sorgu_sayisi_sayfa_boyutundan_bagimsiz(self, api_client):
+        """Sayfa boyutu ne olursa olsun sorgu sayısı sabit kalmalı"""
+        _hayvanlar_olustur(30)
+
+        kucuk, _ = _sorgu_sayisi(api_client, f"{LISTE_URL}?page_size=5")
+        buyuk, response = _sorgu_sayisi(api_client, f"{LISTE_URL}?page_size=30")
+
+        assert len(response.data['results']) == 30
+        assert kucuk == buyuk
+        # COUNT(*) + sayfa sorgusu
+        assert buyuk == 2
+
+    def test_kapak_fotografi_onceligi(self, api_client):
+        """Kapak işaretli fotoğraf, ilk fotoğrafa tercih edilmeli"""
+        hayvan = _hayvanlar_olustur(1)[0]
+
+        response = api_client.get(LISTE_URL)
+
+        url = response.data['results'][0]['kapak_fotografi_url']
+        assert url.endswith(f"{hayvan.pk}-1.jpg")
+        assert hayvan.kapak_fotografi.fotograf.name.endswith(f"{hayvan.pk}-1.jpg")
+
+    def test_fotografsiz_hayvan(self, api_client):
+        """Fotoğrafı olmayan hayvan için URL None olmalı"""
+        Hayvan.objects.create(ad="Pamuk", tur="kedi")
+
+        response = api_client.get(LISTE_URL)
+
+        assert response.data['results'][0]['kapak_fotografi_url'] is None
+
+    @pytest.mark.parametrize('action', ['populer', 'son_eklenenler'])
+    def test_vitrin_sorgu_sayisi(self, api_client, action):
+        """Popüler ve son eklenenler tek sorguda gelmeli"""
+        _hayvanlar_olustur(10)
+
+        sorgu, response = _sorgu_sayisi(api_client, f"{LISTE_URL}{action}/")
+
+        assert len(response.data['data']) == 10
+        assert sorgu == 1
+
+
+@pytest.mark.django_db
+class TestHayvanArama:
+    """`search` parametresi ile arama testleri"""
+
+    def test_ad_ve_aciklamada_arama(self, api_client):
+        """Ad ve açıklamada geçen terim bulunmalı"""
+        Hayvan.objects.create(ad="Tarçın", tur="kedi")
+        Hayvan.objects.create(ad="Pamuk", tur="kedi", aciklama="Tarçın ile büyüdü")
+        Hayvan.objects.create(ad="Zeytin", tur="kedi")
+
+        response = api_client.get(LISTE_URL, {'search': 'Tarçın'})
+
+        adlar = {hayvan['ad'] for hayvan in response.data['results']}
+        assert adlar == {"Tarçın", "Pamuk"}
+
+    def test_irk_adinda_arama(self, api_client):
+        """Irk adı üzerinden arama yapılabilmeli"""
+        irk = KopekIrk.objects.create(id='kangal', ad='Kangal')
+        Hayvan.objects.create(ad="Paşa", tur="kopek", irk=irk)
+        Hayvan.objects.create(ad="Duman", tur="kopek")
+
+        response = api_client.get(LISTE_URL, {'search': 'kangal'})
+
+        assert [h['ad'] for h in response.data['results']] == ["Paşa"]
+
+    def test_servis_aramasi(self):
+        """HayvanService.hayvan_listele aynı arama yolunu kullanmalı"""
+        Hayvan.objects.create(ad="Boncuk", tur="kedi")
+        Hayvan.objects.create(ad="Fındık", tur="kedi")
+
+        sonuc = HayvanService.hayvan_listele({'search': 'bonc'})
+
+        assert [h.ad for h in sonuc] == ["Boncuk"]
+
+
+@pytest.mark.django_db
+class TestHayvanCursorSayfalama:
+    """`cursor` parametresi ile keyset sayfalama testleri"""
+
+    def test_tum_sayfalar_tekrarsiz_gezilir(self, api_client):
+        """Aynı created_at'e sahip kayıtlar dahil her hayvan bir kez gelmeli"""
+        ayni_an = timezone.now()
+        hayvanlar = [
+            Hayvan.objects.create(ad=f"Duman {i}", tur="kedi", created_at=ayni_an)
+            for i in range(7)
+        ]
+
+        gorulen = []
+        url = f"{LISTE_URL}?cursor=&page_size=3"
+        while url:
+            response = api_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            gorulen.extend(h['id'] for h in response.data['results'])
+            url = response.data['links']['next']
+
+        # (-created_at, id): eşit zamanlarda id artan sırada
+        assert gorulen == sorted(h.pk for h in hayvanlar)
+
+    def test_onceki_sayfa(self, api_client):
+        """previous linki bir önceki sayfayı aynı sırayla döndürmeli"""
+        _hayvanlar_olustur(5)
+
+        ilk = api_client.get(LISTE_URL, {'cursor': '', 'page_size': 2}).data
+        ikinci = api_client.get(ilk['links']['next']).data
+        geri = api_client.get(ikinci['links']['previous']).data
+
+        assert ilk['links']['previous'] is None
+        assert [h['id'] for h in geri['results']] == [h['id'] for h in ilk['results']]
+
+    def test_zarf_ve_sayim_modlari(self, api_client):
+        """Zarf korunmalı, count=none ile COUNT(*) çalışmamalı"""
+        _hayvanlar_olustur(3)
+
+        tam = api_client.get(LISTE_URL, {'cursor': ''}).data
+        sorgu, response = _sorgu_sayisi(api_client, f"{LISTE_URL}?cursor=&count=none")
+
+        assert set(tam) == {'links', 'count', 'page_size', 'results'}
+        assert tam['count'] == 3
+        assert response.data['count'] is None
+        assert sorgu == 1
+
+    def test_farkli_siralama_korunur(self, api_client):
+        """?ordering=yas ile cursor sayfalama sırayı ezmemeli"""
+        Hayvan.objects.create(ad="Paşa", tur="kopek", yas="senior")
+        Hayvan.objects.create(ad="Pamuk", tur="kedi", yas_ay=4)
+
+        response = api_client.get(LISTE_URL, {'cursor': '', 'ordering': 'yas'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [h['ad'] for h in response.data['results']] == ["Pamuk", "Paşa"]
+        assert 'current_page' in response.data
+
+    def test_gecersiz_cursor(self, api_client):
+        """Bozuk cursor 404 dönmeli"""
+        response = api_client.get(LISTE_URL, {'cursor': 'bozuk!'})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestYakinHayvanlar:
+    """Mesafeye göre sıralı yakınlık araması"""
+
+    YAKIN_URL = f'{LISTE_URL}yakindakiler/'
+
+    @pytest.fixture
+    def hayvanlar(self):
+        return {
+            'kadikoy': Hayvan.objects.create(ad="Pamuk", tur="kedi", il="İstanbul", ilce="Kadıköy"),
+            'sariyer': Hayvan.objects.create(ad="Karabaş", tur="kopek", il="İstanbul", ilce="Sarıyer"),
+            'kocaeli': Hayvan.objects.create(ad="Tekir", tur="kedi", il="Kocaeli"),
+            'ankara': Hayvan.objects.create(ad="Zeytin", tur="kedi", il="Ankara"),
+        }
+
+    def test_koordinat_kayitta_atanir(self, hayvanlar):
+        assert (hayvanlar['kadikoy'].enlem, hayvanlar['kadikoy'].boylam) == (40.99, 29.03)
+        # Veri setinde olmayan ilçe il merkezini kullanır
+        hayvan = Hayvan.objects.create(ad="Minnoş", tur="kedi", il="Ankara", ilce="Bilinmeyen")
+        assert (hayvan.enlem, hayvan.boylam) == (39.93, 32.86)
+
+    def test_servis_mesafeye_gore_sirali(self, hayvanlar):
+        # Üsküdar civarı
+        sonuc = HayvanService.yakindakiler(41.02, 29.02, yaricap_km=100)
+
+        assert [h.pk for h in sonuc] == [
+            hayvanlar['kadikoy'].pk, hayvanlar['sariyer'].pk, hayvanlar['kocaeli'].pk
+        ]
+        assert sonuc[0].mesafe_km < sonuc[1].mesafe_km < sonuc[2].mesafe_km < 100
+
+    def test_sinir_kutusu_on_filtresi(self, hayvanlar):
+        with CaptureQueriesContext(connection) as ctx:
+            HayvanService.yakindakiler(41.02, 29.02, yaricap_km=30)
+
+        assert 'BETWEEN' in ctx.captured_queries[0]['sql'].upper()
+        assert len(ctx.captured_queries) == 2
+
+    def test_endpoint_header_ve_filtre(self, api_client, hayvanlar):
+        response = api_client.get(
+            self.YAKIN_URL, {'yaricap': 100, 'tur': 'kedi'},
+            HTTP_X_LATITUDE='41.02', HTTP_X_LONGITUDE='29.02',
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()['data']
+        assert [h['ad'] for h in data] == ["Pamuk", "Tekir"]
+        assert data[0]['il_kod'] == 34
+        assert data[0]['mesafe_km'] < data[1]['mesafe_km']
+        # Kocaeli kaydının ilçesi yok: mesafe il merkezine göre
+        assert [h['konum_hassasiyeti'] for h in data] == ['ilce', 'il']
+
+    def test_gecersiz_konum(self, api_client):
+        assert api_client.get(self.YAKIN_URL).status_code == status.HTTP_400_BAD_REQUEST
+        assert api_client.get(
+            self.YAKIN_URL, {'enlem': 'abc', 'boylam': 29}
+        ).status_code == status.HTTP_400_BAD_REQUEST
+        assert api_client.get(
+            self.YAKIN_URL, {'enlem': 95, 'boylam': 29}
+        ).status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestHayvanFasetleri:
+    """Filtrelenmiş küme için faset sayıları"""
+
+    FASET_URL = f'{LISTE_URL}facets/'
+
+    @pytest.fixture
+    def hayvanlar(self):
+        return [
+            Hayvan.objects.create(ad="Pamuk", tur="kedi", cinsiyet="female", il="İzmir"),
+            Hayvan.objects.create(ad="Tekir", tur="kedi", cinsiyet="male", il="İzmir", sahiplenildi=True),
+            Hayvan.objects.create(ad="Karabaş", tur="kopek", cinsiyet="male", il="Ankara"),
+            Hayvan.objects.create(ad="Gizli", tur="kedi", il="Ankara", aktif=False),
+        ]
+
+    @staticmethod
+    def _sayilar(faset):
+        return {satir['deger']: satir['adet'] for satir in faset}
+
+    def test_tek_sorguda_tum_fasetler(self, api_client, hayvanlar):
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(self.FASET_URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(ctx.captured_queries) == 1
+        data = response.json()['data']
+        assert data['toplam'] == 3
+        assert self._sayilar(data['fasetler']['tur']) == {'kedi': 2, 'kopek': 1}
+        assert self._sayilar(data['fasetler']['cinsiyet']) == {'male': 2, 'female': 1}
+        assert self._sayilar(data['fasetler']['sahiplenildi']) == {True: 1, False: 2}
+        assert data['fasetler']['il'][0] == {'deger': 35, 'ad': 'İzmir', 'adet': 2}
+        assert data['fasetler']['yas'] == []
+
+    def test_filtreler_uygulanir(self, api_client, hayvanlar):
+        data = api_client.get(self.FASET_URL, {'tur': 'kedi', 'page': 2}).json()['data']
+
+        assert data['toplam'] == 2
+        assert self._sayilar(data['fasetler']['il']) == {35: 2}
+
+    def test_cache_ve_yazimda_gecersiz_kilma(self, api_client, hayvanlar, settings,
+                                             django_capture_on_commit_callbacks):
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'faset-test',
+        }}
+        api_client.get(self.FASET_URL, {'tur': 'kedi'})
+
+        # Aynı filtre kümesi (farklı sayfa parametresiyle) cache'ten gelir
+        with CaptureQueriesContext(connection) as ctx:
+            data = api_client.get(self.FASET_URL, {'page': 2, 'tur': 'kedi'}).json()['data']
+        assert len(ctx.captured_queries) == 0
+        assert data['toplam'] == 2
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Hayvan.objects.create(ad="Minnoş", tur="kedi", il="İzmir")
+        assert api_client.get(self.FASET_URL, {'tur': 'kedi'}).json()['data']['toplam'] == 3
+
+    def test_kanonik_parametreler(self):
+        from django.http import QueryDict
+        from apps.hayvanlar.filters import HayvanFilter
+
+        a = HayvanFilter.kanonik_parametreler(QueryDict('tur=kedi&il=35&page=3&cinsiyet='))
+        b = HayvanFilter.kanonik_parametreler(QueryDict('il=35&tur=kedi&ordering=ad'))
+        assert a == b == 'il=35&tur=kedi'
+
+    def test_grouping_satirlari(self):
+        from apps.hayvanlar.managers import grouping_satirlarini_coz
+
+        # GROUPING(f0, f1): f0 gruplanınca 0b01, f1 gruplanınca 0b10, toplam 0b11
+        satirlar = [(0b01, 'kedi', None, 2), (0b01, 'kopek', None, 1),
+                    (0b10, None, 35, 3), (0b10, None, None, 4), (0b11, None, None, 7)]
+        assert grouping_satirlarini_coz(['tur', 'il_kod'], satirlar) == (
+            7, {'tur': {'kedi': 2, 'kopek': 1}, 'il_kod': {35: 3}}
+        )
+
+
+@pytest.mark.django_db
+class TestYasBoyutAraliklari:
+    """Sayısal yaş/boyut sütunları, aralık filtreleri ve sıralama"""
+
+    @pytest.fixture
+    def hayvanlar(self):
+        return {
+            'yavru': Hayvan.objects.create(ad="Pamuk", tur="kedi", yas_ay=4, boyut="xs"),
+            'genc': Hayvan.objects.create(ad="Tekir", tur="kedi", yas="young", boyut="sm"),
+            'yetiskin': Hayvan.objects.create(ad="Karabaş", tur="kopek", yas_ay=36, boyut="lg"),
+            'yasli': Hayvan.objects.create(ad="Paşa", tur="kopek", yas="senior", boyut="md"),
+        }
+
+    def _adlar(self, api_client, **params):
+        response = api_client.get(LISTE_URL, params)
+        assert response.status_code == status.HTTP_200_OK
+        return [hayvan['ad'] for hayvan in response.json()['results']]
+
+    def test_yas_ve_kategori_tutarli(self, hayvanlar):
+        assert hayvanlar['yavru'].yas == 'baby'
+        assert hayvanlar['yetiskin'].yas == 'adult'
+        assert hayvanlar['genc'].yas_ay is None
+        assert hayvanlar['genc'].yas_sira == 15
+        assert hayvanlar['yasli'].boyut_sira == 3
+
+        hayvan = Hayvan.objects.get(pk=hayvanlar['yetiskin'].pk)
+        hayvan.yas = 'senior'
+        hayvan.save(update_fields=['yas'])
+        hayvan.refresh_from_db()
+        assert (hayvan.yas_ay, hayvan.yas_sira) == (None, 120)
+
+        hayvan.yas_ay = 10
+        hayvan.save(update_fields=['yas_ay'])
+        hayvan.refresh_from_db()
+        assert hayvan.yas == 'young'
+
+    def test_yas_araligi(self, api_client, hayvanlar):
+        # 2 yaşından küçükler
+        assert set(self._adlar(api_client, yas_max=24)) == {"Pamuk", "Tekir"}
+        assert set(self._adlar(api_client, yas_min=24, yas_max=100)) == {"Karabaş", "Paşa"}
+        # Ayı bilinmeyen yetişkin kategori sınırıyla eşleşir
+        Hayvan.objects.create(ad="Zeytin", tur="kedi", yas="adult")
+        assert set(self._adlar(api_client, yas_max=36)) == {"Pamuk", "Tekir", "Karabaş", "Zeytin"}
+        assert set(self._adlar(api_client, yas_min=90)) == {"Paşa"}
+        # Temsili yaşı (3) sınırın altında kalan yavru kategorisi de eşleşir
+        Hayvan.objects.create(ad="Fındık", tur="kedi", yas="baby")
+        assert "Fındık" in self._adlar(api_client, yas_min=5)
+        assert "Pamuk" not in self._adlar(api_client, yas_min=5)
+
+    def test_temsili_yas_apiye_cikmaz(self, api_client, hayvanlar):
+        response = api_client.get(LISTE_URL, {'yas': 'young'})
+        assert response.json()['results'][0]['yas_ay'] is None
+
+    def test_boyut_araligi(self, api_client, hayvanlar):
+        assert set(self._adlar(api_client, boyut_min='md')) == {"Karabaş", "Paşa"}
+        assert set(self._adlar(api_client, boyut_min=2, boyut_max='md')) == {"Tekir", "Paşa"}
+        assert self._adlar(api_client, boyut_min='dev') == []
+
+    def test_yasa_gore_siralama_sayisal(self, api_client, hayvanlar):
+        assert self._adlar(api_client, ordering='yas') == ["Pamuk", "Tekir", "Karabaş", "Paşa"]
+        assert self._adlar(api_client, ordering='-boyut') == ["Karabaş", "Paşa", "Tekir", "Pamuk"]
+
+
+class _SahteRedis:
+    """Sayaç tamponunun kullandığı Redis komutlarının bellek içi karşılığı"""
+
+    def __init__(self):
+        self.veri = {}
+
+    def pipeline(self, transaction=True):
+        return _SahteBoruHatti(self)
+
+    def hincrby(self, anahtar, alan, miktar):
+        hash_ = self.veri.setdefault(anahtar, {})
+        hash_[alan] = hash_.get(alan, 0) + miktar
+        return hash_[alan]
+
+    def hlen(self, anahtar):
+        return len(self.veri.get(anahtar, {}))
+
+    def hmget(self, anahtar, alanlar):
+        return [self.veri.get(anahtar, {}).get(alan) for alan in alanlar]
+
+    def hgetall(self, anahtar):
+        return dict(self.veri.get(anahtar, {}))
+
+    def exists(self, anahtar):
+        return int(anahtar in self.veri)
+
+    def set(self, anahtar, deger, nx=False, ex=None):
+        if nx and anahtar in self.veri:
+            return None
+        self.veri[anahtar] = deger
+        return True
+
+    def rename(self, eski, yeni):
+        self.veri[yeni] = self.veri.pop(eski)
+
+    def delete(self, *anahtarlar):
+        for anahtar in anahtarlar:
+            self.veri.pop(anahtar, None)
+
+
+class _SahteBoruHatti:
+    def __init__(self, istemci):
+        self.istemci = istemci
+        self.komutlar = []
+
+    def __getattr__(self, ad):
+        def ekle(*args, **kwargs):
+            self.komutlar.append((ad, args, kwargs))
+            return self
+        return ekle
+
+    def execute(self):
+        return [getattr(self.istemci, ad)(*args, **kwargs) for ad, args, kwargs in self.komutlar]
+
+
+@pytest.mark.django_db
+class TestTamponluSayaclar:
+    """Görüntülenme/beğeni sayaçları tamponda birikir, toplu yazılır"""
+
+    @pytest.fixture(autouse=True)
+    def temiz_tampon(self, settings):
+        # Testte kendiliğinden boşaltma olmasın
+        settings.SAYAC_TAMPONU_BOSALTMA_SANIYE = 3600
+        sayac_tamponu.sifirla()
+        yield
+        sayac_tamponu.sifirla()
+
+    @pytest.fixture
+    def hayvanlar(self):
+        return [Hayvan.objects.create(ad=f"Boncuk {i}", tur="kedi") for i in range(3)]
+
+    def test_artis_veritabanina_gitmez(self, hayvanlar):
+        hayvan = hayvanlar[0]
+        with CaptureQueriesContext(connection) as ctx:
+            hayvan.increment_views()
+            hayvan.increment_views()
+            hayvan.increment_likes()
+
+        assert len(ctx.captured_queries) == 0
+        assert hayvan.guncel_sayaclar() == {'view_count': 2, 'like_count': 1, 'share_count': 0}
+        hayvan.refresh_from_db()
+        assert hayvan.view_count == 0
+
+    def test_bosaltma_tek_update(self, hayvanlar):
+        for hayvan in hayvanlar:
+            hayvan.increment_views()
+        hayvanlar[1].increment_shares()
+
+        with CaptureQueriesContext(connection) as ctx:
+            assert tasks.sayac_tamponunu_bosalt() == 3
+
+        guncellemeler = [q for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]
+        assert len(guncellemeler) == 1
+        assert list(Hayvan.objects.order_by('id').values_list('view_count', 'share_count')) == [
+            (1, 0), (1, 1), (1, 0)
+        ]
+        assert sayac_tamponu.bekleyen_farklar(
+            Hayvan, [h.pk for h in hayvanlar], ['view_count', 'share_count']
+        ) == {}
+
+    def test_kayit_bosaltilan_sayaci_ezmez(self, hayvanlar):
+        hayvan = Hayvan.objects.get(pk=hayvanlar[0].pk)
+        hayvan.increment_views()
+        sayac_tamponu.bosalt()
+
+        hayvan.ad = "Pamuk"
+        hayvan.save()
+
+        hayvan.refresh_from_db()
+        assert (hayvan.ad, hayvan.view_count) == ("Pamuk", 1)
+
+    def test_silinmis_kayit_yeniden_eklenir(self, hayvanlar):
+        hayvan = Hayvan.objects.get(pk=hayvanlar[0].pk)
+        Hayvan.objects.filter(pk=hayvan.pk).delete()
+
+        hayvan.save()
+
+        assert Hayvan.objects.filter(pk=hayvan.pk).exists()
+
+    def test_redis_beat_gecikirse_yazma_yolunda_bosaltilir(self, hayvanlar, monkeypatch,
+                                                           django_capture_on_commit_callbacks):
+        istemci = _SahteRedis()
+        monkeypatch.setattr(sayac_tamponu, '_redis', lambda: istemci)
+
+        # Son boşaltma işareti yok: beat çalışmıyor, artış hemen yazılır
+        with django_capture_on_commit_callbacks(execute=True):
+            hayvanlar[0].increment_views()
+        assert Hayvan.objects.get(pk=hayvanlar[0].pk).view_count == 1
+
+        # İşaret taze: artış tamponda bekler
+        hayvanlar[0].increment_views()
+        assert Hayvan.objects.get(pk=hayvanlar[0].pk).view_count == 1
+        assert sayac_tamponu.bekleyen_farklar(Hayvan, [hayvanlar[0].pk], ['view_count']) == {
+            str(hayvanlar[0].pk): {'view_count': 1}
+        }
+
+        # Tampon sınırı aşılınca (kilit süresi dolduktan sonra) boşaltılır
+        monkeypatch.setattr(sayac_tamponu, 'MAKS_ALAN', 1)
+        istemci.delete(sayac_tamponu._redis_anahtari(sayac_tamponu.BOSALTMA_KILIDI))
+        hayvanlar[1].increment_views()
+        assert list(Hayvan.objects.order_by('id').values_list('view_count', flat=True)) == [2, 1, 0]
+
+    def test_redis_yazilamayan_farklar_sonraki_bosaltmada_islenir(
+            self, hayvanlar, monkeypatch, django_capture_on_commit_callbacks):
+        istemci = _SahteRedis()
+        monkeypatch.setattr(sayac_tamponu, '_redis', lambda: istemci)
+        istemci.set(sayac_tamponu._redis_anahtari(sayac_tamponu.SON_BOSALTMA_ANAHTARI), 1)
+        islenen = sayac_tamponu._redis_anahtari(sayac_tamponu.ISLENEN_ANAHTARI)
+        hayvanlar[0].increment_views()
+
+        # Yazım başarısız: farklar işleme anahtarında kalır ve okumalarda görünür
+        modele_yaz = sayac_tamponu._modele_yaz
+
+        def yazilamaz(*args, **kwargs):
+            raise DatabaseError("bağlantı koptu")
+
+        monkeypatch.setattr(sayac_tamponu, '_modele_yaz', yazilamaz)
+        with pytest.raises(DatabaseError):
+            sayac_tamponu.bosalt()
+        assert islenen in istemci.veri
+        assert sayac_tamponu.bekleyen_farklar(Hayvan, [hayvanlar[0].pk], ['view_count']) == {
+            str(hayvanlar[0].pk): {'view_count': 1}
+        }
+
+        # Sonraki boşaltma önce kalan anahtarı işler, yeni artış tamponda bekler
+        monkeypatch.setattr(sayac_tamponu, '_modele_yaz', modele_yaz)
+        hayvanlar[1].increment_views()
+        with django_capture_on_commit_callbacks(execute=True):
+            assert sayac_tamponu.bosalt() == 1
+        assert islenen not in istemci.veri
+        assert list(Hayvan.objects.order_by('id').values_list('view_count', flat=True)) == [1, 0, 0]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            assert sayac_tamponu.bosalt() == 1
+        assert list(Hayvan.objects.order_by('id').values_list('view_count', flat=True)) == [1, 1, 0]
+
+    def test_detay_goruntulenme_sayar(self, api_client, hayvanlar):
+        url = f'{LISTE_URL}{hayvanlar[0].pk}/'
+        api_client.get(url)
+        response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['view_count'] == 2
+        sayac_tamponu.bosalt()
+        assert Hayvan.objects.get(pk=hayvanlar[0].pk).view_count == 2
+
+    def test_populer_sayaclara_gore(self, api_client, hayvanlar, settings):
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        cache.clear()
+        Hayvan.objects.filter(pk=hayvanlar[0].pk).update(view_count=10)
+        # Bekleyen 3 beğeni (15 puan) kalıcı 10 görüntülenmeyi geçer;
+        # sıralama görevi önce tamponu boşaltır
+        for _ in range(3):
+            hayvanlar[2].increment_likes()
+        PopulerlikService.siralamayi_guncelle()
+
+        response = api_client.get(f'{LISTE_URL}populer/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [h['id'] for h in response.json()['data']] == [
+            hayvanlar[2].pk, hayvanlar[0].pk, hayvanlar[1].pk
+        ]
+
@@ -6,29 +6,45 @@ Hayvanlarla ilgili yardımcı işlevler ve araçlar
 """
 
 import os
+import time
 from io import BytesIO
-from PIL import Image
+from PIL import Image, ImageOps
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 
 
+# Üretilen genişlikler (px) ve formatlar: (format, uzantı, kayıt ayarları)
+VARYANT_GENISLIKLERI = (320, 640, 1280)
+VARYANT_FORMATLARI = (
+    ('JPEG', 'jpg', {'quality': 82, 'progressive': True}),
+    ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+)
+
+# İşlem bitene kadar gösterilen yer tutucu (4:3 gri SVG)
+FOTOGRAF_PLACEHOLDER = (
+    "data:image/svg+xml;utf8,"
+    "<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 4 3'>"
+    "<rect width='4' height='3' fill='%23e5e7eb'/></svg>"
+)
+
+
 def create_thumbnail(photo_field, size=(300, 300)):
     """
     Fotoğraf için thumbnail oluşturur
     
+    Dosya storage üzerinden stream olarak okunur (S3 vb. ile de çalışır).
+    
     Args:
         photo_field: ImageField
         size: (genişlik, yükseklik) tuple
         
     Returns:
-        ContentFile: Thumbnail dosyası
+        str: Kaydedilen thumbnail yolu
     """
-    # Orijinal resmi aç
-    file_path = photo_field.path
-    thumbnail_name = f"thumb_{os.path.basename(file_path)}"
+    thumbnail_name = f"thumb_{os.path.basename(photo_field.name)}"
     
     # Resmi işle
-    with Image.open(file_path) as img:
+    with photo_field.open('rb') as kaynak, Image.open(kaynak) as img:
         # Doğru oran ile küçült
         img.thumbnail(size, Image.LANCZOS)
         
@@ -36,13 +52,77 @@ def create_thumbnail(photo_field, size=(300, 300)):
         thumb_io = BytesIO()
         img_format = img.format if img.format else 'JPEG'
         img.save(thumb_io, format=img_format, quality=85)
-        thumb_io.seek(0)
         
         # Dosya yolu oluştur
         thumbnail_path = os.path.join('hayvanlar/thumbnails', thumbnail_name)
         
         # Kaydet ve döndür
-        return default_storage.save(thumbnail_path, ContentFile(thumb_io.read()))
+        return photo_field.storage.save(thumbnail_path, ContentFile(thumb_io.getvalue()))
+
+
+def fotograf_varyantlari_uret(kaynak, storage=None, hedef_klasor='hayvanlar/varyantlar',
+                              genislikler=VARYANT_GENISLIKLERI, formatlar=VARYANT_FORMATLARI):
+    """
+    Fotoğraftan farklı genişlik ve formatlarda varyantlar üretir
+    
+    Kaynak bir dosya nesnesi (stream) olarak okunur, varyantlar storage'a
+    yazılır; yerel dosya yolu gerekmez. JPEG kaynaklarda decoder doğrudan
+    en büyük hedef boyuta yakın ölçekte açılır (draft), küçük varyantlar
+    bir öncekinden küçültülür.
+    
+    Args:
+        kaynak: Okunabilir dosya nesnesi (adı `name` özelliğinden alınır)
+        storage: Hedef storage (varsayılan: default_storage)
+        
+    Returns:
+        dict: {'orijinal': {...}, 'varyantlar': [{'genislik', 'yukseklik',
+              'format', 'yol', 'boyut'}, ...], 'sure_ms': int}
+    """
+    storage = storage or default_storage
+    baslangic = time.perf_counter()
+    kok_ad = os.path.splitext(os.path.basename(getattr(kaynak, 'name', '') or 'fotograf'))[0]
+    
+    with Image.open(kaynak) as img:
+        orijinal = {'genislik': img.width, 'yukseklik': img.height, 'format': img.format}
+        
+        # Döndürme (EXIF) sonrası genişlik değişebilir: her iki kenar da yeterli kalsın
+        if img.format == 'JPEG':
+            img.draft('RGB', (max(genislikler), max(genislikler)))
+        
+        calisan = ImageOps.exif_transpose(img)
+        if calisan.mode not in ('RGB', 'L'):
+            calisan = calisan.convert('RGB')
+        
+        # Hedef genişlikler: orijinalden büyük olanlar üretilmez (en az bir varyant)
+        hedefler = sorted(
+            {min(genislik, calisan.width) for genislik in genislikler}, reverse=True
+        )
+        
+        varyantlar = []
+        for genislik in hedefler:
+            yukseklik = max(1, round(calisan.height * genislik / calisan.width))
+            if calisan.width != genislik:
+                calisan = calisan.resize((genislik, yukseklik), Image.LANCZOS, reducing_gap=3.0)
+            
+            for format_adi, uzanti, ayarlar in formatlar:
+                cikti = BytesIO()
+                calisan.save(cikti, format=format_adi, **ayarlar)
+                yol = storage.save(
+                    f"{hedef_klasor}/{kok_ad}_{genislik}.{uzanti}", ContentFile(cikti.getvalue())
+                )
+                varyantlar.append({
+                    'genislik': genislik,
+                    'yukseklik': yukseklik,
+                    'format': uzanti,
+                    'yol': yol,
+                    'boyut': cikti.tell(),
+                })
+    
+    return {
+        'orijinal': orijinal,
+        'varyantlar': sorted(varyantlar, key=lambda v: (v['format'], v['genislik'])),
+        'sure_ms': round((time.perf_counter() - baslangic) * 1000),
+    }
 
 
 def karakter_ozellikleri_listesi():
@@ -64,3 +144,26 @@ def karakter_ozellikleri_listesi():
         ('intelligent', 'Zeki', 'Yeni şeyleri hızlıca öğrenir'),
         ('curious', 'Meraklı', 'Keşfetmeyi ve araştırmayı sever')
     ]
+
+
+# Karakter özelliği -> bit (sıra kalıcıdır: yeni özellikler listenin sonuna eklenmeli)
+KARAKTER_BITLERI = {
+    anahtar: 1 << sira for sira, (anahtar, _ad, _aciklama) in enumerate(karakter_ozellikleri_listesi())
+}
+
+
+def karakter_maskesi_hesapla(ozellikler):
+    """
+    Karakter özelliği listesinin bit maskesi (tanımsız özellikler yok sayılır)
+    
+    Args:
+        ozellikler: ['playful', 'calm', ...]
+        
+    Returns:
+        int: Özelliklerin bitlerinin OR'u
+    """
+    maske = 0
+    for ozellik in ozellikler or []:
+        if isinstance(ozellik, str):
+            maske |= KARAKTER_BITLERI.get(ozellik.strip(), 0)
+    return maske
@@ -14,14 +14,24 @@ from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnl
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from apps.ortak import sayac_tamponu
 from apps.ortak.pagination import StandardPagination
+from apps.ortak.servisler import KonumService
 from .models import Hayvan, HayvanFotograf, KopekIrk
 from .serializers import (
     HayvanListSerializer, HayvanDetailSerializer, 
     HayvanCreateUpdateSerializer, HayvanFotografEkleSerializer,
-    KopekIrkSerializer
+    HayvanYakinSerializer, HayvanEslesmeSerializer, KopekIrkSerializer
 )
-from .filters import HayvanFilter
+from .filters import HayvanFilter, HayvanOrderingFilter
+from .servisler import EslesmeService, HayvanService
+
+# Yakınlık araması sınırları
+YAKIN_VARSAYILAN_YARICAP_KM = 25
+YAKIN_MAKS_YARICAP_KM = 500
+YAKIN_MAKS_LIMIT = 100
+# Eşleştirme sonuç sınırı
+ESLESME_MAKS_LIMIT = 50
 
 
 class HayvanViewSet(viewsets.ModelViewSet):
@@ -33,10 +43,10 @@ class HayvanViewSet(viewsets.ModelViewSet):
     queryset = Hayvan.objects.filter(aktif=True)
     permission_classes = [IsAuthenticatedOrReadOnly]
     pagination_class = StandardPagination
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    # Metin araması HayvanFilter.search üzerinden yapılır (HayvanQuerySet.ara)
+    filter_backends = [DjangoFilterBackend, HayvanOrderingFilter]
     filterset_class = HayvanFilter
-    search_fields = ['ad', 'aciklama', 'irk__ad', 'kategori__ad']
-    ordering_fields = ['created_at', 'ad', 'yas']
+    ordering_fields = ['created_at', 'ad', 'yas', 'boyut']
     ordering = ['-created_at']
     
     def get_serializer_class(self):
@@ -57,12 +67,20 @@ class HayvanViewSet(viewsets.ModelViewSet):
                 'kategori', 'irk'
             ).prefetch_related('fotograflar')
         
-        # Liste görünümü için kapak fotoğrafı prefetch et
-        elif self.action == 'list':
-            queryset = queryset.select_related('irk')
+        # Liste görünümleri için ırk ve kapak fotoğrafı tek sorguda
+        elif self.action in ['list', 'populer', 'son_eklenenler']:
+            queryset = queryset.liste_icin()
         
         return queryset
     
+    def retrieve(self, request, *args, **kwargs):
+        """Hayvan detayı - görüntülenme tamponlu sayılır"""
+        hayvan = self.get_object()
+        hayvan.increment_views()
+        sayac_tamponu.birlestir([hayvan], Hayvan.SAYAC_ALANLARI)
+        serializer = self.get_serializer(hayvan)
+        return Response(serializer.data)
+    
     @action(detail=True, methods=['post'], 
             permission_classes=[IsAuthenticated],
             parser_classes=[parsers.MultiPartParser])
@@ -95,12 +113,23 @@ class HayvanViewSet(viewsets.ModelViewSet):
     
     @action(detail=False)
     def populer(self, request):
-        """En popüler hayvanlar"""
-        # Burada popülerlik kriterlerine göre hayvanlar listelenebilir
-        # Örneğin en çok görüntülenen, favori eklenen vb.
-        queryset = self.get_queryset().order_by('-created_at')[:10]
+        """
+        En popüler hayvanlar - önceden hesaplanmış sıralamadan
+        
+        `tur` ve `il` (ad veya plaka kodu) parametreleriyle gruba daraltılır.
+        """
+        tur = request.query_params.get('tur') or None
+        il = request.query_params.get('il')
+        il_kodu = KonumService.il_kodu(il) if il else None
+        
+        if il and il_kodu is None:
+            hayvanlar = []
+        else:
+            hayvanlar = HayvanService.populer_hayvanlar(
+                10, queryset=self.get_queryset(), tur=tur, il_kodu=il_kodu
+            )
         serializer = HayvanListSerializer(
-            queryset, many=True, context={'request': request}
+            hayvanlar, many=True, context={'request': request}
         )
         
         return Response({
@@ -109,6 +138,94 @@ class HayvanViewSet(viewsets.ModelViewSet):
             'message': _('Popüler hayvanlar listelendi')
         })
     
+    @action(detail=False)
+    def yakindakiler(self, request):
+        """
+        Yakındaki hayvanlar - mesafeye göre sıralı
+        
+        Konum `enlem`/`boylam` parametrelerinden, yoksa X-Latitude/X-Longitude
+        header'larından okunur. `yaricap` km cinsindendir; liste filtreleri
+        (tur, cinsiyet, ...) aynen uygulanır.
+        """
+        params = request.query_params
+        try:
+            enlem = float(params.get('enlem') or request.META['HTTP_X_LATITUDE'])
+            boylam = float(params.get('boylam') or request.META['HTTP_X_LONGITUDE'])
+            yaricap = float(params.get('yaricap') or YAKIN_VARSAYILAN_YARICAP_KM)
+            limit = int(params.get('limit') or 20)
+        except (KeyError, TypeError, ValueError):
+            enlem = None
+        
+        if enlem is None or not (-90 <= enlem <= 90 and -180 <= boylam <= 180) or yaricap <= 0:
+            return Response({
+                'success': False,
+                'message': _('Geçerli bir konum (enlem/boylam) ve yarıçap gerekli')
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        hayvanlar = HayvanService.yakindakiler(
+            enlem, boylam,
+            yaricap_km=min(yaricap, YAKIN_MAKS_YARICAP_KM),
+            limit=max(1, min(limit, YAKIN_MAKS_LIMIT)),
+            queryset=self.filter_queryset(self.get_queryset()),
+        )
+        serializer = HayvanYakinSerializer(
+            hayvanlar, many=True, context={'request': request}
+        )
+        
+        return Response({
+            'success': True,
+            'data': serializer.data,
+            'message': _('Yakındaki hayvanlar listelendi')
+        })
+    
+    @action(detail=False, permission_classes=[IsAuthenticated])
+    def eslesmeler(self, request):
+        """
+        Kullanıcının profiline en uygun hayvanlar
+        
+        Ev tipi, bahçe, deneyim, evdeki diğer hayvanlar ve il konumuna göre
+        0-100 uyum puanı ve puanı belirleyen gerekçelerle döner. `tur` ile
+        türe daraltılabilir.
+        """
+        try:
+            limit = int(request.query_params.get('limit') or 10)
+        except ValueError:
+            limit = 10
+        
+        hayvanlar = EslesmeService.eslesmeler(
+            request.user,
+            limit=max(1, min(limit, ESLESME_MAKS_LIMIT)),
+            tur=request.query_params.get('tur') or None,
+        )
+        serializer = HayvanEslesmeSerializer(
+            hayvanlar, many=True, context={'request': request}
+        )
+        
+        return Response({
+            'success': True,
+            'data': serializer.data,
+            'message': _('Size uygun hayvanlar listelendi')
+        })
+    
+    @action(detail=False, url_path='facets')
+    def fasetler(self, request):
+        """
+        Mevcut filtrelere göre faset sayıları (yan menü)
+        
+        Liste ile aynı filtreleri alır; tüm fasetler tek sorguda sayılır ve
+        kanonik filtre parametrelerine göre kısa süreli cache'lenir.
+        """
+        data = HayvanService.faset_sayilari(
+            self.filter_queryset(self.get_queryset()),
+            HayvanFilter.kanonik_parametreler(request.query_params),
+        )
+        
+        return Response({
+            'success': True,
+            'data': data,
+            'message': _('Faset sayıları hesaplandı')
+        })
+    
     @action(detail=False)
     def son_eklenenler(self, request):
         """Son eklenen hayvanlar"""
@@ -136,6 +253,7 @@ class KopekIrkViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ['ad', 'aciklama']
     ordering_fields = ['ad']
     ordering = ['ad']
+    keyset_ordering = ('ad', 'id')
     
     @action(detail=False)
     def populer(self, request):
@@ -122,6 +122,10 @@ class KategoriAdmin(admin.ModelAdmin):
     # Yönetici işlemleri
     def aktif_yap(self, request, queryset):
         updated = queryset.update(aktif=True)
+        # Üst kategori toplamları aktif alt kategorilere göre hesaplanır
+        from .servisler import KategoriService
+        KategoriService.sayaclari_esitle()
+        KategoriService._cache_temizle()
         self.message_user(
             request, 
             _('{} kategori aktif edildi').format(updated)
@@ -130,6 +134,10 @@ class KategoriAdmin(admin.ModelAdmin):
     
     def pasif_yap(self, request, queryset):
         updated = queryset.update(aktif=False)
+        # Üst kategori toplamları aktif alt kategorilere göre hesaplanır
+        from .servisler import KategoriService
+        KategoriService.sayaclari_esitle()
+        KategoriService._cache_temizle()
         self.message_user(
             request, 
             _('{} kategori pasif edildi').format(updated)
@@ -137,20 +145,19 @@ class KategoriAdmin(admin.ModelAdmin):
     pasif_yap.short_description = _('Seçili kategorileri pasifleştir')
     
     def istatistikleri_guncelle(self, request, queryset):
-        for kategori in queryset:
-            from .servisler import KategoriService
-            KategoriService.kategori_kullanim_guncelle(kategori.id)
+        from .servisler import KategoriService
+        duzeltilen = KategoriService.sayaclari_esitle(list(queryset.values_list('id', flat=True)))
             
         self.message_user(
             request,
-            _('{} kategorinin istatistikleri güncellendi').format(queryset.count())
+            _('{} kategorinin istatistikleri güncellendi').format(duzeltilen)
         )
     istatistikleri_guncelle.short_description = _('İstatistikleri güncelle')
     
     def kopek_irklari_esitle(self, request, queryset):
         """Köpek ırkları ile kategorileri eşitler"""
         # Sadece Köpekler kategorisi ve alt kategorileri için çalışır
-        kopekler = queryset.filter(ad__iexact='Köpekler', parent__isnull=True).first()
+        kopekler = queryset.filter(ad__tr_iexact='Köpekler', parent__isnull=True).first()
         if not kopekler:
             self.message_user(request, _("Lütfen 'Köpekler' ana kategorisini seçin"), level='WARNING')
             return
@@ -166,7 +173,7 @@ class KategoriAdmin(admin.ModelAdmin):
                 # Bu ırk için kategori var mı?
                 alt_kategori = Kategori.objects.filter(
                     parent=kopekler,
-                    ad__iexact=irk.ad
+                    ad__tr_iexact=irk.ad
                 ).first()
                 
                 if not alt_kategori:
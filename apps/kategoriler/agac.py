@@ -0,0 +1,125 @@
+"""
+🐾 Kategori Ağacı
+==============================================================================
+Aktif kategori ağacının bellek içi (materialize) temsili. Tek sorguyla
+kurulur; ağaç, breadcrumb, seviye ve alt kategori ID sorguları veritabanına
+gitmeden bu yapıdan cevaplanır.
+==============================================================================
+"""
+
+from django.urls import NoReverseMatch, reverse
+
+from apps.ortak.constants import PetTypes
+
+
+# Ağaç düğümünde tutulan model alanları
+AGAC_ALANLARI = (
+    'id', 'parent_id', 'ad', 'slug', 'aciklama', 'pet_type',
+    'ikon_adi', 'renk_kodu', 'kullanim_sayisi',
+)
+
+
+def kategori_url(kategori_id):
+    """Kategori detay URL'i"""
+    try:
+        return reverse('kategoriler:kategori-detail', kwargs={'pk': kategori_id})
+    except NoReverseMatch:
+        return None
+
+
+class KategoriAgaci:
+    """
+    Aktif kategorilerin materialize ağacı
+
+    Düğümler API'nin ağaç formatındaki sözlüklerdir (`children` dahil),
+    böylece ağaç endpoint'i yapıyı doğrudan döndürebilir. Pasif bir üst
+    kategorinin altındaki kategoriler ağaçta yer almaz.
+    """
+
+    def __init__(self, satirlar):
+        pet_type_adlari = dict(PetTypes.choices)
+
+        self._dugumler = {}
+        self._parent = {}
+        for satir in satirlar:
+            self._parent[satir['id']] = satir['parent_id']
+            self._dugumler[satir['id']] = {
+                'id': satir['id'],
+                'ad': satir['ad'],
+                'slug': satir['slug'],
+                'aciklama': satir['aciklama'],
+                'pet_type': satir['pet_type'],
+                'pet_type_display': str(pet_type_adlari.get(satir['pet_type'], satir['pet_type'])),
+                'ikon_adi': satir['ikon_adi'],
+                'renk_kodu': satir['renk_kodu'],
+                'hayvan_sayisi': satir['kullanim_sayisi'],
+                'children': [],
+            }
+
+        # Satırlar (sira, ad) sıralı geldiği için children da sıralı kalır
+        self.kokler = []
+        for kategori_id, dugum in self._dugumler.items():
+            parent_id = self._parent[kategori_id]
+            if parent_id is None:
+                self.kokler.append(dugum)
+            elif parent_id in self._dugumler:
+                self._dugumler[parent_id]['children'].append(dugum)
+
+        # Sadece köklerden erişilebilen düğümler ağaçtadır
+        self._seviye = {}
+        yigin = [(dugum, 0) for dugum in self.kokler]
+        while yigin:
+            dugum, seviye = yigin.pop()
+            self._seviye[dugum['id']] = seviye
+            yigin.extend((alt, seviye + 1) for alt in dugum['children'])
+        self._dugumler = {
+            kategori_id: dugum
+            for kategori_id, dugum in self._dugumler.items()
+            if kategori_id in self._seviye
+        }
+
+    def __contains__(self, kategori_id):
+        return kategori_id in self._dugumler
+
+    def dugum(self, kategori_id):
+        """Kategori düğümü (ağaçta yoksa None)"""
+        return self._dugumler.get(kategori_id)
+
+    def seviye(self, kategori_id):
+        """Kategori seviyesi (0: ana, 1: alt, vs.)"""
+        return self._seviye.get(kategori_id)
+
+    def yol(self, kategori_id):
+        """Kökten kategoriye kadar düğümler"""
+        if kategori_id not in self._dugumler:
+            return []
+        yol = []
+        while kategori_id is not None:
+            yol.append(self._dugumler[kategori_id])
+            kategori_id = self._parent[kategori_id]
+        return list(reversed(yol))
+
+    def tam_ad(self, kategori_id):
+        """Hiyerarşik tam ad"""
+        yol = self.yol(kategori_id)
+        return ' > '.join(dugum['ad'] for dugum in yol) if yol else None
+
+    def breadcrumbs(self, kategori_id):
+        """Breadcrumb navigasyonu için kategori yolu"""
+        return [
+            {'ad': dugum['ad'], 'slug': dugum['slug'], 'url': kategori_url(dugum['id'])}
+            for dugum in self.yol(kategori_id)
+        ]
+
+    def alt_kategori_idleri(self, kategori_id, kendisi_dahil=True):
+        """Kategorinin tüm alt kategori ID'leri (derinlemesine)"""
+        dugum = self._dugumler.get(kategori_id)
+        if dugum is None:
+            return []
+        idler = [kategori_id] if kendisi_dahil else []
+        yigin = list(dugum['children'])
+        while yigin:
+            alt = yigin.pop()
+            idler.append(alt['id'])
+            yigin.extend(alt['children'])
+        return idler
@@ -19,8 +19,8 @@ class KategorilerConfig(AppConfig):
         """
         Uygulama hazır olduğunda çalışacak setup
         """
-        # Future: signals import edilecek
-        # import apps.kategoriler.signals  # noqa
+        # Sinyal işleyicilerini kaydet
+        import apps.kategoriler.signals  # noqa
         
         # Kategori sistem mesajı
         print("🏷️ Kategoriler sistemi hazır - Hayvan türleri organize edildi!")
@@ -0,0 +1,33 @@
+"""
+🐾 Kategori Sayaç Eşitleme Komutu
+==============================================================================
+Delta ile güncellenen kategori sayaçlarındaki kaymayı düzelten yönetim komutu.
+Periyodik (cron / beat) çalıştırılmak üzere tasarlanmıştır.
+==============================================================================
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.kategoriler.servisler import KategoriService
+
+
+class Command(BaseCommand):
+    """
+    Kategori kullanım ve toplam sayaçlarını hayvan kayıtlarıyla eşitler
+    
+    Kullanım:
+        python manage.py kategori_sayaclarini_esitle
+    """
+    
+    help = 'Kategori sayaçlarını tek GROUP BY sorgusuyla yeniden hesaplar'
+    
+    def handle(self, *args, **options):
+        baslangic = time.perf_counter()
+        duzeltilen = KategoriService.sayaclari_esitle()
+        sure = time.perf_counter() - baslangic
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'{duzeltilen} kategorinin sayacı düzeltildi ({sure:.2f} sn)'
+        ))
@@ -5,9 +5,18 @@ Kategori sorgulama ve yönetimi için özel manager'lar
 ==============================================================================
 """
 
-from django.db import models
-from django.db.models import Count, Q
-from django.core.cache import cache
+from collections import defaultdict
+
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from apps.ortak.cache import etiketleri_gecersiz_kil, etiketli_get_or_set
+
+
+# Cache etiketleri: yapı (ekleme/düzenleme/silme) ve hayvan sayaçları
+KATEGORI_CACHE_ETIKETI = "kategoriler"
+KATEGORI_SAYAC_CACHE_ETIKETI = "kategoriler:sayaclar"
 
 
 class KategoriQuerySet(models.QuerySet):
@@ -70,55 +79,44 @@ class KategoriManager(models.Manager):
     
     def ana_kategoriler(self):
         """Ana kategorileri getir"""
-        cache_key = "kategoriler:ana_kategoriler"
-        kategoriler = cache.get(cache_key)
-        
-        if kategoriler is None:
-            kategoriler = list(
+        return etiketli_get_or_set(
+            "kategoriler:ana_kategoriler",
+            lambda: list(
                 self.get_queryset()
                 .aktif()
                 .ana_kategoriler()
                 .order_by('sira', 'ad')
                 .values('id', 'ad', 'slug', 'ikon_adi', 'renk_kodu', 'aciklama', 'pet_type')
-            )
-            cache.set(cache_key, kategoriler, 3600)  # 1 saat cache
-        
-        return kategoriler
+            ),
+            [KATEGORI_CACHE_ETIKETI],
+            3600  # 1 saat cache
+        )
     
     def kategori_agaci(self):
-        """Tüm kategori ağacını getir"""
-        cache_key = "kategoriler:agac"
-        agac = cache.get(cache_key)
+        """Tüm kategori ağacını getir (materialize ağaçtan, bkz. KategoriAgacService)"""
+        from .servisler import KategoriAgacService
         
-        if agac is None:
-            ana_kategoriler = self.get_queryset().aktif().ana_kategoriler().hiyerarshi_ile()
-            
-            agac = []
-            for ana_kategori in ana_kategoriler:
-                kategori_data = {
-                    'id': ana_kategori.id,
-                    'ad': ana_kategori.ad,
-                    'slug': ana_kategori.slug,
-                    'ikon_adi': ana_kategori.ikon_adi,
-                    'renk_kodu': ana_kategori.renk_kodu,
-                    'aciklama': ana_kategori.aciklama,
-                    'pet_type': ana_kategori.pet_type,
-                    'alt_kategoriler': []
-                }
-                
-                # Alt kategorileri ekle
-                for alt_kategori in ana_kategori.alt_kategoriler.filter(aktif=True):
-                    kategori_data['alt_kategoriler'].append({
-                        'id': alt_kategori.id,
-                        'ad': alt_kategori.ad,
-                        'slug': alt_kategori.slug,
-                        'aciklama': alt_kategori.aciklama,
-                        'kullanim_sayisi': alt_kategori.kullanim_sayisi,
-                    })
-                
-                agac.append(kategori_data)
-            
-            cache.set(cache_key, agac, 1800)  # 30 dakika cache
+        agac = []
+        for ana_kategori in KategoriAgacService.agac().kokler:
+            agac.append({
+                'id': ana_kategori['id'],
+                'ad': ana_kategori['ad'],
+                'slug': ana_kategori['slug'],
+                'ikon_adi': ana_kategori['ikon_adi'],
+                'renk_kodu': ana_kategori['renk_kodu'],
+                'aciklama': ana_kategori['aciklama'],
+                'pet_type': ana_kategori['pet_type'],
+                'alt_kategoriler': [
+                    {
+                        'id': alt_kategori['id'],
+                        'ad': alt_kategori['ad'],
+                        'slug': alt_kategori['slug'],
+                        'aciklama': alt_kategori['aciklama'],
+                        'kullanim_sayisi': alt_kategori['hayvan_sayisi'],
+                    }
+                    for alt_kategori in ana_kategori['children']
+                ]
+            })
         
         return agac
     
@@ -133,19 +131,17 @@ class KategoriManager(models.Manager):
     
     def populer_kategoriler(self, limit=10):
         """En popüler kategoriler"""
-        cache_key = f"kategoriler:populer:{limit}"
-        kategoriler = cache.get(cache_key)
-        
-        if kategoriler is None:
-            kategoriler = list(
+        return etiketli_get_or_set(
+            f"kategoriler:populer:{limit}",
+            lambda: list(
                 self.get_queryset()
                 .aktif()
                 .populer(limit)
                 .values('id', 'ad', 'slug', 'kullanim_sayisi', 'ikon_adi', 'renk_kodu')
-            )
-            cache.set(cache_key, kategoriler, 1800)  # 30 dakika cache
-        
-        return kategoriler
+            ),
+            [KATEGORI_CACHE_ETIKETI, KATEGORI_SAYAC_CACHE_ETIKETI],
+            1800  # 30 dakika cache
+        )
     
     def arama_yap(self, query, limit=20):
         """Kategori arama"""
@@ -166,30 +162,255 @@ class KategoriManager(models.Manager):
         except self.model.DoesNotExist:
             return None
     
-    def istatistikleri_guncelle(self, kategori_id):
-        """Kategori kullanım istatistiklerini güncelle"""
+    def istatistikleri_guncelle(self, kategori_id=None):
+        """
+        Kategori kullanım istatistiklerini güncelle
+
+        Verilen kategori (yoksa tüm kategoriler) için sayaçlar tek GROUP BY
+        ile eşitlenir (bkz. sayaclari_esitle).
+        """
+        return self.sayaclari_esitle(None if kategori_id is None else [kategori_id])
+    
+    def sayaclari_esitle(self, kategori_idleri=None):
+        """
+        Sayaç kaymasını düzelt: kullanım ve alt kategorilerle toplam sayılar
+
+        Args:
+            kategori_idleri: Eşitlenecek kategoriler (None: tümü)
+
+        Hedef satırlar önce `select_for_update` ile kilitlenir, hayvan
+        sayıları kilit alındıktan sonra okunur. Böylece aynı anda çalışan
+        `kullanim_sayilarini_degistir` deltaları ya sayıma dahil olur ya da
+        kilit bırakıldıktan sonra yazılan değerin üzerine eklenir; mutlak
+        değer yazımı eşzamanlı bir deltayı ezmez. Toplamlar için yalnızca
+        hedeflerin alt ağaçları okunur ve sadece değişen hedefler yazılır.
+        Hedefin toplamındaki düzeltme, aynı transaction içinde aktif üst
+        kategori zincirine delta olarak eklenir (bkz. _toplam_duzeltmelerini_yay).
+
+        Returns:
+            int: Düzeltilen kategori sayısı
+        """
         try:
-            kategori = self.get(id=kategori_id)
-            
-            # Hayvan modeli ile entegrasyon eklendi
-            try:
-                from apps.hayvanlar.models import Hayvan
-                hayvan_sayisi = Hayvan.objects.filter(kategori=kategori).count()
-                kategori.kullanim_sayisi = hayvan_sayisi
-                kategori.save(update_fields=['kullanim_sayisi'])
-            except ImportError:
-                # Hayvanlar modülü henüz import edilemiyorsa
-                pass
-                
-            # Cache'i temizle
-            cache.delete_many([
-                "kategoriler:ana_kategoriler",
-                "kategoriler:agac",
-                f"kategoriler:populer:10"
-            ])
+            from apps.hayvanlar.models import Hayvan
+        except ImportError:
+            # Hayvanlar modülü henüz import edilemiyorsa
+            return 0
+        
+        with transaction.atomic():
+            hedefler = self.all() if kategori_idleri is None else self.filter(id__in=kategori_idleri)
+            kategoriler = list(
+                hedefler.select_for_update().order_by('id').only(
+                    'id', 'parent_id', 'aktif', 'kullanim_sayisi', 'toplam_kullanim_sayisi'
+                )
+            )
+            if not kategoriler:
+                return 0
             
-        except self.model.DoesNotExist:
-            pass
+            sayilar = self._gercek_sayilar(Hayvan, kategoriler, tumu=kategori_idleri is None)
+            degisen = self._sayac_farklarini_yaz(kategoriler, sayilar, yay=kategori_idleri is not None)
+        
+        if degisen:
+            # Ağaçtaki sayılar da değişti
+            etiketleri_gecersiz_kil(KATEGORI_CACHE_ETIKETI, KATEGORI_SAYAC_CACHE_ETIKETI)
+        
+        return degisen
+    
+    def _gercek_sayilar(self, hayvan_modeli, kategoriler, tumu):
+        """
+        Hedeflerin veritabanındaki (kullanım, toplam kullanım) sayıları
+
+        Doğrudan sayılar tek GROUP BY ile okunur; toplamlar aktif alt
+        kategoriler üzerinden toplanır. Tüm kategoriler eşitlenmiyorsa
+        yalnızca hedeflerin alt ağaçları okunur.
+
+        Returns:
+            dict: {kategori_id: (kullanim_sayisi, toplam_kullanim_sayisi)}
+        """
+        if tumu:
+            agac = {k.id: (k.parent_id, k.aktif) for k in kategoriler}
+            hayvanlar = hayvan_modeli.objects.filter(kategori__isnull=False)
+        else:
+            agac = self._alt_kategori_agaci([k.id for k in kategoriler])
+            hayvanlar = hayvan_modeli.objects.filter(kategori_id__in=agac)
+        
+        dogrudan = dict(
+            hayvanlar.order_by()
+            .values('kategori_id')
+            .annotate(adet=Count('id'))
+            .values_list('kategori_id', 'adet')
+        )
+        
+        alt_kategoriler = defaultdict(list)
+        for kategori_id, (parent_id, aktif) in agac.items():
+            if parent_id and aktif:
+                alt_kategoriler[parent_id].append(kategori_id)
+        
+        toplamlar = {}
+        
+        def toplam(kategori_id):
+            if kategori_id not in toplamlar:
+                toplamlar[kategori_id] = dogrudan.get(kategori_id, 0) + sum(
+                    toplam(alt_id) for alt_id in alt_kategoriler[kategori_id]
+                )
+            return toplamlar[kategori_id]
+        
+        return {k.id: (dogrudan.get(k.id, 0), toplam(k.id)) for k in kategoriler}
+    
+    def _sayac_farklarini_yaz(self, kategoriler, sayilar, yay):
+        """
+        Sayıları değişen hedefleri tek bulk_update ile yaz
+
+        `yay` ise aktif hedeflerin toplam farkı üst kategori zincirine delta
+        olarak eklenir (bkz. _toplam_duzeltmelerini_yay).
+
+        Returns:
+            int: Düzeltilen kategori sayısı
+        """
+        degisenler = []
+        toplam_duzeltmeleri = {}
+        for kategori in kategoriler:
+            kullanim, genel_toplam = sayilar[kategori.id]
+            if (kategori.kullanim_sayisi, kategori.toplam_kullanim_sayisi) == (kullanim, genel_toplam):
+                continue
+            if genel_toplam != kategori.toplam_kullanim_sayisi and kategori.aktif:
+                toplam_duzeltmeleri[kategori.id] = genel_toplam - kategori.toplam_kullanim_sayisi
+            kategori.kullanim_sayisi = kullanim
+            kategori.toplam_kullanim_sayisi = genel_toplam
+            degisenler.append(kategori)
+        
+        if degisenler:
+            self.bulk_update(
+                degisenler, ['kullanim_sayisi', 'toplam_kullanim_sayisi'], batch_size=500
+            )
+        if yay and toplam_duzeltmeleri:
+            self._toplam_duzeltmelerini_yay(
+                toplam_duzeltmeleri, {k.id: k.parent_id for k in kategoriler}
+            )
+        return len(degisenler)
+    
+    def kullanim_sayilarini_degistir(self, deltalar):
+        """
+        Kullanım sayılarını COUNT(*) yapmadan artır/azalt
+
+        Args:
+            deltalar: {kategori_id: +n / -n} sözlüğü
+
+        Delta, aktif üst kategori zinciri boyunca toplam sayılara da eklenir.
+        Aynı deltalara sahip kategoriler tek UPDATE ile güncellenir; sayaçlar
+        sıfırın altına inmez.
+        """
+        deltalar = {
+            kategori_id: delta
+            for kategori_id, delta in deltalar.items()
+            if kategori_id and delta
+        }
+        if not deltalar:
+            return
+        
+        zincir = self._ust_kategori_zinciri(deltalar)
+        toplam_deltalari = defaultdict(int)
+        for kategori_id, delta in deltalar.items():
+            mevcut = kategori_id
+            while mevcut in zincir:
+                toplam_deltalari[mevcut] += delta
+                parent_id, aktif = zincir[mevcut]
+                if not aktif:
+                    break
+                mevcut = parent_id
+        
+        gruplar = defaultdict(list)
+        for kategori_id in toplam_deltalari:
+            gruplar[(deltalar.get(kategori_id, 0), toplam_deltalari[kategori_id])].append(kategori_id)
+        
+        for (delta, toplam_delta), kategori_idleri in gruplar.items():
+            self.filter(id__in=kategori_idleri).update(
+                kullanim_sayisi=Greatest(F('kullanim_sayisi') + delta, 0),
+                toplam_kullanim_sayisi=Greatest(F('toplam_kullanim_sayisi') + toplam_delta, 0)
+            )
+        
+        etiketleri_gecersiz_kil(KATEGORI_SAYAC_CACHE_ETIKETI)
+    
+    def siralamayi_ada_gore_yenile(self, parent_id):
+        """
+        Alt kategorilerin `sira` alanını ada göre tek UPDATE ile 1..n yap
+
+        Her satırın sırası, kendinden önce gelen kardeş sayısı + 1'dir
+        (ad, parent içinde benzersiz olduğundan eşitlik oluşmaz).
+
+        Returns:
+            int: Güncellenen satır sayısı
+        """
+        onceki_kardesler = (
+            self.model.objects.filter(parent_id=parent_id, ad__lt=OuterRef('ad'))
+            .order_by()
+            .values('parent_id')
+            .annotate(adet=Count('pk'))
+            .values('adet')
+        )
+        return self.filter(parent_id=parent_id).update(
+            sira=Coalesce(Subquery(onceki_kardesler), Value(0)) + 1
+        )
+    
+    def _toplam_duzeltmelerini_yay(self, duzeltmeler, hedefler):
+        """
+        Eşitlenen hedeflerin toplam farkını üst kategorilere F() ile ekle
+
+        Args:
+            duzeltmeler: {kategori_id: yeni toplam - eski toplam} (aktif hedefler)
+            hedefler: Eşitlenen kategoriler, {id: parent_id}
+
+        Yayılım pasif bir üstte ya da kendisi de hedef olan bir üstte durur;
+        hedef üstün toplamı alt ağacından zaten yeniden hesaplandı.
+        """
+        zincir = self._ust_kategori_zinciri(
+            [hedefler[kategori_id] for kategori_id in duzeltmeler if hedefler[kategori_id]]
+        )
+        ust_deltalari = defaultdict(int)
+        for kategori_id, delta in duzeltmeler.items():
+            mevcut = hedefler[kategori_id]
+            while mevcut in zincir and mevcut not in hedefler:
+                ust_deltalari[mevcut] += delta
+                parent_id, aktif = zincir[mevcut]
+                if not aktif:
+                    break
+                mevcut = parent_id
+        
+        gruplar = defaultdict(list)
+        for kategori_id, delta in ust_deltalari.items():
+            if delta:
+                gruplar[delta].append(kategori_id)
+        for delta, kategori_idleri in gruplar.items():
+            self.filter(id__in=kategori_idleri).update(
+                toplam_kullanim_sayisi=Greatest(F('toplam_kullanim_sayisi') + delta, 0)
+            )
+    
+    def _ust_kategori_zinciri(self, kategori_idleri):
+        """Kategoriler ve tüm üstleri için {id: (parent_id, aktif)} - seviye başına bir sorgu"""
+        zincir = {}
+        bekleyenler = set(kategori_idleri)
+        while bekleyenler:
+            satirlar = self.filter(id__in=bekleyenler).values_list('id', 'parent_id', 'aktif')
+            bekleyenler = set()
+            for kategori_id, parent_id, aktif in satirlar:
+                zincir[kategori_id] = (parent_id, aktif)
+                if parent_id and parent_id not in zincir:
+                    bekleyenler.add(parent_id)
+        return zincir
+    
+    def _alt_kategori_agaci(self, kategori_idleri):
+        """Kategoriler ve tüm altları için {id: (parent_id, aktif)} - seviye başına bir sorgu"""
+        agac = {}
+        bekleyenler = set(kategori_idleri)
+        sorgu = self.filter(id__in=bekleyenler)
+        while bekleyenler:
+            satirlar = sorgu.values_list('id', 'parent_id', 'aktif')
+            bekleyenler = set()
+            for kategori_id, parent_id, aktif in satirlar:
+                if kategori_id not in agac:
+                    agac[kategori_id] = (parent_id, aktif)
+                    bekleyenler.add(kategori_id)
+            sorgu = self.filter(parent_id__in=bekleyenler)
+        return agac
     
     def aktif(self):
         return self.filter(aktif=True)
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.16 on 2026-10-18 19:00
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def sayaclari_doldur(apps, schema_editor):
+    """Kullanım ve toplam sayılarını tek GROUP BY ile hesapla"""
+    Kategori = apps.get_model('kategoriler', 'Kategori')
+    Hayvan = apps.get_model('hayvanlar', 'Hayvan')
+
+    dogrudan = dict(
+        Hayvan.objects.order_by()
+        .filter(kategori__isnull=False)
+        .values('kategori_id')
+        .annotate(adet=Count('id'))
+        .values_list('kategori_id', 'adet')
+    )
+
+    kategoriler = list(Kategori.objects.all())
+    alt_kategoriler = defaultdict(list)
+    for kategori in kategoriler:
+        if kategori.parent_id:
+            alt_kategoriler[kategori.parent_id].append(kategori)
+
+    toplamlar = {}
+
+    def toplam(kategori):
+        if kategori.id not in toplamlar:
+            toplamlar[kategori.id] = dogrudan.get(kategori.id, 0) + sum(
+                toplam(alt) for alt in alt_kategoriler[kategori.id] if alt.aktif
+            )
+        return toplamlar[kategori.id]
+
+    for kategori in kategoriler:
+        kategori.kullanim_sayisi = dogrudan.get(kategori.id, 0)
+        kategori.toplam_kullanim_sayisi = toplam(kategori)
+    Kategori.objects.bulk_update(
+        kategoriler, ['kullanim_sayisi', 'toplam_kullanim_sayisi'], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kategoriler', '0001_initial'),
+        ('hayvanlar', '0003_make_kategori_nullable'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kategori',
+            name='toplam_kullanim_sayisi',
+            field=models.PositiveIntegerField(default=0, help_text='Bu kategori ve aktif alt kategorilerindeki hayvan sayısı', verbose_name='Toplam Kullanım Sayısı'),
+        ),
+        migrations.RunPython(sayaclari_doldur, migrations.RunPython.noop),
+    ]
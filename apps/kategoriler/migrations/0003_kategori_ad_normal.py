@@ -0,0 +1,32 @@
+# Generated by Django 4.2.16 on 2026-10-18 19:32
+
+import apps.ortak.fields
+from django.db import migrations
+
+from apps.ortak.utils import turkce_normalize
+
+
+def kategori_ad_normal_doldur(apps, schema_editor):
+    """Mevcut kayıtların gölge sütununu doldur"""
+    Kategori = apps.get_model('kategoriler', 'Kategori')
+    degisenler = []
+    for nesne in Kategori.objects.only('id', 'ad', 'ad_normal').iterator(chunk_size=2000):
+        nesne.ad_normal = turkce_normalize(nesne.ad or '')
+        degisenler.append(nesne)
+    Kategori.objects.bulk_update(degisenler, ['ad_normal'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kategoriler', '0002_kategori_toplam_kullanim_sayisi'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kategori',
+            name='ad_normal',
+            field=apps.ortak.fields.NormalizeAlan(kaynak='ad', max_length=100, verbose_name='Normalize Ad'),
+        ),
+        migrations.RunPython(kategori_ad_normal_doldur, migrations.RunPython.noop),
+    ]
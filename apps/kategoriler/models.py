@@ -11,6 +11,7 @@ from django.core.validators import MinLengthValidator
 from django.utils.text import slugify
 from django.core.cache import cache
 
+from apps.ortak.fields import NormalizeAlan
 from apps.ortak.models import TimestampedModel
 from apps.ortak.constants import PetTypes
 from .managers import KategoriManager
@@ -29,6 +30,12 @@ class Kategori(TimestampedModel):
         verbose_name=_("Kategori Adı"),
         help_text=_("Örn: Köpek, Kedi, Golden Retriever")
     )
+    # Türkçe duyarlı ad eşleştirmesi için gölge sütun (ad__tr_iexact)
+    ad_normal = NormalizeAlan(
+        kaynak='ad',
+        max_length=100,
+        verbose_name=_("Normalize Ad")
+    )
     
     slug = models.SlugField(
         max_length=120,
@@ -84,6 +91,11 @@ class Kategori(TimestampedModel):
         verbose_name=_("Kullanım Sayısı"),
         help_text=_("Bu kategoride kaç hayvan var")
     )
+    toplam_kullanim_sayisi = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Toplam Kullanım Sayısı"),
+        help_text=_("Bu kategori ve aktif alt kategorilerindeki hayvan sayısı")
+    )
     
     # Durum bilgileri
     aktif = models.BooleanField(
@@ -160,10 +172,32 @@ class Kategori(TimestampedModel):
             self.pet_type = self.parent.pet_type
         
         super().save(*args, **kwargs)
+        # Yapı değişmiş olabilir; sonraki erişim güncel ağacı yükler
+        self.__dict__.pop('_kategori_agaci', None)
+    
+    def agaci_ata(self, agac):
+        """Önceden yüklenmiş ağacı kullan (serializer context'i, toplu işlemler)"""
+        self._kategori_agaci = agac
+    
+    def _agac(self):
+        """
+        Kategori aktif ağaçtaysa materialize ağaç, değilse None
+        
+        Ağaç örnek başına bir kez yüklenir (ya da agaci_ata ile verilir);
+        tam_ad / seviye / get_breadcrumbs her erişimde yeniden istemez.
+        """
+        agac = self.__dict__.get('_kategori_agaci')
+        if agac is None:
+            from .servisler import KategoriAgacService
+            agac = self._kategori_agaci = KategoriAgacService.agac()
+        return agac if self.pk in agac else None
     
     @property
     def tam_ad(self):
         """Hiyerarşik tam ad"""
+        agac = self._agac()
+        if agac:
+            return agac.tam_ad(self.pk)
         if self.parent:
             return f"{self.parent.ad} > {self.ad}"
         return self.ad
@@ -171,6 +205,9 @@ class Kategori(TimestampedModel):
     @property
     def seviye(self):
         """Kategori seviyesi (0: ana, 1: alt, vs.)"""
+        agac = self._agac()
+        if agac:
+            return agac.seviye(self.pk)
         level = 0
         parent = self.parent
         while parent:
@@ -181,24 +218,27 @@ class Kategori(TimestampedModel):
     @property
     def alt_kategori_sayisi(self):
         """Bu kategorinin alt kategori sayısı"""
+        agac = self._agac()
+        if agac:
+            return len(agac.dugum(self.pk)['children'])
         return self.alt_kategoriler.filter(aktif=True).count()
     
     @property
     def toplam_hayvan_sayisi(self):
         """Bu kategori ve alt kategorilerindeki toplam hayvan sayısı"""
-        # Bu method hayvan modeli oluşturulduktan sonra implement edilecek
-        total = self.kullanim_sayisi
-        for alt_kategori in self.alt_kategoriler.filter(aktif=True):
-            total += alt_kategori.toplam_hayvan_sayisi
-        return total
+        return self.toplam_kullanim_sayisi
     
     def get_absolute_url(self):
         """Kategori detay URL'i"""
-        from django.urls import reverse
-        return reverse('api:v1:kategoriler:detay', kwargs={'slug': self.slug})
+        from .agac import kategori_url
+        return kategori_url(self.pk)
     
     def get_breadcrumbs(self):
         """Breadcrumb navigasyonu için kategori yolu"""
+        agac = self._agac()
+        if agac:
+            return agac.breadcrumbs(self.pk)
+        
         breadcrumbs = []
         current = self
         while current:
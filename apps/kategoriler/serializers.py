@@ -24,14 +24,59 @@ class KategoriOzellikSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class KategoriBasicSerializer(serializers.ModelSerializer):
+class KategoriAgacMixin:
+    """
+    Hiyerarşi alanlarını materialize kategori ağacından okur
+
+    Ağaç serializer context'inde bir kez yüklenir ve iç içe / çoklu
+    serializer'lar arasında paylaşılır; kategori başına sorgu yapılmaz.
+    Ağaçta olmayan (pasif) kategoriler model property'lerine düşer.
+    """
+    
+    def _agac_dugumu(self, obj):
+        from .servisler import KategoriAgacService
+        
+        agac = self.context.get('kategori_agaci')
+        if agac is None:
+            agac = self.context['kategori_agaci'] = KategoriAgacService.agac()
+        
+        if isinstance(obj, dict):
+            kategori_id = obj['id']
+        else:
+            # Model property'lerine düşülürse de aynı ağaç kullanılır
+            obj.agaci_ata(agac)
+            kategori_id = obj.pk
+        return agac, (kategori_id if kategori_id in agac else None)
+    
+    def get_tam_ad(self, obj):
+        agac, kategori_id = self._agac_dugumu(obj)
+        return agac.tam_ad(kategori_id) if kategori_id is not None else getattr(obj, 'tam_ad', None)
+    
+    def get_seviye(self, obj):
+        agac, kategori_id = self._agac_dugumu(obj)
+        return agac.seviye(kategori_id) if kategori_id is not None else getattr(obj, 'seviye', None)
+    
+    def get_alt_kategori_sayisi(self, obj):
+        agac, kategori_id = self._agac_dugumu(obj)
+        if kategori_id is not None:
+            return len(agac.dugum(kategori_id)['children'])
+        return getattr(obj, 'alt_kategori_sayisi', 0)
+    
+    def get_breadcrumbs(self, obj):
+        agac, kategori_id = self._agac_dugumu(obj)
+        if kategori_id is not None:
+            return agac.breadcrumbs(kategori_id)
+        return obj.get_breadcrumbs() if hasattr(obj, 'get_breadcrumbs') else []
+
+
+class KategoriBasicSerializer(KategoriAgacMixin, serializers.ModelSerializer):
     """
     Temel kategori bilgileri (liste görünümü için)
     """
     
     pet_type_display = serializers.CharField(source='get_pet_type_display', read_only=True)
-    tam_ad = serializers.CharField(read_only=True)
-    seviye = serializers.IntegerField(read_only=True)
+    tam_ad = serializers.SerializerMethodField()
+    seviye = serializers.SerializerMethodField()
     url = serializers.CharField(source='get_absolute_url', read_only=True)
     
     class Meta:
@@ -44,17 +89,17 @@ class KategoriBasicSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'slug', 'kullanim_sayisi']
 
 
-class KategoriDetailSerializer(serializers.ModelSerializer):
+class KategoriDetailSerializer(KategoriAgacMixin, serializers.ModelSerializer):
     """
     Detaylı kategori bilgileri
     """
     
     pet_type_display = serializers.CharField(source='get_pet_type_display', read_only=True)
-    tam_ad = serializers.CharField(read_only=True)
-    seviye = serializers.IntegerField(read_only=True)
-    alt_kategori_sayisi = serializers.IntegerField(read_only=True)
+    tam_ad = serializers.SerializerMethodField()
+    seviye = serializers.SerializerMethodField()
+    alt_kategori_sayisi = serializers.SerializerMethodField()
     toplam_hayvan_sayisi = serializers.IntegerField(read_only=True)
-    breadcrumbs = serializers.JSONField(source='get_breadcrumbs', read_only=True)
+    breadcrumbs = serializers.SerializerMethodField()
     url = serializers.CharField(source='get_absolute_url', read_only=True)
     
     # İlişkili veriler
@@ -69,15 +114,15 @@ class KategoriDetailSerializer(serializers.ModelSerializer):
             'pet_type_display', 'ikon_adi', 'renk_kodu',
             'kullanim_sayisi', 'tam_ad', 'seviye', 
             'alt_kategori_sayisi', 'toplam_hayvan_sayisi',
-            'breadcrumbs', 'url', 'olusturulma_tarihi',
+            'breadcrumbs', 'url', 'created_at',
             'parent', 'alt_kategoriler', 'ozellikler'
         ]
         read_only_fields = [
-            'id', 'slug', 'kullanim_sayisi', 'olusturulma_tarihi'
+            'id', 'slug', 'kullanim_sayisi', 'created_at'
         ]
 
 
-class KategoriTreeSerializer(serializers.ModelSerializer):
+class KategoriTreeSerializer(KategoriAgacMixin, serializers.ModelSerializer):
     """
     Kategori ağaç yapısı serializer
     """
@@ -95,15 +140,11 @@ class KategoriTreeSerializer(serializers.ModelSerializer):
         ]
     
     def get_children(self, obj):
-        """Alt kategorileri getir"""
-        if hasattr(obj, 'prefetched_children'):
-            # Prefetch edilmiş alt kategoriler varsa kullan
-            children = obj.prefetched_children
-        else:
-            # Yoksa sorgula
-            children = obj.alt_kategoriler.filter(aktif=True).order_by('sira', 'ad')
-        
-        return KategoriTreeSerializer(children, many=True, context=self.context).data
+        """Alt kategorileri materialize ağaçtan getir (düğümler aynı formatta)"""
+        agac, kategori_id = self._agac_dugumu(obj)
+        if kategori_id is None:
+            return []
+        return agac.dugum(kategori_id)['children']
 
 
 class KategoriStatsSerializer(serializers.Serializer):
@@ -147,7 +188,7 @@ class KategoriCreateUpdateSerializer(serializers.ModelSerializer):
         # Aynı parent altında aynı isimde kategori kontrolü
         parent = self.initial_data.get('parent')
         existing = Kategori.objects.filter(
-            ad__iexact=value, 
+            ad__tr_iexact=value, 
             parent=parent
         )
         
@@ -5,13 +5,19 @@ Kategori işlemlerinin merkezi iş mantığı - Her işlemin hikayesi burada
 ==============================================================================
 """
 
+import time
 from typing import List, Dict, Optional, Tuple
 from django.db import transaction
 from django.core.cache import cache
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
 
+from .agac import AGAC_ALANLARI, KategoriAgaci
+from .managers import KATEGORI_CACHE_ETIKETI, KATEGORI_SAYAC_CACHE_ETIKETI
 from .models import Kategori, KategoriOzellik, KATEGORI_HIKAYELERI
+from apps.ortak.cache import (
+    etiket_versiyonlari, etiketleri_gecersiz_kil, etiketli_anahtar, etiketli_get_or_set
+)
 from apps.ortak.exceptions import PlatformBaseException
 
 
@@ -23,16 +29,9 @@ class KategoriService:
     @staticmethod
     def kategori_agaci_olustur() -> List[Dict]:
         """
-        Kategori ağacını oluştur ve cache'le
+        Kategori ağacını oluştur (versiyonlu cache: KategoriAgacService)
         """
-        cache_key = "kategori_agaci_service"
-        agac = cache.get(cache_key)
-        
-        if agac is None:
-            agac = Kategori.objects.kategori_agaci()
-            cache.set(cache_key, agac, 1800)  # 30 dakika
-        
-        return agac
+        return Kategori.objects.kategori_agaci()
     
     @staticmethod
     def ana_kategorileri_getir() -> List[Dict]:
@@ -92,6 +91,10 @@ class KategoriService:
             kategori.full_clean()
             kategori.save()
             
+            # Hiyerarşi değiştiyse üst toplamları yeniden hesapla
+            if {'aktif', 'parent', 'parent_id'} & set(guncelleme_data):
+                KategoriService.sayaclari_esitle()
+            
             # Cache temizle
             KategoriService._cache_temizle()
             
@@ -134,6 +137,10 @@ class KategoriService:
             kategori.aktif = False
             kategori.save()
             
+            # Pasif kategori üst toplamlara katılmaz
+            if kategori.parent_id:
+                KategoriService.sayaclari_esitle()
+            
             # Cache temizle
             KategoriService._cache_temizle()
             
@@ -160,13 +167,10 @@ class KategoriService:
         """
         Kategori istatistiklerini hesapla
         """
-        cache_key = "kategori_istatistikleri_service"
-        stats = cache.get(cache_key)
-        
-        if stats is None:
+        def hesapla():
             from django.db.models import Count
             
-            stats = {
+            return {
                 'toplam_kategori': Kategori.objects.aktif().count(),
                 'ana_kategori_sayisi': Kategori.objects.aktif().ana_kategoriler().count(),
                 'alt_kategori_sayisi': Kategori.objects.aktif().alt_kategoriler().count(),
@@ -178,10 +182,13 @@ class KategoriService:
                 ),
                 'en_populer_5': Kategori.objects.populer_kategoriler(5)
             }
-            
-            cache.set(cache_key, stats, 3600)  # 1 saat
         
-        return stats
+        return etiketli_get_or_set(
+            "kategoriler:istatistikler:service",
+            hesapla,
+            [KATEGORI_CACHE_ETIKETI, KATEGORI_SAYAC_CACHE_ETIKETI],
+            3600  # 1 saat
+        )
     
     @staticmethod
     def kategori_ozellikleri_getir(kategori_id: int) -> List[KategoriOzellik]:
@@ -236,39 +243,98 @@ class KategoriService:
             return []
     
     @staticmethod
-    def kategori_kullanim_guncelle(kategori_id: int):
+    def kategori_kullanim_guncelle(kategori_id: int = None):
         """
         Kategori kullanım sayısını güncelle
+        
+        Sadece verilen kategori eşitlenir; kategori verilmezse tümü.
         """
-        Kategori.objects.istatistikleri_guncelle(kategori_id)
+        return KategoriService.sayaclari_esitle(None if kategori_id is None else [kategori_id])
+    
+    @staticmethod
+    def sayaclari_esitle(kategori_idleri: Optional[List[int]] = None) -> int:
+        """
+        Kategori sayaçlarındaki kaymayı düzelt
+        
+        Args:
+            kategori_idleri: Eşitlenecek kategoriler (None: tümü)
+        
+        Returns:
+            int: Düzeltilen kategori sayısı
+        """
+        return Kategori.objects.sayaclari_esitle(kategori_idleri)
+    
+    @staticmethod
+    def kategori_degisikligi_uygula(eski_kategori_id: Optional[int], yeni_kategori_id: Optional[int]):
+        """
+        Hayvanın kategori değişikliğini sayaçlara yansıt (eski -1, yeni +1)
+        """
+        if eski_kategori_id == yeni_kategori_id:
+            return
+        
+        deltalar = {}
+        if eski_kategori_id:
+            deltalar[eski_kategori_id] = -1
+        if yeni_kategori_id:
+            deltalar[yeni_kategori_id] = 1
+        Kategori.objects.kullanim_sayilarini_degistir(deltalar)
     
     @staticmethod
     def _cache_temizle():
         """
-        Kategori ile ilgili tüm cache'leri temizle
+        Kategori ile ilgili tüm cache'leri geçersiz kıl (etiket versiyonu artırılır)
         """
-        cache_keys = [
-            "kategoriler:ana_kategoriler",
-            "kategoriler:agac",
-            "kategori_agaci_service",
-            "kategori_istatistikleri_service"
-        ]
+        etiketleri_gecersiz_kil(KATEGORI_CACHE_ETIKETI)
+
+
+class KategoriAgacService:
+    """
+    Versiyonlu kategori ağacı servisi
+
+    Ağaç tek sorguyla kurulur ve `kategoriler` cache etiketiyle cache'lenir.
+    Kategori yazmaları etiketi geçersiz kılar; eski anahtarlar kendiliğinden
+    süresi dolarak düşer. Aynı versiyon süreç içinde de kısa süre tutulur
+    (cache'e gitmeden).
+    """
+    
+    CACHE_TIMEOUT = 300  # Hayvan sayıları en fazla 5 dakika gecikmeli
+    BELLEK_TIMEOUT = 60
+    
+    # (versiyon, zaman, ağaç) - süreç içi kopya
+    _bellek = (None, 0.0, None)
+    
+    @staticmethod
+    def versiyon() -> Optional[int]:
+        """Güncel ağaç versiyonu (cache devre dışıysa None)"""
+        versiyonlar = etiket_versiyonlari([KATEGORI_CACHE_ETIKETI])
+        return versiyonlar[KATEGORI_CACHE_ETIKETI] if versiyonlar else None
+    
+    @staticmethod
+    def agac() -> KategoriAgaci:
+        """Aktif kategori ağacı (en fazla bir sorgu)"""
+        versiyonlar = etiket_versiyonlari([KATEGORI_CACHE_ETIKETI])
+        versiyon = versiyonlar[KATEGORI_CACHE_ETIKETI] if versiyonlar else None
+        bellek_versiyon, bellek_zamani, bellek_agac = KategoriAgacService._bellek
+        if (
+            versiyon is not None and bellek_versiyon == versiyon and
+            time.monotonic() - bellek_zamani < KategoriAgacService.BELLEK_TIMEOUT
+        ):
+            return bellek_agac
         
-        for key in cache_keys:
-            cache.delete(key)
+        cache_key = None
+        if versiyon is not None:
+            cache_key = etiketli_anahtar("kategoriler:agac", [KATEGORI_CACHE_ETIKETI], versiyonlar)
+        agac = cache.get(cache_key) if cache_key is not None else None
+        if agac is None:
+            agac = KategoriAgaci(
+                Kategori.objects.aktif().order_by('sira', 'ad').values(*AGAC_ALANLARI)
+            )
+            if cache_key is not None:
+                cache.set(cache_key, agac, KategoriAgacService.CACHE_TIMEOUT)
         
-        # Pattern-based cache temizleme
-        try:
-            from django_redis import get_redis_connection
-            conn = get_redis_connection("default")
-            
-            patterns = ["kategoriler:*", "kategori:*"]
-            for pattern in patterns:
-                keys = conn.keys(pattern)
-                if keys:
-                    conn.delete(*keys)
-        except:
-            pass
+        if versiyon is not None:
+            KategoriAgacService._bellek = (versiyon, time.monotonic(), agac)
+        return agac
 
 
 class KategoriInitializationService:
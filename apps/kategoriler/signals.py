@@ -0,0 +1,23 @@
+"""
+🐾 Evcil Hayvan Platformu - Kategori Sinyalleri
+==============================================================================
+Kategori yazmalarında kategori cache etiketini geçersiz kılan sinyaller
+==============================================================================
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Kategori
+
+
+@receiver(post_save, sender=Kategori)
+@receiver(post_delete, sender=Kategori)
+def kategori_cache_gecersiz_kil(sender, instance, **kwargs):
+    """Kategori eklendi, değişti veya silindi: ağaç dahil kategori cache'lerini geçersiz kıl"""
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and set(update_fields) <= {'kullanim_sayisi', 'toplam_kullanim_sayisi'}:
+        return
+    
+    from .servisler import KategoriService
+    KategoriService._cache_temizle()
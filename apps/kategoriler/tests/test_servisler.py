@@ -0,0 +1,230 @@
+"""
+🐾 Evcil Hayvan Platformu - Kategori Servis Testleri
+==============================================================================
+Kategori sayaçları ve servis işlemleri için testler
+==============================================================================
+"""
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from apps.hayvanlar.models import Hayvan
+from apps.kategoriler.models import Kategori
+from apps.kategoriler.servisler import KategoriAgacService, KategoriService
+
+
+@pytest.fixture
+def ana_kategori():
+    """Ana kategori"""
+    return Kategori.objects.create(ad="Kediler", pet_type="kedi")
+
+
+@pytest.fixture
+def alt_kategori(ana_kategori):
+    """Alt kategori"""
+    return Kategori.objects.create(ad="Tekir", pet_type="kedi", parent=ana_kategori)
+
+
+def _yenile(*kategoriler):
+    for kategori in kategoriler:
+        kategori.refresh_from_db()
+
+
+@pytest.mark.django_db
+class TestKategoriSayaclari:
+    """Delta tabanlı kategori sayaçları"""
+
+    def test_alt_kategori_ust_toplama_yansir(self, ana_kategori, alt_kategori):
+        """Alt kategorideki hayvan üst kategorinin toplamına eklenmeli"""
+        Hayvan.objects.create(ad="Pamuk", tur="kedi", kategori=alt_kategori)
+        Hayvan.objects.create(ad="Duman", tur="kedi", kategori=ana_kategori)
+
+        _yenile(ana_kategori, alt_kategori)
+        assert (alt_kategori.kullanim_sayisi, alt_kategori.toplam_hayvan_sayisi) == (1, 1)
+        assert (ana_kategori.kullanim_sayisi, ana_kategori.toplam_hayvan_sayisi) == (1, 2)
+
+    def test_silme_sayaci_azaltir(self, ana_kategori, alt_kategori):
+        """Silinen hayvan hem kullanım hem toplam sayıdan düşmeli"""
+        hayvan = Hayvan.objects.create(ad="Pamuk", tur="kedi", kategori=alt_kategori)
+
+        hayvan.delete()
+
+        _yenile(ana_kategori, alt_kategori)
+        assert alt_kategori.kullanim_sayisi == 0
+        assert ana_kategori.toplam_hayvan_sayisi == 0
+
+    def test_esitleme_kaymayi_duzeltir(self, ana_kategori, alt_kategori):
+        """Sinyalleri atlayan yazmalar esitleme ile düzeltilmeli"""
+        Hayvan.objects.bulk_create([
+            Hayvan(ad=f"Tekir {i}", slug=f"tekir-{i}", tur="kedi", kategori=alt_kategori)
+            for i in range(3)
+        ])
+        Kategori.objects.filter(pk=ana_kategori.pk).update(kullanim_sayisi=7)
+
+        duzeltilen = KategoriService.sayaclari_esitle()
+
+        _yenile(ana_kategori, alt_kategori)
+        assert duzeltilen == 2
+        assert (alt_kategori.kullanim_sayisi, alt_kategori.toplam_hayvan_sayisi) == (3, 3)
+        assert (ana_kategori.kullanim_sayisi, ana_kategori.toplam_hayvan_sayisi) == (0, 3)
+
+    def test_esitleme_sadece_verilen_kategoriyi_yazar(self, ana_kategori, alt_kategori):
+        """Kapsamlı eşitleme alt ağacı okur, diğer kategorilere dokunmaz"""
+        Hayvan.objects.bulk_create([
+            Hayvan(ad=f"Tekir {i}", slug=f"tekir-{i}", tur="kedi", kategori=alt_kategori)
+            for i in range(2)
+        ])
+        diger = Kategori.objects.create(ad="Köpekler", pet_type="kopek")
+        Kategori.objects.filter(pk=diger.pk).update(kullanim_sayisi=5)
+
+        duzeltilen = KategoriService.kategori_kullanim_guncelle(ana_kategori.pk)
+
+        _yenile(ana_kategori, alt_kategori, diger)
+        assert duzeltilen == 1
+        assert ana_kategori.toplam_hayvan_sayisi == 2
+        assert alt_kategori.kullanim_sayisi == 0
+        assert diger.kullanim_sayisi == 5
+
+    def test_kapsamli_esitleme_ust_toplami_duzeltir(self, ana_kategori, alt_kategori):
+        """Alt kategorideki düzeltme üst kategorinin toplamına yansımalı"""
+        Hayvan.objects.bulk_create([
+            Hayvan(ad=f"Tekir {i}", slug=f"tekir-{i}", tur="kedi", kategori=alt_kategori)
+            for i in range(2)
+        ])
+
+        KategoriService.kategori_kullanim_guncelle(alt_kategori.pk)
+
+        _yenile(ana_kategori, alt_kategori)
+        assert alt_kategori.toplam_hayvan_sayisi == 2
+        assert ana_kategori.toplam_hayvan_sayisi == 2
+
+    def test_kategori_id_ile_update_fields(self, ana_kategori, alt_kategori):
+        """update_fields=['kategori_id'] de sayaç deltası üretmeli"""
+        hayvan = Hayvan.objects.create(ad="Pamuk", tur="kedi", kategori=ana_kategori)
+        hayvan = Hayvan.objects.get(pk=hayvan.pk)
+
+        hayvan.kategori_id = alt_kategori.pk
+        hayvan.save(update_fields=['kategori_id'])
+
+        _yenile(ana_kategori, alt_kategori)
+        assert (ana_kategori.kullanim_sayisi, ana_kategori.toplam_hayvan_sayisi) == (0, 1)
+        assert alt_kategori.kullanim_sayisi == 1
+
+    def test_pasif_alt_kategori_toplama_katilmaz(self, ana_kategori, alt_kategori):
+        """Pasif alt kategoriler üst toplama dahil edilmemeli"""
+        Hayvan.objects.create(ad="Pamuk", tur="kedi", kategori=alt_kategori)
+
+        KategoriService.kategori_sil(alt_kategori.pk)
+
+        _yenile(ana_kategori)
+        assert ana_kategori.toplam_hayvan_sayisi == 0
+
+    def test_esitleme_komutu(self, ana_kategori, capsys):
+        """Yönetim komutu sayaçları eşitlemeli"""
+        Kategori.objects.filter(pk=ana_kategori.pk).update(toplam_kullanim_sayisi=5)
+
+        call_command('kategori_sayaclarini_esitle')
+
+        _yenile(ana_kategori)
+        assert ana_kategori.toplam_kullanim_sayisi == 0
+        assert '1 kategorinin' in capsys.readouterr().out
+
+
+@pytest.mark.django_db
+class TestKategoriAgaci:
+    """Materialize kategori ağacı"""
+
+    def test_agac_sorgulari(self, ana_kategori, alt_kategori):
+        """Seviye, yol ve alt kategori ID'leri ağaçtan cevaplanmalı"""
+        agac = KategoriAgacService.agac()
+
+        assert agac.seviye(ana_kategori.pk) == 0
+        assert agac.seviye(alt_kategori.pk) == 1
+        assert agac.tam_ad(alt_kategori.pk) == "Kediler > Tekir"
+        assert [b['slug'] for b in agac.breadcrumbs(alt_kategori.pk)] == [
+            ana_kategori.slug, alt_kategori.slug
+        ]
+        assert set(agac.alt_kategori_idleri(ana_kategori.pk)) == {ana_kategori.pk, alt_kategori.pk}
+
+    def test_pasif_ust_altindakiler_agacta_yok(self, ana_kategori, alt_kategori):
+        """Pasif ana kategorinin alt kategorileri ağaçta yer almamalı"""
+        Kategori.objects.filter(pk=ana_kategori.pk).update(aktif=False)
+
+        agac = KategoriAgacService.agac()
+
+        assert alt_kategori.pk not in agac
+        assert agac.kokler == []
+
+    def test_model_property_agactan_okur(self, ana_kategori, alt_kategori):
+        """Model property'leri ağaçla aynı sonucu vermeli"""
+        alt_kategori = Kategori.objects.get(pk=alt_kategori.pk)
+
+        assert alt_kategori.seviye == 1
+        assert alt_kategori.get_breadcrumbs()[0]['ad'] == "Kediler"
+
+    def test_model_property_agaci_bir_kez_yukler(self, ana_kategori, alt_kategori, monkeypatch):
+        """tam_ad / seviye / breadcrumbs aynı örnekte ağacı tekrar istememeli"""
+        alt_kategori = Kategori.objects.get(pk=alt_kategori.pk)
+        yuklemeler = []
+        agac = KategoriAgacService.agac
+        monkeypatch.setattr(
+            KategoriAgacService, 'agac', staticmethod(lambda: yuklemeler.append(1) or agac())
+        )
+
+        assert alt_kategori.tam_ad == "Kediler > Tekir"
+        assert alt_kategori.seviye == 1
+        assert len(alt_kategori.get_breadcrumbs()) == 2
+        assert len(yuklemeler) == 1
+
+        alt_kategori.save()
+        assert alt_kategori.seviye == 1
+        assert len(yuklemeler) == 2
+
+
+YEREL_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@pytest.mark.django_db
+class TestKategoriCacheEtiketleri:
+    """Nesil sayaçlı (etiketli) kategori cache'i"""
+
+    @pytest.fixture(autouse=True)
+    def yerel_cache(self, settings):
+        settings.CACHES = YEREL_CACHE
+        yield
+        cache.clear()
+
+    def test_sayac_degisimi_tum_populer_listeleri_gecersiz_kilar(
+        self, ana_kategori, django_capture_on_commit_callbacks
+    ):
+        """kategoriler:populer:<n> her n için geçersiz olmalı (eskiden sadece n=10)"""
+        assert Kategori.objects.populer_kategoriler(5) == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Kategori.objects.kullanim_sayilarini_degistir({ana_kategori.id: 3})
+
+        assert Kategori.objects.populer_kategoriler(5)[0]['kullanim_sayisi'] == 3
+
+    def test_kategori_yazmasi_cache_gecersiz_kilar(
+        self, ana_kategori, django_capture_on_commit_callbacks
+    ):
+        """Yeni kategori ana kategoriler listesinde hemen görünmeli"""
+        assert len(Kategori.objects.ana_kategoriler()) == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Kategori.objects.create(ad="Köpekler", pet_type="kopek")
+
+        assert len(Kategori.objects.ana_kategoriler()) == 2
+
+    def test_gecersiz_kilma_baska_anahtarlara_dokunmaz(
+        self, ana_kategori, django_capture_on_commit_callbacks
+    ):
+        """Geçersiz kılma global değil: oturum vb. anahtarlar kalmalı"""
+        cache.set("session:abc", "oturum")
+        Kategori.objects.ana_kategoriler()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            KategoriService._cache_temizle()
+
+        assert cache.get("session:abc") == "oturum"
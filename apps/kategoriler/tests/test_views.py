@@ -0,0 +1,104 @@
+"""
+🐾 Evcil Hayvan Platformu - Kategori Views Testleri
+==============================================================================
+Kategori API endpoint testleri
+==============================================================================
+"""
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.kategoriler.models import Kategori
+
+
+KATEGORI_URL = '/api/v1/kategoriler/kategoriler/'
+
+
+@pytest.fixture
+def api_client():
+    """API istekleri için client"""
+    return APIClient()
+
+
+@pytest.fixture
+def kategori_agaci():
+    """İki ana kategori, her birinin altında üç alt kategori"""
+    kokler = [
+        Kategori.objects.create(ad=ad, pet_type=pet_type, sira=sira)
+        for sira, (ad, pet_type) in enumerate([("Kediler", "kedi"), ("Köpekler", "kopek")])
+    ]
+    for kok in kokler:
+        for i in range(3):
+            Kategori.objects.create(ad=f"{kok.ad} {i}", parent=kok, sira=i)
+    # Pasif alt kategori ağaçta görünmemeli
+    Kategori.objects.create(ad="Eski", parent=kokler[0], aktif=False)
+    return kokler
+
+
+def _sorgu_sayisi(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    return len(ctx.captured_queries), response
+
+
+@pytest.mark.django_db
+class TestKategoriAgaciEndpointleri:
+    """Materialize ağaç kullanan endpoint'lerin sorgu sayıları"""
+
+    def test_agac_tek_sorgu(self, api_client, kategori_agaci):
+        """Ağaç endpoint'i tüm hiyerarşiyi tek sorguda döndürmeli"""
+        sorgu, response = _sorgu_sayisi(api_client, f"{KATEGORI_URL}kategori_agaci/")
+
+        data = response.data['data']
+        assert sorgu == 1
+        assert [kok['ad'] for kok in data] == ["Kediler", "Köpekler"]
+        assert [alt['ad'] for alt in data[0]['children']] == ["Kediler 0", "Kediler 1", "Kediler 2"]
+
+    def test_liste_sorgu_sayisi_sabit(self, api_client, kategori_agaci):
+        """Liste endpoint'inde seviye/tam_ad kategori başına sorgu yapmamalı"""
+        kucuk, _ = _sorgu_sayisi(api_client, f"{KATEGORI_URL}?page_size=2")
+        buyuk, response = _sorgu_sayisi(api_client, f"{KATEGORI_URL}?page_size=8")
+
+        assert kucuk == buyuk
+        alt = next(k for k in response.data['results'] if k['ad'] == "Köpekler 1")
+        assert alt['seviye'] == 1
+        assert alt['tam_ad'] == "Köpekler > Köpekler 1"
+
+    def test_detay_breadcrumbs(self, api_client, kategori_agaci):
+        """Detayda breadcrumb ve alt kategori sayısı ağaçtan gelmeli"""
+        response = api_client.get(f"{KATEGORI_URL}{kategori_agaci[0].pk}/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['alt_kategori_sayisi'] == 3
+        assert [b['ad'] for b in response.data['breadcrumbs']] == ["Kediler"]
+
+
+@pytest.mark.django_db
+class TestKategoriYanitCache:
+    """Cache'lenen liste/detay yanıtlarında kullanım sayısı güncel kalmalı"""
+
+    @pytest.fixture(autouse=True)
+    def yerel_cache(self, settings):
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        yield
+        cache.clear()
+
+    def test_sayac_deltasi_detay_ve_listeyi_yeniler(
+        self, api_client, kategori_agaci, django_capture_on_commit_callbacks
+    ):
+        kok = kategori_agaci[0]
+        detay_url = f"{KATEGORI_URL}{kok.pk}/"
+        assert api_client.get(detay_url).data['kullanim_sayisi'] == 0
+        api_client.get(KATEGORI_URL)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Kategori.objects.kullanim_sayilarini_degistir({kok.id: 2})
+
+        assert api_client.get(detay_url).data['kullanim_sayisi'] == 2
+        liste = api_client.get(KATEGORI_URL).data['results']
+        assert next(k for k in liste if k['id'] == kok.pk)['kullanim_sayisi'] == 2
@@ -7,7 +7,6 @@ Kategori endpoint'leri - Her kategorinin hikayesini API'de anlatıyoruz
 
 from django.utils.translation import gettext_lazy as _
 from django.db.models import Q, Count, Prefetch
-from django.core.cache import cache
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -15,14 +14,20 @@ from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from apps.ortak.cache import etiketli_get, etiketli_set
 from apps.ortak.pagination import StandardPagination
 from apps.ortak.permissions import IsOwnerOrReadOnly
+from .managers import KATEGORI_CACHE_ETIKETI, KATEGORI_SAYAC_CACHE_ETIKETI
 from .models import Kategori, KategoriOzellik
 from .serializers import (
     KategoriBasicSerializer, KategoriDetailSerializer, 
-    KategoriTreeSerializer, KategoriStatsSerializer,
+    KategoriStatsSerializer,
     KategoriCreateUpdateSerializer, KategoriFilterSerializer
 )
+from .servisler import KategoriAgacService
+
+# kullanim_sayisi içeren yanıtlar sayaç deltalarıyla da geçersiz olur
+SAYACLI_CACHE_ETIKETLERI = [KATEGORI_CACHE_ETIKETI, KATEGORI_SAYAC_CACHE_ETIKETI]
 
 
 class KategoriViewSet(viewsets.ModelViewSet):
@@ -38,8 +43,10 @@ class KategoriViewSet(viewsets.ModelViewSet):
     pagination_class = StandardPagination
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     search_fields = ['ad', 'aciklama']
-    ordering_fields = ['ad', 'sira', 'kullanim_sayisi', 'olusturulma_tarihi']
+    ordering_fields = ['ad', 'sira', 'kullanim_sayisi', 'created_at']
     ordering = ['sira', 'ad']
+    # Varsayılan sıralamanın (sira, ad) devamı: cursor modu aynı sırayı korur
+    keyset_ordering = ('sira', 'ad', 'id')
     
     def get_serializer_class(self):
         """Her action için uygun serializer seç"""
@@ -56,7 +63,8 @@ class KategoriViewSet(viewsets.ModelViewSet):
         
         # Prefetch optimizasyonları
         if self.action == 'retrieve':
-            queryset = queryset.prefetch_related(
+            # Sınıf queryset'indeki düz 'alt_kategoriler' prefetch'i Prefetch ile çakışır
+            queryset = queryset.prefetch_related(None).prefetch_related(
                 'ozellikler',
                 Prefetch('alt_kategoriler', queryset=Kategori.objects.aktif())
             )
@@ -71,7 +79,7 @@ class KategoriViewSet(viewsets.ModelViewSet):
         """
         # Cache key oluştur
         cache_key = f"kategoriler:list:{request.GET.urlencode()}"
-        cached_data = cache.get(cache_key)
+        cached_data = etiketli_get(cache_key, SAYACLI_CACHE_ETIKETLERI)
         
         if cached_data:
             return Response(cached_data)
@@ -80,7 +88,7 @@ class KategoriViewSet(viewsets.ModelViewSet):
         
         # Başarılı response'u cache'le
         if response.status_code == 200:
-            cache.set(cache_key, response.data, 900)  # 15 dakika
+            etiketli_set(cache_key, response.data, SAYACLI_CACHE_ETIKETLERI, 900)  # 15 dakika
         
         return response
     
@@ -94,8 +102,8 @@ class KategoriViewSet(viewsets.ModelViewSet):
         instance = self.get_object()
         
         # Cache key
-        cache_key = f"kategori:detail:{instance.slug}"
-        cached_data = cache.get(cache_key)
+        cache_key = f"kategoriler:detail:{instance.slug}"
+        cached_data = etiketli_get(cache_key, SAYACLI_CACHE_ETIKETLERI)
         
         if cached_data:
             return Response(cached_data)
@@ -104,7 +112,7 @@ class KategoriViewSet(viewsets.ModelViewSet):
         response_data = serializer.data
         
         # Cache'le
-        cache.set(cache_key, response_data, 1800)  # 30 dakika
+        etiketli_set(cache_key, response_data, SAYACLI_CACHE_ETIKETLERI, 1800)  # 30 dakika
         
         return Response(response_data)
     
@@ -120,7 +128,7 @@ class KategoriViewSet(viewsets.ModelViewSet):
         
         # Cache'den kontrol et
         cache_key = "kategoriler:ana_kategoriler:api"
-        cached_data = cache.get(cache_key)
+        cached_data = etiketli_get(cache_key, SAYACLI_CACHE_ETIKETLERI)
         
         if cached_data:
             return Response({
@@ -132,7 +140,7 @@ class KategoriViewSet(viewsets.ModelViewSet):
         serializer = KategoriBasicSerializer(ana_kategoriler, many=True)
         
         # Cache'le
-        cache.set(cache_key, serializer.data, 3600)  # 1 saat
+        etiketli_set(cache_key, serializer.data, SAYACLI_CACHE_ETIKETLERI, 3600)  # 1 saat
         
         return Response({
             'success': True,
@@ -149,36 +157,14 @@ class KategoriViewSet(viewsets.ModelViewSet):
         Tüm kategorileri hiyerarşik yapıda getir.
         Alt kategoriler ana kategorilerin altında nested.
         """
-        cache_key = "kategoriler:agac:api"
-        cached_data = cache.get(cache_key)
-        
-        if cached_data:
-            return Response({
-                'success': True,
-                'data': cached_data,
-                'message': _('Kategori ağacı getirildi')
-            })
-        
-        # Ana kategorileri ve alt kategorilerini prefetch ile getir
-        ana_kategoriler = (
-            Kategori.objects.aktif()
-            .ana_kategoriler()
-            .prefetch_related(
-                Prefetch('alt_kategoriler', queryset=Kategori.objects.aktif())
-            )
-            .order_by('sira', 'ad')
-        )
-        
-        serializer = KategoriTreeSerializer(ana_kategoriler, many=True)
-        
-        # Cache'le
-        cache.set(cache_key, serializer.data, 1800)  # 30 dakika
+        # Materialize ağaç: en fazla bir sorgu, versiyonlu cache
+        agac = KategoriAgacService.agac().kokler
         
         return Response({
             'success': True,
-            'data': serializer.data,
+            'data': agac,
             'message': _('Kategori ağacı getirildi'),
-            'count': len(serializer.data)
+            'count': len(agac)
         })
     
     @action(detail=True, methods=['get'])
@@ -190,8 +176,8 @@ class KategoriViewSet(viewsets.ModelViewSet):
         """
         kategori = self.get_object()
         
-        cache_key = f"kategori:{kategori.slug}:alt_kategoriler"
-        cached_data = cache.get(cache_key)
+        cache_key = f"kategoriler:{kategori.slug}:alt_kategoriler"
+        cached_data = etiketli_get(cache_key, SAYACLI_CACHE_ETIKETLERI)
         
         if cached_data:
             return Response({
@@ -204,7 +190,7 @@ class KategoriViewSet(viewsets.ModelViewSet):
         serializer = KategoriBasicSerializer(alt_kategoriler, many=True)
         
         # Cache'le
-        cache.set(cache_key, serializer.data, 1800)  # 30 dakika
+        etiketli_set(cache_key, serializer.data, SAYACLI_CACHE_ETIKETLERI, 1800)  # 30 dakika
         
         return Response({
             'success': True,
@@ -244,7 +230,7 @@ class KategoriViewSet(viewsets.ModelViewSet):
         Platform genelindeki kategori istatistiklerini getir.
         """
         cache_key = "kategoriler:istatistikler"
-        cached_stats = cache.get(cache_key)
+        cached_stats = etiketli_get(cache_key, SAYACLI_CACHE_ETIKETLERI)
         
         if cached_stats:
             return Response({
@@ -280,7 +266,7 @@ class KategoriViewSet(viewsets.ModelViewSet):
         serializer = KategoriStatsSerializer(stats_data)
         
         # Cache'le
-        cache.set(cache_key, serializer.data, 3600)  # 1 saat
+        etiketli_set(cache_key, serializer.data, SAYACLI_CACHE_ETIKETLERI, 3600)  # 1 saat
         
         return Response({
             'success': True,
@@ -329,39 +315,9 @@ class KategoriViewSet(viewsets.ModelViewSet):
             'count': len(serializer.data)
         })
     
-    def perform_create(self, serializer):
-        """Kategori oluştururken cache temizle"""
-        serializer.save()
-        self._clear_category_cache()
-    
-    def perform_update(self, serializer):
-        """Kategori güncellerken cache temizle"""
-        serializer.save()
-        self._clear_category_cache()
-    
-    def perform_destroy(self, instance):
-        """Kategori silerken cache temizle"""
-        super().perform_destroy(instance)
-        self._clear_category_cache()
-    
-    def _clear_category_cache(self):
-        """Kategori cache'lerini temizle"""
-        cache_patterns = [
-            "kategoriler:*",
-            "kategori:*"
-        ]
-        
-        # Redis backend kullanıyorsak pattern ile temizle
-        try:
-            from django_redis import get_redis_connection
-            conn = get_redis_connection("default")
-            for pattern in cache_patterns:
-                keys = conn.keys(pattern)
-                if keys:
-                    conn.delete(*keys)
-        except:
-            # Fallback: tüm cache'i temizle
-            cache.clear()
+    # Yazma sonrası cache geçersiz kılma kategoriler.signals içinde yapılır
+    # (admin ve servis yazmalarını da kapsar).
+
 
 # ==============================================================================
 # 💝 PLATFORM MESSAGE
@@ -10,7 +10,15 @@ from django.db import models
 from django.db.models import Q, Count, Avg
 from django.utils import timezone
 from django.core.cache import cache
-from apps.ortak.constants import UserStatus, UserRoles
+from apps.ortak.constants import TURKISH_CITIES, UserStatus, UserRoles
+from apps.ortak.servisler import KonumService
+from apps.ortak.utils import turkce_normalize
+
+
+# Kullanıcı istatistikleri cache etiketi
+KULLANICI_ISTATISTIK_CACHE_ETIKETI = "kullanicilar:istatistikler"
+
+SEHIR_KODLARI = {kod for kod, _ad in TURKISH_CITIES}
 
 
 class CustomUserManager(BaseUserManager):
@@ -76,8 +84,20 @@ class CustomUserManager(BaseUserManager):
     def sehire_gore(self, sehir):
         """
         📍 Şehire göre kullanıcıları getir
+        
+        Aranan değer bir ile (ad veya plaka kodu) çözülürse indeksli il_kod
+        eşitliği kullanılır. Şehir kodları normalize biçimde saklanır
+        ('istanbul'); tanınmayan değerde kod eşitliği, o da yoksa kod
+        içinde arama yapılır.
         """
-        return self.aktif_kullanicilar().filter(sehir__icontains=sehir)
+        il_kodu = KonumService.il_kodu(sehir)
+        if il_kodu is not None:
+            return self.aktif_kullanicilar().filter(il_kod=il_kodu)
+        
+        kod = turkce_normalize(sehir).replace(' ', '')
+        if kod in SEHIR_KODLARI:
+            return self.aktif_kullanicilar().filter(sehir=kod)
+        return self.aktif_kullanicilar().filter(sehir__contains=kod)
     
     def deneyimli_kullanicilar(self):
         """Deneyimli kullanıcılar (profil detayı olan)"""
@@ -86,9 +106,14 @@ class CustomUserManager(BaseUserManager):
         ).select_related('profil_detay')
     
     def email_ile_getir(self, email):
-        """E-posta ile kullanıcı getir"""
+        """
+        E-posta ile kullanıcı getir
+        
+        E-postalar kayıtta küçük harfe çevrildiği için benzersiz indeksli
+        tam eşleşme yeterlidir (LOWER() taraması yapılmaz).
+        """
         try:
-            return self.get(email__iexact=email)
+            return self.get(email=email.strip().lower())
         except self.model.DoesNotExist:
             return None
     
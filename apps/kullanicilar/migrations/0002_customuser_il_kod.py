@@ -0,0 +1,30 @@
+# Generated by Django 4.2.16 on 2026-10-18 19:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def il_kodlarini_doldur(apps, schema_editor):
+    """Şehir kodundan ('istanbul') il_kod doldur"""
+    Il = apps.get_model('ortak', 'Il')
+    CustomUser = apps.get_model('kullanicilar', 'CustomUser')
+
+    for ad_normal, kod in Il.objects.values_list('ad_normal', 'kod'):
+        CustomUser.objects.filter(sehir=ad_normal.replace(' ', '')).update(il_kod=kod)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ortak', '0001_initial'),
+        ('kullanicilar', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='il_kod',
+            field=models.ForeignKey(blank=True, db_column='il_kod', editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='kullanicilar', to='ortak.il', verbose_name='İl Kodu'),
+        ),
+        migrations.RunPython(il_kodlarini_doldur, migrations.RunPython.noop),
+    ]
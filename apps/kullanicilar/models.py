@@ -13,6 +13,7 @@ from django.core.validators import RegexValidator
 from django.utils import timezone
 from apps.ortak.models import TimestampedModel
 from apps.ortak.constants import UserRoles, UserStatus, TURKISH_CITIES
+from apps.ortak.servisler import KonumService
 from apps.ortak.validators import validate_strong_password, validate_user_input_security
 from apps.kullanicilar.managers import CustomUserManager
 
@@ -70,6 +71,17 @@ class CustomUser(AbstractUser):
         verbose_name=_("Şehir"),
         help_text=_("Hangi şehirde yaşıyorsunuz?")
     )
+    # Şehir seçiminin plaka kodu - kayıtta şehirden türetilir
+    il_kod = models.ForeignKey(
+        'ortak.Il',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        editable=False,
+        db_column='il_kod',
+        related_name='kullanicilar',
+        verbose_name=_("İl Kodu")
+    )
     
     biyografi = models.TextField(
         max_length=500,
@@ -200,6 +212,12 @@ class CustomUser(AbstractUser):
         if not self.username or self.username != self.email:
             self.username = self.email
         
+        # Şehir kodunu ('istanbul') plaka koduna çevir; 'other' için boş kalır
+        self.il_kod_id = KonumService.il_kodu(self.sehir) if self.sehir else None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'sehir' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'il_kod'}
+        
         super().save(*args, **kwargs)
     
     @property
@@ -113,7 +113,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     
     def validate_email(self, value):
         """E-posta validasyonu"""
-        if CustomUser.objects.filter(email__iexact=value).exists():
+        if CustomUser.objects.filter(email=value.strip().lower()).exists():
             raise serializers.ValidationError(
                 _("Bu e-posta adresi zaten kullanılıyor.")
             )
@@ -284,7 +284,7 @@ class PasswordResetRequestSerializer(serializers.Serializer):
     def validate_email(self, value):
         """E-posta kontrolü"""
         try:
-            user = CustomUser.objects.get(email__iexact=value.lower())
+            user = CustomUser.objects.get(email=value.strip().lower())
             if not user.is_active:
                 raise serializers.ValidationError(
                     _("Bu hesap devre dışı bırakılmış.")
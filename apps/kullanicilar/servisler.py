@@ -16,7 +16,9 @@ from django.template.loader import render_to_string
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 
+from .managers import KULLANICI_ISTATISTIK_CACHE_ETIKETI
 from .models import CustomUser, KullaniciProfil
+from apps.ortak.cache import etiketleri_gecersiz_kil, etiketli_get_or_set
 from apps.ortak.exceptions import PlatformBaseException
 
 
@@ -86,7 +88,7 @@ class UserService:
         Şifre sıfırlama talebi oluştur
         """
         try:
-            user = CustomUser.objects.get(email__iexact=email.lower())
+            user = CustomUser.objects.get(email=email.strip().lower())
             
             # Sıfırlama token oluştur
             reset_token = secrets.token_urlsafe(32)
@@ -137,13 +139,10 @@ class UserService:
         """
         Platform kullanıcı istatistiklerini hesapla
         """
-        cache_key = "platform_user_stats"
-        stats = cache.get(cache_key)
-        
-        if stats is None:
+        def hesapla():
             from django.db.models import Count
             
-            stats = {
+            return {
                 'toplam_kullanici': CustomUser.objects.count(),
                 'aktif_kullanici': CustomUser.objects.aktif_kullanicilar().count(),
                 'dogrulanmis_kullanici': CustomUser.objects.filter(email_dogrulanmis=True).count(),
@@ -163,10 +162,13 @@ class UserService:
                     uyelik_tarihi__gte=timezone.now() - timezone.timedelta(days=7)
                 ).count()
             }
-            
-            cache.set(cache_key, stats, 1800)  # 30 dakika
         
-        return stats
+        return etiketli_get_or_set(
+            "kullanicilar:istatistikler:service",
+            hesapla,
+            [KULLANICI_ISTATISTIK_CACHE_ETIKETI],
+            1800  # 30 dakika
+        )
     
     @staticmethod
     def kullanici_arama(query: str, filters: Dict = None) -> List[CustomUser]:
@@ -196,13 +198,8 @@ class UserService:
         """
         Kullanıcı ile ilgili cache'leri temizle
         """
-        cache_keys = [
-            f"user_profile:{user_id}",
-            "platform_user_stats"
-        ]
-        
-        for key in cache_keys:
-            cache.delete(key)
+        cache.delete(f"user_profile:{user_id}")
+        etiketleri_gecersiz_kil(KULLANICI_ISTATISTIK_CACHE_ETIKETI)
 
 
 class EmailService:
@@ -8,7 +8,6 @@ Kullanıcı endpoint'leri - Her kullanıcının dijital hikayesi API'de yaşar
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import login, logout
 from django.db.models import Q, Count
-from django.core.cache import cache
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -17,7 +16,9 @@ from rest_framework.authtoken.models import Token
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from apps.ortak.cache import etiketli_get, etiketli_set
 from apps.ortak.pagination import StandardPagination
+from .managers import KULLANICI_ISTATISTIK_CACHE_ETIKETI
 from .models import CustomUser, KullaniciProfil
 from .permissions import IsProfileOwner, IsVerifiedUser, IsModeratorOrAdmin
 from .serializers import (
@@ -43,6 +44,7 @@ class UserViewSet(viewsets.ModelViewSet):
     search_fields = ['first_name', 'last_name', 'email', 'sehir']
     ordering_fields = ['first_name', 'last_name', 'uyelik_tarihi']
     ordering = ['-uyelik_tarihi']
+    keyset_ordering = ('-uyelik_tarihi', 'id')
     
     def get_serializer_class(self):
         """Her action için uygun serializer seç"""
@@ -285,8 +287,8 @@ class UserViewSet(viewsets.ModelViewSet):
         """
         Platform kullanıcı istatistikleri
         """
-        cache_key = "kullanici_istatistikleri"
-        stats = cache.get(cache_key)
+        cache_key = "kullanicilar:istatistikler"
+        stats = etiketli_get(cache_key, [KULLANICI_ISTATISTIK_CACHE_ETIKETI])
         
         if stats is None:
             stats = {
@@ -303,7 +305,7 @@ class UserViewSet(viewsets.ModelViewSet):
                     .values_list('sehir', 'count')[:10]
                 )
             }
-            cache.set(cache_key, stats, 3600)  # 1 saat
+            etiketli_set(cache_key, stats, [KULLANICI_ISTATISTIK_CACHE_ETIKETI], 3600)  # 1 saat
         
         serializer = UserStatsSerializer(stats)
         return Response({
@@ -5,10 +5,37 @@ Ortak modüller uygulaması konfigürasyonu
 ==============================================================================
 """
 
-from django.apps import AppConfig
+from django.apps import AppConfig, apps as global_apps
+from django.db import DEFAULT_DB_ALIAS, router
+from django.db.models.signals import post_migrate
+
+
+def illeri_yukle(sender, using=DEFAULT_DB_ALIAS, apps=global_apps, **kwargs):
+    """
+    İl tablosu boşsa doldur
+
+    Migration'sız kurulan veritabanlarında (testler) 0001'deki veri adımı
+    çalışmaz; il kodu FK'ları için tablo her migrate sonrası hazır olmalı.
+    """
+    from apps.ortak.servisler import KonumService
+
+    try:
+        Il = apps.get_model('ortak', 'Il')
+    except LookupError:
+        return
+    if not router.allow_migrate_model(using, Il):
+        return
+    if not Il.objects.using(using).exists():
+        KonumService.illeri_yukle(Il, using)
 
 
 class OrtakConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.ortak'
     verbose_name = 'Ortak Modüller'
+    
+    def ready(self):
+        # tr_iexact / tr_icontains / tr_istartswith / tr_in lookup'larını kaydet
+        import apps.ortak.fields  # noqa: F401
+
+        post_migrate.connect(illeri_yukle, sender=self)
@@ -0,0 +1,170 @@
+"""
+🐾 Evcil Hayvan Platformu - Etiketli Cache
+==============================================================================
+Nesil (generation) sayaçlarıyla etiketli cache anahtarları. Her etiketin
+cache'te bir versiyon sayacı vardır; anahtarlar ilgili etiketlerin güncel
+versiyonlarını içerir. Geçersiz kılmak sayacı bir artırmaktır (O(1)):
+eski anahtarlar artık okunmaz ve süreleri dolunca düşer. KEYS taraması veya
+cache.clear() gerekmez; kalan eski anahtarlar arka planda SCAN ile temizlenir.
+==============================================================================
+"""
+
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+ETIKET_ONEKI = "cache_etiket"
+ETIKET_AYRACI = "|"
+VERSIYON_AYRACI = "="
+
+
+def _etiket_anahtari(etiket: str) -> str:
+    return f"{ETIKET_ONEKI}:{etiket}"
+
+
+def etiket_versiyonlari(etiketler: Iterable[str]) -> Optional[Dict[str, int]]:
+    """
+    Etiketlerin güncel versiyonları (tek get_many)
+
+    Versiyonu olmayan etiket zaman damgasıyla başlatılır; böylece cache'ten
+    düşen bir sayaç eski bir versiyonla çakışmaz. Cache devre dışıysa
+    (DummyCache) None döner ve çağıran cache'i atlar.
+    """
+    etiketler = list(etiketler)
+    anahtarlar = {_etiket_anahtari(etiket): etiket for etiket in etiketler}
+    bulunan = cache.get_many(list(anahtarlar))
+
+    eksikler = [anahtar for anahtar in anahtarlar if anahtar not in bulunan]
+    if eksikler:
+        for anahtar in eksikler:
+            cache.add(anahtar, time.time_ns(), None)
+        bulunan.update(cache.get_many(eksikler))
+        if any(anahtar not in bulunan for anahtar in eksikler):
+            return None
+
+    return {anahtarlar[anahtar]: versiyon for anahtar, versiyon in bulunan.items()}
+
+
+def etiketli_anahtar(anahtar: str, etiketler: Iterable[str],
+                     versiyonlar: Optional[Dict[str, int]] = None) -> Optional[str]:
+    """
+    Etiket versiyonlarını içeren cache anahtarı
+
+    Örn: `kategoriler:populer:10|kategoriler:sayaclar=1718...`
+    Versiyonlar zaten okunduysa tekrar okunmaması için verilebilir.
+    """
+    etiketler = list(etiketler)
+    if versiyonlar is None:
+        versiyonlar = etiket_versiyonlari(etiketler)
+    if versiyonlar is None:
+        return None
+    parcalar = [f"{etiket}{VERSIYON_AYRACI}{versiyonlar[etiket]}" for etiket in etiketler]
+    return ETIKET_AYRACI.join([anahtar, *parcalar])
+
+
+def etiketli_get(anahtar: str, etiketler: Iterable[str], default: Any = None) -> Any:
+    """Etiketli cache'ten oku"""
+    tam_anahtar = etiketli_anahtar(anahtar, etiketler)
+    if tam_anahtar is None:
+        return default
+    return cache.get(tam_anahtar, default)
+
+
+def etiketli_set(anahtar: str, deger: Any, etiketler: Iterable[str], timeout: Optional[int] = 300):
+    """Etiketli cache'e yaz"""
+    tam_anahtar = etiketli_anahtar(anahtar, etiketler)
+    if tam_anahtar is not None:
+        cache.set(tam_anahtar, deger, timeout)
+
+
+def etiketli_get_or_set(anahtar: str, hesapla: Callable[[], Any], etiketler: Iterable[str],
+                        timeout: Optional[int] = 300) -> Any:
+    """
+    Etiketli cache'ten al yoksa hesaplayıp yaz
+
+    Versiyonlar bir kez okunur; okuma ve yazma aynı anahtarı kullanır.
+    """
+    tam_anahtar = etiketli_anahtar(anahtar, etiketler)
+    if tam_anahtar is None:
+        return hesapla()
+
+    deger = cache.get(tam_anahtar)
+    if deger is None:
+        deger = hesapla()
+        cache.set(tam_anahtar, deger, timeout)
+    return deger
+
+
+def etiketleri_gecersiz_kil(*etiketler: str):
+    """
+    Etiketlere bağlı tüm cache kayıtlarını geçersiz kıl
+
+    Versiyonlar transaction commit olduktan sonra artırılır; aksi halde
+    commit öncesi okuyan bir istek eski veriyi yeni versiyonla cache'leyebilir.
+    """
+    def artir():
+        for etiket in etiketler:
+            try:
+                cache.incr(_etiket_anahtari(etiket))
+            except ValueError:
+                # Sayaç yok (hiç okunmamış veya cache'ten düşmüş)
+                cache.set(_etiket_anahtari(etiket), time.time_ns(), None)
+
+    transaction.on_commit(artir)
+
+
+def eski_nesil_anahtarlarini_temizle(desen: str = "*", parti: int = 500) -> int:
+    """
+    Versiyonu güncel olmayan etiketli anahtarları sil
+
+    Sadece SCAN destekleyen backend'lerde (django-redis `iter_keys`) çalışır
+    ve arka plan görevi olarak çağrılmalıdır. Eski anahtarlar zaten okunmadığı
+    için bu temizlik yalnızca bellek kazanımıdır.
+
+    Returns:
+        int: Silinen anahtar sayısı
+    """
+    if not hasattr(cache, 'iter_keys'):
+        return 0
+
+    silinen = 0
+    adaylar = []
+    for anahtar in cache.iter_keys(f"{desen}{ETIKET_AYRACI}*", itersize=parti):
+        adaylar.append(anahtar)
+        if len(adaylar) >= parti:
+            silinen += _eski_olanlari_sil(adaylar)
+            adaylar = []
+    if adaylar:
+        silinen += _eski_olanlari_sil(adaylar)
+    return silinen
+
+
+def _eski_olanlari_sil(anahtarlar) -> int:
+    """Bir parti anahtarı güncel versiyonlarla karşılaştırıp eskileri sil"""
+    etiketli = {}
+    for anahtar in anahtarlar:
+        parcalar = anahtar.split(ETIKET_AYRACI)[1:]
+        try:
+            etiketli[anahtar] = [
+                (etiket, int(versiyon))
+                for etiket, versiyon in (parca.rsplit(VERSIYON_AYRACI, 1) for parca in parcalar)
+            ]
+        except ValueError:
+            continue
+
+    etiketler = {etiket for ciftler in etiketli.values() for etiket, _ in ciftler}
+    guncel = {
+        anahtar[len(ETIKET_ONEKI) + 1:]: versiyon
+        for anahtar, versiyon in cache.get_many([_etiket_anahtari(e) for e in etiketler]).items()
+    }
+
+    eskiler = [
+        anahtar for anahtar, ciftler in etiketli.items()
+        if any(guncel.get(etiket) != versiyon for etiket, versiyon in ciftler)
+    ]
+    if eskiler:
+        cache.delete_many(eskiler)
+    return len(eskiler)
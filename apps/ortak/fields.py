@@ -0,0 +1,187 @@
+"""
+🐾 Evcil Hayvan Platformu - Normalize Gölge Sütunlar
+==============================================================================
+Büyük/küçük harf duyarsız aramalar (`iexact`, `icontains`) SQL'de LOWER()
+ile sarıldığı için btree indeksini kullanamaz; LOWER() ayrıca Türkçe
+noktalı/noktasız I'yı yanlış katlar (SQLite yalnızca ASCII'yi küçültür).
+
+NormalizeAlan, kaynak alanın `turkce_normalize` ile katlanmış kopyasını
+indeksli bir sütunda tutar. `tr_iexact`, `tr_icontains`, `tr_istartswith`
+ve `tr_in` lookup'ları kaynak alan üzerinde yazılır; sorgu aranan değeri
+Python'da normalize edip gölge sütuna yönlendirir:
+
+    Kategori.objects.filter(ad__tr_iexact='KÖPEKLER')
+    -> WHERE ad_normal = 'kopekler'
+==============================================================================
+"""
+
+from django.core.exceptions import FieldError
+from django.db import models
+from django.db.models.lookups import Contains, Exact, In, StartsWith
+
+from .utils import turkce_normalize
+
+
+class NormalizeAlan(models.CharField):
+    """
+    Kaynak alanın normalize kopyası (gölge sütun)
+
+    Her kayıtta (bulk_create dahil) kaynak alandan yeniden hesaplanır.
+    `bulk_update` / `QuerySet.update` pre_save çağırmadığından, kaynak alanı
+    bu yollarla değiştiren kod gölge sütunu da birlikte yazmalıdır.
+
+    Args:
+        kaynak: Normalize edilecek alanın adı
+        normalizer: Katlama fonksiyonu (varsayılan: turkce_normalize)
+    """
+
+    def __init__(self, *args, kaynak=None, normalizer=turkce_normalize, **kwargs):
+        self.kaynak = kaynak
+        self.normalizer = normalizer
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('blank', True)
+        kwargs.setdefault('default', '')
+        kwargs.setdefault('db_index', True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['kaynak'] = self.kaynak
+        if self.normalizer is not turkce_normalize:
+            kwargs['normalizer'] = self.normalizer
+        # Varsayılanlar bu alana özgü: eşitse yazma, farklıysa (Field'ın
+        # varsayılanına eşit olsa bile) açıkça yaz
+        for anahtar, varsayilan in (('editable', False), ('blank', True), ('default', ''), ('db_index', True)):
+            deger = getattr(self, anahtar)
+            if deger == varsayilan:
+                kwargs.pop(anahtar, None)
+            else:
+                kwargs[anahtar] = deger
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        deger = self.normalizer(getattr(model_instance, self.kaynak) or '')
+        setattr(model_instance, self.attname, deger)
+        return deger
+
+
+class BitMaskesiAlan(models.PositiveIntegerField):
+    """
+    Kaynak listenin bit maskesi (türetilmiş sütun)
+
+    "Şu değerlerin hepsine sahip" sorgusu JSON taraması yerine tek tamsayı
+    karşılaştırmasına döner: `maske & istenen = istenen`. Kaynak alan
+    doğruluk kaynağıdır; maske her kayıtta (bulk_create dahil) yeniden
+    hesaplanır. NormalizeAlan gibi `bulk_update` / `QuerySet.update` ile
+    kaynak değiştiren kod maskeyi de birlikte yazmalıdır.
+
+    Args:
+        kaynak: Liste tutan alanın adı
+        maskeleyici: Listeden maske üreten fonksiyon
+    """
+
+    def __init__(self, *args, kaynak=None, maskeleyici=None, **kwargs):
+        self.kaynak = kaynak
+        self.maskeleyici = maskeleyici
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('default', 0)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['kaynak'] = self.kaynak
+        kwargs['maskeleyici'] = self.maskeleyici
+        for anahtar, varsayilan in (('editable', False), ('default', 0)):
+            deger = getattr(self, anahtar)
+            if deger == varsayilan:
+                kwargs.pop(anahtar, None)
+            else:
+                kwargs[anahtar] = deger
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        deger = self.maskeleyici(getattr(model_instance, self.kaynak) or [])
+        setattr(model_instance, self.attname, deger)
+        return deger
+
+
+class SayacAlan(models.PositiveIntegerField):
+    """
+    Tampondan göreli artışla güncellenen sayaç (bkz. sayac_tamponu)
+
+    Mevcut kaydın UPDATE'inde sütun kendisine eşitlenir (`x = x`); bellekte
+    kalmış eski değerin geri yazılması boşaltılmış artışları ezmez. İlk
+    kayıtta (INSERT) değer olduğu gibi yazılır. Mutlak değer yazmak için
+    `QuerySet.update()` kullanılmalıdır.
+    """
+
+    def pre_save(self, model_instance, add):
+        if add:
+            return super().pre_save(model_instance, add)
+        return models.F(self.attname)
+
+
+def golge_alan(alan):
+    """Alanın NormalizeAlan gölgesi (alan zaten gölgeyse kendisi, yoksa None)"""
+    if isinstance(alan, NormalizeAlan):
+        return alan
+    model = getattr(alan, 'model', None)
+    if model is None:
+        return None
+    for aday in model._meta.concrete_fields:
+        if isinstance(aday, NormalizeAlan) and aday.kaynak == alan.name:
+            return aday
+    return None
+
+
+class _GolgeYonlendirme:
+    """lhs'i kaynak alanın gölge sütununa, rhs'i normalize değere çevir"""
+
+    def __init__(self, lhs, rhs):
+        golge = golge_alan(getattr(lhs, 'target', None))
+        if golge is None:
+            raise FieldError(
+                f"'{self.lookup_name}' lookup'ı için {getattr(lhs, 'target', lhs)} alanının "
+                f"NormalizeAlan gölge sütunu yok"
+            )
+        super().__init__(golge.get_col(lhs.alias), self._normalize(golge, rhs))
+
+    def get_rhs_op(self, connection, rhs):
+        # Veritabanı operatör tabloları temel lookup adıyla anahtarlanır
+        return connection.operators[self.islem] % rhs
+
+    @staticmethod
+    def _normalize(golge, rhs):
+        return golge.normalizer(rhs) if isinstance(rhs, str) else rhs
+
+
+@models.CharField.register_lookup
+class TurkceIExact(_GolgeYonlendirme, Exact):
+    lookup_name = 'tr_iexact'
+    islem = 'exact'
+
+
+@models.CharField.register_lookup
+class TurkceIContains(_GolgeYonlendirme, Contains):
+    lookup_name = 'tr_icontains'
+    islem = 'contains'
+
+
+@models.CharField.register_lookup
+class TurkceIStartsWith(_GolgeYonlendirme, StartsWith):
+    lookup_name = 'tr_istartswith'
+    islem = 'startswith'
+
+
+@models.CharField.register_lookup
+class TurkceIn(_GolgeYonlendirme, In):
+    lookup_name = 'tr_in'
+
+    def get_rhs_op(self, connection, rhs):
+        return In.get_rhs_op(self, connection, rhs)
+
+    @staticmethod
+    def _normalize(golge, rhs):
+        if isinstance(rhs, (list, tuple, set, frozenset)):
+            return [golge.normalizer(deger) for deger in rhs if isinstance(deger, str)]
+        return rhs
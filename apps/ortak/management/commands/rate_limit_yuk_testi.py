@@ -0,0 +1,97 @@
+"""
+🐾 Rate Limit Yük Testi Komutu
+==============================================================================
+SecurityMiddleware'i birden çok thread'den eşzamanlı isteklerle çalıştırır.
+Worker başına istek/sn ve gecikme yüzdeliklerini raporlar; her IP için izin
+verilen istek sayısının limiti aşmadığını (kayıp artış olmadığını) doğrular.
+Gerçek sonuç için ayarlarda Redis cache backend'i ile çalıştırın.
+==============================================================================
+"""
+
+import statistics
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+
+from apps.ortak.middleware import SecurityMiddleware
+from apps.ortak.rate_limit import KayanPencereLimiti
+
+
+class Command(BaseCommand):
+    help = 'SecurityMiddleware rate limit yolunu eşzamanlı yük altında ölçer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sure', type=float, default=5.0,
+                            help='Test süresi (sn)')
+        parser.add_argument('--thread', type=int, default=8,
+                            help='Eşzamanlı thread sayısı')
+        parser.add_argument('--ip', type=int, default=50,
+                            help='Farklı istemci IP sayısı')
+        parser.add_argument('--limit', type=int, default=1000,
+                            help='IP başına pencere limiti')
+        parser.add_argument('--pencere', type=int, default=3600,
+                            help='Pencere süresi (sn)')
+        parser.add_argument('--hedef-rps', type=int, default=3000,
+                            help='Başarılı sayılması için gereken istek/sn')
+
+    def handle(self, *args, **options):
+        gruplar = [('yuk', ('/',), options['limit'], options['pencere'])]
+        ipler = [f'10.0.{i // 256}.{i % 256}' for i in range(options['ip'])]
+        izinli = Counter()
+        reddedilen = Counter()
+        gecikmeler = []
+        kilit = threading.Lock()
+        bitis = time.perf_counter() + options['sure']
+
+        factory = RequestFactory()
+        SecurityMiddleware.limiter = KayanPencereLimiti(onek='rate_limit_yuk_testi')
+        middleware = SecurityMiddleware(lambda request: None)
+
+        def calistir(sira):
+            yerel_izinli, yerel_red, yerel_gecikme = Counter(), Counter(), []
+            # İlk IP sel yapan istemci: isteklerin yarısı ondan gelir
+            i = sira
+            while time.perf_counter() < bitis:
+                ip = ipler[0] if i % 2 else ipler[i % len(ipler)]
+                request = factory.get('/api/v1/hayvanlar/', REMOTE_ADDR=ip)
+                baslangic = time.perf_counter()
+                response = middleware.process_request(request)
+                yerel_gecikme.append(time.perf_counter() - baslangic)
+                (yerel_izinli if response is None else yerel_red)[ip] += 1
+                i += 1
+            with kilit:
+                izinli.update(yerel_izinli)
+                reddedilen.update(yerel_red)
+                gecikmeler.extend(yerel_gecikme)
+
+        with override_settings(RATE_LIMIT_GRUPLARI=gruplar):
+            baslangic = time.perf_counter()
+            threadler = [threading.Thread(target=calistir, args=(n,)) for n in range(options['thread'])]
+            for thread in threadler:
+                thread.start()
+            for thread in threadler:
+                thread.join()
+            sure = time.perf_counter() - baslangic
+
+        toplam = sum(izinli.values()) + sum(reddedilen.values())
+        rps = toplam / sure
+        gecikmeler.sort()
+        self.stdout.write(f"cache backend: {settings.CACHES['default']['BACKEND']}")
+        self.stdout.write(f"istek: {toplam}  izin: {sum(izinli.values())}  red: {sum(reddedilen.values())}")
+        self.stdout.write(f"istek/sn: {rps:.0f}")
+        self.stdout.write(
+            f"gecikme ms  p50: {statistics.median(gecikmeler) * 1000:.3f}"
+            f"  p99: {gecikmeler[int(len(gecikmeler) * 0.99) - 1] * 1000:.3f}"
+        )
+
+        asanlar = {ip: adet for ip, adet in izinli.items() if adet > options['limit']}
+        if asanlar:
+            self.stdout.write(self.style.ERROR(f'Limit aşıldı (kayıp artış): {asanlar}'))
+        elif rps < options['hedef_rps']:
+            self.stdout.write(self.style.WARNING(f"Hedef {options['hedef_rps']} istek/sn altında"))
+        else:
+            self.stdout.write(self.style.SUCCESS('Limit korundu, hedef hıza ulaşıldı.'))
@@ -6,82 +6,172 @@ Custom security middleware for enhanced protection
 """
 
 import logging
-import time
-from django.core.cache import cache
-from django.http import HttpResponseForbidden
+from urllib.parse import unquote_plus
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.http.request import RawPostDataException
 from django.utils.deprecation import MiddlewareMixin
-from django.contrib.auth import get_user_model
+from django.utils.translation import gettext as _
 from ipware import get_client_ip
 
+from .exceptions import RateLimitExceededError
+from .rate_limit import KayanPencereLimiti
+from .tarayici import ISTEK_TARAYICI, metrikleri_aktar_gerekirse
+
 logger = logging.getLogger(__name__)
-User = get_user_model()
+
+
+# Şüpheli desen taramasında okunacak en fazla gövde boyutu (byte)
+SUPHELI_TARAMA_LIMITI = 64 * 1024
+
 
 class SecurityMiddleware(MiddlewareMixin):
     """
     Enhanced security middleware for pet platform
     """
     
+    limiter = KayanPencereLimiti()
+    
     def process_request(self, request):
         # Get client IP
         client_ip, is_routable = get_client_ip(request)
         request.client_ip = client_ip
         
-        # Rate limiting per IP
-        if self.is_rate_limited(client_ip, request):
-            logger.warning(f"Rate limit exceeded for IP: {client_ip}")
-            return HttpResponseForbidden("Rate limit exceeded")
+        # Rate limiting per user (or IP) and route group
+        retry_after = self.rate_limit_kontrol(client_ip, request)
+        if retry_after is not None:
+            return self.rate_limit_yaniti(retry_after)
         
         # Suspicious activity detection
         if self.detect_suspicious_activity(request):
             logger.warning(f"Suspicious activity detected from IP: {client_ip}")
             # Block but don't return error (log for investigation)
         
+        # Tarayıcı sayaçları aralıkla paylaşılan cache'e ve loga
+        metrikleri_aktar_gerekirse()
+        
+        return None
+    
+    @staticmethod
+    def route_grubu(path):
+        """İstek yolunun rate limit grubu: (grup, limit, pencere) - settings.RATE_LIMIT_GRUPLARI"""
+        for grup, onekler, limit, pencere in settings.RATE_LIMIT_GRUPLARI:
+            if path.startswith(onekler):
+                return grup, limit, pencere
         return None
     
-    def is_rate_limited(self, ip, request):
-        """Rate limiting based on IP and endpoint"""
+    def rate_limit_kontrol(self, ip, request):
+        """
+        İstemci + route grubu için kayan pencere limiti
         
-        # Different limits for different endpoints
-        if '/api/v1/auth/login/' in request.path:
-            limit = 5  # 5 login attempts
-            window = 300  # 5 minutes
-        elif '/api/v1/' in request.path:
-            limit = 100  # 100 API calls
-            window = 3600  # 1 hour
-        else:
-            limit = 200  # 200 general requests
-            window = 3600  # 1 hour
+        Returns:
+            Limit aşıldıysa Retry-After saniyesi, aksi halde None
+        """
+        grup = self.route_grubu(request.path_info)
+        if grup is None:
+            return None
         
-        cache_key = f"rate_limit:{ip}:{request.path_info}"
-        requests = cache.get(cache_key, 0)
+        istemci = self.istemci_anahtari(request, ip)
+        if istemci is None:
+            # IP belirlenemedi: herkesi tek kovaya toplamaktansa sınırlama
+            return None
         
-        if requests >= limit:
-            return True
+        ad, limit, pencere = grup
+        return self.limiter.kontrol(f"{ad}:{istemci}", limit, pencere)
+    
+    @staticmethod
+    def istemci_anahtari(request, ip):
+        """
+        Rate limit kovasının sahibi: kullanıcı kimliği, yoksa IP
+        
+        Oturum kullanıcısı AuthenticationMiddleware'den, API token'ı
+        sahibinin kimliğinden okunur; NAT arkasındaki kullanıcılar böylece
+        aynı IP kovasını paylaşmaz. Geçersiz token IP'ye düşer, rastgele
+        token üreterek limit aşılamaz.
+        """
+        kullanici = getattr(request, 'user', None)
+        if kullanici is not None and kullanici.is_authenticated:
+            return f"kullanici:{kullanici.pk}"
+        
+        tur, _bosluk, anahtar = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+        if tur.lower() == 'token' and anahtar:
+            from rest_framework.authtoken.models import Token
+            kullanici_id = (
+                Token.objects.filter(key=anahtar.strip()).values_list('user_id', flat=True).first()
+            )
+            if kullanici_id is not None:
+                return f"kullanici:{kullanici_id}"
         
-        # Increment counter
-        cache.set(cache_key, requests + 1, window)
-        return False
+        return f"ip:{ip}" if ip else None
+    
+    @staticmethod
+    def rate_limit_yaniti(retry_after):
+        """429 yanıtı (Retry-After başlığıyla)"""
+        response = JsonResponse({
+            'success': False,
+            'error': {
+                'code': RateLimitExceededError.default_code,
+                'message': _(RateLimitExceededError.default_message),
+                'extra_data': {'retry_after': retry_after},
+            }
+        }, status=429)
+        response['Retry-After'] = str(retry_after)
+        return response
     
     def detect_suspicious_activity(self, request):
-        """Detect suspicious patterns"""
-        
-        suspicious_patterns = [
-            # SQL injection attempts
-            'union select', 'drop table', '1=1', 'script>',
-            # Path traversal
-            '../', '..\\', '/etc/passwd',
-            # Command injection
-            '; cat ', '| nc ', '&& curl'
-        ]
+        """Detect suspicious patterns (tek geçişli derlenmiş tarayıcı)"""
+        return ISTEK_TARAYICI.ilk_eslesme(self.taranacak_metin(request)) is not None
+    
+    @staticmethod
+    def taranacak_metin(request):
+        """
+        Sorgu dizgisi ve gövdenin taranacak metni (boyut sınırlı)
         
-        query_string = request.GET.urlencode().lower()
-        post_data = str(request.POST).lower() if request.POST else ""
+        Gövde sınırı aşıyorsa taranmaz. Multipart gövdelerde sadece metin
+        alanları alınır, dosya parçaları atlanır; request.POST ayrıştırılmaz.
+        """
+        limit = getattr(settings, 'SUSPICIOUS_SCAN_MAX_BYTES', SUPHELI_TARAMA_LIMITI)
+        sorgu = unquote_plus(request.META.get('QUERY_STRING', ''))[:limit]
+        govde = SecurityMiddleware._govde_metinleri(request, limit)
+        return '\n'.join([sorgu, *govde])
+    
+    @staticmethod
+    def _govde_metinleri(request, limit):
+        """Gövdenin taranacak metin parçaları; boş, büyük veya okunmuş gövdede boş liste"""
+        try:
+            uzunluk = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            uzunluk = 0
+        if not uzunluk:
+            return []
+        if uzunluk > limit:
+            ISTEK_TARAYICI.sayac_artir('atlanan_govde')
+            return []
         
-        for pattern in suspicious_patterns:
-            if pattern in query_string or pattern in post_data:
-                return True
+        try:
+            govde = request.body
+        except RawPostDataException:
+            return []
         
-        return False
+        if request.content_type == 'multipart/form-data':
+            sinir = request.content_params.get('boundary', '').encode('latin-1')
+            return SecurityMiddleware._multipart_metinleri(govde, sinir)
+        if request.content_type == 'application/x-www-form-urlencoded':
+            return [unquote_plus(govde.decode('utf-8', 'ignore'))]
+        return [govde.decode('utf-8', 'ignore')]
+    
+    @staticmethod
+    def _multipart_metinleri(govde, sinir):
+        """Multipart gövdenin metin alanları; dosya parçaları atlanır"""
+        metinler = []
+        for parca in govde.split(b'--' + sinir) if sinir else ():
+            basliklar, _, icerik = parca.partition(b'\r\n\r\n')
+            if b'filename=' in basliklar:
+                ISTEK_TARAYICI.sayac_artir('atlanan_dosya')
+                continue
+            metinler.append(icerik.decode('utf-8', 'ignore'))
+        return metinler
 
 class AuditMiddleware(MiddlewareMixin):
     """
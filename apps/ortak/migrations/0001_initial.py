@@ -0,0 +1,74 @@
+# Generated by Django 4.2.16 on 2026-10-18 19:36
+
+import apps.ortak.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# constants.Iller'in bu migration anındaki kopyası (plaka kodu, ad)
+ILLER = (
+    (1, 'Adana'), (2, 'Adıyaman'), (3, 'Afyonkarahisar'), (4, 'Ağrı'), (68, 'Aksaray'),
+    (5, 'Amasya'), (6, 'Ankara'), (7, 'Antalya'), (75, 'Ardahan'), (8, 'Artvin'), (9, 'Aydın'),
+    (10, 'Balıkesir'), (74, 'Bartın'), (72, 'Batman'), (69, 'Bayburt'), (11, 'Bilecik'),
+    (12, 'Bingöl'), (13, 'Bitlis'), (14, 'Bolu'), (15, 'Burdur'), (16, 'Bursa'), (17, 'Çanakkale'),
+    (18, 'Çankırı'), (19, 'Çorum'), (20, 'Denizli'), (21, 'Diyarbakır'), (81, 'Düzce'),
+    (22, 'Edirne'), (23, 'Elazığ'), (24, 'Erzincan'), (25, 'Erzurum'), (26, 'Eskişehir'),
+    (27, 'Gaziantep'), (28, 'Giresun'), (29, 'Gümüşhane'), (30, 'Hakkari'), (31, 'Hatay'),
+    (76, 'Iğdır'), (32, 'Isparta'), (34, 'İstanbul'), (35, 'İzmir'), (46, 'Kahramanmaraş'),
+    (78, 'Karabük'), (70, 'Karaman'), (36, 'Kars'), (37, 'Kastamonu'), (38, 'Kayseri'),
+    (79, 'Kilis'), (71, 'Kırıkkale'), (39, 'Kırklareli'), (40, 'Kırşehir'), (41, 'Kocaeli'),
+    (42, 'Konya'), (43, 'Kütahya'), (44, 'Malatya'), (45, 'Manisa'), (47, 'Mardin'),
+    (33, 'Mersin'), (48, 'Muğla'), (49, 'Muş'), (50, 'Nevşehir'), (51, 'Niğde'), (52, 'Ordu'),
+    (80, 'Osmaniye'), (53, 'Rize'), (54, 'Sakarya'), (55, 'Samsun'), (63, 'Şanlıurfa'),
+    (56, 'Siirt'), (57, 'Sinop'), (58, 'Sivas'), (73, 'Şırnak'), (59, 'Tekirdağ'), (60, 'Tokat'),
+    (61, 'Trabzon'), (62, 'Tunceli'), (64, 'Uşak'), (65, 'Van'), (77, 'Yalova'), (66, 'Yozgat'),
+    (67, 'Zonguldak'),
+)
+
+
+def illeri_yukle(apps, schema_editor):
+    """81 ili yükle (ad_normal bulk_create'te hesaplanır)"""
+    Il = apps.get_model('ortak', 'Il')
+    Il.objects.using(schema_editor.connection.alias).bulk_create(
+        [Il(kod=kod, ad=ad) for kod, ad in ILLER], ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Il',
+            fields=[
+                ('kod', models.PositiveSmallIntegerField(primary_key=True, serialize=False, verbose_name='Plaka Kodu')),
+                ('ad', models.CharField(max_length=50, verbose_name='İl Adı')),
+                ('ad_normal', apps.ortak.fields.NormalizeAlan(db_index=False, kaynak='ad', max_length=50, unique=True, verbose_name='Normalize Ad')),
+            ],
+            options={
+                'verbose_name': '📍 İl',
+                'verbose_name_plural': '📍 İller',
+                'ordering': ['ad'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Ilce',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ad', models.CharField(max_length=50, verbose_name='İlçe Adı')),
+                ('ad_normal', apps.ortak.fields.NormalizeAlan(db_index=False, kaynak='ad', max_length=50, verbose_name='Normalize Ad')),
+                ('il', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ilceler', to='ortak.il', verbose_name='İl')),
+            ],
+            options={
+                'verbose_name': '📍 İlçe',
+                'verbose_name_plural': '📍 İlçeler',
+                'ordering': ['il', 'ad'],
+                'unique_together': {('il', 'ad_normal')},
+            },
+        ),
+        migrations.RunPython(illeri_yukle, migrations.RunPython.noop),
+    ]
@@ -15,6 +15,9 @@ from django.utils.text import slugify
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
 
+from . import sayac_tamponu
+from .fields import NormalizeAlan, SayacAlan
+
 # ==============================================================================
 # 🕒 TIMESTAMP MODEL - Zaman damgası temeli
 # ==============================================================================
@@ -353,21 +356,27 @@ class AnalyticsModel(models.Model):
     """
     Platform analitiği için
     Görüntülenme, beğeni gibi metriklerin takibi
+    
+    Artışlar sayaç tamponunda birikir ve toplu yazılır (bkz. sayac_tamponu);
+    güncel değer için guncel_sayaclar() kullanılmalı. Sayaç sütunları
+    mevcut kaydın save()'inde yazılmaz (bkz. SayacAlan).
     """
     
-    view_count = models.PositiveIntegerField(
+    SAYAC_ALANLARI = ('view_count', 'like_count', 'share_count')
+    
+    view_count = SayacAlan(
         default=0,
         verbose_name="Görüntülenme Sayısı",
         help_text="Kaç kez görüntülendiği"
     )
     
-    like_count = models.PositiveIntegerField(
+    like_count = SayacAlan(
         default=0,
         verbose_name="Beğeni Sayısı",
         help_text="Toplam beğeni sayısı"
     )
     
-    share_count = models.PositiveIntegerField(
+    share_count = SayacAlan(
         default=0,
         verbose_name="Paylaşım Sayısı",
         help_text="Kaç kez paylaşıldığı"
@@ -377,25 +386,92 @@ class AnalyticsModel(models.Model):
         abstract = True
     
     def increment_views(self):
-        """Görüntülenme sayısını artır"""
-        self.__class__.objects.filter(id=self.id).update(
-            view_count=models.F('view_count') + 1
-        )
-        self.refresh_from_db(fields=['view_count'])
+        """Görüntülenme sayısını artır (tamponlu)"""
+        sayac_tamponu.artir(self, 'view_count')
     
     def increment_likes(self):
-        """Beğeni sayısını artır"""
-        self.__class__.objects.filter(id=self.id).update(
-            like_count=models.F('like_count') + 1
-        )
-        self.refresh_from_db(fields=['like_count'])
+        """Beğeni sayısını artır (tamponlu)"""
+        sayac_tamponu.artir(self, 'like_count')
     
     def increment_shares(self):
-        """Paylaşım sayısını artır"""
-        self.__class__.objects.filter(id=self.id).update(
-            share_count=models.F('share_count') + 1
-        )
-        self.refresh_from_db(fields=['share_count'])
+        """Paylaşım sayısını artır (tamponlu)"""
+        sayac_tamponu.artir(self, 'share_count')
+    
+    def guncel_sayaclar(self):
+        """Kalıcı değer + tamponda bekleyen fark"""
+        farklar = sayac_tamponu.bekleyen_farklar(
+            type(self), [self.pk], self.SAYAC_ALANLARI
+        ).get(str(self.pk), {})
+        return {
+            alan: getattr(self, alan) + farklar.get(alan, 0)
+            for alan in self.SAYAC_ALANLARI
+        }
+
+# ==============================================================================
+# 📍 KONUM REFERANSI - İl / ilçe tabloları
+# ==============================================================================
+
+class Il(models.Model):
+    """
+    Türkiye illeri (plaka kodu birincil anahtar)
+    Veriler constants.Iller'den migration ile yüklenir
+    """
+    
+    kod = models.PositiveSmallIntegerField(
+        primary_key=True,
+        verbose_name="Plaka Kodu"
+    )
+    ad = models.CharField(
+        max_length=50,
+        verbose_name="İl Adı"
+    )
+    ad_normal = NormalizeAlan(
+        kaynak='ad',
+        max_length=50,
+        unique=True,
+        db_index=False,
+        verbose_name="Normalize Ad"
+    )
+    
+    class Meta:
+        verbose_name = "📍 İl"
+        verbose_name_plural = "📍 İller"
+        ordering = ['ad']
+    
+    def __str__(self):
+        return self.ad
+
+
+class Ilce(models.Model):
+    """
+    İlçeler - kayıtlardaki ilçe adlarından il başına tekil olarak oluşur
+    """
+    
+    il = models.ForeignKey(
+        Il,
+        on_delete=models.CASCADE,
+        related_name='ilceler',
+        verbose_name="İl"
+    )
+    ad = models.CharField(
+        max_length=50,
+        verbose_name="İlçe Adı"
+    )
+    ad_normal = NormalizeAlan(
+        kaynak='ad',
+        max_length=50,
+        db_index=False,
+        verbose_name="Normalize Ad"
+    )
+    
+    class Meta:
+        verbose_name = "📍 İlçe"
+        verbose_name_plural = "📍 İlçeler"
+        ordering = ['il', 'ad']
+        unique_together = [['il', 'ad_normal']]
+    
+    def __str__(self):
+        return f"{self.ad} / {self.il_id}"
 
 # ==============================================================================
 # 💝 PLATFORM MESSAGE
@@ -1,16 +1,225 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from apps.ortak.utils import estimate_queryset_count, serialize_for_json
+
+
+class KeysetPagination(BasePagination):
+    """
+    🐾 Keyset (cursor) sayfalama sınıfı
+    OFFSET ve COUNT(*) yerine son görülen kaydın sıralama değerleriyle
+    sayfalar; sayfa derinliğinden bağımsız olarak sabit sürede çalışır.
+
+    Sıralama varsayılan olarak `(-created_at, id)`'dir, view üzerinde
+    `keyset_ordering` ile değiştirilebilir. Sıralama alanları NULL
+    içermemeli ve son alan benzersiz olmalıdır.
+
+    `?count=exact|estimated|none` ile toplam sayı davranışı seçilir.
+    View'in uyguladığı sıralama (`?ordering=`, arama skoru) keyset
+    sıralamasıyla uyumlu değilse StandardPagination sayfa numarasıyla
+    sayfalar (bkz. siralama_uyumlu).
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    ordering = ('-created_at', 'id')
+
+    SAYIM_TAM = 'exact'
+    SAYIM_TAHMINI = 'estimated'
+    SAYIM_YOK = 'none'
+    count_mode = SAYIM_TAM
+
+    invalid_cursor_message = _('Geçersiz cursor')
+
+    @classmethod
+    def siralama_uyumlu(cls, queryset, view=None):
+        """
+        Queryset'in açık sıralaması keyset sıralamasının öneki mi?
+
+        Sıralama yoksa (model varsayılanı) uyumludur; `-created_at` gibi bir
+        önek de uyumludur, keyset yalnızca eşitlik bozan alanı ekler.
+        Alan adı olmayan ifadeler (arama skoru) uyumsuz sayılır.
+        """
+        ordering = tuple(getattr(view, 'keyset_ordering', None) or cls.ordering)
+        mevcut = tuple(queryset.query.order_by)
+        if not mevcut:
+            return True
+        return all(isinstance(alan, str) for alan in mevcut) and mevcut == ordering[:len(mevcut)]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = tuple(getattr(view, 'keyset_ordering', None) or self.ordering)
+        self.count = self.get_count(queryset, request)
+
+        cursor = self.decode_cursor(request)
+        geri = False
+        if cursor is not None:
+            degerler, geri = cursor
+            queryset = queryset.filter(self._konum_filtresi(queryset.model, degerler, geri))
+
+        siralama = self._ters_siralama() if geri else self.ordering
+        sonuclar = list(queryset.order_by(*siralama)[:self.page_size + 1])
+        fazlasi_var = len(sonuclar) > self.page_size
+        sonuclar = sonuclar[:self.page_size]
+
+        if geri:
+            sonuclar.reverse()
+            self.has_next = True
+            self.has_previous = fazlasi_var
+        else:
+            self.has_next = fazlasi_var
+            self.has_previous = cursor is not None
+
+        self.page = sonuclar
+        return sonuclar
+
+    def get_paginated_response(self, data):
+        return Response({
+            'links': {
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link()
+            },
+            'count': self.count,
+            'page_size': self.page_size,
+            'results': data
+        })
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+            if page_size > 0:
+                return min(page_size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return self.page_size
+
+    def get_count(self, queryset, request):
+        """Seçilen sayım moduna göre toplam kayıt sayısı"""
+        mod = request.query_params.get(self.count_query_param, self.count_mode)
+        if mod == self.SAYIM_YOK:
+            return None
+        if mod == self.SAYIM_TAHMINI:
+            return estimate_queryset_count(queryset)
+        return queryset.count()
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], geri=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return replace_query_param(self.base_url, self.cursor_query_param, '')
+        return self.encode_cursor(self.page[0], geri=True)
+
+    def encode_cursor(self, obj, geri):
+        """Kaydın sıralama değerlerinden cursor içeren URL üret"""
+        degerler = [
+            serialize_for_json(getattr(obj, self._alan(obj._meta, alan).attname))
+            for alan in self.ordering
+        ]
+        veri = json.dumps({'v': degerler, 'r': geri}, default=str, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(veri.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        """İstekteki cursor'ı (değerler, geri) olarak çöz"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            veri = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            degerler, geri = veri['v'], bool(veri['r'])
+        except (TypeError, ValueError, KeyError, binascii.Error, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(degerler, list) or len(degerler) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return degerler, geri
+
+    def _konum_filtresi(self, model, degerler, geri):
+        """
+        Cursor'dan sonraki (geri ise önceki) kayıtlar için filtre
+
+        (a, b) sıralaması için: a < x OR (a = x AND b > y). İlk alana ayrıca
+        kapsayıcı bir sınır eklenir ki indeks aralık taramasıyla kullanılsın.
+        """
+        kosul = Q()
+        esitlikler = {}
+        ilk_sinir = None
+
+        for alan, deger in zip(self.ordering, degerler):
+            ad = alan.lstrip('-')
+            try:
+                deger = self._alan(model._meta, alan).to_python(deger)
+            except Exception:
+                raise NotFound(self.invalid_cursor_message)
+
+            azalan = alan.startswith('-') != geri
+            operator = 'lt' if azalan else 'gt'
+            kosul |= Q(**esitlikler, **{f'{ad}__{operator}': deger})
+            esitlikler[ad] = deger
+
+            if ilk_sinir is None:
+                ilk_sinir = Q(**{f'{ad}__{operator}e': deger})
+
+        return ilk_sinir & kosul
+
+    def _ters_siralama(self):
+        return tuple(
+            alan[1:] if alan.startswith('-') else f'-{alan}'
+            for alan in self.ordering
+        )
+
+    @staticmethod
+    def _alan(meta, alan):
+        return meta.get_field(alan.lstrip('-'))
+
 
 class StandardPagination(PageNumberPagination):
     """
     🐾 Standart sayfalama sınıfı
     Platform genelinde kullanılan standart sayfalama ayarları
+
+    İstekte `cursor` parametresi varsa (ilk sayfa için boş olabilir)
+    KeysetPagination'a devreder; sonsuz kaydırma istemcileri bununla
+    derin sayfalarda da sabit süreli yanıt alır. İstenen sıralama (ör.
+    `?ordering=yas`, arama skoru) keyset sıralamasından farklıysa sıra
+    korunur ve sayfa numarasıyla sayfalanır.
     """
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
-    
+    keyset_pagination_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        keyset_sinifi = self.keyset_pagination_class
+        if (keyset_sinifi.cursor_query_param in request.query_params
+                and keyset_sinifi.siralama_uyumlu(queryset, view)):
+            self.keyset = self.keyset_pagination_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
     def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+
         return Response({
             'links': {
                 'next': self.get_next_link(),
@@ -21,4 +230,4 @@ class StandardPagination(PageNumberPagination):
             'current_page': self.page.number,
             'page_size': self.get_page_size(self.request),
             'results': data
-        })
\ No newline at end of file
+        })
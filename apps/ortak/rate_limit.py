@@ -0,0 +1,132 @@
+"""
+🐾 Evcil Hayvan Platformu - Rate Limiting
+==============================================================================
+Kayan pencere (sliding window counter) istek sınırlayıcı. Sayaçlar paylaşılan
+cache'te atomik artırılır: Redis'te tek round-trip'lik Lua script'i
+(INCR + ilk artışta EXPIRE + önceki pencereyi okuma), diğer backend'lerde
+cache.add + cache.incr. Limiti aşmış anahtarlar süreç içinde de tutulur;
+böylece sel halindeki istemciler Redis'e hiç gitmeden reddedilir.
+==============================================================================
+"""
+
+import logging
+import math
+import time
+from typing import Optional
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+KAYAN_PENCERE_LUA = """
+local simdiki = redis.call('INCR', KEYS[1])
+if simdiki == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+local onceki = redis.call('GET', KEYS[2])
+return {simdiki, tonumber(onceki) or 0}
+"""
+
+
+class KayanPencereLimiti:
+    """
+    Atomik kayan pencere sınırlayıcı
+
+    Tahmini istek sayısı = önceki pencere × (pencerenin kalan oranı) + bu
+    pencere. Her pencere sayacı iki pencere süresi yaşar; TTL sadece ilk
+    artışta verilir, sonraki artışlar süreyi uzatmaz.
+    """
+
+    # Süreç içi engel tablosu bu boyutu aşarsa süresi dolanlar atılır
+    YEREL_TABLO_LIMITI = 10_000
+
+    def __init__(self, onek: str = "rate_limit"):
+        self.onek = onek
+        self._engelliler = {}
+        self._lua = None
+        self._redis_durumu = None  # None: bilinmiyor, False: Redis yok
+
+    def kontrol(self, anahtar: str, limit: int, pencere: int, simdi: Optional[float] = None) -> Optional[int]:
+        """
+        İsteği say ve limiti kontrol et
+
+        Returns:
+            Limit aşıldıysa Retry-After saniyesi, aksi halde None
+        """
+        simdi = time.time() if simdi is None else simdi
+
+        # 1) Yerel ön kontrol: bu anahtar zaten engelli mi?
+        engel_bitisi = self._engelliler.get(anahtar)
+        if engel_bitisi is not None:
+            if engel_bitisi > simdi:
+                return math.ceil(engel_bitisi - simdi)
+            self._engelliler.pop(anahtar, None)
+
+        # 2) Paylaşılan sayaç
+        pencere_no, gecen = divmod(simdi, pencere)
+        pencere_no = int(pencere_no)
+        sayaclar = self._artir(
+            f"{self.onek}:{anahtar}:{pencere_no}",
+            f"{self.onek}:{anahtar}:{pencere_no - 1}",
+            pencere,
+        )
+        if sayaclar is None:
+            return None  # Cache kullanılamıyor: açık kal (fail-open)
+
+        simdiki, onceki = sayaclar
+        kalan_oran = 1 - gecen / pencere
+        if onceki * kalan_oran + simdiki <= limit:
+            return None
+
+        bekleme = self._bekleme_suresi(simdiki, onceki, limit, pencere, gecen)
+        if len(self._engelliler) >= self.YEREL_TABLO_LIMITI:
+            self._engelliler = {k: v for k, v in self._engelliler.items() if v > simdi}
+        if anahtar not in self._engelliler:
+            logger.warning(f"Rate limit exceeded: {anahtar}")
+        self._engelliler[anahtar] = simdi + bekleme
+        return bekleme
+
+    @staticmethod
+    def _bekleme_suresi(simdiki, onceki, limit, pencere, gecen) -> int:
+        """Tahmini sayının limitin altına ineceği ana kadar geçecek süre"""
+        if simdiki <= limit and onceki:
+            # onceki × (1 - (gecen + t) / pencere) + simdiki = limit
+            t = pencere * (1 - (limit - simdiki) / onceki) - gecen
+        else:
+            # Bu pencere tek başına dolu: en erken pencere sonunda
+            t = pencere - gecen
+        return max(1, math.ceil(t))
+
+    def _artir(self, anahtar, onceki_anahtar, pencere):
+        """(bu pencere, önceki pencere) sayaçları - tek atomik işlem"""
+        script = self._redis_script()
+        if script is not None:
+            try:
+                simdiki, onceki = script(
+                    keys=[cache.make_key(anahtar), cache.make_key(onceki_anahtar)],
+                    args=[pencere * 2],
+                )
+                return int(simdiki), int(onceki)
+            except Exception as e:
+                logger.warning(f"Rate limit Redis hatası: {e}")
+                return None
+
+        cache.add(anahtar, 0, pencere * 2)
+        try:
+            simdiki = cache.incr(anahtar)
+        except ValueError:
+            # Anahtar yazılamadı (örn. DummyCache) veya arada düştü
+            return None
+        return simdiki, cache.get(onceki_anahtar, 0)
+
+    def _redis_script(self):
+        """django-redis varsa Lua script'ini bir kez kaydet"""
+        if self._redis_durumu is None:
+            try:
+                from django_redis import get_redis_connection
+                self._lua = get_redis_connection("default").register_script(KAYAN_PENCERE_LUA)
+                self._redis_durumu = True
+            except (ImportError, NotImplementedError):
+                self._redis_durumu = False
+        return self._lua
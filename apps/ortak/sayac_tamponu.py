@@ -0,0 +1,354 @@
+"""
+🐾 Evcil Hayvan Platformu - Sayaç Tamponu
+==============================================================================
+Görüntülenme / beğeni / paylaşım artışları satıra tek tek yazılmaz; önce
+tamponda birikir, periyodik görev (sayac_tamponunu_bosalt) birikmiş farkları
+parti başına tek `UPDATE ... SET x = CASE ... END` ile veritabanına işler.
+Popüler bir kayıtta her istek aynı satırı kilitlemez.
+
+Cache backend'i django-redis ise tampon tek bir Redis hash'idir (HINCRBY,
+süreçler arası ortak). Aksi halde (geliştirme/test) süreç içi sözlük
+kullanılır ve yazma yolunda aralık dolunca kendiliğinden boşaltılır.
+
+Redis'te de tampon sınırsız büyümez: beat görevi gecikirse (son boşaltma
+işaretinin süresi dolarsa) veya hash MAKS_ALAN'ı aşarsa, kilidi alan tek
+istek tamponu kendisi boşaltır.
+
+Boşaltılan Redis hash'i işleme anahtarına taşınır ve ancak veritabanı
+yazımı commit edildikten sonra silinir; süreç arada çökerse veya yazım
+başarısız olursa bir sonraki boşaltma önce bu anahtarı işler. Farklar en az
+bir kez yazılır: commit ile silme arasında çökme yalnızca bu farkları iki
+kez yazabilir.
+
+Okumalar kalıcı değeri bekleyen farkla birleştirir (bkz. birlestir).
+==============================================================================
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+
+logger = logging.getLogger(__name__)
+
+TAMPON_ANAHTARI = "sayac_tamponu"
+# Her boşaltmada 2 aralık süreyle yazılır; yoksa beat gecikmiş demektir
+SON_BOSALTMA_ANAHTARI = "sayac_tamponu:son_bosaltma"
+BOSALTMA_KILIDI = "sayac_tamponu:bosaltma_kilidi"
+# Boşaltılan hash, yazım commit edilene kadar bu anahtarda kalır
+ISLENEN_ANAHTARI = "sayac_tamponu:bosaltiliyor"
+# Aynı anda tek boşaltma işleme anahtarına dokunur; süre çöken boşaltmanın
+# kilidini bırakır
+ISLEME_KILIDI = "sayac_tamponu:isleme_kilidi"
+ISLEME_KILIT_SURESI = 300
+ALAN_AYRACI = ":"
+# Tek UPDATE'te işlenecek en fazla satır
+PARTI_BOYUTU = 500
+# Redis hash'inde bu kadar alan birikirse beat beklenmeden boşaltılır
+MAKS_ALAN = 20_000
+
+# Redis yoksa kullanılan süreç içi tampon: (model etiketi, pk, alan) -> fark
+_yerel_tampon: Dict[Tuple[str, str, str], int] = defaultdict(int)
+_yerel_kilit = threading.Lock()
+_son_bosaltma = time.monotonic()
+
+
+def _redis():
+    """django-redis istemcisi; backend Redis değilse None"""
+    if not hasattr(cache, 'get_client'):
+        return None
+    return cache.get_client(write=True)
+
+
+def _redis_anahtari(anahtar: str = TAMPON_ANAHTARI) -> str:
+    return cache.make_key(anahtar)
+
+
+def _etiket(model) -> str:
+    return model._meta.label_lower
+
+
+def _hash_alani(etiket: str, pk, alan: str) -> str:
+    return ALAN_AYRACI.join((etiket, str(pk), alan))
+
+
+def _bosaltma_araligi() -> float:
+    return getattr(settings, 'SAYAC_TAMPONU_BOSALTMA_SANIYE', 30)
+
+
+def artir(nesne: models.Model, alan: str, miktar: int = 1):
+    """
+    Nesnenin sayacına bekleyen artış ekle (veritabanına gitmez)
+
+    Redis'e ulaşılamazsa artış süreç içi tampona düşer; sayım kaybolmaz,
+    sadece o sürecin bir sonraki boşaltmasını bekler.
+    """
+    etiket = _etiket(type(nesne))
+    istemci = _redis()
+    if istemci is not None:
+        try:
+            pipe = istemci.pipeline(transaction=False)
+            pipe.hincrby(_redis_anahtari(), _hash_alani(etiket, nesne.pk, alan), miktar)
+            pipe.hlen(_redis_anahtari())
+            pipe.exists(_redis_anahtari(SON_BOSALTMA_ANAHTARI))
+            _, alan_sayisi, zamaninda = pipe.execute()
+        except Exception:
+            logger.warning("Sayaç tamponuna yazılamadı, süreç içi tampon kullanılıyor", exc_info=True)
+        else:
+            if alan_sayisi > MAKS_ALAN or not zamaninda:
+                _gecikmeli_bosalt(istemci, alan_sayisi)
+            return
+
+    with _yerel_kilit:
+        _yerel_tampon[(etiket, str(nesne.pk), alan)] += miktar
+
+    # Redis olmayan ortamda periyodik boşaltmayı yazma yolu tetikler
+    if istemci is None and time.monotonic() - _son_bosaltma >= _bosaltma_araligi():
+        bosalt()
+
+
+def _gecikmeli_bosalt(istemci, alan_sayisi: int):
+    """
+    Beat gecikmişse/tampon taşmışsa boşaltmayı yazma yolunda yap
+
+    Kilit aralık boyunca tek bir isteğe izin verir; hata isteği bozmaz.
+    """
+    try:
+        if not istemci.set(_redis_anahtari(BOSALTMA_KILIDI), 1, nx=True,
+                           ex=max(int(_bosaltma_araligi()), 1)):
+            return
+        logger.warning(
+            "Sayaç tamponu beat görevini beklemeden boşaltılıyor (%s alan bekliyor)", alan_sayisi
+        )
+        bosalt()
+    except Exception:
+        logger.exception("Sayaç tamponu yazma yolunda boşaltılamadı")
+
+
+def bekleyen_farklar(model, pkler: Iterable, alanlar: Iterable[str]) -> Dict[str, Dict[str, int]]:
+    """
+    Henüz veritabanına yazılmamış farklar (tek HMGET)
+
+    Returns:
+        Dict: {str(pk): {alan: fark}} - farkı olmayanlar dahil edilmez
+    """
+    etiket = _etiket(model)
+    anahtarlar = [(str(pk), alan) for pk in pkler for alan in alanlar]
+    if not anahtarlar:
+        return {}
+
+    sonuc: Dict[str, Dict[str, int]] = defaultdict(dict)
+    istemci = _redis()
+    if istemci is not None:
+        hash_alanlari = [_hash_alani(etiket, pk, alan) for pk, alan in anahtarlar]
+        try:
+            # İşlenmekte olan (henüz commit edilmemiş) farklar da bekliyor sayılır
+            pipe = istemci.pipeline(transaction=False)
+            pipe.hmget(_redis_anahtari(), hash_alanlari)
+            pipe.hmget(_redis_anahtari(ISLENEN_ANAHTARI), hash_alanlari)
+            tampondakiler, islenenler = pipe.execute()
+        except Exception:
+            logger.warning("Sayaç tamponu okunamadı", exc_info=True)
+            tampondakiler = islenenler = [None] * len(anahtarlar)
+        for (pk, alan), *degerler in zip(anahtarlar, tampondakiler, islenenler):
+            fark = sum(int(deger) for deger in degerler if deger)
+            if fark:
+                sonuc[pk][alan] = fark
+
+    with _yerel_kilit:
+        for pk, alan in anahtarlar:
+            fark = _yerel_tampon.get((etiket, pk, alan))
+            if fark:
+                sonuc[pk][alan] = sonuc[pk].get(alan, 0) + fark
+    return dict(sonuc)
+
+
+def birlestir(nesneler: Iterable[models.Model], alanlar: Iterable[str]):
+    """
+    Nesnelerin sayaç özniteliklerine bekleyen farkları ekle (yerinde)
+
+    Yalnızca gösterim içindir; save() mevcut kaydın sayaç sütunlarını
+    yazmadığından (bkz. SayacAlan) birleştirilmiş değer veritabanına gitmez.
+    """
+    nesneler = list(nesneler)
+    alanlar = list(alanlar)
+    if not nesneler:
+        return nesneler
+
+    farklar = bekleyen_farklar(type(nesneler[0]), [n.pk for n in nesneler], alanlar)
+    for nesne in nesneler:
+        for alan, fark in farklar.get(str(nesne.pk), {}).items():
+            setattr(nesne, alan, getattr(nesne, alan) + fark)
+    return nesneler
+
+
+def _coz(hash_alani) -> Tuple[str, str, str]:
+    if isinstance(hash_alani, bytes):
+        hash_alani = hash_alani.decode()
+    etiket, pk, alan = hash_alani.rsplit(ALAN_AYRACI, 2)
+    return etiket, pk, alan
+
+
+def _kilit_al(istemci) -> bool:
+    try:
+        return bool(istemci.set(_redis_anahtari(ISLEME_KILIDI), 1, nx=True, ex=ISLEME_KILIT_SURESI))
+    except Exception:
+        logger.warning("Sayaç tamponu işleme kilidi alınamadı", exc_info=True)
+        return False
+
+
+def _kilidi_birak(istemci, islenen_silinsin: bool):
+    """Kilidi bırak; yazım commit edildiyse işleme anahtarını da sil"""
+    anahtarlar = [_redis_anahtari(ISLEME_KILIDI)]
+    if islenen_silinsin:
+        anahtarlar.append(_redis_anahtari(ISLENEN_ANAHTARI))
+    try:
+        istemci.delete(*anahtarlar)
+    except Exception:
+        logger.warning("Sayaç tamponu işleme anahtarı silinemedi", exc_info=True)
+
+
+def _redisten_devral(istemci) -> Optional[Dict[Tuple[str, str, str], int]]:
+    """
+    İşleme anahtarındaki farklar (kilit alınmış olmalı); Redis'e
+    ulaşılamazsa None
+
+    Önceki boşaltmadan kalan işleme anahtarı varsa yalnızca o işlenir,
+    tampon bir sonraki boşaltmayı bekler. Yoksa tampon RENAME ile atomik
+    olarak işleme anahtarına taşınır; bu sırada gelen artışlar yeni (boş)
+    hash'e yazılır ve kaybolmaz.
+    """
+    islenen = _redis_anahtari(ISLENEN_ANAHTARI)
+    farklar: Dict[Tuple[str, str, str], int] = defaultdict(int)
+    try:
+        istemci.set(_redis_anahtari(SON_BOSALTMA_ANAHTARI), 1,
+                    ex=max(int(_bosaltma_araligi() * 2), 1))
+        if istemci.exists(islenen):
+            logger.warning("Önceki boşaltmadan kalan sayaç farkları işleniyor")
+        elif istemci.exists(_redis_anahtari()):
+            istemci.rename(_redis_anahtari(), islenen)
+        degerler = istemci.hgetall(islenen)
+    except Exception:
+        logger.warning("Sayaç tamponu devralınamadı", exc_info=True)
+        return None
+    for hash_alani, deger in degerler.items():
+        farklar[_coz(hash_alani)] += int(deger)
+    return farklar
+
+
+def _yerelden_devral() -> Dict[Tuple[str, str, str], int]:
+    """Süreç içi tamponu al ve sıfırla"""
+    global _son_bosaltma
+
+    with _yerel_kilit:
+        farklar = dict(_yerel_tampon)
+        _yerel_tampon.clear()
+        _son_bosaltma = time.monotonic()
+    return farklar
+
+
+def _geri_yaz(farklar: Dict[Tuple[str, str, str], int]):
+    """Veritabanına yazılamayan süreç içi farkları tampona geri koy"""
+    with _yerel_kilit:
+        for anahtar, fark in farklar.items():
+            _yerel_tampon[anahtar] += fark
+
+
+def _modele_yaz(model, satirlar: Dict[str, Dict[str, int]], parti_boyutu: int) -> int:
+    """
+    Bir modelin farklarını parti başına tek UPDATE ile uygula
+
+    Her alan için `CASE WHEN id=.. THEN alan + fark ... ELSE alan END`;
+    artış göreli olduğundan arada yapılan diğer güncellemeler ezilmez.
+    pk'ler sıralı işlenir, eşzamanlı boşaltmalar aynı sırayla kilitler.
+    """
+    pk_alani = model._meta.pk
+    pkler = sorted((pk_alani.to_python(pk) for pk in satirlar), key=str)
+    guncellenen = 0
+    for i in range(0, len(pkler), parti_boyutu):
+        parti = pkler[i:i + parti_boyutu]
+        alanlar = sorted({alan for pk in parti for alan in satirlar[str(pk)]})
+        degerler = {
+            alan: models.Case(
+                *[
+                    models.When(pk=pk, then=models.F(alan) + satirlar[str(pk)][alan])
+                    for pk in parti if alan in satirlar[str(pk)]
+                ],
+                default=models.F(alan),
+                output_field=model._meta.get_field(alan),
+            )
+            for alan in alanlar
+        }
+        guncellenen += model._base_manager.filter(pk__in=parti).update(**degerler)
+    return guncellenen
+
+
+def _modellere_ayir(*kaynaklar: Dict[Tuple[str, str, str], int]) -> Dict[str, Dict[str, Dict[str, int]]]:
+    """Farkları topla: {model etiketi: {pk: {alan: fark}}} (sıfır farklar atlanır)"""
+    farklar: Dict[Tuple[str, str, str], int] = defaultdict(int)
+    for kaynak in kaynaklar:
+        for anahtar, fark in kaynak.items():
+            farklar[anahtar] += fark
+    modeller: Dict[str, Dict[str, Dict[str, int]]] = defaultdict(lambda: defaultdict(dict))
+    for (etiket, pk, alan), fark in farklar.items():
+        if fark:
+            modeller[etiket][pk][alan] = fark
+    return modeller
+
+
+def bosalt(parti_boyutu: int = PARTI_BOYUTU) -> int:
+    """
+    Birikmiş farkları veritabanına işle
+
+    Redis farkları işleme anahtarında commit'i bekler (bkz. modül açıklaması);
+    başka bir boşaltma işleme kilidini tutuyorsa yalnızca süreç içi tampon
+    boşaltılır. Yazma başarısız olursa süreç içi farklar tampona geri konur.
+
+    Returns:
+        int: Güncellenen satır sayısı
+    """
+    istemci = _redis()
+    kilitli = istemci is not None and _kilit_al(istemci)
+    redis_farklari = _redisten_devral(istemci) if kilitli else None
+    # Devralma başarısızsa işleme anahtarına dokunulmaz
+    devralindi = redis_farklari is not None
+    yerel_farklar = _yerelden_devral()
+
+    modeller = _modellere_ayir(redis_farklari or {}, yerel_farklar)
+    if not modeller:
+        if kilitli:
+            _kilidi_birak(istemci, islenen_silinsin=devralindi)
+        return 0
+
+    try:
+        with transaction.atomic():
+            guncellenen = sum(
+                _modele_yaz(apps.get_model(etiket), satirlar, parti_boyutu)
+                for etiket, satirlar in modeller.items()
+            )
+            if kilitli:
+                transaction.on_commit(lambda: _kilidi_birak(istemci, islenen_silinsin=devralindi))
+    except Exception:
+        _geri_yaz(yerel_farklar)
+        if kilitli:
+            # İşleme anahtarı kalır, sonraki boşaltma yeniden dener
+            _kilidi_birak(istemci, islenen_silinsin=False)
+        raise
+    return guncellenen
+
+
+def sifirla():
+    """Bekleyen farkları yazmadan at (testler ve bakım için)"""
+    with _yerel_kilit:
+        _yerel_tampon.clear()
+    istemci = _redis()
+    if istemci is not None:
+        istemci.delete(_redis_anahtari(), _redis_anahtari(SON_BOSALTMA_ANAHTARI),
+                       _redis_anahtari(BOSALTMA_KILIDI), _redis_anahtari(ISLENEN_ANAHTARI),
+                       _redis_anahtari(ISLEME_KILIDI))
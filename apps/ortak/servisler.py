@@ -0,0 +1,177 @@
+"""
+🐾 Evcil Hayvan Platformu - Ortak Servisler
+==============================================================================
+Uygulamalar arası paylaşılan iş mantığı
+==============================================================================
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .constants import IL_MERKEZLERI, ILCE_MERKEZLERI, Iller
+from .utils import turkce_normalize
+
+try:
+    import numpy as np
+except ImportError:  # Opsiyonel: yoksa mesafeler saf Python ile hesaplanır
+    np = None
+
+# Ortalama dünya yarıçapı ve bir enlem derecesinin uzunluğu (km)
+DUNYA_YARICAPI_KM = 6371.0088
+ENLEM_DERECESI_KM = 111.32
+
+
+class KonumService:
+    """
+    📍 İl / ilçe çözümleme
+
+    İl tablosu constants.Iller'in kopyasıdır; il kodu çözümlemesi bu sabit
+    listeden kurulan süreç içi sözlükle yapılır, veritabanına gitmez.
+    """
+
+    _il_haritasi: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def _harita(cls) -> Dict[str, int]:
+        if cls._il_haritasi is None:
+            harita = {}
+            for kod, ad in Iller.choices:
+                harita[turkce_normalize(ad)] = int(kod)
+                harita[kod] = int(kod)
+            cls._il_haritasi = harita
+        return cls._il_haritasi
+
+    @classmethod
+    def il_kodu(cls, deger) -> Optional[int]:
+        """
+        Plaka kodu ('34', '034', 34) veya il adından ('İSTANBUL') il kodu
+
+        Returns:
+            Optional[int]: Plaka kodu; tanınmayan değer için None
+        """
+        if deger is None:
+            return None
+        metin = str(deger).strip()
+        if metin.isdigit():
+            metin = str(int(metin))
+        return cls._harita().get(metin) or cls._harita().get(turkce_normalize(metin))
+
+    @staticmethod
+    def il_adi(kod) -> Optional[str]:
+        """Plaka kodundan il adı"""
+        return Iller.get_il_adi(str(kod)) if kod is not None else None
+
+    @staticmethod
+    def illeri_yukle(il_modeli=None, using: str = 'default') -> int:
+        """
+        İl tablosunu constants.Iller'den doldur (mevcut kayıtlara dokunmaz)
+
+        Args:
+            il_modeli: Il modeli (migration'larda tarihsel model)
+            using: Veritabanı alias'ı
+
+        Returns:
+            int: Gönderilen il sayısı
+        """
+        if il_modeli is None:
+            from .models import Il as il_modeli
+
+        iller = [il_modeli(kod=int(kod), ad=str(ad)) for kod, ad in Iller.choices]
+        il_modeli.objects.using(using).bulk_create(iller, ignore_conflicts=True)
+        return len(iller)
+
+    @staticmethod
+    def ilce_id(il_kodu: Optional[int], ad: str, olustur: bool = False) -> Optional[int]:
+        """
+        İl içinde ilçe adından ilçe ID'si (Türkçe duyarlı, büyük/küçük harf duyarsız)
+
+        Args:
+            il_kodu: Plaka kodu
+            ad: İlçe adı
+            olustur: Yoksa ilçe kaydı oluştur
+        """
+        from .models import Ilce
+
+        ad = (ad or '').strip()
+        if not il_kodu or not ad:
+            return None
+        if olustur:
+            ilce, _ = Ilce.objects.get_or_create(
+                il_id=il_kodu, ad_normal=turkce_normalize(ad), defaults={'ad': ad}
+            )
+            return ilce.id
+        return Ilce.objects.filter(il_id=il_kodu, ad__tr_iexact=ad).values_list('id', flat=True).first()
+
+    @staticmethod
+    def koordinat(il_kodu: Optional[int], ilce: str = '') -> Optional[Tuple[float, float]]:
+        """
+        İlçe (biliniyorsa) veya il merkezinin koordinatı
+
+        Returns:
+            Optional[Tuple[float, float]]: (enlem, boylam); il bilinmiyorsa None
+        """
+        if not il_kodu:
+            return None
+        if ilce:
+            merkez = ILCE_MERKEZLERI.get((il_kodu, turkce_normalize(ilce)))
+            if merkez:
+                return merkez
+        return IL_MERKEZLERI.get(il_kodu)
+
+    @staticmethod
+    def koordinat_hassasiyeti(il_kodu: Optional[int], ilce: str = '') -> Optional[str]:
+        """
+        `koordinat`ın döndüğü noktanın düzeyi
+
+        ILCE_MERKEZLERI her ilçeyi kapsamaz; tabloda olmayan ilçeler il
+        merkezine düşer ve mesafeleri yaklaşıktır.
+
+        Returns:
+            Optional[str]: 'ilce', 'il' veya koordinat yoksa None
+        """
+        if ilce and il_kodu and (il_kodu, turkce_normalize(ilce)) in ILCE_MERKEZLERI:
+            return 'ilce'
+        return 'il' if il_kodu in IL_MERKEZLERI else None
+
+    @staticmethod
+    def sinir_kutusu(enlem: float, boylam: float, yaricap_km: float) -> Tuple[float, float, float, float]:
+        """
+        Yarıçapı kapsayan enlem/boylam kutusu (indeksli ön filtre için)
+
+        Returns:
+            Tuple: (min_enlem, max_enlem, min_boylam, max_boylam)
+        """
+        enlem_farki = yaricap_km / ENLEM_DERECESI_KM
+        # Kutunun kutba yakın kenarında boylam derecesi en kısadır
+        kenar = min(abs(enlem) + enlem_farki, 89.9)
+        boylam_farki = yaricap_km / (ENLEM_DERECESI_KM * math.cos(math.radians(kenar)))
+        return (
+            enlem - enlem_farki, enlem + enlem_farki,
+            boylam - boylam_farki, boylam + boylam_farki,
+        )
+
+    @staticmethod
+    def mesafeler(enlem: float, boylam: float,
+                  enlemler: Sequence[float], boylamlar: Sequence[float]) -> List[float]:
+        """
+        Bir noktadan nokta listesine haversine mesafeleri (km)
+
+        numpy kuruluysa tüm liste tek seferde (vektörel) hesaplanır.
+        """
+        if np is not None:
+            enlem_r = np.radians(np.asarray(enlemler, dtype=float))
+            boylam_r = np.radians(np.asarray(boylamlar, dtype=float))
+            merkez_enlem, merkez_boylam = math.radians(enlem), math.radians(boylam)
+            a = (np.sin((enlem_r - merkez_enlem) / 2) ** 2 +
+                 math.cos(merkez_enlem) * np.cos(enlem_r) * np.sin((boylam_r - merkez_boylam) / 2) ** 2)
+            return (2 * DUNYA_YARICAPI_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))).tolist()
+
+        merkez_enlem, merkez_boylam = math.radians(enlem), math.radians(boylam)
+        cos_merkez = math.cos(merkez_enlem)
+        sonuc = []
+        for e, b in zip(enlemler, boylamlar):
+            e, b = math.radians(e), math.radians(b)
+            a = (math.sin((e - merkez_enlem) / 2) ** 2 +
+                 cos_merkez * math.cos(e) * math.sin((b - merkez_boylam) / 2) ** 2)
+            sonuc.append(2 * DUNYA_YARICAPI_KM * math.asin(math.sqrt(min(a, 1.0))))
+        return sonuc
@@ -0,0 +1,190 @@
+"""
+🐾 Evcil Hayvan Platformu - Şüpheli Desen Tarayıcı
+==============================================================================
+Desen gruplarını tek bir alternation regex'ine derleyip metni tek geçişte
+tarayan motor. Middleware (istek taraması) ve validatörler (alan taraması)
+aynı motoru ve aynı desen tanımlarını kullanır. Her tarayıcı, grup başına
+eşleşme sayaçlarını metrik olarak tutar.
+
+Süreç içi sayaçlar en fazla AKTARIM_ARALIGI saniyede bir paylaşılan cache'e
+eklenir ve bir log satırı olarak yazılır (bkz. metrikleri_aktar_gerekirse).
+Süreçler arası toplamlar personel için /api/v1/ortak/tarayici-metrikleri/
+üzerinden okunur.
+==============================================================================
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Süreç içi sayaçların paylaşılan cache'e eklenme aralığı (sn)
+AKTARIM_ARALIGI = 60
+METRIK_ONEKI = "tarayici"
+
+# Ada göre tüm tarayıcılar (aktarım ve metrik endpoint'i için)
+TARAYICILAR: Dict[str, 'DesenTarayici'] = {}
+
+# ==============================================================================
+# 🧩 DESEN TANIMLARI - Grup başına regex parçaları
+# ==============================================================================
+
+SQL_DESENLERI = [
+    r'union\s+select',
+    r'drop\s+table',
+    r'delete\s+from',
+    r'insert\s+into',
+    r'update\s+.*\s+set',
+]
+
+XSS_DESENLERI = [
+    r'<script[^>]*>.*?</script>',
+    r'javascript:',
+    r'onload\s*=',
+    r'onerror\s*=',
+    r'onclick\s*=',
+]
+
+# İstek taramasına özgü kaba desenler (alan validasyonunda kullanılmaz)
+ISTEK_SQL_DESENLERI = SQL_DESENLERI + [r'\b1\s*=\s*1\b']
+ISTEK_XSS_DESENLERI = XSS_DESENLERI + [r'<script', r'script>']
+YOL_DESENLERI = [r'\.\./', r'\.\.\\', r'/etc/passwd']
+KOMUT_DESENLERI = [r';\s*cat\s', r'\|\s*nc\s', r'&&\s*curl']
+
+
+class DesenTarayici:
+    """
+    Derlenmiş tek geçişli desen tarayıcı
+
+    Her grup bir isimli yakalama grubudur; `re` tüm alternatifleri metin
+    üzerinde tek soldan sağa geçişte dener. Eşleşmeler grup adıyla sayılır.
+
+    Args:
+        gruplar: (grup adı, regex parçaları) sırası - öncelik sırasıdır
+        ad: Metrik adı; verilirse tarayıcı TARAYICILAR'a kaydedilir
+        ek_sayaclar: Eşleşme dışı sayaç adları (bkz. sayac_artir)
+    """
+
+    def __init__(self, gruplar: Sequence[Tuple[str, Iterable[str]]], flags: int = re.IGNORECASE,
+                 ad: Optional[str] = None, ek_sayaclar: Sequence[str] = ()):
+        self.grup_adlari = [grup for grup, _ in gruplar]
+        self.sayac_adlari = [*self.grup_adlari, *ek_sayaclar]
+        self.desen = re.compile(
+            '|'.join(f"(?P<{grup}>{'|'.join(parcalar)})" for grup, parcalar in gruplar),
+            flags,
+        )
+        self.ad = ad
+        self._sayaclar = Counter()
+        self._aktarilmamis = Counter()
+        self._son_aktarim = time.monotonic()
+        self._kilit = threading.Lock()
+        if ad is not None:
+            TARAYICILAR[ad] = self
+
+    def ilk_eslesme(self, metin: str) -> Optional[Tuple[str, str]]:
+        """Metindeki ilk eşleşme: (grup, eşleşen metin)"""
+        if not metin:
+            return None
+        eslesme = self.desen.search(metin)
+        if eslesme is None:
+            return None
+        self._say(eslesme.lastgroup)
+        return eslesme.lastgroup, eslesme.group()
+
+    def oncelikli_eslesme(self, metin: str) -> Optional[Tuple[str, str]]:
+        """
+        Tanım sırasına göre en öncelikli grubun ilk eşleşmesi
+
+        Metin yine tek geçişte taranır; en öncelikli grup bulununca durulur.
+        """
+        if not metin:
+            return None
+        bulunan = {}
+        en_oncelikli = self.grup_adlari[0]
+        for eslesme in self.desen.finditer(metin):
+            bulunan.setdefault(eslesme.lastgroup, eslesme.group())
+            if eslesme.lastgroup == en_oncelikli:
+                break
+        for ad in self.grup_adlari:
+            if ad in bulunan:
+                self._say(ad)
+                return ad, bulunan[ad]
+        return None
+
+    def _say(self, ad):
+        with self._kilit:
+            self._sayaclar[ad] += 1
+            self._aktarilmamis[ad] += 1
+
+    def sayac_artir(self, ad: str):
+        """Eşleşme dışı metrikler (örn. atlanan istekler) için sayaç"""
+        self._say(ad)
+
+    def metrikler(self) -> Dict[str, int]:
+        """Grup başına eşleşme sayaçlarının kopyası (bu süreç)"""
+        with self._kilit:
+            return dict(self._sayaclar)
+
+    def _metrik_anahtari(self, sayac: str) -> str:
+        return f"{METRIK_ONEKI}:{self.ad}:{sayac}"
+
+    def metrikleri_aktar(self) -> Dict[str, int]:
+        """
+        Son aktarımdan bu yana artışları paylaşılan cache'e ekle ve logla
+
+        Cache kullanılamazsa artışlar bir sonraki aktarıma bırakılır.
+
+        Returns:
+            Dict[str, int]: Aktarılan artışlar
+        """
+        with self._kilit:
+            artislar, self._aktarilmamis = dict(self._aktarilmamis), Counter()
+            self._son_aktarim = time.monotonic()
+        if not artislar or self.ad is None:
+            return {}
+
+        try:
+            for sayac, artis in artislar.items():
+                anahtar = self._metrik_anahtari(sayac)
+                cache.add(anahtar, 0, None)
+                cache.incr(anahtar, artis)
+        except Exception:
+            with self._kilit:
+                self._aktarilmamis.update(artislar)
+            logger.warning("Tarayıcı metrikleri cache'e yazılamadı: %s", self.ad, exc_info=True)
+            return {}
+
+        logger.info(
+            "Tarayıcı metrikleri (%s): %s", self.ad,
+            ' '.join(f"{sayac}=+{artis}" for sayac, artis in sorted(artislar.items())),
+        )
+        return artislar
+
+    def paylasilan_metrikler(self) -> Dict[str, int]:
+        """Tüm süreçlerin aktardığı toplam sayaçlar"""
+        anahtarlar = {self._metrik_anahtari(sayac): sayac for sayac in self.sayac_adlari}
+        degerler = cache.get_many(list(anahtarlar))
+        return {sayac: degerler.get(anahtar, 0) for anahtar, sayac in anahtarlar.items()}
+
+
+def metrikleri_aktar_gerekirse(simdi: Optional[float] = None):
+    """Aralığı dolan tarayıcıların sayaçlarını aktar (istek yolunda ucuz kontrol)"""
+    simdi = time.monotonic() if simdi is None else simdi
+    for tarayici in TARAYICILAR.values():
+        if simdi - tarayici._son_aktarim >= AKTARIM_ARALIGI:
+            tarayici.metrikleri_aktar()
+
+
+# Middleware'in istek taraması için ortak örnek
+ISTEK_TARAYICI = DesenTarayici([
+    ('sql', ISTEK_SQL_DESENLERI),
+    ('xss', ISTEK_XSS_DESENLERI),
+    ('yol', YOL_DESENLERI),
+    ('komut', KOMUT_DESENLERI),
+], ad='istek', ek_sayaclar=('atlanan_govde', 'atlanan_dosya'))
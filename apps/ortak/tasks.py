@@ -0,0 +1,42 @@
+"""
+🐾 Evcil Hayvan Platformu - Ortak Arka Plan Görevleri
+==============================================================================
+Platform genelindeki bakım görevleri
+==============================================================================
+"""
+
+import logging
+
+from celery import shared_task
+
+from . import sayac_tamponu
+from .cache import eski_nesil_anahtarlarini_temizle
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def eski_cache_anahtarlarini_temizle(desen: str = "*"):
+    """
+    Etiket versiyonu geçmiş cache anahtarlarını SCAN ile temizle
+
+    Celery beat ile ESKI_CACHE_TEMIZLEME_SANIYE aralığında çalışır
+    (bkz. CELERY_BEAT_SCHEDULE).
+    """
+    silinen = eski_nesil_anahtarlarini_temizle(desen)
+    logger.info("Eski nesil cache anahtarları temizlendi: %s", silinen)
+    return silinen
+
+
+@shared_task(ignore_result=True)
+def sayac_tamponunu_bosalt():
+    """
+    Tamponda biriken sayaç artışlarını veritabanına işle
+
+    Celery beat ile SAYAC_TAMPONU_BOSALTMA_SANIYE aralığında çalışır
+    (bkz. CELERY_BEAT_SCHEDULE).
+    """
+    guncellenen = sayac_tamponu.bosalt()
+    if guncellenen:
+        logger.info("Sayaç tamponu boşaltıldı: %s satır", guncellenen)
+    return guncellenen
@@ -0,0 +1,96 @@
+"""
+🐾 Evcil Hayvan Platformu - Normalize Gölge Sütun Testleri
+==============================================================================
+Türkçe katlama, NormalizeAlan ve tr_* lookup yönlendirmesi için testler
+==============================================================================
+"""
+
+import pytest
+from django.core.exceptions import FieldError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.etiketler.models import Etiket
+from apps.hayvanlar.models import Hayvan
+from apps.kategoriler.models import Kategori
+from apps.kullanicilar.models import CustomUser
+from apps.ortak.utils import create_slug, turkce_kucult, turkce_normalize
+
+
+class TestTurkceKatlama:
+    """Paylaşılan Türkçe küçültme ve normalize fonksiyonları"""
+
+    def test_noktali_noktasiz_i(self):
+        assert turkce_kucult("IŞIK İZMİR") == "ışık izmir"
+        assert turkce_normalize("  IŞIKLI   Köpek ") == "isikli kopek"
+        assert turkce_normalize("TATLI") == turkce_normalize("Tatlı") == "tatli"
+        assert turkce_normalize("YENİ ETİKET") == turkce_normalize("Yeni Etiket")
+
+    def test_slug_ayni_haritayi_kullanir(self):
+        assert create_slug("Aynı Ad") == "ayni-ad"
+        assert create_slug("İstanbul Şişli") == "istanbul-sisli"
+
+
+@pytest.mark.django_db
+class TestNormalizeAlan:
+    """Gölge sütun ve tr_* lookup'ları"""
+
+    def test_kayitta_ve_toplu_eklemede_doldurulur(self):
+        etiket = Etiket.objects.create(ad="Işıklı Göz")
+        Etiket.tum_etiketler.bulk_create([Etiket(ad="ÇOK SEVİMLİ", slug="cok-sevimli")])
+
+        etiket.refresh_from_db()
+        assert etiket.ad_normal == "isikli goz"
+        assert Etiket.tum_etiketler.get(slug="cok-sevimli").ad_normal == "cok sevimli"
+
+    def test_tr_iexact_golge_sutuna_yonlenir(self):
+        Kategori.objects.create(ad="Köpekler", pet_type="kopek")
+
+        with CaptureQueriesContext(connection) as ctx:
+            kategori = Kategori.objects.filter(ad__tr_iexact="KÖPEKLER").first()
+
+        assert kategori is not None
+        sql = ctx.captured_queries[0]['sql']
+        assert '"ad_normal" = ' in sql
+        assert 'LOWER' not in sql.upper().replace('"AD_NORMAL"', '')
+
+    def test_diger_lookuplar(self):
+        for ad in ("Sakin Kedi", "Şımarık", "Işıklı"):
+            Etiket.objects.create(ad=ad)
+
+        assert list(Etiket.objects.filter(ad__tr_icontains="KED").values_list('ad', flat=True)) == ["Sakin Kedi"]
+        assert list(Etiket.objects.filter(ad__tr_istartswith="şı").values_list('ad', flat=True)) == ["Şımarık"]
+        assert Etiket.objects.filter(ad__tr_in=["IŞIKLI", "ŞIMARIK"]).count() == 2
+
+    def test_hayvan_il_filtresi(self):
+        Hayvan.objects.create(ad="Pamuk", tur="kedi", il="İzmir")
+
+        assert Hayvan.objects.filter(il__tr_iexact="IZMIR").count() == 1
+        assert Hayvan.objects.filter(il__tr_iexact="izmir").count() == 1
+
+    def test_golgesi_olmayan_alan_hata_verir(self):
+        with pytest.raises(FieldError):
+            Etiket.objects.filter(aciklama__tr_iexact="x")
+
+
+@pytest.mark.django_db
+class TestKullaniciAramalari:
+    """E-posta ve şehir aramaları indeksli eşitliğe döner"""
+
+    @pytest.fixture
+    def kullanici(self):
+        return CustomUser.objects.create_user(
+            email="Ilker@Example.com", password="GucluSifre123!",
+            first_name="İlker", last_name="Yılmaz", sehir="izmir",
+        )
+
+    def test_email_ile_getir(self, kullanici):
+        with CaptureQueriesContext(connection) as ctx:
+            bulunan = CustomUser.objects.email_ile_getir("  ILKER@example.COM ")
+
+        assert bulunan == kullanici
+        assert 'LIKE' not in ctx.captured_queries[0]['sql'].upper()
+
+    def test_sehire_gore(self, kullanici):
+        assert list(CustomUser.objects.sehire_gore("İZMİR")) == [kullanici]
+        assert list(CustomUser.objects.sehire_gore("izm")) == [kullanici]
@@ -0,0 +1,168 @@
+"""
+🐾 Evcil Hayvan Platformu - Konum Kodu Testleri
+==============================================================================
+İl/ilçe kod çözümlemesi, kayıtta kod senkronizasyonu ve kod filtreleri
+==============================================================================
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.hayvanlar.filters import HayvanFilter
+from apps.hayvanlar.models import Hayvan
+from apps.hayvanlar.servisler import HayvanService
+from apps.kullanicilar.models import CustomUser
+from apps.ortak.models import Il, Ilce
+from apps.ortak.servisler import KonumService
+
+
+class TestIlKodu:
+    """Ad veya plaka kodundan il kodu"""
+
+    def test_ad_ve_kod(self):
+        assert KonumService.il_kodu("İstanbul") == 34
+        assert KonumService.il_kodu("ISTANBUL") == 34
+        assert KonumService.il_kodu("istanbul") == 34
+        assert KonumService.il_kodu("6") == 6
+        assert KonumService.il_kodu("06") == 6
+        assert KonumService.il_kodu(35) == 35
+        assert KonumService.il_adi(35) == "İzmir"
+
+    def test_taninmayan(self):
+        assert KonumService.il_kodu("Atlantis") is None
+        assert KonumService.il_kodu("99") is None
+        assert KonumService.il_kodu("") is None
+        assert KonumService.il_kodu(None) is None
+
+
+@pytest.mark.django_db
+class TestHayvanKonumKodlari:
+    """Hayvan kaydında il_kod / ilce_kod senkronizasyonu"""
+
+    def test_iller_yuklu(self):
+        assert Il.objects.count() == 81
+        assert Il.objects.get(kod=34).ad_normal == "istanbul"
+
+    def test_kayitta_kodlar_atanir(self):
+        hayvan = Hayvan.objects.create(ad="Pamuk", tur="kedi", il="IZMIR", ilce="Karşıyaka")
+
+        hayvan.refresh_from_db()
+        assert hayvan.il == "İzmir"
+        assert hayvan.il_kod_id == 35
+        assert hayvan.ilce_kod.ad == "Karşıyaka"
+        assert hayvan.ilce_kod.il_id == 35
+
+    def test_plaka_kodu_ile_kayit(self):
+        hayvan = Hayvan.objects.create(ad="Karabaş", tur="kopek", il="6")
+
+        assert hayvan.il_kod_id == 6
+        assert hayvan.il == "Ankara"
+        assert hayvan.ilce_kod_id is None
+
+    def test_ilce_tekil_olusur(self):
+        Hayvan.objects.create(ad="Pamuk", tur="kedi", il="İzmir", ilce="KARŞIYAKA")
+        Hayvan.objects.create(ad="Boncuk", tur="kedi", il="İzmir", ilce="karşıyaka")
+
+        assert Ilce.objects.filter(il_id=35).count() == 1
+
+    def test_konum_degisince_guncellenir(self):
+        hayvan = Hayvan.objects.create(ad="Pamuk", tur="kedi", il="İzmir", ilce="Bornova")
+
+        hayvan = Hayvan.objects.get(pk=hayvan.pk)
+        hayvan.il = "Ankara"
+        hayvan.ilce = "Çankaya"
+        hayvan.save(update_fields=['il', 'ilce'])
+
+        hayvan.refresh_from_db()
+        assert hayvan.il_kod_id == 6
+        assert hayvan.il_normal == "ankara"
+        assert hayvan.ilce_kod.ad == "Çankaya"
+
+    def test_konum_degismezse_sorgu_yok(self):
+        hayvan = Hayvan.objects.create(ad="Pamuk", tur="kedi", il="İzmir", ilce="Bornova")
+        hayvan = Hayvan.objects.get(pk=hayvan.pk)
+
+        with CaptureQueriesContext(connection) as ctx:
+            hayvan.ad = "Pamuk Kız"
+            hayvan.save(update_fields=['ad'])
+
+        assert not any('ortak_ilce' in sorgu['sql'] for sorgu in ctx.captured_queries)
+
+
+@pytest.mark.django_db
+class TestKonumFiltreleri:
+    """İl/ilçe filtreleri kod eşitliğine çevrilir"""
+
+    @pytest.fixture
+    def hayvanlar(self):
+        return [
+            Hayvan.objects.create(ad="Pamuk", tur="kedi", il="İzmir", ilce="Karşıyaka"),
+            Hayvan.objects.create(ad="Karabaş", tur="kopek", il="Ankara", ilce="Çankaya"),
+            Hayvan.objects.create(ad="Tekir", tur="kedi", il="İstanbul", ilce="Kadıköy"),
+        ]
+
+    def _filtrele(self, **params):
+        return list(HayvanFilter(params, queryset=Hayvan.objects.order_by('id')).qs)
+
+    def test_il_ad_ve_kod(self, hayvanlar):
+        assert self._filtrele(il="IZMIR") == [hayvanlar[0]]
+        assert self._filtrele(il="6") == [hayvanlar[1]]
+        assert self._filtrele(il_kod=34) == [hayvanlar[2]]
+        assert self._filtrele(il="Atlantis") == []
+
+    def test_il_filtresi_kod_sutununu_kullanir(self, hayvanlar):
+        with CaptureQueriesContext(connection) as ctx:
+            self._filtrele(il="ankara")
+
+        sql = ctx.captured_queries[-1]['sql']
+        assert '"il_kod" = 6' in sql
+        assert ' LIKE ' not in sql.upper()
+
+    def test_ilce(self, hayvanlar):
+        assert self._filtrele(ilce="KARŞI") == [hayvanlar[0]]
+        assert self._filtrele(ilce="kadikoy") == [hayvanlar[2]]
+
+    def test_servis_il_filtresi(self, hayvanlar):
+        assert list(HayvanService.hayvan_listele({'il': 'İSTANBUL'})) == [hayvanlar[2]]
+
+    def test_servis_taninmayan_il_bos(self, hayvanlar):
+        # Konumsuz kayıt il_kod IS NULL ile eşleşmemeli
+        Hayvan.objects.create(ad="Minnoş", tur="kedi")
+        assert list(HayvanService.hayvan_listele({'il': 'xyz'})) == []
+
+
+@pytest.mark.django_db
+class TestKullaniciIlKodu:
+    """Kullanıcı şehrinden il_kod"""
+
+    def test_sehirden_il_kodu(self):
+        kullanici = CustomUser.objects.create_user(
+            email="ayse@example.com", password="GucluSifre123!",
+            first_name="Ayşe", last_name="Kaya", sehir="istanbul",
+        )
+        assert kullanici.il_kod_id == 34
+        assert list(CustomUser.objects.sehire_gore("34")) == [kullanici]
+
+        kullanici.sehir = "other"
+        kullanici.save(update_fields=['sehir'])
+        kullanici.refresh_from_db()
+        assert kullanici.il_kod_id is None
+        assert list(CustomUser.objects.sehire_gore("other")) == [kullanici]
+
+
+class TestMesafe:
+    """Haversine ve sınır kutusu"""
+
+    def test_bilinen_mesafe(self):
+        # İstanbul - Ankara il merkezleri arası ~350 km
+        (mesafe,) = KonumService.mesafeler(41.01, 28.98, [39.93], [32.86])
+        assert 345 < mesafe < 355
+        assert KonumService.mesafeler(41.01, 28.98, [41.01], [28.98]) == [0.0]
+
+    def test_sinir_kutusu_yaricapi_kapsar(self):
+        min_enlem, max_enlem, min_boylam, max_boylam = KonumService.sinir_kutusu(41.0, 29.0, 50)
+        kenarlar = KonumService.mesafeler(
+            41.0, 29.0, [min_enlem, max_enlem, 41.0, 41.0], [29.0, 29.0, min_boylam, max_boylam]
+        )
+        assert all(mesafe >= 49.9 for mesafe in kenarlar)
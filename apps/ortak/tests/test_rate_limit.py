@@ -0,0 +1,122 @@
+"""
+🐾 Evcil Hayvan Platformu - Rate Limit Testleri
+==============================================================================
+Kayan pencere sınırlayıcı ve SecurityMiddleware için testler
+==============================================================================
+"""
+
+import pytest
+from django.core.cache import cache
+from django.test import RequestFactory
+
+from apps.ortak.middleware import SecurityMiddleware
+from apps.ortak.rate_limit import KayanPencereLimiti
+
+
+YEREL_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@pytest.fixture(autouse=True)
+def yerel_cache(settings):
+    settings.CACHES = YEREL_CACHE
+    yield
+    cache.clear()
+
+
+class TestKayanPencereLimiti:
+    """Atomik kayan pencere sayacı"""
+
+    def test_limit_asilinca_retry_after_doner(self):
+        limiter = KayanPencereLimiti()
+
+        sonuclar = [limiter.kontrol("ip", limit=3, pencere=60, simdi=1200.0) for _ in range(4)]
+
+        assert sonuclar[:3] == [None, None, None]
+        assert sonuclar[3] == 60
+
+    def test_onceki_pencere_agirlikli_sayilir(self):
+        """Pencere başında önceki pencerenin trafiği hâlâ sayılmalı"""
+        limiter = KayanPencereLimiti()
+        for _ in range(10):
+            limiter.kontrol("ip", limit=10, pencere=60, simdi=1200.0)
+
+        # Yeni pencerenin %25'i geçti: 10 × 0.75 + 3 = 10.5 > 10
+        sonuclar = [limiter.kontrol("ip", limit=10, pencere=60, simdi=1275.0) for _ in range(3)]
+
+        assert sonuclar[:2] == [None, None]
+        assert sonuclar[2] is not None
+
+    def test_engelli_anahtar_yerelde_reddedilir(self, monkeypatch):
+        """Engel süresince paylaşılan cache'e gidilmemeli"""
+        limiter = KayanPencereLimiti()
+        limiter.kontrol("ip", limit=1, pencere=60, simdi=1200.0)
+        assert limiter.kontrol("ip", limit=1, pencere=60, simdi=1200.0) == 60
+
+        monkeypatch.setattr(limiter, '_artir', lambda *args: pytest.fail("cache'e gidildi"))
+
+        assert limiter.kontrol("ip", limit=1, pencere=60, simdi=1230.0) == 30
+
+    def test_cache_yoksa_acik_kalir(self, settings):
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+        limiter = KayanPencereLimiti()
+
+        assert all(limiter.kontrol("ip", limit=1, pencere=60) is None for _ in range(5))
+
+
+class TestSecurityMiddlewareRateLimit:
+    """Route grubu anahtarları ve 429 yanıtı"""
+
+    @pytest.fixture
+    def middleware(self, monkeypatch):
+        monkeypatch.setattr(SecurityMiddleware, 'limiter', KayanPencereLimiti())
+        return SecurityMiddleware(lambda request: None)
+
+    def test_farkli_urller_ayni_kovayi_paylasir(self, middleware, settings):
+        settings.RATE_LIMIT_GRUPLARI = [('api', ('/api/',), 2, 60)]
+        factory = RequestFactory()
+
+        for yol in ('/api/v1/hayvanlar/1/', '/api/v1/hayvanlar/2/'):
+            assert middleware.process_request(factory.get(yol)) is None
+        response = middleware.process_request(factory.get('/api/v1/hayvanlar/3/'))
+
+        assert response.status_code == 429
+        assert int(response['Retry-After']) >= 1
+
+    def test_gruplar_ayri_sayilir(self, middleware, settings):
+        settings.RATE_LIMIT_GRUPLARI = [
+            ('giris', ('/api/v1/token/',), 1, 300),
+            ('api', ('/api/',), 100, 3600),
+        ]
+        factory = RequestFactory()
+
+        assert middleware.process_request(factory.post('/api/v1/token/')) is None
+        assert middleware.process_request(factory.post('/api/v1/token/')).status_code == 429
+        assert middleware.process_request(factory.get('/api/v1/kategoriler/')) is None
+
+    def test_ip_yoksa_sinirlanmaz(self, middleware, settings):
+        settings.RATE_LIMIT_GRUPLARI = [('api', ('/api/',), 1, 60)]
+        factory = RequestFactory()
+
+        for _ in range(3):
+            assert middleware.process_request(factory.get('/api/v1/hayvanlar/', REMOTE_ADDR='')) is None
+
+    @pytest.mark.django_db
+    def test_kullanici_kendi_kovasini_kullanir(self, middleware, settings, django_user_model):
+        """Aynı IP'deki kullanıcılar birbirinin limitini tüketmemeli"""
+        settings.RATE_LIMIT_GRUPLARI = [('api', ('/api/',), 1, 60)]
+        factory = RequestFactory()
+        kullanicilar = [
+            django_user_model.objects.create_user(
+                email=f"k{i}@ornek.com", password="GucluSifre123!", first_name="Ayşe", last_name="Kaya"
+            )
+            for i in range(2)
+        ]
+
+        for kullanici in kullanicilar:
+            request = factory.get('/api/v1/hayvanlar/')
+            request.user = kullanici
+            assert middleware.process_request(request) is None
+        request = factory.get('/api/v1/hayvanlar/')
+        request.user = kullanicilar[0]
+
+        assert middleware.process_request(request).status_code == 429
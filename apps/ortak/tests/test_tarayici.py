@@ -0,0 +1,151 @@
+"""
+🐾 Evcil Hayvan Platformu - Şüpheli Desen Tarayıcı Testleri
+==============================================================================
+Tek geçişli tarayıcı, middleware taraması ve ortak validatörler için testler
+==============================================================================
+"""
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.test import RequestFactory
+from rest_framework.test import APIClient
+
+from apps.ortak import tarayici as tarayici_modulu
+from apps.ortak.middleware import SecurityMiddleware
+from apps.ortak.tarayici import ISTEK_TARAYICI, DesenTarayici
+from apps.ortak.validators import validate_content_appropriateness, validate_user_input_security
+
+
+class TestDesenTarayici:
+    """Derlenmiş alternation tarayıcı"""
+
+    def test_ilk_eslesme_grup_ve_metin_doner(self):
+        tarayici = DesenTarayici([('a', [r'foo']), ('b', [r'bar\d'])])
+
+        assert tarayici.ilk_eslesme("xx BAR1 foo") == ('b', 'BAR1')
+        assert tarayici.ilk_eslesme("temiz metin") is None
+
+    def test_oncelikli_eslesme_tanim_sirasina_uyar(self):
+        tarayici = DesenTarayici([('a', [r'foo']), ('b', [r'bar'])])
+
+        assert tarayici.oncelikli_eslesme("bar sonra foo") == ('a', 'foo')
+
+    def test_eslesmeler_sayilir(self):
+        tarayici = DesenTarayici([('a', [r'foo']), ('b', [r'bar'])])
+        tarayici.ilk_eslesme("foo")
+        tarayici.ilk_eslesme("foo bar")
+        tarayici.ilk_eslesme("bar")
+
+        assert tarayici.metrikler() == {'a': 2, 'b': 1}
+
+
+class TestTarayiciMetrikleri:
+    """Sayaçların paylaşılan cache'e aktarımı ve personel endpoint'i"""
+
+    @pytest.fixture(autouse=True)
+    def yerel_cache(self, settings):
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        yield
+        cache.clear()
+
+    def test_aktarim_surecler_arasi_toplanir(self, monkeypatch):
+        monkeypatch.setattr(tarayici_modulu, 'TARAYICILAR', {})
+        birinci = DesenTarayici([('a', [r'foo'])], ad='deneme')
+        ikinci = DesenTarayici([('a', [r'foo'])], ad='deneme')
+        birinci.ilk_eslesme("foo")
+        ikinci.ilk_eslesme("foo")
+
+        assert birinci.metrikleri_aktar() == {'a': 1}
+        assert birinci.metrikleri_aktar() == {}
+        ikinci.metrikleri_aktar()
+
+        assert birinci.paylasilan_metrikler() == {'a': 2}
+
+    def test_aralik_dolunca_aktarilir(self, monkeypatch):
+        monkeypatch.setattr(tarayici_modulu, 'TARAYICILAR', {})
+        tarayici = DesenTarayici([('a', [r'foo'])], ad='deneme')
+        tarayici.ilk_eslesme("foo")
+
+        tarayici_modulu.metrikleri_aktar_gerekirse(tarayici._son_aktarim + 1)
+        assert tarayici.paylasilan_metrikler() == {'a': 0}
+
+        tarayici_modulu.metrikleri_aktar_gerekirse(tarayici._son_aktarim + tarayici_modulu.AKTARIM_ARALIGI)
+        assert tarayici.paylasilan_metrikler() == {'a': 1}
+
+    @pytest.mark.django_db
+    def test_endpoint_yalnizca_personel(self, django_user_model):
+        url = '/api/v1/ortak/tarayici-metrikleri/'
+        client = APIClient()
+        kullanici = django_user_model.objects.create_user(
+            email='uye@ornek.com', password='GucluSifre123!', first_name='Ayşe', last_name='Kaya'
+        )
+        client.force_authenticate(kullanici)
+        assert client.get(url).status_code == 403
+
+        kullanici.is_staff = True
+        kullanici.save(update_fields=['is_staff'])
+        response = client.get(url)
+
+        assert response.status_code == 200
+        assert set(response.json()['istek']) == {'toplam', 'surec'}
+        assert 'atlanan_govde' in response.json()['istek']['toplam']
+
+
+class TestIstekTaramasi:
+    """SecurityMiddleware.detect_suspicious_activity"""
+
+    @pytest.fixture
+    def middleware(self):
+        return SecurityMiddleware(lambda request: None)
+
+    def test_sorgu_dizgisi_cozulerek_taranir(self, middleware):
+        request = RequestFactory().get('/api/v1/hayvanlar/', {'q': "1 UNION  SELECT sifre"})
+
+        assert middleware.detect_suspicious_activity(request)
+
+    def test_multipart_dosya_parcasi_atlanir(self, middleware):
+        dosya = SimpleUploadedFile('foto.jpg', b'\xff\xd8\xff ../../etc/passwd', content_type='image/jpeg')
+        temiz = RequestFactory().post('/api/v1/hayvanlar/', {'ad': 'Pamuk', 'foto': dosya})
+        supheli = RequestFactory().post('/api/v1/hayvanlar/', {'ad': '<script>alert(1)</script>'})
+
+        assert not middleware.detect_suspicious_activity(temiz)
+        assert middleware.detect_suspicious_activity(supheli)
+
+    def test_sinirdan_buyuk_govde_taranmaz(self, middleware, settings):
+        settings.SUSPICIOUS_SCAN_MAX_BYTES = 16
+        once = ISTEK_TARAYICI.metrikler().get('atlanan_govde', 0)
+        request = RequestFactory().post(
+            '/api/v1/hayvanlar/', data='{"aciklama": "x; cat /etc/passwd"}', content_type='application/json'
+        )
+
+        assert not middleware.detect_suspicious_activity(request)
+        assert ISTEK_TARAYICI.metrikler()['atlanan_govde'] == once + 1
+
+
+class TestOrtakValidatorler:
+    """Validatörler aynı motoru kullanır"""
+
+    @pytest.mark.parametrize('deger', ['<script>x</script>', 'javascript:alert(1)', 'a UNION SELECT b'])
+    def test_guvenlik_riskli_girdi(self, deger):
+        with pytest.raises(ValidationError):
+            validate_user_input_security(deger)
+
+    def test_guvenli_girdi(self):
+        validate_user_input_security("Kedileri çok seven bir hayvan dostu")
+
+    @pytest.mark.parametrize('metin, kod', [
+        ('Kedi SATILIK, arayın', 'inappropriate_content'),
+        ('Bilgi için 532 123 45 67', 'phone_in_content'),
+        ('Yazın: ornek@alanadi.com', 'email_in_content'),
+    ])
+    def test_icerik_uygunlugu(self, metin, kod):
+        with pytest.raises(ValidationError) as hata:
+            validate_content_appropriateness(metin)
+        assert hata.value.code == kod
+
+    def test_yasakli_kelime_telefondan_once_gelir(self):
+        with pytest.raises(ValidationError) as hata:
+            validate_content_appropriateness('532 123 45 67 numaralı kedi satılık')
+        assert hata.value.code == 'inappropriate_content'
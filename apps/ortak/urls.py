@@ -0,0 +1,18 @@
+"""
+🐾 Evcil Hayvan Platformu - Ortak URLs
+==============================================================================
+Platform geneli yönetim endpoint'leri için URL yapılandırmaları
+==============================================================================
+"""
+
+from django.urls import path
+
+from .views import TarayiciMetrikleriView
+
+# URL patterns
+urlpatterns = [
+    path('tarayici-metrikleri/', TarayiciMetrikleriView.as_view(), name='tarayici-metrikleri'),
+]
+
+# Uygulama adı
+app_name = 'ortak'
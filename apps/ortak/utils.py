@@ -37,20 +37,39 @@ def generate_secure_token(length: int = 32) -> str:
     """
     return secrets.token_urlsafe(length)
 
+# Türkçe küçültme: Python'un lower()'ı 'I' -> 'i', 'İ' -> 'i̇' yapar
+_TURKCE_KUCUK = str.maketrans({'I': 'ı', 'İ': 'i'})
+# Küçük Türkçe harflerin ASCII karşılıkları (birleşik nokta atılır)
+_TURKCE_ASCII = str.maketrans({
+    'ı': 'i', 'ğ': 'g', 'ü': 'u', 'ş': 's', 'ö': 'o', 'ç': 'c',
+    'â': 'a', 'î': 'i', 'û': 'u', '\u0307': None,
+})
+
+
+def turkce_kucult(text: str) -> str:
+    """
+    Türkçe kurallarla küçük harfe çevir: 'IŞIK' -> 'ışık', 'İZMİR' -> 'izmir'
+    """
+    return text.translate(_TURKCE_KUCUK).lower()
+
+
+def turkce_normalize(text: str) -> str:
+    """
+    Büyük/küçük harf ve aksan duyarsız karşılaştırma anahtarı
+    
+    Türkçe küçültür, ASCII'ye katlar ve boşlukları sadeleştirir:
+    '  IŞIKLI  Köpek ' -> 'isikli kopek'. Gölge sütunlar (NormalizeAlan)
+    ve `tr_*` lookup'ları bu anahtarla karşılaştırır.
+    """
+    return ' '.join(turkce_kucult(text).translate(_TURKCE_ASCII).split())
+
+
 def create_slug(text: str, max_length: int = 50) -> str:
     """
     SEO dostu slug oluştur
     """
     # Türkçe karakterleri dönüştür
-    turkish_map = {
-        'ı': 'i', 'ğ': 'g', 'ü': 'u', 'ş': 's', 'ö': 'o', 'ç': 'c',
-        'İ': 'i', 'Ğ': 'g', 'Ü': 'u', 'Ş': 's', 'Ö': 'o', 'Ç': 'c'
-    }
-    
-    for tr_char, en_char in turkish_map.items():
-        text = text.replace(tr_char, en_char)
-    
-    slug = slugify(text, allow_unicode=False)
+    slug = slugify(turkce_kucult(text).translate(_TURKCE_ASCII), allow_unicode=False)
     return slug[:max_length] if len(slug) > max_length else slug
 
 def mask_sensitive_data(data: str, mask_char: str = "*", visible_chars: int = 3) -> str:
@@ -256,18 +275,14 @@ def cache_get_or_set(key: str, callable_func, timeout: int = 300):
 
 def invalidate_cache_pattern(pattern: str):
     """
-    Pattern'e uyan cache'leri temizle
+    Cache etiketini geçersiz kıl
+
+    Eskiden `KEYS *pattern*` ile tarayıp siliyordu (Redis'i bloklar) ve hata
+    durumunda tüm cache'i temizliyordu. Artık `pattern` bir cache etiketi
+    olarak yorumlanır, bkz. apps.ortak.cache.
     """
-    # Redis backend kullanıyorsak
-    try:
-        from django_redis import get_redis_connection
-        conn = get_redis_connection("default")
-        keys = conn.keys(f"*{pattern}*")
-        if keys:
-            conn.delete(*keys)
-    except:
-        # Fallback: cache.clear() kullan
-        cache.clear()
+    from apps.ortak.cache import etiketleri_gecersiz_kil
+    etiketleri_gecersiz_kil(pattern)
 
 # ==============================================================================
 # 📊 DATA UTILITIES - Veri yardımcıları
@@ -297,6 +312,40 @@ def paginate_queryset(queryset, page: int = 1, per_page: int = 20):
         'total': paginator.count,
     }
 
+def estimate_queryset_count(queryset) -> int:
+    """
+    QuerySet için tahmini kayıt sayısı (COUNT(*) çalıştırmadan)
+
+    PostgreSQL'de filtresiz sorgular için `pg_class.reltuples`, filtreli
+    sorgular için planlayıcının satır tahmini kullanılır. Diğer
+    veritabanlarında veya istatistik yoksa gerçek sayıma düşülür.
+    """
+    import json
+    from django.db import connections
+
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+            # Hiç ANALYZE edilmemiş tablolarda reltuples -1 döner
+            if row and row[0] >= 0:
+                return row[0]
+            return queryset.count()
+
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
 def serialize_for_json(obj) -> Any:
     """
     Objeyi JSON serializable hale getir
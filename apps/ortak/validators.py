@@ -17,6 +17,9 @@ from django.core.validators import RegexValidator
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
 
+from .constants import Iller
+from .tarayici import SQL_DESENLERI, XSS_DESENLERI, DesenTarayici
+
 # ==============================================================================
 # 📞 TELEFON NUMARASI VALIDASYONU - Türkiye formatı
 # ==============================================================================
@@ -153,6 +156,13 @@ FORBIDDEN_WORDS = [
     # Daha fazla kelime eklenebilir
 ]
 
+# Yasaklı kelime, telefon ve e-posta tek geçişte taranır (öncelik bu sırada)
+ICERIK_TARAYICI = DesenTarayici([
+    ('yasakli_kelime', [re.escape(word) for word in FORBIDDEN_WORDS]),
+    ('telefon', [r'[0-9]{3}[\s\-]?[0-9]{3}[\s\-]?[0-9]{2}[\s\-]?[0-9]{2}']),
+    ('email', [r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b']),
+], ad='icerik')
+
 def validate_content_appropriateness(text):
     """
     İçerik uygunluğu kontrolü
@@ -161,20 +171,22 @@ def validate_content_appropriateness(text):
     if not text:
         return
     
-    text_lower = text.lower()
+    eslesme = ICERIK_TARAYICI.oncelikli_eslesme(text)
+    if eslesme is None:
+        return
+    
+    grup, eslesen = eslesme
     
     # Yasaklı kelime kontrolü
-    for word in FORBIDDEN_WORDS:
-        if word in text_lower:
-            raise ValidationError(
-                _(f'İçeriğinizde uygunsuz kelime tespit edildi: "{word}". '
-                  f'Platform politikalarımıza göre hayvan satışı yasaktır.'),
-                code='inappropriate_content'
-            )
+    if grup == 'yasakli_kelime':
+        raise ValidationError(
+            _(f'İçeriğinizde uygunsuz kelime tespit edildi: "{eslesen.lower()}". '
+              f'Platform politikalarımıza göre hayvan satışı yasaktır.'),
+            code='inappropriate_content'
+        )
     
     # Telefon numarası kontrolü (içerikte telefon paylaşımı yasak)
-    phone_pattern = r'[0-9]{3}[\s\-]?[0-9]{3}[\s\-]?[0-9]{2}[\s\-]?[0-9]{2}'
-    if re.search(phone_pattern, text):
+    if grup == 'telefon':
         raise ValidationError(
             _('İçerikte telefon numarası paylaşamazsınız. '
               'İletişim için platform mesajlaşma sistemini kullanın.'),
@@ -182,13 +194,11 @@ def validate_content_appropriateness(text):
         )
     
     # Email kontrolü
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    if re.search(email_pattern, text):
-        raise ValidationError(
-            _('İçerikte email adresi paylaşamazsınız. '
-              'İletişim için platform mesajlaşma sistemini kullanın.'),
-            code='email_in_content'
-        )
+    raise ValidationError(
+        _('İçerikte email adresi paylaşamazsınız. '
+          'İletişim için platform mesajlaşma sistemini kullanın.'),
+        code='email_in_content'
+    )
 
 # ==============================================================================
 # 🏷️ ETİKET VALIDASYONU - İçerik etiketleri için
@@ -224,23 +234,8 @@ def validate_tag_name(tag_name):
 # 📍 KONUM VALIDASYONU - Türkiye il/ilçe kontrolü
 # ==============================================================================
 
-# Türkiye'nin 81 ili
-TURKISH_CITIES = [
-    'Adana', 'Adıyaman', 'Afyonkarahisar', 'Ağrı', 'Aksaray', 'Amasya',
-    'Ankara', 'Antalya', 'Ardahan', 'Artvin', 'Aydın', 'Balıkesir',
-    'Bartın', 'Batman', 'Bayburt', 'Bilecik', 'Bingöl', 'Bitlis',
-    'Bolu', 'Burdur', 'Bursa', 'Çanakkale', 'Çankırı', 'Çorum',
-    'Denizli', 'Diyarbakır', 'Düzce', 'Edirne', 'Elazığ', 'Erzincan',
-    'Erzurum', 'Eskişehir', 'Gaziantep', 'Giresun', 'Gümüşhane', 'Hakkari',
-    'Hatay', 'Iğdır', 'Isparta', 'İstanbul', 'İzmir', 'Kahramanmaraş',
-    'Karabük', 'Karaman', 'Kars', 'Kastamonu', 'Kayseri', 'Kırıkkale',
-    'Kırklareli', 'Kırşehir', 'Kilis', 'Kocaeli', 'Konya', 'Kütahya',
-    'Malatya', 'Manisa', 'Mardin', 'Mersin', 'Muğla', 'Muş',
-    'Nevşehir', 'Niğde', 'Ordu', 'Osmaniye', 'Rize', 'Sakarya',
-    'Samsun', 'Siirt', 'Sinop', 'Sivas', 'Şanlıurfa', 'Şırnak',
-    'Tekirdağ', 'Tokat', 'Trabzon', 'Tunceli', 'Uşak', 'Van',
-    'Yalova', 'Yozgat', 'Zonguldak'
-]
+# Türkiye'nin 81 ili (tek kaynak: constants.Iller)
+TURKISH_CITIES = [str(ad) for _kod, ad in Iller.choices]
 
 def validate_turkish_city(city_name):
     """
@@ -372,35 +367,26 @@ def validate_strong_password(password):
     if password.lower() in common_passwords:
         raise ValidationError(_('Bu şifre çok yaygın kullanılıyor.'))
 
+# XSS ve SQL injection desenleri (middleware ile aynı motor ve tanımlar)
+GUVENLIK_TARAYICI = DesenTarayici([
+    ('xss', XSS_DESENLERI),
+    ('sql', SQL_DESENLERI),
+], ad='guvenlik')
+
 def validate_user_input_security(value):
     """
     Validate user input for security threats
     """
-    # XSS prevention
-    xss_patterns = [
-        r'<script[^>]*>.*?</script>',
-        r'javascript:',
-        r'onload\s*=',
-        r'onerror\s*=',
-        r'onclick\s*=',
-    ]
+    eslesme = GUVENLIK_TARAYICI.oncelikli_eslesme(value)
+    if eslesme is None:
+        return
     
-    for pattern in xss_patterns:
-        if re.search(pattern, value, re.IGNORECASE):
-            raise ValidationError(_('Geçersiz içerik tespit edildi.'))
+    # XSS prevention
+    if eslesme[0] == 'xss':
+        raise ValidationError(_('Geçersiz içerik tespit edildi.'))
     
     # SQL injection prevention
-    sql_patterns = [
-        r'union\s+select',
-        r'drop\s+table',
-        r'delete\s+from',
-        r'insert\s+into',
-        r'update\s+.*\s+set',
-    ]
-    
-    for pattern in sql_patterns:
-        if re.search(pattern, value, re.IGNORECASE):
-            raise ValidationError(_('Güvenlik riski tespit edildi.'))
+    raise ValidationError(_('Güvenlik riski tespit edildi.'))
 
 # ==============================================================================
 # 💝 PLATFORM MESSAGE
@@ -0,0 +1,32 @@
+"""
+🐾 Evcil Hayvan Platformu - Ortak Views
+==============================================================================
+Platform geneli yönetim endpoint'leri
+==============================================================================
+"""
+
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .tarayici import TARAYICILAR
+
+
+class TarayiciMetrikleriView(APIView):
+    """
+    🔍 Şüpheli desen tarayıcı metrikleri (yalnızca personel)
+
+    Tarayıcı başına grup eşleşme sayaçları: `toplam` tüm süreçlerin
+    paylaşılan cache'e aktardığı değerler, `surec` yanıtı veren sürecin
+    henüz aktarılmamışlar dahil sayaçları.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            ad: {
+                'toplam': tarayici.paylasilan_metrikler(),
+                'surec': tarayici.metrikler(),
+            }
+            for ad, tarayici in sorted(TARAYICILAR.items())
+        })
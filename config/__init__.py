@@ -5,4 +5,8 @@ Django configuration package initialization
 ==============================================================================
 """
 
-# This file makes Python treat the directory as a package
+# Celery uygulaması Django ile birlikte yüklenir; @shared_task görevleri bu
+# uygulamaya bağlanır
+from .celery import app as celery_app
+
+__all__ = ('celery_app',)
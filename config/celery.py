@@ -0,0 +1,28 @@
+"""
+🐾 Evcil Hayvan Platformu - Celery Configuration
+==============================================================================
+Celery uygulaması. Ayarlar Django settings'ten `CELERY_` önekiyle okunur,
+görevler kurulu uygulamaların `tasks.py` modüllerinden keşfedilir.
+
+    celery -A config worker -l info
+    celery -A config beat -l info --scheduler django_celery_beat.schedulers:DatabaseScheduler
+==============================================================================
+"""
+
+import os
+
+from celery import Celery
+
+# wsgi.py ile aynı ortam seçimi
+settings_modules = {
+    'development': 'config.settings.development',
+    'testing': 'config.settings.testing',
+    'staging': 'config.settings.production',
+    'production': 'config.settings.production',
+}
+environment = os.getenv('DJANGO_ENVIRONMENT', 'development').lower()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_modules.get(environment, 'config.settings.development'))
+
+app = Celery('config')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
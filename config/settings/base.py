@@ -47,6 +47,7 @@ DJANGO_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # Tam metin arama ve trigram lookup'ları
 ]
 
 # Third party apps
@@ -55,6 +56,7 @@ THIRD_PARTY_APPS = [
     'rest_framework.authtoken',
     'corsheaders',
     'django_filters',
+    'django_celery_beat',  # CELERY_BEAT_SCHEDULE'ı veritabanı zamanlayıcısına taşır
 ]
 
 # Local apps - FAZ 2 güncellemesi
@@ -80,6 +82,8 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # Oturum kullanıcısı çözüldükten sonra: rate limit kullanıcıya göre tutulur
+    'apps.ortak.middleware.SecurityMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -216,6 +220,66 @@ CORS_ALLOWED_ORIGINS = env.list('CORS_ALLOWED_ORIGINS', default=[
 
 CORS_ALLOW_CREDENTIALS = True
 
+# ==============================================================================
+# 🚦 RATE LIMITING - SecurityMiddleware kayan pencere limitleri
+# ==============================================================================
+
+# (grup, yol önekleri, limit, pencere sn) - ilk eşleşen grup uygulanır.
+# Giriş yapmış kullanıcılar kullanıcı kimliğiyle, diğerleri IP ile sayılır.
+RATE_LIMIT_GRUPLARI = [
+    ('giris', ('/api/v1/kullanicilar/users/login/', '/api/v1/token/', '/api/v1/auth/login/'),
+     env.int('RATE_LIMIT_GIRIS', default=5), 300),
+    ('api', ('/api/',), env.int('RATE_LIMIT_API_DAKIKA', default=300), 60),
+    ('genel', ('/',), env.int('RATE_LIMIT_GENEL_DAKIKA', default=600), 60),
+]
+
+# ==============================================================================
+# 🔄 CELERY - Arka plan görevleri (config/celery.py)
+# ==============================================================================
+
+CELERY_BROKER_URL = env('CELERY_BROKER_URL', default='redis://localhost:6379/0')
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
+
+# ==============================================================================
+# 🔄 CELERY BEAT - Periyodik görevler
+# ==============================================================================
+
+# Görüntülenme/beğeni/paylaşım sayaç tamponunun boşaltılma aralığı (sn).
+# Redis olmayan ortamlarda süreç içi tampon bu aralıkla yazma yolunda boşaltılır.
+SAYAC_TAMPONU_BOSALTMA_SANIYE = env.int('SAYAC_TAMPONU_BOSALTMA_SANIYE', default=30)
+
+# Popülerlik sıralamasının yeniden hesaplanma aralığı (sn)
+POPULERLIK_HESAPLAMA_SANIYE = env.int('POPULERLIK_HESAPLAMA_SANIYE', default=600)
+
+# Eşleştirme dizilerine değişen hayvanların yazılıp paylaşılan cache'e
+# yayınlanma aralığı (sn) ve dizilerin sıfırdan kurulma aralığı (sn)
+ESLESME_INDEKSI_GUNCELLEME_SANIYE = env.int('ESLESME_INDEKSI_GUNCELLEME_SANIYE', default=60)
+ESLESME_INDEKSI_KURMA_SANIYE = env.int('ESLESME_INDEKSI_KURMA_SANIYE', default=3600)
+
+# Etiket versiyonu geçmiş cache anahtarlarının SCAN ile temizlenme aralığı (sn)
+ESKI_CACHE_TEMIZLEME_SANIYE = env.int('ESKI_CACHE_TEMIZLEME_SANIYE', default=3600)
+
+CELERY_BEAT_SCHEDULE = {
+    'sayac-tamponunu-bosalt': {
+        'task': 'apps.ortak.tasks.sayac_tamponunu_bosalt',
+        'schedule': SAYAC_TAMPONU_BOSALTMA_SANIYE,
+    },
+    'populerlik-siralamasini-guncelle': {
+        'task': 'apps.hayvanlar.tasks.populerlik_siralamasini_guncelle',
+        'schedule': POPULERLIK_HESAPLAMA_SANIYE,
+    },
+    'eslesme-indeksini-guncelle': {
+        'task': 'apps.hayvanlar.tasks.eslesme_indeksini_guncelle',
+        'schedule': ESLESME_INDEKSI_GUNCELLEME_SANIYE,
+    },
+    'eski-cache-anahtarlarini-temizle': {
+        'task': 'apps.ortak.tasks.eski_cache_anahtarlarini_temizle',
+        'schedule': ESKI_CACHE_TEMIZLEME_SANIYE,
+    },
+}
+
 # ==============================================================================
 # 📊 LOGGING - Platform sağlığının takibi (Geçici olarak basit)
 # ==============================================================================